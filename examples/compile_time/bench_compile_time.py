@@ -0,0 +1,286 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import argparse
+import json
+import os
+import platform
+import sys
+
+import tvm
+from tvm.script import tir as T
+from tvm.sparse import (
+    FormatRewriteRule,
+    format_decompose,
+    format_instances,
+    ir_node_count,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    profile,
+    specialize_params,
+)
+from tvm.sparse.format_search import ell_rule
+
+sys.path.append(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../tests/python/sparsetir")
+)
+import sparse_tir_scripts  # pylint: disable=wrong-import-position
+
+SPARSE_PASSES = [
+    "tir.SparseFormatDecompose",
+    "tir.LowerSparseIter",
+    "tir.LowerSparseBuffer",
+    "tir.HorizontalFusion",
+]
+
+SCRIPT_KERNELS = [
+    "csrmm",
+    "csrmm_dense_iter",
+    "segment_reduce",
+    "csr_reduce",
+    "bsrmm",
+    "ellmm",
+    "csr_element_wise",
+    "hyper_gnn",
+    "bmm",
+    "sddmm",
+    "fused_sddmm",
+    "square_sum",
+    "square_sum_two_K",
+    "fused_reduction_4d_2d",
+    "fused_reduction_4d_3d",
+    "rgcn_homo_forward",
+    "rgcn_hetero_forward",
+    "sparse_softmax",
+]
+
+
+@T.prim_func
+def ell3d(
+    a: T.handle,
+    indptr_io: T.handle,
+    indices_ii: T.handle,
+    indices_j: T.handle,
+    d0: T.int32,
+    d1: T.int32,
+    d2: T.int32,
+    nnz: T.int32,
+    nnz_rows: T.int32,
+    nnz_cols: T.int32,
+) -> None:
+    R = T.dense_fixed(d0, idtype="int32")
+    IO = T.dense_variable(R, (d1, nnz), indptr_io, idtype="int32")
+    II = T.sparse_fixed(IO, (d2, nnz_rows), indices_ii, idtype="int32")
+    J = T.sparse_fixed(II, (d2, nnz_cols), indices_j, idtype="int32")
+    A = T.match_sparse_buffer(a, (R, IO, II, J), dtype="float32")
+    T.evaluate(0)
+
+
+def csf_to_ell3d_inv_idx_map(r, io, ii, j):
+    return r, ii, j
+
+
+def csf_to_ell3d_idx_map(r, i, j):
+    return r, 0, i, j
+
+
+def hyb_rules(num_buckets: int, parametric: bool):
+    # ELL buckets of widths 1, 2, ..., num_buckets, the width is a parameter in parametric mode
+    return [
+        ell_rule("ell_{}".format(width), None if parametric else width)
+        for width in range(1, num_buckets + 1)
+    ]
+
+
+def rgms_rules(num_buckets: int, group_size: int = 32):
+    d0, d1, d2, nnz, nnz_rows, nnz_cols = ell3d.params[-6:]
+    return [
+        FormatRewriteRule(
+            "ell3d_{}".format(width),
+            ell3d.specialize({nnz_rows: max(group_size // width, 1), nnz_cols: width}),
+            ["A"],
+            ["R", "I", "J"],
+            ["R", "IO", "II", "J"],
+            {"R": ["R"], "I": ["IO", "II"], "J": ["J"]},
+            csf_to_ell3d_idx_map,
+            csf_to_ell3d_inv_idx_map,
+        )
+        for width in range(1, num_buckets + 1)
+    ]
+
+
+def specialize_hyb(func: tvm.tir.PrimFunc, num_rows: int = 4096, feat_size: int = 128):
+    names = {param.name for param in func.params}
+    values = {"m": num_rows, "n": num_rows, "nnz": num_rows * 16, "feat_size": feat_size}
+    for name in names:
+        if name.startswith(("m_", "n_", "num_rows_")):
+            values[name] = num_rows
+    return specialize_params(func, {k: v for k, v in values.items() if k in names})
+
+
+def schedule_hyb(mod: tvm.IRModule, sp_iter_names):
+    # one thread block per row of every bucket, merged into one kernel by HorizontalFusion
+    sch = tvm.tir.Schedule(mod)
+    for name in sp_iter_names:
+        sp_iteration = sch.get_sparse_iteration(name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_iter(sch.mod)
+    sch = tvm.tir.Schedule(mod)
+    for name in sp_iter_names:
+        loops = sch.get_loops(sch.get_block(name + "0"))
+        sch.bind(loops[0], "blockIdx.x")
+        sch.bind(loops[-1], "threadIdx.x")
+    return sch.mod
+
+
+def compile_workload(mod: tvm.IRModule, rules=None, parametric=False, hyb=False):
+    stages = [("input", mod)]
+    with profile(trace_memory=False) as prof:
+        with prof.phase("pipeline"):
+            if rules:
+                mod = format_decompose(mod, rules, parametric=parametric)
+                mod = tvm.tir.transform.RemovePreprocess()(mod)
+                stages.append(("format_decompose", mod))
+            if hyb:
+                func = mod["main"]
+                if parametric:
+                    names = ["csrmm_" + name for name in format_instances(func)]
+                else:
+                    names = ["csrmm_" + rule.name for rule in rules]
+                func = specialize_hyb(func).with_attr("horizontal_fuse", True)
+                mod = schedule_hyb(tvm.IRModule({"main": func}), names)
+            else:
+                mod = lower_sparse_iter(mod)
+            stages.append(("lower_sparse_iter", mod))
+            mod = lower_sparse_buffer(mod)
+            stages.append(("lower_sparse_buffer", mod))
+            mod = tvm.lower(mod)
+            stages.append(("lower", mod))
+    summary = prof.summary()
+    return {
+        "total_ms": summary["pipeline"]["wall_ms"],
+        "passes": {name: summary[name]["wall_ms"] for name in SPARSE_PASSES if name in summary},
+        "nodes": {stage: ir_node_count(stage_mod) for stage, stage_mod in stages},
+    }
+
+
+def workloads(buckets):
+    for name in SCRIPT_KERNELS:
+        yield name, 1, dict(mod=tvm.IRModule.from_expr(getattr(sparse_tir_scripts, name)))
+    csrmm = tvm.IRModule.from_expr(sparse_tir_scripts.csrmm)
+    rgms = tvm.IRModule.from_expr(sparse_tir_scripts.rgcn_hetero_forward)
+    for num_buckets in buckets:
+        yield "hyb", num_buckets, dict(mod=csrmm, rules=hyb_rules(num_buckets, False), hyb=True)
+        yield "hyb_parametric", num_buckets, dict(
+            mod=csrmm, rules=hyb_rules(num_buckets, True), parametric=True, hyb=True
+        )
+        yield "rgms", num_buckets, dict(mod=rgms, rules=rgms_rules(num_buckets))
+
+
+def bench(kwargs, repeat: int):
+    results = [compile_workload(**kwargs) for _ in range(repeat)]
+    # the fastest run is the least disturbed by the machine
+    best = min(results, key=lambda result: result["total_ms"])
+    best["passes"] = {
+        name: min(result["passes"][name] for result in results) for name in best["passes"]
+    }
+    return best
+
+
+def find_regressions(records, baseline, tolerance: float, min_ms: float):
+    regressions = []
+    base = {(r["workload"], r["scale"]): r for r in baseline["records"]}
+    for record in records:
+        key = (record["workload"], record["scale"])
+        if key not in base:
+            continue
+        timings = dict(record["passes"], total_ms=record["total_ms"])
+        base_timings = dict(base[key]["passes"], total_ms=base[key]["total_ms"])
+        for name, ms in timings.items():
+            base_ms = base_timings.get(name)
+            if base_ms is not None and ms > base_ms * (1 + tolerance) and ms - base_ms > min_ms:
+                regressions.append(
+                    "{} x{} {}: {:.3f}ms -> {:.3f}ms".format(*key, name, base_ms, ms)
+                )
+        # the IR size does not depend on the machine, any growth is a regression
+        for stage, count in record["nodes"].items():
+            base_count = base[key]["nodes"].get(stage)
+            if base_count is not None and count > base_count:
+                regressions.append(
+                    "{} x{} {} nodes: {} -> {}".format(*key, stage, base_count, count)
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser("compile time benchmark of sparse-tir passes")
+    parser.add_argument(
+        "--buckets", "-b", nargs="+", type=int, default=[4, 16, 64, 256], help="bucket counts"
+    )
+    parser.add_argument("--workloads", "-w", nargs="+", default=None, help="workloads to run")
+    parser.add_argument("--repeat", type=int, default=3, help="repeat of measurements")
+    parser.add_argument("--output", "-o", type=str, default=None, help="json file of results")
+    parser.add_argument("--baseline", type=str, default=None, help="json file to compare with")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.25, help="relative slowdown reported as regression"
+    )
+    parser.add_argument(
+        "--min-ms", type=float, default=1.0, help="absolute slowdown reported as regression"
+    )
+    args = parser.parse_args()
+
+    records = []
+    for workload, scale, kwargs in workloads(args.buckets):
+        if args.workloads is not None and workload not in args.workloads:
+            continue
+        record = {"workload": workload, "scale": scale}
+        record.update(bench(kwargs, args.repeat))
+        print(
+            "{} x{}:\ttotal {:.3f}ms\t{}\tnodes {}".format(
+                workload,
+                scale,
+                record["total_ms"],
+                "\t".join(
+                    "{} {:.3f}ms".format(name.split(".")[-1], ms)
+                    for name, ms in record["passes"].items()
+                ),
+                record["nodes"]["lower_sparse_buffer"],
+            )
+        )
+        records.append(record)
+
+    result = {
+        "machine": platform.machine(),
+        "tvm_version": tvm.__version__,
+        "records": records,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+    if args.baseline is not None:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = find_regressions(records, baseline, args.tolerance, args.min_ms)
+        for regression in regressions:
+            print("regression: " + regression)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
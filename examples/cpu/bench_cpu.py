@@ -0,0 +1,461 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import argparse
+import timeit
+
+import numpy as np
+import scipy.sparse as sp
+import tvm
+import tvm.testing
+import tvm.tir as tir
+from tvm.script import tir as T
+from tvm.sparse import (
+    FormatCandidate,
+    column_part_hyb,
+    format_decompose,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+)
+
+try:
+    import torch as th
+except ImportError:
+    th = None
+
+
+target = "llvm -mcpu=native"
+dev = tvm.cpu()
+
+
+def csrmm(m: int, n: int, feat_size: int, nnz: int):
+    @T.prim_func
+    def func(
+        a: T.handle,
+        b: T.handle,
+        c: T.handle,
+        indptr: T.handle,
+        indices: T.handle,
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(m)
+        J = T.sparse_variable(I, (n, nnz), (indptr, indices), "int32")
+        J_detach = T.dense_fixed(n)
+        K = T.dense_fixed(feat_size)
+        A = T.match_sparse_buffer(a, (I, J), "float32")
+        B = T.match_sparse_buffer(b, (J_detach, K), "float32")
+        C = T.match_sparse_buffer(c, (I, K), "float32")
+        with T.sp_iter([I, J, K], "SRS", "csrmm") as [i, j, k]:
+            with T.init():
+                C[i, k] = 0.0
+            C[i, k] = C[i, k] + A[i, j] * B[j, k]
+
+    return func
+
+
+def sddmm(m: int, n: int, feat_size: int, nnz: int):
+    @T.prim_func
+    def func(
+        a: T.handle,
+        b: T.handle,
+        c: T.handle,
+        indptr: T.handle,
+        indices: T.handle,
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(m)
+        J = T.sparse_variable(I, (n, nnz), (indptr, indices), "int32")
+        J_detach = T.dense_fixed(n)
+        K = T.dense_fixed(feat_size)
+        A = T.match_sparse_buffer(a, (I, K), "float32")
+        B = T.match_sparse_buffer(b, (J_detach, K), "float32")
+        C = T.match_sparse_buffer(c, (I, J), "float32")
+        with T.sp_iter([I, J, K], "SSR", "sddmm") as [i, j, k]:
+            with T.init():
+                C[i, j] = 0.0
+            C[i, j] = C[i, j] + A[i, k] * B[j, k]
+
+    return func
+
+
+def bsrmm(mb: int, nb: int, nnzb: int, blk: int, feat_size: int):
+    @T.prim_func
+    def func(
+        a: T.handle,
+        b: T.handle,
+        c: T.handle,
+        indptr: T.handle,
+        indices: T.handle,
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(mb)
+        J = T.sparse_variable(I, (nb, nnzb), (indptr, indices), "int32")
+        J_detach = T.dense_fixed(nb)
+        BI = T.dense_fixed(blk)
+        BJ = T.dense_fixed(blk)
+        F = T.dense_fixed(feat_size)
+        A = T.match_sparse_buffer(a, (I, J, BI, BJ), "float32")
+        B = T.match_sparse_buffer(b, (J_detach, BJ, F), "float32")
+        C = T.match_sparse_buffer(c, (I, BI, F), "float32")
+        with T.sp_iter([I, J, BI, BJ, F], "SRSRS", "bsrmm") as [i, j, bi, bj, f]:
+            with T.init():
+                C[i, bi, f] = 0.0
+            C[i, bi, f] = C[i, bi, f] + A[i, j, bi, bj] * B[j, bj, f]
+
+    return func
+
+
+def rgms(m: int, n: int, num_rels: int, feat_size: int, nnz_i: int, nnz_j: int):
+    @T.prim_func
+    def func(
+        a: T.handle,
+        w: T.handle,
+        x: T.handle,
+        y: T.handle,
+        indptr_i: T.handle,
+        indices_i: T.handle,
+        indptr_j: T.handle,
+        indices_j: T.handle,
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        R = T.dense_fixed(num_rels)
+        I = T.sparse_variable(R, (m, nnz_i), (indptr_i, indices_i), "int32")
+        J = T.sparse_variable(I, (n, nnz_j), (indptr_j, indices_j), "int32")
+        I_detach = T.dense_fixed(m)
+        J_detach = T.dense_fixed(n)
+        F_in = T.dense_fixed(feat_size)
+        F_out = T.dense_fixed(feat_size)
+        A = T.match_sparse_buffer(a, (R, I, J), "float32")
+        W = T.match_sparse_buffer(w, (R, F_out, F_in), "float32")
+        X = T.match_sparse_buffer(x, (J_detach, F_in), "float32")
+        Y = T.match_sparse_buffer(y, (I_detach, F_out), "float32")
+        with T.sp_iter([F_out, R, I, J, F_in], "SSSRR", "rgms") as [fo, r, i, j, fi]:
+            with T.init():
+                Y[i, fo] = 0.0
+            Y[i, fo] = Y[i, fo] + A[r, i, j] * W[r, fo, fi] * X[j, fi]
+
+    return func
+
+
+# CPU schedules: rows (or output features when rows of different iterations collide) are
+# distributed to threads with `parallel`, the innermost dense feature loop is vectorized.
+
+
+def schedule_csrmm_cpu(mod: tvm.IRModule, vec_size: int) -> tvm.IRModule:
+    mod = lower_sparse_iter(mod)
+    sch = tir.Schedule(mod)
+    (i,) = sch.get_loops(sch.get_block("csrmm0"))
+    sch.parallel(i)
+    j, k = sch.get_loops(sch.get_block("csrmm1"))
+    _, ki = sch.split(k, [None, vec_size])
+    sch.vectorize(ki)
+    return lower_sparse_buffer(sch.mod)
+
+
+def schedule_hyb_cpu(mod: tvm.IRModule, buckets, vec_size: int) -> tvm.IRModule:
+    sch = tir.Schedule(mod)
+    for width in buckets:
+        sp_iteration = sch.get_sparse_iteration("csrmm_ell_{}".format(width))
+        o, i, j, k = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_iter(sch.mod)
+    sch = tir.Schedule(mod)
+    for width in buckets:
+        blk = sch.get_block("csrmm_ell_{}0".format(width))
+        i, j, k = sch.get_loops(blk)
+        _, ki = sch.split(k, [None, vec_size])
+        sch.parallel(i)
+        sch.unroll(j)
+        sch.vectorize(ki)
+    return lower_sparse_buffer(sch.mod)
+
+
+def schedule_sddmm_cpu(mod: tvm.IRModule) -> tvm.IRModule:
+    mod = lower_sparse_iter(mod)
+    sch = tir.Schedule(mod)
+    (i,) = sch.get_loops(sch.get_block("sddmm0"))
+    sch.parallel(i)
+    return lower_sparse_buffer(sch.mod)
+
+
+def schedule_bsrmm_cpu(mod: tvm.IRModule, vec_size: int) -> tvm.IRModule:
+    mod = lower_sparse_iter(mod)
+    sch = tir.Schedule(mod)
+    (i,) = sch.get_loops(sch.get_block("bsrmm0"))
+    sch.parallel(i)
+    f = sch.get_loops(sch.get_block("bsrmm1"))[-1]
+    _, fi = sch.split(f, [None, vec_size])
+    sch.vectorize(fi)
+    return lower_sparse_buffer(sch.mod)
+
+
+def schedule_rgms_cpu(mod: tvm.IRModule) -> tvm.IRModule:
+    mod = lower_sparse_iter(mod)
+    sch = tir.Schedule(mod)
+    # the rows of different relations overlap, output features are disjoint
+    fo = sch.get_loops(sch.get_block("rgms0"))[0]
+    sch.parallel(fo)
+    return lower_sparse_buffer(sch.mod)
+
+
+def measure(f, args, repeat: int) -> float:
+    evaluator = f.time_evaluator(f.entry_name, dev, number=repeat)
+    return evaluator(*args).mean * 1000
+
+
+def measure_py(func, repeat: int) -> float:
+    func()
+    return timeit.timeit(func, number=repeat) / repeat * 1000
+
+
+def report(name: str, times):
+    print(
+        "{}:\t".format(name)
+        + "\t".join(
+            "{} {}".format(k, "{:.5f}ms".format(v) if v is not None else "n/a")
+            for k, v in times.items()
+        )
+    )
+
+
+def torch_csr(mat: sp.csr_matrix):
+    return th.sparse_csr_tensor(
+        th.from_numpy(mat.indptr.astype("int64")),
+        th.from_numpy(mat.indices.astype("int64")),
+        th.from_numpy(mat.data),
+        size=mat.shape,
+    )
+
+
+def bench_csrmm(mat: sp.csr_matrix, feat_size: int, vec_size: int, repeat: int):
+    m, n = mat.shape
+    x = np.random.rand(n, feat_size).astype("float32")
+    y_golden = mat @ x
+    mod = schedule_csrmm_cpu(
+        tvm.IRModule.from_expr(csrmm(m, n, feat_size, mat.nnz)), vec_size
+    )
+    f = tvm.build(mod["main"], target=target)
+    args = [
+        tvm.nd.array(mat.data, dev),
+        tvm.nd.array(x.reshape(-1), dev),
+        tvm.nd.array(np.zeros(m * feat_size, "float32"), dev),
+        tvm.nd.array(mat.indptr.astype("int32"), dev),
+        tvm.nd.array(mat.indices.astype("int32"), dev),
+    ]
+    f(*args)
+    tvm.testing.assert_allclose(args[2].numpy().reshape(m, feat_size), y_golden, rtol=1e-4)
+    times = {"tir": measure(f, args, repeat), "scipy": measure_py(lambda: mat @ x, repeat)}
+    if th is not None:
+        a_th, x_th = torch_csr(mat), th.from_numpy(x)
+        times["torch"] = measure_py(lambda: th.sparse.mm(a_th, x_th), repeat)
+    report("csr spmm", times)
+
+
+def bench_hyb(mat: sp.csr_matrix, feat_size: int, vec_size: int, repeat: int):
+    m, n = mat.shape
+    # buckets wide enough for the longest row, so that every row lands in exactly one bucket
+    max_degree = int(np.diff(mat.indptr).max())
+    buckets = [1 << i for i in range(max(max_degree - 1, 0).bit_length() + 1)]
+    binary = sp.csr_matrix(
+        (np.ones(mat.nnz, "float32"), mat.indices, mat.indptr), shape=mat.shape
+    )
+    x = np.random.rand(n, feat_size).astype("float32")
+    y_golden = binary @ x
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        1,
+        buckets,
+    )
+    mod = tvm.IRModule.from_expr(csrmm(m, n, feat_size, mat.nnz))
+    mod = format_decompose(mod, FormatCandidate("hyb", buckets).rules())
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    params = {param.name: param for param in mod["main"].params}
+    param_map = {}
+    for bucket_id, width in enumerate(buckets):
+        suffix = "_ell_{}".format(width)
+        param_map[params["m" + suffix]] = m
+        param_map[params["n" + suffix]] = n
+        param_map[params["num_rows" + suffix]] = row_indices[0][bucket_id].shape[0]
+    mod["main"] = mod["main"].specialize(param_map)
+    mod = schedule_hyb_cpu(mod, buckets, vec_size)
+    mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+    f = tvm.build(mod["main"], target=target)
+    c_nd = tvm.nd.array(np.zeros(m * feat_size, "float32"), dev)
+    args = [tvm.nd.array(x.reshape(-1), dev), c_nd]
+    for bucket_id, _ in enumerate(buckets):
+        args += [
+            tvm.nd.array(mask[0][bucket_id].numpy().reshape(-1).astype("float32"), dev),
+            tvm.nd.array(row_indices[0][bucket_id].numpy().astype("int32"), dev),
+            tvm.nd.array(col_indices[0][bucket_id].numpy().reshape(-1).astype("int32"), dev),
+        ]
+    f(*args)
+    tvm.testing.assert_allclose(c_nd.numpy().reshape(m, feat_size), y_golden, rtol=1e-4)
+    times = {"tir": measure(f, args, repeat), "scipy": measure_py(lambda: binary @ x, repeat)}
+    if th is not None:
+        a_th, x_th = torch_csr(binary), th.from_numpy(x)
+        times["torch"] = measure_py(lambda: th.sparse.mm(a_th, x_th), repeat)
+    report("hyb spmm", times)
+
+
+def bench_sddmm(mat: sp.csr_matrix, feat_size: int, repeat: int):
+    m, n = mat.shape
+    a = np.random.rand(m, feat_size).astype("float32")
+    b = np.random.rand(n, feat_size).astype("float32")
+    rows = np.repeat(np.arange(m), np.diff(mat.indptr))
+    c_golden = np.einsum("ij,ij->i", a[rows], b[mat.indices])
+    mod = schedule_sddmm_cpu(tvm.IRModule.from_expr(sddmm(m, n, feat_size, mat.nnz)))
+    f = tvm.build(mod["main"], target=target)
+    args = [
+        tvm.nd.array(a.reshape(-1), dev),
+        tvm.nd.array(b.reshape(-1), dev),
+        tvm.nd.array(np.zeros(mat.nnz, "float32"), dev),
+        tvm.nd.array(mat.indptr.astype("int32"), dev),
+        tvm.nd.array(mat.indices.astype("int32"), dev),
+    ]
+    f(*args)
+    tvm.testing.assert_allclose(args[2].numpy(), c_golden, rtol=1e-4)
+
+    def scipy_sddmm():
+        # scipy has no SDDMM, gather the rows and reduce
+        return np.einsum("ij,ij->i", a[rows], b[mat.indices])
+
+    times = {"tir": measure(f, args, repeat), "scipy": measure_py(scipy_sddmm, repeat)}
+    if th is not None and hasattr(th.sparse, "sampled_addmm"):
+        mask_th, a_th, bt_th = torch_csr(mat), th.from_numpy(a), th.from_numpy(b.T.copy())
+        try:
+            times["torch"] = measure_py(
+                lambda: th.sparse.sampled_addmm(mask_th, a_th, bt_th, beta=0.0), repeat
+            )
+        except RuntimeError:
+            # sampled_addmm has no CPU kernel in older releases
+            times["torch"] = None
+    report("sddmm", times)
+
+
+def bench_bsrmm(mat: sp.csr_matrix, block_size: int, feat_size: int, vec_size: int, repeat: int):
+    m, n = mat.shape
+    bsr = sp.bsr_matrix(mat, blocksize=(block_size, block_size))
+    mb, nb = m // block_size, n // block_size
+    x = np.random.rand(n, feat_size).astype("float32")
+    y_golden = bsr @ x
+    mod = schedule_bsrmm_cpu(
+        tvm.IRModule.from_expr(bsrmm(mb, nb, bsr.indices.shape[0], block_size, feat_size)),
+        vec_size,
+    )
+    f = tvm.build(mod["main"], target=target)
+    args = [
+        tvm.nd.array(bsr.data.reshape(-1), dev),
+        tvm.nd.array(x.reshape(-1), dev),
+        tvm.nd.array(np.zeros(m * feat_size, "float32"), dev),
+        tvm.nd.array(bsr.indptr.astype("int32"), dev),
+        tvm.nd.array(bsr.indices.astype("int32"), dev),
+    ]
+    f(*args)
+    tvm.testing.assert_allclose(args[2].numpy().reshape(m, feat_size), y_golden, rtol=1e-4)
+    times = {"tir": measure(f, args, repeat), "scipy": measure_py(lambda: bsr @ x, repeat)}
+    if th is not None:
+        a_th, x_th = torch_csr(mat), th.from_numpy(x)
+        times["torch"] = measure_py(lambda: th.sparse.mm(a_th, x_th), repeat)
+    report("bsr spmm", times)
+
+
+def bench_rgms(mats, feat_size: int, repeat: int):
+    num_rels = len(mats)
+    m, n = mats[0].shape
+    # CSF: relations -> non-empty rows -> columns
+    indptr_i, indices_i, row_lengths, indices_j, values = [0], [], [], [], []
+    for mat in mats:
+        rows = np.flatnonzero(np.diff(mat.indptr))
+        indptr_i.append(indptr_i[-1] + len(rows))
+        indices_i.append(rows)
+        row_lengths.append(np.diff(mat.indptr)[rows])
+        indices_j.append(mat.indices)
+        values.append(mat.data)
+    indptr_j = np.concatenate([[0], np.cumsum(np.concatenate(row_lengths))])
+    indices_i, indices_j = np.concatenate(indices_i), np.concatenate(indices_j)
+    values = np.concatenate(values).astype("float32")
+    x = np.random.rand(n, feat_size).astype("float32")
+    w = np.random.rand(num_rels, feat_size, feat_size).astype("float32")
+
+    def scipy_rgms():
+        return sum(mat @ (x @ w[r].T) for r, mat in enumerate(mats))
+
+    y_golden = scipy_rgms()
+    mod = schedule_rgms_cpu(
+        tvm.IRModule.from_expr(
+            rgms(m, n, num_rels, feat_size, len(indices_i), len(indices_j))
+        )
+    )
+    f = tvm.build(mod["main"], target=target)
+    args = [
+        tvm.nd.array(values, dev),
+        tvm.nd.array(w.reshape(-1), dev),
+        tvm.nd.array(x.reshape(-1), dev),
+        tvm.nd.array(np.zeros(m * feat_size, "float32"), dev),
+        tvm.nd.array(np.array(indptr_i, "int32"), dev),
+        tvm.nd.array(indices_i.astype("int32"), dev),
+        tvm.nd.array(indptr_j.astype("int32"), dev),
+        tvm.nd.array(indices_j.astype("int32"), dev),
+    ]
+    f(*args)
+    tvm.testing.assert_allclose(args[3].numpy().reshape(m, feat_size), y_golden, rtol=1e-4)
+    times = {"tir": measure(f, args, repeat), "scipy": measure_py(scipy_rgms, repeat)}
+    if th is not None:
+        mats_th = [torch_csr(mat) for mat in mats]
+        x_th, w_th = th.from_numpy(x), th.from_numpy(w)
+        times["torch"] = measure_py(
+            lambda: sum(th.sparse.mm(a, x_th @ w_th[r].T) for r, a in enumerate(mats_th)), repeat
+        )
+    report("rgms", times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser("sparse operators on CPU in sparse-tir")
+    parser.add_argument("--num-rows", "-n", type=int, default=4096, help="matrix size")
+    parser.add_argument("--density", "-p", type=float, default=0.002, help="matrix density")
+    parser.add_argument("--feat-size", "-f", type=int, default=128, help="feature size")
+    parser.add_argument("--block-size", "-b", type=int, default=16, help="bsr block size")
+    parser.add_argument("--num-rels", "-r", type=int, default=4, help="rgms relations")
+    parser.add_argument("--vec-size", "-v", type=int, default=8, help="vector lanes")
+    parser.add_argument("--repeat", type=int, default=20, help="repeat of measurements")
+    args = parser.parse_args()
+    mat = sp.random(
+        args.num_rows, args.num_rows, density=args.density, format="csr", dtype="float32"
+    )
+    bench_csrmm(mat, args.feat_size, args.vec_size, args.repeat)
+    bench_hyb(mat, args.feat_size, args.vec_size, args.repeat)
+    bench_sddmm(mat, args.feat_size, args.repeat)
+    block_mat = sp.kron(
+        sp.random(
+            args.num_rows // args.block_size,
+            args.num_rows // args.block_size,
+            density=args.density * args.block_size,
+        ),
+        np.ones((args.block_size, args.block_size)),
+        format="csr",
+    ).astype("float32")
+    bench_bsrmm(block_mat, args.block_size, args.feat_size, args.vec_size, args.repeat)
+    rel_mats = [
+        sp.random(
+            args.num_rows, args.num_rows, density=args.density / args.num_rels, format="csr"
+        ).astype("float32")
+        for _ in range(args.num_rels)
+    ]
+    bench_rgms(rel_mats, args.feat_size // 4, args.repeat)
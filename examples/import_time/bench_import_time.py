@@ -0,0 +1,133 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+# name: (statement, environment variables)
+STATEMENTS = {
+    "tvm": ("import tvm", {"TVM_LAZY_IMPORT": "0"}),
+    "tvm_lazy": ("import tvm", {"TVM_LAZY_IMPORT": "1"}),
+    "runtime": (
+        "import tvm; tvm.nd.array([1.0], tvm.cpu()); "
+        "tvm.get_global_func('runtime.ModuleLoadFromFile')",
+        {"TVM_LAZY_IMPORT": "1"},
+    ),
+    "sparse": ("import tvm.sparse", {"TVM_LAZY_IMPORT": "0"}),
+    "relay": ("import tvm.relay", {"TVM_LAZY_IMPORT": "0"}),
+}
+
+PROBE = """
+import sys, time
+start = time.perf_counter()
+{}
+print(time.perf_counter() - start)
+print(len(sys.modules))
+"""
+
+
+def run(statement: str, env_vars, extra_args=()):
+    env = dict(os.environ, **env_vars)
+    return subprocess.run(
+        [sys.executable, *extra_args, "-c", PROBE.format(statement)],
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+
+
+def bench(statement: str, env_vars, repeat: int):
+    times, process_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = run(statement, env_vars).stdout.split()
+        process_times.append((time.perf_counter() - start) * 1000)
+        times.append(float(out[0]) * 1000)
+        num_modules = int(out[1])
+    times.sort()
+    process_times.sort()
+    return {
+        "import_ms": times[len(times) // 2],
+        "process_ms": process_times[len(process_times) // 2],
+        "modules": num_modules,
+    }
+
+
+def print_importtime(statement: str, env_vars, top: int):
+    stderr = run(statement, env_vars, ["-X", "importtime"]).stderr
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((int(cumulative_us), int(self_us), module.rstrip()))
+    rows.sort(reverse=True)
+    print("{:>14}{:>14}  {}".format("cumulative us", "self us", "module"))
+    for cumulative_us, self_us, module in rows[:top]:
+        print("{:>14}{:>14}  {}".format(cumulative_us, self_us, module))
+
+
+def main():
+    parser = argparse.ArgumentParser("import time benchmark of tvm")
+    parser.add_argument(
+        "--statements", "-s", nargs="+", default=list(STATEMENTS), help="statements to run"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="repeat of measurements")
+    parser.add_argument("--output", "-o", type=str, default=None, help="json file of results")
+    parser.add_argument(
+        "--importtime",
+        type=str,
+        default=None,
+        help="print the slowest modules imported by a statement, with python -X importtime",
+    )
+    parser.add_argument("--top", type=int, default=30, help="modules printed with --importtime")
+    args = parser.parse_args()
+
+    if args.importtime is not None:
+        print_importtime(*STATEMENTS[args.importtime], args.top)
+        return
+
+    records = []
+    for name in args.statements:
+        statement, env_vars = STATEMENTS[name]
+        record = {"statement": name}
+        record.update(bench(statement, env_vars, args.repeat))
+        print(
+            "{}:\timport {:.1f}ms\tprocess {:.1f}ms\tmodules {}".format(
+                name, record["import_ms"], record["process_ms"], record["modules"]
+            )
+        )
+        records.append(record)
+
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            result = {
+                "machine": platform.machine(),
+                "python": platform.python_version(),
+                "records": records,
+            }
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -21,6 +21,7 @@ import tvm.testing
 import tvm.tir as tir
 import scipy.sparse as sp
 import argparse
+import time
 import numpy as np
 import torch as th
 from tvm.script import tir as T
@@ -30,6 +31,13 @@ from tvm.sparse import (
     lower_sparse_iter,
     column_part_hyb,
     format_decompose,
+    from_dgl_graph,
+    pack_params,
+    plan_reduction,
+    quantize_sparse_buffer,
+    quantize_values,
+    rule_param_names,
+    specialize_params,
 )
 import tvm.sparse
 from utils import get_dataset, ell
@@ -97,21 +105,23 @@ def bench_hyb(
     coersening_factor=2,
     num_col_parts=1,
     use_implicit_unroll=False,
+    atomic_threshold=4,
+    value_dtype="float32",
 ):
     num_buckets = len(bucket_sizes)
     coersening_factor = min(coersening_factor, feat_size // 32)
-    indptr, indices, _ = g.adj_sparse("csc")
     m = g.num_dst_nodes()
     n = g.num_src_nodes()
     nnz = g.num_edges()
     global cached_bucketing_format
     if cached_bucketing_format is None:
-        indptr_nd = tvm.nd.array(indptr.numpy(), device=tvm.cpu())
-        indices_nd = tvm.nd.array(indices.numpy(), device=tvm.cpu())
+        indptr_nd, indices_nd, _ = from_dgl_graph(g, "csc", device=tvm.cpu())
         cached_bucketing_format = column_part_hyb(
             m, n, indptr_nd, indices_nd, num_col_parts, bucket_sizes
         )
     row_indices, col_indices, mask = cached_bucketing_format
+    # the reduction of every bucket, from the contention on its output rows
+    plan = plan_reduction(row_indices, m, feat_size, atomic_threshold=atomic_threshold)
 
     # rewrite csrmm
     nnz_cols_symbol = ell.params[-1]
@@ -135,23 +145,25 @@ def bench_hyb(
     mod = tvm.tir.transform.RemovePreprocess()(mod)
 
     # specialize
-    params = mod["main"].params
-    param_map = {
-        params[5]: m,  # m
-        params[6]: n,  # n
-        params[7]: feat_size // coersening_factor // 32,  # num_tiles,
-        params[8]: nnz,  # nnz
-        params[9]: coersening_factor,  # coersening_factor
+    values = {
+        "m": m,
+        "n": n,
+        "num_tiles": feat_size // coersening_factor // 32,
+        "nnz": nnz,
+        "cwm": coersening_factor,
     }
     for part_id in range(num_col_parts):
         for bucket_id in range(num_buckets):
-            param_map[params[10 + 7 * (part_id * num_buckets + bucket_id) + 4]] = m
-            param_map[params[10 + 7 * (part_id * num_buckets + bucket_id) + 5]] = n
-            param_map[params[10 + 7 * (part_id * num_buckets + bucket_id) + 6]] = row_indices[
-                part_id
-            ][bucket_id].shape[0]
+            suffix = "_{}_{}".format(part_id, bucket_id)
+            values["m" + suffix] = m
+            values["n" + suffix] = n
+            values["num_rows" + suffix] = row_indices[part_id][bucket_id].shape[0]
 
-    mod["main"] = mod["main"].specialize(param_map).with_attr("horizontal_fuse", True)
+    mod["main"] = specialize_params(mod["main"], values).with_attr("horizontal_fuse", True)
+    if value_dtype != "float32":
+        # store the values of every bucket in value_dtype, accumulate in float32
+        for rule in rewrites:
+            mod["main"] = quantize_sparse_buffer(mod["main"], "a_" + rule.name, value_dtype)
 
     # schedule
     sch = tvm.tir.Schedule(mod)
@@ -167,7 +179,7 @@ def bench_hyb(
     sch = tvm.tir.Schedule(mod)
     for part_id in range(num_col_parts):
         for bucket_id, bucket_size in enumerate(bucket_sizes):
-            is_atomic = num_col_parts > 1 or bucket_id + 1 == num_buckets
+            is_atomic = plan.is_atomic(part_id, bucket_id)
             blk = sch.get_block("csrmm_{}_{}0".format(part_id, bucket_id))
             i, j, foo, foi, fi = sch.get_loops(blk)
             sch.reorder(foo, fi, j, foi)
@@ -196,7 +208,13 @@ def bench_hyb(
 
     mod = tvm.sparse.lower_sparse_buffer(sch.mod)
     mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+    # redirect the writes of the private and segmented buckets
+    mod["main"] = plan.apply(mod["main"])
+    # pack the index and mask arrays of all buckets into one buffer per dtype
+    rule_names = [rule.name for rule in rewrites]
+    mod["main"], layout = pack_params(mod["main"], rule_param_names(mod["main"], rule_names))
     f = tvm.build(mod, target="cuda")
+    reduce = plan.build_reduce("cuda", tvm.cuda(0))
 
     # prepare nd array
     b_nd = tvm.nd.array(
@@ -205,29 +223,41 @@ def bench_hyb(
     )
     c_nd = tvm.nd.array(np.zeros((n * feat_size,)).astype("float32"), device=tvm.cuda(0))
     # prepare args
-    args = [b_nd, c_nd]
-
+    buffers = plan.make_buffers(tvm.cuda(0))
+    arrays = {"b": b_nd, "c": c_nd, **buffers}
     for part_id in range(num_col_parts):
         for bucket_id, _ in enumerate(bucket_sizes):
-            weight = tvm.nd.array(
-                mask[part_id][bucket_id].numpy().reshape(-1).astype("float32"), device=tvm.cuda(0)
-            )
-            rows = tvm.nd.array(
-                row_indices[part_id][bucket_id].numpy().astype("int32"), device=tvm.cuda(0)
-            )
-            cols = tvm.nd.array(
-                col_indices[part_id][bucket_id].numpy().reshape(-1).astype("int32"),
-                device=tvm.cuda(0),
-            )
-            args += [weight, rows, cols]
+            suffix = "_{}_{}".format(part_id, bucket_id)
+            if value_dtype == "float32":
+                arrays["a" + suffix] = mask[part_id][bucket_id].numpy().astype("float32")
+            else:
+                quantized, scales = quantize_values(mask[part_id][bucket_id], value_dtype)
+                arrays["a" + suffix] = quantized
+                if scales is not None:
+                    arrays["scale_a" + suffix] = scales
+            arrays["indices_i" + suffix] = row_indices[part_id][bucket_id].numpy().astype("int32")
+            arrays["indices_j" + suffix] = col_indices[part_id][bucket_id].numpy().astype("int32")
+    args = layout.make_args(arrays, tvm.cuda(0))
 
     # test accuracy
     f(*args)
+    reduce(c_nd, buffers)
     tvm.testing.assert_allclose(c_nd.numpy().reshape(-1, feat_size), y_golden.numpy(), rtol=1e-4)
 
     # evaluate time
     evaluator = f.time_evaluator(f.entry_name, tvm.cuda(0), number=100)
     print("tir hyb time: {:.5f}ms".format(evaluator(*args).mean * 1000))
+    if plan.private_parts or plan.segmented:
+        tvm.cuda(0).sync()
+        start = time.perf_counter()
+        for _ in range(100):
+            reduce(c_nd, buffers)
+        tvm.cuda(0).sync()
+        print(
+            "tir hyb reduction time: {:.5f}ms ({} private partitions, {} segmented buckets)".format(
+                (time.perf_counter() - start) * 10, len(plan.private_parts), len(plan.segmented)
+            )
+        )
 
 
 col_part_config = {
@@ -257,6 +287,19 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser("hybrid format spmm in sparse-tir")
     parser.add_argument("--dataset", "-d", type=str, default="arxiv", help="dataset name")
     parser.add_argument("--implicit-unroll", "-i", action="store_true", help="use implicit unroll")
+    parser.add_argument(
+        "--atomic-threshold",
+        type=int,
+        default=4,
+        help="most writers of an output row for which atomic additions are used",
+    )
+    parser.add_argument(
+        "--value-dtype",
+        type=str,
+        default="float32",
+        choices=["float32", "float16", "bfloat16", "int8"],
+        help="storage dtype of the sparse values",
+    )
     args = parser.parse_args()
     name = args.dataset
     g = get_dataset(name)
@@ -274,4 +317,6 @@ if __name__ == "__main__":
             coersening_factor=2,
             num_col_parts=col_part_config[name],
             use_implicit_unroll=args.implicit_unroll,
+            atomic_threshold=args.atomic_threshold,
+            value_dtype=args.value_dtype,
         )
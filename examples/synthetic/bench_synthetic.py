@@ -0,0 +1,136 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+import scipy.sparse as sp
+import tvm
+import tvm.testing
+from tvm import te, topi
+from tvm.sparse import as_ndarray, from_scipy
+from tvm.sparse.testing import GENERATORS, generate
+
+SCALES = {"small": 1 << 10, "medium": 1 << 13, "large": 1 << 16}
+
+target = "llvm"
+dev = tvm.cpu()
+
+
+def convert_csr(mat: sp.csr_matrix):
+    csr = from_scipy(mat, device=dev)
+    return [csr.data, csr.indices, csr.indptr]
+
+
+def convert_bsr(mat: sp.csr_matrix, block_size: int):
+    bsr = mat.tobsr(blocksize=(block_size, block_size))
+    return [
+        as_ndarray(bsr.data, device=dev),
+        as_ndarray(bsr.indices, "int32", dev),
+        as_ndarray(bsr.indptr, "int32", dev),
+    ]
+
+
+def compile_spmm(x_shape, weight_args):
+    # Y = X @ A^T with a SparseTIR kernel, A in CSR when the data is 1-D and in BSR when 3-D
+    x = te.placeholder(x_shape, "float32", name="x")
+    w_data, w_indices, w_indptr = [
+        te.placeholder(arr.shape, arr.dtype, name=name)
+        for arr, name in zip(weight_args, ["w_data", "w_indices", "w_indptr"])
+    ]
+    with tvm.target.Target(target):
+        y = topi.nn.sparse_dense_sparse_tir(x, w_data, w_indices, w_indptr)
+        s = te.create_schedule(y.op)
+    return tvm.build(s, [x, w_data, w_indices, w_indptr, y], target=target)
+
+
+def bench(mat: sp.csr_matrix, fmt: str, feat_size: int, repeat: int):
+    n, k = mat.shape
+    x_np = np.random.rand(feat_size, k).astype("float32")
+
+    tic = time.perf_counter()
+    weight_args = convert_csr(mat) if fmt == "csr" else convert_bsr(mat, int(fmt.split("_")[1]))
+    convert_ms = (time.perf_counter() - tic) * 1000
+
+    tic = time.perf_counter()
+    f = compile_spmm(x_np.shape, weight_args)
+    compile_ms = (time.perf_counter() - tic) * 1000
+
+    x = tvm.nd.array(x_np, dev)
+    y = tvm.nd.empty((feat_size, n), "float32", dev)
+    f(x, *weight_args, y)
+    tvm.testing.assert_allclose(y.numpy(), (mat @ x_np.T).T, rtol=1e-4, atol=1e-4)
+    evaluator = f.time_evaluator(f.entry_name, dev, number=repeat)
+    run_ms = evaluator(x, *weight_args, y).mean * 1000
+    return {"convert_ms": convert_ms, "compile_ms": compile_ms, "run_ms": run_ms}
+
+
+def main():
+    parser = argparse.ArgumentParser("offline benchmark of sparse-tir on synthetic matrices")
+    parser.add_argument(
+        "--matrices", "-m", nargs="+", default=list(GENERATORS), choices=list(GENERATORS)
+    )
+    parser.add_argument(
+        "--scales", "-s", nargs="+", default=["small", "medium"], choices=list(SCALES)
+    )
+    parser.add_argument("--formats", nargs="+", default=["csr", "bsr_16"], help="csr or bsr_<b>")
+    parser.add_argument("--avg-degree", "-d", type=float, default=16, help="non-zeros per row")
+    parser.add_argument("--feat-size", "-f", type=int, default=64, help="feature size")
+    parser.add_argument("--repeat", type=int, default=10, help="repeat of measurements")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the generators")
+    parser.add_argument("--output", "-o", type=str, default=None, help="json file of results")
+    args = parser.parse_args()
+
+    records = []
+    for name in args.matrices:
+        for scale in args.scales:
+            mat = generate(name, SCALES[scale], args.avg_degree, args.seed)
+            for fmt in args.formats:
+                if fmt != "csr" and mat.shape[0] % int(fmt.split("_")[1]) != 0:
+                    continue
+                record = {
+                    "matrix": name,
+                    "scale": scale,
+                    "num_rows": mat.shape[0],
+                    "nnz": mat.nnz,
+                    "format": fmt,
+                    "feat_size": args.feat_size,
+                }
+                record.update(bench(mat, fmt, args.feat_size, args.repeat))
+                print(
+                    "{matrix} {scale} {format}:\tconvert {convert_ms:.3f}ms\t"
+                    "compile {compile_ms:.3f}ms\trun {run_ms:.5f}ms".format(**record)
+                )
+                records.append(record)
+
+    result = {
+        "target": target,
+        "machine": platform.machine(),
+        "tvm_version": tvm.__version__,
+        "seed": args.seed,
+        "records": records,
+    }
+    if args.output is not None:
+        with open(args.output, "w") as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -212,6 +212,24 @@ class ScheduleRule : public runtime::ObjectRef {
                                                          int max_vectorize_extent,         //
                                                          Array<Integer> unroll_max_steps,  //
                                                          bool unroll_explicit);
+  /*!
+   * \brief Create a tiling rule for the stage-II blocks emitted by SparseTIR's LowerSparseIter.
+   * Rows are tiled with a factor inversely proportional to the constant reduction extent of the
+   * block (e.g. the bucket width of an ELL bucket), the feature loop is split to threads, reductions
+   * with an indirect output index are annotated as atomic, and binary search blocks only get their
+   * outermost loop distributed.
+   * \param tile_binds The thread axes the row tile, the rows inside a tile and the features are
+   * bound to. Recommended:
+   * - NullOpt on CPU, where row tiles are parallelized
+   * - [blockIdx.x, threadIdx.y, threadIdx.x] on GPU
+   * \param thread_extents Candidates of the number of threads along the feature loop.
+   * \param row_tile_work Candidates of the amount of work per row tile, i.e. the number of rows
+   * multiplied by the constant reduction extent.
+   * \return The schedule rule created
+   */
+  TVM_DLL static ScheduleRule SparseTiling(Optional<Array<String>> tile_binds,  //
+                                           Array<Integer> thread_extents,       //
+                                           Array<Integer> row_tile_work);
   /*!
    * \brief Create a schedule rule with customized methods on the python-side.
    * \param f_initialize_with_tune_context The packed function of `InitializeWithTuneContext`.
@@ -679,6 +679,21 @@ class ScheduleNode : public runtime::Object {
   virtual void SparseFuse(const SparseIterationRV& sp_iteration_rv,
                           const Array<SpIterVar>& iters_to_fuse) = 0;
 
+  /*!
+   * \brief Create a sparse iteration that gathers the rows of a sparse buffer read through the
+   * indices of a sparse axis into a cache per tile of rows, holding every unique column id of the
+   * tile once. The maps from the nonzeros to the unique column ids of their tiles are added to
+   * the parameters of the function.
+   * \param sp_iteration_rv The sparse iteration reading the buffer.
+   * \param buffer_name The name of the sparse buffer to be cached.
+   * \param storage_scope The storage scope of the cache buffer.
+   * \param tile_size The number of rows of a tile.
+   * \return The sparse iteration filling the cache.
+   */
+  virtual SparseIterationRV SparseCacheRead(const SparseIterationRV& sp_iteration_rv,
+                                            const String& buffer_name,
+                                            const String& storage_scope, int tile_size) = 0;
+
   /*!
    * \brief Hide some buffer access in the given block.
    * \param block_rv The block where we hide buffer access.
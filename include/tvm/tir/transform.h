@@ -627,9 +627,15 @@ TVM_DLL Pass RenormalizeSplitPattern();
 
 /*!
  * \brief Lower sparse iterations in Sparse TIR.
+ * \param check_invalid_binary_search Whether check invalid indices made by binary search.
+ * \param binary_search How binary searches are emitted: "loop" narrows the range with a
+ *   data-dependent branch, "branchless" with selects and a number of steps that only depends on
+ *   the range, "merge" is "branchless" except for the rows of the non-zeros of fused (I, J) axes,
+ *   which are found by one sweep over the rows.
  * \return The pass.
  */
-TVM_DLL Pass LowerSparseIter(bool check_invalid_binary_search = false);
+TVM_DLL Pass LowerSparseIter(bool check_invalid_binary_search = false,
+                             String binary_search = "loop");
 
 /*!
  * \brief Lower sparse buffers in Sparse TIR.
@@ -654,10 +660,12 @@ TVM_DLL Pass LowerAtomic();
  * \param format_rewrite_rules The list of format rewrite rules to perform.
  * \param include_format_rewrite_blks Whether to include format rewrite blocks in the output TIR
  * scripts.
+ * \param parametric Whether rules that only differ in their names share the sparse iterations of
+ * the first one, recorded in the "format_instances" function attribute.
  * \return The pass.
  */
 TVM_DLL Pass SparseFormatDecompose(Array<FormatRewriteRule> format_rewrite_rules,
-                                   bool include_format_rewrite_blks);
+                                   bool include_format_rewrite_blks, bool parametric = false);
 
 /*!
  * \brief Extract the preprocess blocks/sparse iterations in the module.
@@ -15,11 +15,20 @@
 # specific language governing permissions and limitations
 # under the License.
 # pylint: disable=redefined-builtin, wildcard-import
-"""TVM: Open Deep Learning Compiler Stack."""
+"""TVM: Open Deep Learning Compiler Stack.
+
+The runtime is always imported. The compiler stack (ir, tir, te, target, driver, ...) is
+imported with the package, unless TVM is loaded with the runtime library only or the
+`TVM_LAZY_IMPORT` environment variable is set to 1. It is then imported on first access of
+one of its attributes, e.g. `tvm.build` or `tvm.tir`. The other subpackages, e.g. `tvm.relay`
+and `tvm.sparse`, are always imported on first access.
+"""
+import importlib
 import multiprocessing
 import sys
 import os
 import traceback
+import types
 
 # top-level alias
 # tvm._ffi
@@ -38,41 +47,132 @@ from .runtime import ndarray as nd
 # tvm.error
 from . import error
 
-# tvm.ir
-from .ir import IRModule
-from .ir import transform
-from .ir import instrument
-from .ir import container
-from .ir import PoolInfo
-from .ir import WorkspaceMemoryPools
-from . import ir
+_LAZY_IMPORT = _RUNTIME_ONLY or os.environ.get("TVM_LAZY_IMPORT", "0") == "1"
+
+# the top-level aliases of the compiler stack
+_COMPILER_ATTRS = {
+    "IRModule",
+    "transform",
+    "instrument",
+    "container",
+    "PoolInfo",
+    "WorkspaceMemoryPools",
+    "ir",
+    "tir",
+    "target",
+    "te",
+    "build",
+    "lower",
+    "parser",
+    "arith",
+    "support",
+}
+
+# subpackages imported on first access
+_LAZY_SUBPACKAGES = {
+    "auto_scheduler",
+    "autotvm",
+    "contrib",
+    "driver",
+    "exec",
+    "generic",
+    "meta_schedule",
+    "relay",
+    "rpc",
+    "script",
+    "sparse",
+    "testing",
+    "topi",
+}
+
+
+# whether the compiler stack is imported or being imported
+_COMPILER_IMPORTED = False
+
+
+def _import_compiler():
+    """Import the compiler stack and its top-level aliases, once."""
+    global _COMPILER_IMPORTED
+    if _COMPILER_IMPORTED:
+        return
+    # the submodules imported below access the attributes of this module, e.g. through
+    # `from . import ir`, which must not import the compiler stack again
+    _COMPILER_IMPORTED = True
+    try:
+        _import_compiler_stack()
+    except BaseException:
+        _COMPILER_IMPORTED = False
+        raise
+
+
+def _import_compiler_stack():
+    # pylint: disable=import-outside-toplevel, redefined-outer-name, global-variable-undefined
+    # pylint: disable=unused-import
+    global IRModule, transform, instrument, container, PoolInfo, WorkspaceMemoryPools, ir
+    global tir, target, te, build, lower, parser, arith, support, micro
+
+    # tvm.ir
+    from .ir import IRModule
+    from .ir import transform
+    from .ir import instrument
+    from .ir import container
+    from .ir import PoolInfo
+    from .ir import WorkspaceMemoryPools
+    from . import ir
+
+    # tvm.tir
+    from . import tir
+
+    # tvm.target
+    from . import target
+
+    # tvm.te
+    from . import te
+
+    # tvm.driver
+    from .driver import build, lower
+
+    # tvm.parser
+    from . import parser
+
+    # others
+    from . import arith
+
+    # support infra
+    from . import support
 
-# tvm.tir
-from . import tir
+    # Contrib initializers, registering the compilation callbacks used by the code generators
+    from .contrib import rocm as _rocm, nvcc as _nvcc, sdaccel as _sdaccel
 
-# tvm.target
-from . import target
+    if not _RUNTIME_ONLY and support.libinfo().get("USE_MICRO", "OFF") == "ON":
+        from . import micro
 
-# tvm.te
-from . import te
 
-# tvm.driver
-from .driver import build, lower
+class _LazyModule(types.ModuleType):
+    """The class of this module, resolving the lazy attributes on first access.
 
-# tvm.parser
-from . import parser
+    A module-level `__getattr__` would only work from Python 3.7.
+    """
 
-# others
-from . import arith
+    def __getattr__(self, name):
+        if name in _COMPILER_ATTRS:
+            _import_compiler()
+            if name in globals():
+                return globals()[name]
+            # the compiler stack is being imported, `from . import` then imports the submodule
+            raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+        if name in _LAZY_SUBPACKAGES or name == "micro":
+            if _LAZY_IMPORT:
+                # the subpackages rely on the registrations made by the compiler stack
+                _import_compiler()
+            return importlib.import_module("." + name, __name__)
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
-# support infra
-from . import support
 
-# Contrib initializers
-from .contrib import rocm as _rocm, nvcc as _nvcc, sdaccel as _sdaccel
+sys.modules[__name__].__class__ = _LazyModule
 
-if not _RUNTIME_ONLY and support.libinfo().get("USE_MICRO", "OFF") == "ON":
-    from . import micro
+if not _LAZY_IMPORT:
+    _import_compiler()
 
 # NOTE: This file should be python2 compatible so we can
 # raise proper error message when user run the package using
@@ -28,6 +28,15 @@ float32 = "float32"
 itype = "int32"
 
 
+def _index_dtype(*sizes):
+    """int32 if all the sizes fit in it, int64 otherwise."""
+    return itype if max(sizes, default=0) <= _np.iinfo(itype).max else "int64"
+
+
+def _is_scipy_sparse(arg):
+    return hasattr(arg, "tocsr") and hasattr(arg, "nnz")
+
+
 class CSRNDArray(object):
     """Sparse tensor object in CSR format."""
 
@@ -36,37 +45,46 @@ class CSRNDArray(object):
 
         Parameters
         ----------
-        arg1 : numpy.ndarray or a tuple with (data, indices, indptr)
-            The corresponding a dense numpy array,
+        arg1 : numpy.ndarray, scipy.sparse.spmatrix or a tuple with (data, indices, indptr)
+            The corresponding a dense numpy array, a scipy sparse matrix,
             or a tuple for constructing a sparse matrix directly.
 
-        device: Device
-            The corresponding device.
+        device: Device, optional
+            The corresponding device, the cpu by default.
 
         shape : tuple of int
             The shape of the array
         """
+        if device is None:
+            device = _nd.cpu(0)
         if isinstance(arg1, tuple):
             assert len(arg1) == 3
             self.data, self.indices, self.indptr = arg1
             self.shape = shape
         elif isinstance(arg1, _np.ndarray):
             source_array = arg1
-            ridx, cidx = _np.nonzero(source_array)
-            data = source_array[ridx, cidx]
-            self.data = _nd.array(data, device)
-            indices = _np.nonzero(source_array)[1].astype(itype)
-            self.indices = _nd.array(indices, device)
-            indptr = [0] + _np.apply_along_axis(
-                _np.count_nonzero, axis=1, arr=source_array
-            ).tolist()
-            indptr = _np.cumsum(_np.array(indptr, itype)).astype(itype)
+            assert source_array.ndim == 2, "Only 2-D arrays can be stored in CSR"
+            # row-major order of the non-zeros is the CSR order
+            flat = _np.flatnonzero(source_array)
+            num_rows, num_cols = source_array.shape
+            dtype = _index_dtype(len(flat), num_cols)
+            self.data = _nd.array(source_array.reshape(-1)[flat], device)
+            self.indices = _nd.array((flat % num_cols).astype(dtype), device)
+            indptr = _np.zeros(num_rows + 1, dtype)
+            _np.cumsum(_np.count_nonzero(source_array, axis=1), out=indptr[1:])
             self.indptr = _nd.array(indptr, device)
             self.shape = source_array.shape
+        elif _is_scipy_sparse(arg1):
+            csr = arg1.tocsr()
+            dtype = _index_dtype(csr.nnz, csr.shape[1])
+            self.data = _nd.array(csr.data, device)
+            self.indices = _nd.array(csr.indices.astype(dtype, copy=False), device)
+            self.indptr = _nd.array(csr.indptr.astype(dtype, copy=False), device)
+            self.shape = csr.shape
         else:
             raise RuntimeError(
-                "Construct CSRNDArray with either a tuple (data, indices, indptr) "
-                "or a numpy.array, can't handle type %s." % (type(arg1),)
+                "Construct CSRNDArray with either a tuple (data, indices, indptr), "
+                "a numpy.array or a scipy sparse matrix, can't handle type %s." % (type(arg1),)
             )
         self.stype = "csr"
         self.dtype = self.data.dtype
@@ -81,6 +99,184 @@ class CSRNDArray(object):
             self.indptr.dtype
         )
 
+    @staticmethod
+    def from_scipy(mat, device=None):
+        """Construct from a scipy sparse matrix of any format.
+
+        Parameters
+        ----------
+        mat : scipy.sparse.spmatrix
+            The matrix, converted to CSR first if needed.
+
+        device: Device, optional
+            The corresponding device, the cpu by default.
+
+        Returns
+        -------
+        ret : CSRNDArray
+            The sparse array.
+        """
+        return CSRNDArray(mat, device=device)
+
+    @staticmethod
+    def from_dlpack(data, indices, indptr, shape):
+        """Construct from the three CSR arrays of another framework without memory copy.
+
+        Parameters
+        ----------
+        data, indices, indptr : object with __dlpack__ attribute or a DLPack capsule
+            The CSR arrays, e.g. torch tensors or the capsules they export.
+
+        shape : tuple of int
+            The shape of the array
+
+        Returns
+        -------
+        ret : CSRNDArray
+            The sparse array sharing memory with the inputs.
+        """
+        return CSRNDArray(
+            (_nd.from_dlpack(data), _nd.from_dlpack(indices), _nd.from_dlpack(indptr)),
+            shape=tuple(shape),
+        )
+
+    @staticmethod
+    def from_coo(data, row, col, shape, device=None):
+        """Construct from COO arrays, duplicated entries are summed.
+
+        Parameters
+        ----------
+        data, row, col : numpy.ndarray or NDArray
+            The values and coordinates of the non-zeros.
+
+        shape : tuple of int
+            The shape of the array
+
+        device: Device, optional
+            The corresponding device, that of `data` if it is an NDArray and the cpu otherwise
+            by default.
+
+        Returns
+        -------
+        ret : CSRNDArray
+            The sparse array.
+        """
+        if device is None:
+            device = data.device if isinstance(data, _nd.NDArray) else _nd.cpu(0)
+        data, row, col = (x.numpy() if isinstance(x, _nd.NDArray) else x for x in (data, row, col))
+        data, row, col = _np.asarray(data), _np.asarray(row), _np.asarray(col)
+        num_rows, num_cols = shape
+        keys = row.astype("int64") * num_cols + col.astype("int64")
+        keys, inverse = _np.unique(keys, return_inverse=True)
+        values = _np.zeros(len(keys), data.dtype)
+        _np.add.at(values, inverse, data)
+        dtype = _index_dtype(len(keys), num_cols)
+        indptr = _np.zeros(num_rows + 1, dtype)
+        _np.cumsum(_np.bincount(keys // num_cols, minlength=num_rows), out=indptr[1:])
+        return CSRNDArray(
+            (
+                _nd.array(values, device),
+                _nd.array((keys % num_cols).astype(dtype), device),
+                _nd.array(indptr, device),
+            ),
+            shape=tuple(shape),
+        )
+
+    @property
+    def nnz(self):
+        """The number of stored values."""
+        return self.data.shape[0]
+
+    def to_dlpack(self):
+        """Export the CSR arrays without memory copy.
+
+        Returns
+        -------
+        ret : Tuple[PyCapsule, PyCapsule, PyCapsule]
+            The DLPack capsules of (data, indices, indptr).
+        """
+        return (self.data.to_dlpack(), self.indices.to_dlpack(), self.indptr.to_dlpack())
+
+    def to_scipy(self):
+        """Convert to a scipy.sparse.csr_matrix."""
+        import scipy.sparse  # pylint: disable=import-outside-toplevel
+
+        return scipy.sparse.csr_matrix(
+            (self.data.numpy(), self.indices.numpy(), self.indptr.numpy()), shape=self.shape
+        )
+
+    def _row_ids(self):
+        indptr = self.indptr.numpy()
+        return _np.repeat(_np.arange(len(indptr) - 1, dtype=indptr.dtype), _np.diff(indptr))
+
+    def to_coo(self):
+        """Convert to COO format.
+
+        Returns
+        -------
+        ret : Tuple[NDArray, NDArray, NDArray]
+            The (data, row, col) arrays, sorted by row then by the CSR order inside a row.
+        """
+        device = self.data.device
+        return (self.data, _nd.array(self._row_ids(), device), self.indices)
+
+    def to_csc(self):
+        """Convert to CSC format, i.e. the CSR format of the transpose.
+
+        Returns
+        -------
+        ret : Tuple[NDArray, NDArray, NDArray]
+            The (data, indices, indptr) arrays in CSC format, indices being the row ids.
+        """
+        device = self.data.device
+        indices = self.indices.numpy()
+        # a stable sort keeps the rows of every column in increasing order
+        order = _np.argsort(indices, kind="stable")
+        indptr = _np.zeros(self.shape[1] + 1, indices.dtype)
+        _np.cumsum(_np.bincount(indices, minlength=self.shape[1]), out=indptr[1:])
+        return (
+            _nd.array(self.data.numpy()[order], device),
+            _nd.array(self._row_ids()[order], device),
+            _nd.array(indptr, device),
+        )
+
+    def to_bsr(self, blocksize):
+        """Convert to BSR format.
+
+        Parameters
+        ----------
+        blocksize : Tuple[int, int]
+            The shape of the blocks, which must divide the shape of the array.
+
+        Returns
+        -------
+        ret : Tuple[NDArray, NDArray, NDArray]
+            The (data, indices, indptr) arrays in BSR format, data being of shape
+            [num_blocks, blocksize[0], blocksize[1]].
+        """
+        bs_r, bs_c = blocksize
+        num_rows, num_cols = self.shape
+        assert num_rows % bs_r == 0 and num_cols % bs_c == 0, "blocksize must divide the shape"
+        device = self.data.device
+        rows = self._row_ids().astype("int64")
+        cols = self.indices.numpy().astype("int64")
+        num_block_cols = num_cols // bs_c
+        keys, block_ids = _np.unique(
+            rows // bs_r * num_block_cols + cols // bs_c, return_inverse=True
+        )
+        data = _np.zeros((len(keys), bs_r, bs_c), self.dtype)
+        data[block_ids, rows % bs_r, cols % bs_c] = self.data.numpy()
+        dtype = _index_dtype(len(keys), num_block_cols)
+        indptr = _np.zeros(num_rows // bs_r + 1, dtype)
+        _np.cumsum(
+            _np.bincount(keys // num_block_cols, minlength=num_rows // bs_r), out=indptr[1:]
+        )
+        return (
+            _nd.array(data, device),
+            _nd.array((keys % num_block_cols).astype(dtype), device),
+            _nd.array(indptr, device),
+        )
+
     def asnumpy(self):
         """Construct a full matrix and convert it to numpy array. This API will be deprecated
         in TVM v0.8 release. Please use `numpy` instead."""
@@ -94,14 +290,13 @@ class CSRNDArray(object):
     def numpy(self):
         """Construct a full matrix and convert it to numpy array."""
         full = _np.zeros(self.shape, self.dtype)
-        ridx = _np.diff(self.indptr.numpy())
-        ridx = _np.hstack((_np.ones((v,), itype) * i for i, v in enumerate(ridx)))
-        full[ridx, self.indices.numpy().astype(itype)] = self.data.numpy()
+        full[self._row_ids(), self.indices.numpy()] = self.data.numpy()
         return full
 
 
 def array(source_array, device=None, shape=None, stype="csr"):
-    """Construct a sparse NDArray from numpy.ndarray"""
+    """Construct a sparse NDArray from numpy.ndarray, a scipy sparse matrix or a tuple of
+    (data, indices, indptr)"""
     ret = None
     if stype == "csr":
         ret = CSRNDArray(source_array, shape=shape, device=device)
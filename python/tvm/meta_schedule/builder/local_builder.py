@@ -254,8 +254,11 @@ def default_build(mod: IRModule, target: Target, _params: Optional[Dict[str, NDA
     """
     # pylint: disable=import-outside-toplevel
     from tvm.driver import build as tvm_build
+    from tvm.tir.transform import LowerSparseBuffer
 
     # pylint: enable=import-outside-toplevel
+    # SparseTIR stage-II modules still carry sparse buffers; the pass is a no-op otherwise.
+    mod = LowerSparseBuffer()(mod)
     return tvm_build(mod, target=target)
 
 
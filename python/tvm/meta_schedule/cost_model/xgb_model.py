@@ -452,6 +452,10 @@ class XGBModel(PyCostModel):
 
         # Step 1. Get the feature group
         new_group_hash = shash2hex(context.mod)
+        data_hash = getattr(self.extractor, "data_hash", None)
+        if data_hash is not None:
+            # the same kernel running on different sparse inputs is a different workload
+            new_group_hash += data_hash(context)
         group = self.data.get(new_group_hash, None)
 
         # Step 2. Extract features
@@ -22,3 +22,4 @@ measure candidates for use in cost model.
 from .feature_extractor import FeatureExtractor, PyFeatureExtractor
 from .per_store_feature import PerStoreFeature
 from .random_feature_extractor import RandomFeatureExtractor
+from .sparse_data_feature import SparseDataFeature, sparse_statistics
@@ -0,0 +1,235 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Data-aware feature extractor for sparse kernels.
+
+The IR of a SparseTIR kernel does not tell how the work is distributed, which is decided by the
+indptr/indices arrays the kernel runs on. This extractor appends summary statistics of the concrete
+sparse structure to every feature vector produced by an IR feature extractor.
+"""
+import hashlib
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np  # type: ignore
+
+from ...runtime.ndarray import NDArray, array
+from ..search_strategy import MeasureCandidate
+from ..tune_context import TuneContext
+from ..utils import derived_object
+from .feature_extractor import FeatureExtractor, PyFeatureExtractor
+from .per_store_feature import PerStoreFeature
+
+SparseStructure = Tuple[Union[np.ndarray, NDArray], Union[np.ndarray, NDArray]]
+
+
+def _to_numpy(arr: Union[np.ndarray, NDArray]) -> np.ndarray:
+    if isinstance(arr, NDArray):
+        return arr.numpy()
+    return np.asarray(arr)
+
+
+def sparse_statistics(
+    indptr: Union[np.ndarray, NDArray],
+    indices: Union[np.ndarray, NDArray],
+    num_cols: Optional[int] = None,
+    bucket_widths: Sequence[int] = (1, 2, 4, 8, 16, 32, 64),
+    num_degree_bins: int = 16,
+) -> np.ndarray:
+    """Summarize a CSR structure into a fixed-length feature vector.
+
+    Parameters
+    ----------
+    indptr : Union[np.ndarray, NDArray]
+        The row pointer array, of length `num_rows + 1`.
+    indices : Union[np.ndarray, NDArray]
+        The column indices array, of length `nnz`.
+    num_cols : Optional[int]
+        The number of columns. Inferred from the largest column index if None.
+    bucket_widths : Sequence[int]
+        The widths of the ELL buckets used to estimate the fill ratio of a bucketed format, where
+        each row goes to the narrowest bucket that holds it and longer rows are split into chunks
+        of the widest bucket.
+    num_degree_bins : int
+        The number of bins of the degree histogram. Bin `b` counts the rows whose degree `d`
+        satisfies `2^(b-1) <= d < 2^b`, the last bin counts all the longer rows.
+
+    Returns
+    -------
+    stats : np.ndarray
+        The statistics, of length `sparse_statistics_length(bucket_widths, num_degree_bins)`:
+        the log-scaled sizes, the degree moments, the degree histogram, the column locality and
+        the per-bucket fill ratio and share of non-zeros.
+    """
+    indptr = _to_numpy(indptr).astype("int64")
+    indices = _to_numpy(indices).astype("int64")
+    assert len(indptr) >= 1, "indptr should contain at least one element"
+    num_rows = len(indptr) - 1
+    nnz = int(indptr[-1] - indptr[0])
+    indices = indices[indptr[0] : indptr[-1]]
+    if num_cols is None:
+        num_cols = int(indices.max()) + 1 if nnz > 0 else 0
+    degree = np.diff(indptr).astype("float64")
+
+    # sizes
+    sizes = [np.log1p(num_rows), np.log1p(num_cols), np.log1p(nnz)]
+
+    # degree moments
+    if num_rows > 0:
+        mean = degree.mean()
+        moments = [
+            np.log1p(mean),
+            degree.std() / mean if mean > 0 else 0.0,
+            np.log1p(degree.max()),
+            degree.max() / mean if mean > 0 else 0.0,
+            float(np.count_nonzero(degree == 0)) / num_rows,
+            nnz / (float(num_rows) * num_cols) if num_cols > 0 else 0.0,
+        ]
+    else:
+        moments = [0.0] * 6
+
+    # degree histogram
+    histogram = np.zeros(num_degree_bins, dtype="float64")
+    if num_rows > 0:
+        bins = np.minimum(
+            np.ceil(np.log2(degree + 1)).astype("int64"),
+            num_degree_bins - 1,
+        )
+        histogram += np.bincount(bins, minlength=num_degree_bins)[:num_degree_bins] / num_rows
+
+    # column locality: how close consecutive non-zeros of a row are
+    if nnz > 1:
+        row_ids = np.repeat(np.arange(num_rows), np.diff(indptr))
+        same_row = row_ids[1:] == row_ids[:-1]
+        gaps = np.abs(np.diff(indices))[same_row]
+    else:
+        gaps = np.zeros(0, dtype="int64")
+    if len(gaps) > 0:
+        locality = [
+            float(np.count_nonzero(gaps == 1)) / len(gaps),
+            float(np.mean(np.log2(gaps + 1))),
+        ]
+    else:
+        locality = [0.0, 0.0]
+
+    # bucket fill ratio
+    widths = np.sort(np.asarray(bucket_widths, dtype="int64"))
+    fill = np.zeros(2 * len(widths), dtype="float64")
+    if num_rows > 0 and len(widths) > 0:
+        degree = degree.astype("int64")
+        chunks = np.maximum(1, -(-degree // widths[-1]))
+        bucket = np.searchsorted(widths, np.minimum(degree, widths[-1]))
+        slots = np.where(degree > widths[-1], chunks * widths[-1], widths[bucket])
+        nonempty = degree > 0
+        for i in range(len(widths)):
+            mask = nonempty & (bucket == i)
+            bucket_slots = slots[mask].sum()
+            bucket_nnz = degree[mask].sum()
+            fill[2 * i] = bucket_nnz / bucket_slots if bucket_slots > 0 else 0.0
+            fill[2 * i + 1] = bucket_nnz / nnz if nnz > 0 else 0.0
+
+    return np.concatenate(
+        [np.asarray(sizes + moments, dtype="float64"), histogram, locality, fill]
+    ).astype("float32")
+
+
+def sparse_statistics_length(
+    bucket_widths: Sequence[int] = (1, 2, 4, 8, 16, 32, 64),
+    num_degree_bins: int = 16,
+) -> int:
+    """The length of the vector returned by `sparse_statistics`."""
+    return 3 + 6 + num_degree_bins + 2 + 2 * len(bucket_widths)
+
+
+@derived_object
+class SparseDataFeature(PyFeatureExtractor):
+    """Joins the IR features of a candidate with statistics of the sparse inputs of its task.
+
+    Every row of the features extracted by `extractor` is extended with a flag telling whether
+    sparse data is bound to the task, followed by `sparse_statistics` of that data (zeros if not).
+
+    Parameters
+    ----------
+    sparse_inputs : Union[SparseStructure, Dict[str, SparseStructure]]
+        The (indptr, indices) pair the kernels run on, or a dict mapping task names to such pairs.
+    extractor : Optional[FeatureExtractor]
+        The IR feature extractor. PerStoreFeature() if None.
+    num_cols : Optional[Union[int, Dict[str, int]]]
+        The number of columns of the sparse inputs, inferred from the indices if None.
+    bucket_widths : Sequence[int]
+        The ELL bucket widths the fill ratio is estimated for.
+    num_degree_bins : int
+        The number of bins of the degree histogram.
+    """
+
+    extractor: FeatureExtractor
+    stats: Dict[Optional[str], np.ndarray]
+    hashes: Dict[Optional[str], str]
+    stats_length: int
+
+    def __init__(
+        self,
+        sparse_inputs: Union[SparseStructure, Dict[str, SparseStructure]],
+        *,
+        extractor: Optional[FeatureExtractor] = None,
+        num_cols: Optional[Union[int, Dict[str, int]]] = None,
+        bucket_widths: Sequence[int] = (1, 2, 4, 8, 16, 32, 64),
+        num_degree_bins: int = 16,
+    ):
+        super().__init__()
+        self.extractor = extractor if extractor is not None else PerStoreFeature()
+        if not isinstance(sparse_inputs, dict):
+            sparse_inputs = {None: sparse_inputs}
+        self.stats = {}
+        self.hashes = {}
+        for task_name, (indptr, indices) in sparse_inputs.items():
+            indptr, indices = _to_numpy(indptr), _to_numpy(indices)
+            cols = num_cols.get(task_name, None) if isinstance(num_cols, dict) else num_cols
+            self.stats[task_name] = sparse_statistics(
+                indptr, indices, cols, bucket_widths, num_degree_bins
+            )
+            digest = hashlib.md5()
+            digest.update(indptr.tobytes())
+            digest.update(indices.tobytes())
+            self.hashes[task_name] = digest.hexdigest()
+        self.stats_length = sparse_statistics_length(bucket_widths, num_degree_bins)
+
+    def _lookup(self, task_name: Optional[str]) -> Optional[str]:
+        if task_name not in self.stats and None in self.stats:
+            return None
+        return task_name
+
+    def data_hash(self, context: TuneContext) -> str:
+        """The hash of the sparse inputs bound to the task, empty if none is bound.
+
+        Cost models that normalize the measured costs per workload use it to tell apart the same
+        kernel running on different sparse inputs.
+        """
+        return self.hashes.get(self._lookup(context.task_name), "")
+
+    def extract_from(
+        self, context: TuneContext, candidates: List[MeasureCandidate]
+    ) -> List[NDArray]:
+        key = self._lookup(context.task_name)
+        if key in self.stats:
+            data = np.concatenate([[1.0], self.stats[key]]).astype("float32")
+        else:
+            data = np.zeros(1 + self.stats_length, dtype="float32")
+        result = []
+        for feature in self.extractor.extract_from(context, candidates):
+            feature = feature.numpy().astype("float32")
+            tiled = np.tile(data, (feature.shape[0], 1))
+            result.append(array(np.concatenate([feature, tiled], axis=1)))
+        return result
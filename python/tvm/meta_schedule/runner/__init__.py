@@ -22,3 +22,4 @@ from .config import EvaluatorConfig, RPCConfig
 from .rpc_runner import RPCRunner
 from .local_runner import LocalRunner, LocalRunnerFuture
 from .runner import PyRunner, Runner, RunnerFuture, RunnerInput, RunnerResult, PyRunnerFuture
+from .utils import bind_args_by_name
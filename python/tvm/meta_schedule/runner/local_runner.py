@@ -17,8 +17,9 @@
 """Local Runner"""
 from contextlib import contextmanager
 import logging
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
+import numpy as np  # type: ignore
 import tvm
 
 from ...contrib.popen_pool import PopenPoolExecutor
@@ -29,8 +30,12 @@ from .runner import PyRunner, RunnerFuture, RunnerInput, RunnerResult, PyRunnerF
 from .utils import (
     T_ARGUMENT_LIST,
     T_ARG_INFO_JSON_OBJ_LIST,
+    T_BOUND_ARGS,
     alloc_argument_common,
+    bound_args_initializer,
+    normalize_bound_args,
     run_evaluator_common,
+    upload_bound_args,
 )
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -177,6 +182,8 @@ class LocalRunner(PyRunner):
         The function name to run the evaluator or the function itself.
     f_cleanup: Optional[str, Callable]
         The function name to cleanup the session or the function itself.
+    bound_args: Optional[T_BOUND_ARGS]
+        The arrays used instead of random data, indexed by the argument position.
     pool: PopenPoolExecutor
         The popen pool executor.
 
@@ -224,6 +231,7 @@ class LocalRunner(PyRunner):
     f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None]
     f_run_evaluator: Union[T_RUN_EVALUATOR, str, None]
     f_cleanup: Union[T_CLEANUP, str, None]
+    bound_args: Optional[T_BOUND_ARGS]
 
     pool: PopenPoolExecutor
 
@@ -237,6 +245,7 @@ class LocalRunner(PyRunner):
         f_run_evaluator: Union[T_RUN_EVALUATOR, str, None] = None,
         f_cleanup: Union[T_CLEANUP, str, None] = None,
         initializer: Optional[Callable[[], None]] = None,
+        bound_args: Optional[Dict[int, Union[np.ndarray, tvm.nd.NDArray]]] = None,
     ) -> None:
         """Constructor
 
@@ -258,6 +267,10 @@ class LocalRunner(PyRunner):
             The function name to cleanup the session or the function itself.
         initializer: Optional[Callable[[], None]]
             The initializer function.
+        bound_args: Optional[Dict[int, Union[np.ndarray, tvm.nd.NDArray]]]
+            The arrays used instead of random data, indexed by the argument position, e.g. the
+            indptr and indices of a sparse kernel (see `bind_args_by_name`). They are sent to the
+            worker once and copied to the device once, then shared by all the measurements.
         """
         super().__init__()
         self.timeout_sec = timeout_sec
@@ -267,12 +280,14 @@ class LocalRunner(PyRunner):
         self.f_alloc_argument = f_alloc_argument
         self.f_run_evaluator = f_run_evaluator
         self.f_cleanup = f_cleanup
+        self.bound_args = normalize_bound_args(bound_args)
 
         logger.info("LocalRunner: max_workers = 1")
         self.pool = PopenPoolExecutor(
             max_workers=1,  # one local worker
             timeout=timeout_sec,
-            initializer=initializer,
+            initializer=bound_args_initializer,
+            initargs=(self.bound_args, initializer),
         )
         self._sanity_check()
 
@@ -349,7 +364,8 @@ def default_alloc_argument(
     f_random_fill = get_global_func_with_default_on_worker(
         name="tvm.contrib.random.random_fill", default=None
     )
-    return alloc_argument_common(f_random_fill, device, args_info, alloc_repeat)
+    bound_args = upload_bound_args(device, cache=True)
+    return alloc_argument_common(f_random_fill, device, args_info, alloc_repeat, bound_args)
 
 
 def default_run_evaluator(
@@ -19,11 +19,12 @@ import concurrent.futures
 import logging
 import os.path as osp
 from contextlib import contextmanager
-from typing import Callable, List, Optional, Union
+from typing import Callable, Dict, List, Optional, Union
 
+import numpy as np  # type: ignore
 from tvm.contrib.popen_pool import PopenPoolExecutor
 from tvm.rpc import RPCSession
-from tvm.runtime import Device, Module
+from tvm.runtime import Device, Module, NDArray
 
 from ..utils import (
     derived_object,
@@ -35,8 +36,12 @@ from .runner import PyRunner, PyRunnerFuture, RunnerFuture, RunnerInput, RunnerR
 from .utils import (
     T_ARG_INFO_JSON_OBJ_LIST,
     T_ARGUMENT_LIST,
+    T_BOUND_ARGS,
     alloc_argument_common,
+    bound_args_initializer,
+    normalize_bound_args,
     run_evaluator_common,
+    upload_bound_args,
 )
 
 logger = logging.getLogger(__name__)  # pylint: disable=invalid-name
@@ -154,6 +159,8 @@ class RPCRunner(PyRunner):
         The function name to run the evaluator or the function itself.
     f_cleanup: Optional[str, Callable]
         The function name to cleanup the session or the function itself.
+    bound_args: Optional[T_BOUND_ARGS]
+        The arrays used instead of random data, indexed by the argument position.
     pool: PopenPoolExecutor
         The popen pool executor.
 
@@ -228,6 +235,7 @@ class RPCRunner(PyRunner):
     f_alloc_argument: Union[T_ALLOC_ARGUMENT, str, None]
     f_run_evaluator: Union[T_RUN_EVALUATOR, str, None]
     f_cleanup: Union[T_CLEANUP, str, None]
+    bound_args: Optional[T_BOUND_ARGS]
 
     pool: PopenPoolExecutor
 
@@ -244,6 +252,7 @@ class RPCRunner(PyRunner):
         f_cleanup: Union[T_CLEANUP, str, None] = None,
         max_workers: int = 1,
         initializer: Optional[Callable[[], None]] = None,
+        bound_args: Optional[Dict[int, Union[np.ndarray, NDArray]]] = None,
     ) -> None:
         """Constructor
 
@@ -271,6 +280,10 @@ class RPCRunner(PyRunner):
             The maximum number of connections. Defaults to 1.
         initializer: Optional[Callable[[], None]]
             The initializer function.
+        bound_args: Optional[Dict[int, Union[np.ndarray, NDArray]]]
+            The arrays used instead of random data, indexed by the argument position, e.g. the
+            indptr and indices of a sparse kernel (see `bind_args_by_name`). They are sent to each
+            worker once, and copied to the remote device once per RPC session.
         """
         super().__init__()
         self.rpc_config = RPCConfig._normalized(rpc_config)
@@ -282,11 +295,13 @@ class RPCRunner(PyRunner):
         self.f_alloc_argument = f_alloc_argument
         self.f_run_evaluator = f_run_evaluator
         self.f_cleanup = f_cleanup
+        self.bound_args = normalize_bound_args(bound_args)
         logger.info("RPCRunner: max_workers = %d", max_workers)
         self.pool = PopenPoolExecutor(
             max_workers=max_workers,
             timeout=rpc_config.session_timeout_sec,
-            initializer=initializer,
+            initializer=bound_args_initializer,
+            initargs=(self.bound_args, initializer),
         )
         self._sanity_check()
 
@@ -474,8 +489,9 @@ def default_alloc_argument(
         "tvm.contrib.random.random_fill",
         "Please make sure 'USE_RANDOM' is turned ON in the config.cmake on the RPC server.",
     )
-
-    return alloc_argument_common(f_random_fill, device, args_info, alloc_repeat)
+    # The remote arrays do not outlive the session, so they are uploaded for each measurement
+    bound_args = upload_bound_args(device, cache=False)
+    return alloc_argument_common(f_random_fill, device, args_info, alloc_repeat, bound_args)
 
 
 def default_run_evaluator(
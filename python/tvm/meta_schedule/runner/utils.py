@@ -16,15 +16,123 @@
 # under the License.
 """Runner utility functions"""
 import itertools
-from typing import Any, Callable, Dict, List
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np  # type: ignore
 
 from ...runtime import Device, Module, ndarray
+from ...tir import PrimFunc
 from .config import EvaluatorConfig
 
 T_ARG_INFO_JSON_OBJ = List[Any]  # pylint: disable=invalid-name
 T_ARG_INFO_JSON_OBJ_LIST = List[T_ARG_INFO_JSON_OBJ]  # pylint: disable=invalid-name
 T_ARGUMENT = Any  # pylint: disable=invalid-name
 T_ARGUMENT_LIST = List[T_ARGUMENT]  # pylint: disable=invalid-name
+T_BOUND_ARGS = Dict[int, np.ndarray]  # pylint: disable=invalid-name
+
+# The arguments bound on the current runner worker, set by `bound_args_initializer`
+_BOUND_ARGS: T_BOUND_ARGS = {}
+# The bound arguments already uploaded to a device of the current runner worker
+_UPLOADED_ARGS: Dict[str, Dict[int, ndarray.NDArray]] = {}
+
+
+def normalize_bound_args(
+    bound_args: Optional[Dict[int, Union[np.ndarray, ndarray.NDArray]]],
+) -> Optional[T_BOUND_ARGS]:
+    """Convert the bound arguments to numpy arrays, so that they can be sent to the workers
+
+    Parameters
+    ----------
+    bound_args: Optional[Dict[int, Union[np.ndarray, ndarray.NDArray]]]
+        The arrays bound to the arguments, indexed by the argument position
+
+    Returns
+    -------
+    bound_args: Optional[T_BOUND_ARGS]
+        The bound arguments as numpy arrays
+    """
+    if bound_args is None:
+        return None
+    result: T_BOUND_ARGS = {}
+    for index, arr in bound_args.items():
+        if isinstance(arr, ndarray.NDArray):
+            arr = arr.numpy()
+        result[int(index)] = np.ascontiguousarray(arr)
+    return result
+
+
+def bind_args_by_name(
+    func: PrimFunc,
+    args: Dict[str, Union[np.ndarray, ndarray.NDArray]],
+) -> T_BOUND_ARGS:
+    """Bind arrays to the parameters of a PrimFunc by name, e.g. the indptr and indices of a
+    SparseTIR kernel
+
+    Parameters
+    ----------
+    func: PrimFunc
+        The function to be tuned
+    args: Dict[str, Union[np.ndarray, ndarray.NDArray]]
+        The arrays bound to the parameters, indexed by the parameter name
+
+    Returns
+    -------
+    bound_args: T_BOUND_ARGS
+        The arrays bound to the parameters, indexed by the parameter position
+    """
+    names = [param.name for param in func.params]
+    result: Dict[int, Union[np.ndarray, ndarray.NDArray]] = {}
+    for name, arr in args.items():
+        if name not in names:
+            raise ValueError(f"Parameter {name} is not found, expected one of: {names}")
+        result[names.index(name)] = arr
+    return normalize_bound_args(result)
+
+
+def bound_args_initializer(
+    bound_args: Optional[T_BOUND_ARGS],
+    initializer: Optional[Callable[[], None]],
+) -> None:
+    """Initializer of the runner workers that records the bound arguments
+
+    Parameters
+    ----------
+    bound_args: Optional[T_BOUND_ARGS]
+        The arrays bound to the arguments, indexed by the argument position
+    initializer: Optional[Callable[[], None]]
+        The user initializer to be called afterwards
+    """
+    _BOUND_ARGS.clear()
+    _UPLOADED_ARGS.clear()
+    if bound_args is not None:
+        _BOUND_ARGS.update(bound_args)
+    if initializer is not None:
+        initializer()
+
+
+def upload_bound_args(device: Device, cache: bool) -> Dict[int, ndarray.NDArray]:
+    """Copy the arguments bound on the current runner worker to the device
+
+    Parameters
+    ----------
+    device: Device
+        The device to copy the arguments to
+    cache: bool
+        Whether to reuse the copy across calls. Should be False if the device belongs to an RPC
+        session, which does not outlive a single measurement.
+
+    Returns
+    -------
+    bound_args: Dict[int, ndarray.NDArray]
+        The bound arguments on the device, indexed by the argument position
+    """
+    key = str(device)
+    if cache and key in _UPLOADED_ARGS:
+        return _UPLOADED_ARGS[key]
+    uploaded = {index: ndarray.array(arr, device=device) for index, arr in _BOUND_ARGS.items()}
+    if cache:
+        _UPLOADED_ARGS[key] = uploaded
+    return uploaded
 
 
 def alloc_argument_common(
@@ -32,6 +140,7 @@ def alloc_argument_common(
     device: Device,
     args_info: T_ARG_INFO_JSON_OBJ_LIST,
     alloc_repeat: int,
+    bound_args: Optional[Dict[int, ndarray.NDArray]] = None,
 ) -> List[T_ARGUMENT_LIST]:
     """Common function to allocate the arguments
 
@@ -45,12 +154,27 @@ def alloc_argument_common(
         The arguments info
     alloc_repeat: int
         The number of times to repeat the allocation
+    bound_args: Optional[Dict[int, ndarray.NDArray]]
+        The arrays on the device used instead of random data, indexed by the argument position.
+        They are shared by all the repeated allocations.
 
     Returns
     -------
     repeated_args: List[T_ARGUMENT_LIST]
         The allocation args
     """
+    if bound_args is None:
+        bound_args = {}
+    for index, arr in bound_args.items():
+        if index >= len(args_info):
+            raise ValueError(
+                f"Argument {index} is bound, but the function only has {len(args_info)} arguments"
+            )
+        if args_info[index][0] == "TENSOR" and args_info[index][1] != arr.dtype:
+            raise ValueError(
+                f"Argument {index} is bound to an array of dtype {arr.dtype}, "
+                f"but {args_info[index][1]} is expected"
+            )
 
     def alloc_tensor(_, dtype, shape) -> ndarray.NDArray:
         arg = ndarray.empty(shape=shape, dtype=dtype, device=device)
@@ -69,7 +193,10 @@ def alloc_argument_common(
     for _ in range(alloc_repeat):
         args: T_ARGUMENT_LIST = []
         arg_info: T_ARG_INFO_JSON_OBJ
-        for arg_info in args_info:
+        for index, arg_info in enumerate(args_info):
+            if index in bound_args:
+                args.append(bound_args[index])
+                continue
             arg_type = arg_info[0]
             arg: Any = dispatcher.get(arg_type, None)(*arg_info)
             args.append(arg)
@@ -0,0 +1,63 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Tiling rule for the stage-II blocks emitted by SparseTIR's lower_sparse_iter"""
+from typing import List, Optional
+
+from tvm._ffi import register_object
+
+from .. import _ffi_api
+from .schedule_rule import ScheduleRule
+
+
+@register_object("meta_schedule.SparseTiling")
+class SparseTiling(ScheduleRule):
+    """Tiling rule for the stage-II blocks emitted by `tvm.sparse.lower_sparse_iter`.
+
+    Rows are tiled with a factor inversely proportional to the constant reduction extent of the
+    block (e.g. the bucket width of an ELL bucket after `format_decompose`), so that every bucket
+    gets a similar amount of work per tile. The innermost spatial loop is split to threads,
+    reductions writing through an indirect index (e.g. the row indices of a bucket) are annotated
+    as atomic, and binary search blocks only get their outermost loop distributed.
+
+    Parameters
+    ----------
+    tile_binds : Optional[List[str]]
+        The thread axes the row tile, the rows inside a tile and the features are bound to.
+        Use None on CPU, where the row tiles are parallelized instead.
+    thread_extents : Optional[List[int]]
+        Candidates of the number of threads along the feature loop.
+    row_tile_work : Optional[List[int]]
+        Candidates of the amount of work per row tile, i.e. the number of rows in a tile
+        multiplied by the constant reduction extent of the block.
+    """
+
+    def __init__(
+        self,
+        tile_binds: Optional[List[str]] = None,
+        thread_extents: Optional[List[int]] = None,
+        row_tile_work: Optional[List[int]] = None,
+    ) -> None:
+        if thread_extents is None:
+            thread_extents = [32, 64, 128]
+        if row_tile_work is None:
+            row_tile_work = [8, 32, 128, 512]
+        self.__init_handle_by_constructor__(
+            _ffi_api.ScheduleRuleSparseTiling,  # type: ignore # pylint: disable=no-member
+            tile_binds,
+            thread_extents,
+            row_tile_work,
+        )
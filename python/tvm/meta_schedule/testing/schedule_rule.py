@@ -24,6 +24,7 @@ from tvm.meta_schedule.schedule_rule import (
     RandomComputeLocation,
     ReuseType,
     ScheduleRule,
+    SparseTiling,
 )
 from tvm.target import Target
 
@@ -126,3 +127,19 @@ def parallel_vectorize_unroll(target: Target) -> ScheduleRule:
             unroll_explicit=True,
         )
     raise NotImplementedError(f"{target.kind.name} is not supported")
+
+
+def sparse_tiling(target: Target) -> ScheduleRule:
+    """Default schedule rules for SparseTIR stage-II blocks"""
+    if target.kind.name == "llvm":
+        return SparseTiling(
+            tile_binds=None,
+            row_tile_work=[8, 32, 128, 512],
+        )
+    if target.kind.name == "cuda":
+        return SparseTiling(
+            tile_binds=["blockIdx.x", "threadIdx.y", "threadIdx.x"],
+            thread_extents=[32, 64, 128],
+            row_tile_work=[8, 32, 128, 512],
+        )
+    raise NotImplementedError(f"{target.kind.name} is not supported")
@@ -179,6 +179,87 @@ class DefaultCUDA:
         }
 
 
+class DefaultSparseLLVM:
+    """Default tuning configuration for SparseTIR stage-II modules on LLVM."""
+
+    @staticmethod
+    def _sch_rules() -> List[ScheduleRule]:
+        from tvm.meta_schedule import schedule_rule as M
+
+        return [
+            M.SparseTiling(
+                tile_binds=None,
+                row_tile_work=[8, 32, 128, 512],
+            ),
+            M.ParallelizeVectorizeUnroll(
+                max_jobs_per_core=-1,  # row tiles are parallelized by SparseTiling
+                max_vectorize_extent=64,
+                unroll_max_steps=[0, 16, 64, 512],
+                unroll_explicit=True,
+            ),
+        ]
+
+    @staticmethod
+    def _postproc() -> List[Postproc]:
+        from tvm.meta_schedule import postproc as M
+
+        # Loops over sparse axes have data-dependent extents, so DisallowDynamicLoop is not used.
+        return [
+            M.RewriteParallelVectorizeUnroll(),
+            M.RewriteReductionBlock(),
+        ]
+
+    @staticmethod
+    def _mutator_probs() -> Dict[Mutator, float]:
+        from tvm.meta_schedule import mutator as M
+
+        return {
+            M.MutateUnroll(): 1.0,
+        }
+
+
+class DefaultSparseCUDA:
+    """Default tuning configuration for SparseTIR stage-II modules on CUDA."""
+
+    @staticmethod
+    def _sch_rules() -> List[ScheduleRule]:
+        from tvm.meta_schedule import schedule_rule as M
+
+        return [
+            M.SparseTiling(
+                tile_binds=["blockIdx.x", "threadIdx.y", "threadIdx.x"],
+                thread_extents=[32, 64, 128],
+                row_tile_work=[8, 32, 128, 512],
+            ),
+            M.ParallelizeVectorizeUnroll(
+                max_jobs_per_core=-1,  # disable parallelize
+                max_vectorize_extent=-1,  # disable vectorize
+                unroll_max_steps=[0, 16, 64, 512, 1024],
+                unroll_explicit=True,
+            ),
+        ]
+
+    @staticmethod
+    def _postproc() -> List[Postproc]:
+        from tvm.meta_schedule import postproc as M
+
+        # Loops over sparse axes have data-dependent extents, so DisallowDynamicLoop is not used,
+        # and VerifyGPUCode cannot lower the sparse buffers of a stage-II module.
+        return [
+            M.RewriteUnboundBlock(),
+            M.RewriteParallelVectorizeUnroll(),
+            M.RewriteReductionBlock(),
+        ]
+
+    @staticmethod
+    def _mutator_probs() -> Dict[Mutator, float]:
+        from tvm.meta_schedule import mutator as M
+
+        return {
+            M.MutateUnroll(): 1.0,
+        }
+
+
 class Parse:
     """Parse tuning configuration from user inputs."""
 
@@ -199,6 +280,19 @@ class Parse:
             mod = IRModule({"main": mod[func_name]})
         return mod
 
+    @staticmethod
+    def _is_sparse(mod: IRModule) -> bool:
+        """Whether the module is a SparseTIR stage-II module, i.e. lowered by lower_sparse_iter."""
+        for func in mod.functions.values():
+            if (
+                isinstance(func, PrimFunc)
+                and func.attrs is not None
+                and "sparse_tir_level" in func.attrs
+            ):
+                if int(func.attrs["sparse_tir_level"]) == 1:
+                    return True
+        return False
+
     @staticmethod
     def _target(target: Union[str, Target]) -> Target:
         if isinstance(target, str):
@@ -290,30 +384,38 @@ class Parse:
         return space_generator
 
     @staticmethod
-    def _sch_rules(sch_rules: Optional[FnScheduleRule], target: Target) -> List[ScheduleRule]:
+    def _sch_rules(
+        sch_rules: Optional[FnScheduleRule],
+        target: Target,
+        sparse: bool = False,
+    ) -> List[ScheduleRule]:
         if callable(sch_rules):
             return sch_rules()
         if sch_rules is not None:
             raise TypeError(f"Expected `sch_rules` to be None or callable, but gets: {sch_rules}")
         # pylint: disable=protected-access
         if target.kind.name == "llvm":
-            return DefaultLLVM._sch_rules()
+            return DefaultSparseLLVM._sch_rules() if sparse else DefaultLLVM._sch_rules()
         if target.kind.name in ["cuda", "rocm", "vulkan"]:
-            return DefaultCUDA._sch_rules()
+            return DefaultSparseCUDA._sch_rules() if sparse else DefaultCUDA._sch_rules()
         # pylint: enable=protected-access
         raise ValueError(f"Unsupported target: {target}")
 
     @staticmethod
-    def _postproc(postproc: Optional[FnPostproc], target: Target) -> List[Postproc]:
+    def _postproc(
+        postproc: Optional[FnPostproc],
+        target: Target,
+        sparse: bool = False,
+    ) -> List[Postproc]:
         if callable(postproc):
             return postproc()
         if postproc is not None:
             raise TypeError(f"Expected `postproc` to be None or callable, but gets: {postproc}")
         # pylint: disable=protected-access
         if target.kind.name == "llvm":
-            return DefaultLLVM._postproc()
+            return DefaultSparseLLVM._postproc() if sparse else DefaultLLVM._postproc()
         if target.kind.name in ["cuda", "rocm", "vulkan"]:
-            return DefaultCUDA._postproc()
+            return DefaultSparseCUDA._postproc() if sparse else DefaultCUDA._postproc()
         # pylint: enable=protected-access
         raise ValueError(f"Unsupported target: {target}")
 
@@ -321,6 +423,7 @@ class Parse:
     def _mutator_probs(
         mutator_probs: Optional[FnMutatorProb],
         target: Target,
+        sparse: bool = False,
     ) -> Dict[Mutator, float]:
         if callable(mutator_probs):
             return mutator_probs()
@@ -330,9 +433,9 @@ class Parse:
             )
         # pylint: disable=protected-access
         if target.kind.name == "llvm":
-            return DefaultLLVM._mutator_probs()
+            return DefaultSparseLLVM._mutator_probs() if sparse else DefaultLLVM._mutator_probs()
         if target.kind.name in ["cuda", "rocm", "vulkan"]:
-            return DefaultCUDA._mutator_probs()
+            return DefaultSparseCUDA._mutator_probs() if sparse else DefaultCUDA._mutator_probs()
         # pylint: enable=protected-access
         raise ValueError(f"Unsupported target: {target}")
 
@@ -483,15 +586,17 @@ def tune_extracted_tasks(
     tune_contexts = []
     for task in extracted_tasks:
         assert len(task.dispatched) == 1, "Only size 1 dispatched task list is supported for now"
+        mod = Parse._mod(task.dispatched[0])
+        sparse = Parse._is_sparse(mod)
         tune_contexts.append(
             TuneContext(
-                mod=Parse._mod(task.dispatched[0]),
+                mod=mod,
                 target=task.target,
                 space_generator=Parse._space_generator(space),
                 search_strategy=config.create_strategy(),
-                sch_rules=Parse._sch_rules(sch_rules, task.target),
-                postprocs=Parse._postproc(postprocs, task.target),
-                mutator_probs=Parse._mutator_probs(mutator_probs, task.target),
+                sch_rules=Parse._sch_rules(sch_rules, task.target, sparse),
+                postprocs=Parse._postproc(postprocs, task.target, sparse),
+                mutator_probs=Parse._mutator_probs(mutator_probs, task.target, sparse),
                 task_name=task.task_name,
                 num_threads=num_threads,
             )
@@ -32,6 +32,25 @@ SparseAnalysisResult = namedtuple(
     [
         "weight_name",
         "weight_shape",
+        "weight_format",
+    ],
+)
+
+SparseWeightStats = namedtuple(
+    "SparseWeightStats",
+    [
+        "sparsity",
+        "degree_cv",
+        "block_fill",
+    ],
+)
+
+SparseFormatChoice = namedtuple(
+    "SparseFormatChoice",
+    [
+        "name",
+        "block_size",
+        "stats",
     ],
 )
 
@@ -54,7 +73,94 @@ def _search_dense_op_weight(expr):
     return _ffi_api.search_dense_op_weight(expr)
 
 
-def process_params(expr, params, block_size, sparsity_threshold):
+def analyze_weight(w_np, block_sizes=(2, 4, 8, 16, 32)):
+    """Measure the sparse structure of a dense weight
+
+    Parameters
+    ----------
+    w_np : numpy.ndarray
+        2-D weight of shape [N, K]
+    block_sizes : Sequence[int]
+        Sizes of the square blocks the block fill is measured for,
+        the sizes not dividing both dimensions of the weight are skipped
+
+    Returns
+    -------
+    ret : SparseWeightStats
+        sparsity: the fraction of zeros
+        degree_cv: the coefficient of variation of the number of non-zeros per row
+        block_fill: dict from block size to the fraction of non-zeros in the non-zero blocks
+    """
+    mask = w_np != 0
+    num_rows, num_cols = mask.shape
+    nnz = int(np.count_nonzero(mask))
+    sparsity = 1.0 - nnz / mask.size
+    degree = mask.sum(axis=1)
+    degree_cv = float(degree.std() / degree.mean()) if nnz > 0 else 0.0
+    block_fill = {}
+    for bs in block_sizes:
+        if num_rows % bs != 0 or num_cols % bs != 0:
+            continue
+        block_nnz = mask.reshape(num_rows // bs, bs, num_cols // bs, bs).sum(axis=(1, 3))
+        num_blocks = np.count_nonzero(block_nnz)
+        block_fill[bs] = nnz / (num_blocks * bs * bs) if num_blocks > 0 else 0.0
+    return SparseWeightStats(sparsity, degree_cv, block_fill)
+
+
+def select_sparse_format(w_np, sparsity_threshold, block_sizes=(2, 4, 8, 16, 32), cost_model=None):
+    """Choose the storage format of a dense weight with a cost model
+
+    The candidates are the formats ``nn.sparse_dense`` computes on: dense, and BSR with
+    1x1 blocks and with the block sizes of ``analyze_weight``, i.e. those dividing the
+    weight. Clustered non-zeros favor BSR with a block size matching the clusters,
+    scattered ones favor 1x1 blocks.
+
+    Parameters
+    ----------
+    w_np : numpy.ndarray
+        2-D weight of shape [N, K]
+    sparsity_threshold : float
+        Minimal sparsity requirement for converting to sparse operation
+    block_sizes : Sequence[int]
+        Candidate sizes of the square blocks of BSR
+    cost_model : Optional[AnalyticFormatCost]
+        The cost model of the formats, tvm.sparse.AnalyticFormatCost() if None. It is called
+        with a FormatCandidate and a SparseStructure, and the cost of the dense format is
+        the cost of `N * K` elements of its `block_cost`.
+
+    Returns
+    -------
+    ret : SparseFormatChoice
+        name: "dense" or "bsr_<block_size>"
+        block_size: the block size of the BSR arrays storing the weight, None if dense
+        stats: the SparseWeightStats of the weight
+    """
+    # pylint: disable=import-outside-toplevel
+    from tvm.sparse import AnalyticFormatCost, FormatCandidate, SparseStructure
+
+    stats = analyze_weight(w_np, block_sizes)
+    if stats.sparsity < sparsity_threshold:
+        return SparseFormatChoice("dense", None, stats)
+    if cost_model is None:
+        cost_model = AnalyticFormatCost()
+    csr = sp.csr_matrix(w_np)
+    structure = SparseStructure(csr.indptr, csr.indices, w_np.shape[1])
+    candidates = [FormatCandidate("bsr", block_size=bs) for bs in [1] + sorted(stats.block_fill)]
+    costs = [cost_model(candidate, structure) for candidate in candidates]
+    best = candidates[int(np.argmin(costs))]
+    if cost_model.block_cost * w_np.size <= min(costs):
+        return SparseFormatChoice("dense", None, stats)
+    return SparseFormatChoice(best.name, (best.block_size, best.block_size), stats)
+
+
+def process_params(
+    expr,
+    params,
+    block_size,
+    sparsity_threshold,
+    block_sizes=(2, 4, 8, 16, 32),
+    cost_model=None,
+):
     """[summary]
 
     Parameters
@@ -63,15 +169,22 @@ def process_params(expr, params, block_size, sparsity_threshold):
         Expr of the network
     params : Dict[String, tvm.nd.array]
         parameters of the network
-    block_size : Tuple(int, int)
-        Blocksize in BSR matrix
+    block_size : Optional[Tuple(int, int)]
+        Blocksize in BSR matrix. If None, the format of every weight is chosen
+        separately by ``select_sparse_format``
     sparsity_threshold : float
         Minimal sparsity requirement for converting to sparse operation
+    block_sizes : Sequence[int]
+        Candidate block sizes when block_size is None
+    cost_model : Optional[AnalyticFormatCost]
+        Cost model of the formats when block_size is None
 
     Returns
     -------
-    ret : Namedtuple[weight_name: Array[String], weight_shape: Array[Array[IntImm]]]
-        return names of qualified dense weight and the shape in BSR format
+    ret : Namedtuple[weight_name: Array[String], weight_shape: Array[Array[IntImm]],
+                     weight_format: Array[String]]
+        return names of qualified dense weight, the shape in BSR format and the chosen
+        format, "bsr_<block_size>"
     """
 
     # pylint: disable=import-outside-toplevel
@@ -79,17 +192,27 @@ def process_params(expr, params, block_size, sparsity_threshold):
         register_task_input_buffer,
     )  # lazily import to avoid recursive dependency
 
-    memo = SparseAnalysisResult(weight_name=[], weight_shape=[])
+    memo = SparseAnalysisResult(weight_name=[], weight_shape=[], weight_format=[])
     weight_names = _search_dense_op_weight(expr)
     for name in weight_names:
         name = str(name)
         w_np = params[name].numpy()
-        sparsity = 1.0 - (np.count_nonzero(w_np) / w_np.size)
-        if sparsity >= sparsity_threshold:
-            sparse_weight = sp.bsr_matrix(w_np, blocksize=block_size)
+        if block_size is None:
+            choice = select_sparse_format(w_np, sparsity_threshold, block_sizes, cost_model)
+        else:
+            sparsity = 1.0 - (np.count_nonzero(w_np) / w_np.size)
+            choice = SparseFormatChoice(
+                "dense" if sparsity < sparsity_threshold else "bsr_{}_{}".format(*block_size),
+                block_size,
+                None,
+            )
+        if choice.name != "dense":
+            layer_block_size = choice.block_size
+            sparse_weight = sp.bsr_matrix(w_np, blocksize=layer_block_size)
             # remove dense weight
             del params[name]
             memo.weight_name.append(name)
+            memo.weight_format.append(choice.name)
             memo.weight_shape.append(
                 list(sparse_weight.data.shape)
                 + list(sparse_weight.indices.shape)
@@ -102,8 +225,8 @@ def process_params(expr, params, block_size, sparsity_threshold):
             prefix = "sparse_dense_bsr_%d_%d_%d_%d_%d_%d_" % (
                 w_np.shape[0],
                 w_np.shape[1],
-                block_size[0],
-                block_size[1],
+                layer_block_size[0],
+                layer_block_size[1],
                 sparse_weight.indices.shape[0],
                 sparse_weight.indptr.shape[0],
             )
@@ -128,5 +251,6 @@ def process_params(expr, params, block_size, sparsity_threshold):
     ret = SparseAnalysisResult(
         weight_name=tvm.runtime.convert(memo.weight_name),
         weight_shape=tvm.runtime.convert(memo.weight_shape),
+        weight_format=tvm.runtime.convert(memo.weight_format),
     )
     return ret
@@ -32,8 +32,10 @@ def convert(func, params, blocksize, sparsity_threshold):
         Expr will be optimized to sparse operation
     params : Dict[Srting, tvm.nd.array]
         Parameters of the Expr
-    blocksize : Tuple(int, int)
-        Blocksize for BSR matrix
+    blocksize : Optional[Tuple(int, int)]
+        Blocksize for BSR matrix. If None, the format and the block size
+        of every weight are chosen separately from its sparse structure,
+        see ```analysis.sparse_dense.select_sparse_format```
     sparsity_threshold : float
         Minimal sparsity requirement for converting.
         If weight sparsity is lower than this threshold,
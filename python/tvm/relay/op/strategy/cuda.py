@@ -961,6 +961,7 @@ def sparse_dense_strategy_cuda(attrs, inputs, out_type, target):
         name="sparse_dense.cuda",
         plevel=10,
     )
+    add_sparse_dense_sparse_tir_implementation(attrs, strategy, target)
     return strategy
 
 
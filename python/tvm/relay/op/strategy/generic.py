@@ -934,9 +934,21 @@ def sparse_dense_strategy(attrs, inputs, out_type, target):
         wrap_topi_schedule(topi.generic.schedule_sparse_dense),
         name="sparse_dense.generic",
     )
+    add_sparse_dense_sparse_tir_implementation(attrs, strategy, target)
     return strategy
 
 
+def add_sparse_dense_sparse_tir_implementation(attrs, strategy, target):
+    """Add the SparseTIR implementation of sparse_dense if enabled by `-libs=sparse_tir`"""
+    if "sparse_tir" in target.libs and not attrs["sparse_lhs"]:
+        strategy.add_implementation(
+            wrap_compute_sparse_dense(topi.nn.sparse_dense_sparse_tir),
+            wrap_topi_schedule(topi.generic.schedule_extern),
+            name="sparse_dense.sparse_tir",
+            plevel=15,
+        )
+
+
 @override_native_generic_func("sparse_dense_padded_strategy")
 def sparse_dense_padded_strategy(attrs, inputs, out_type, target):
     """sparse dense padded generic strategy"""
@@ -994,9 +1006,21 @@ def sparse_conv2d_strategy(attrs, inputs, out_type, target):
         wrap_topi_schedule(topi.generic.schedule_sparse_conv2d),
         name="sparse_conv2d.generic",
     )
+    add_sparse_conv2d_sparse_tir_implementation(attrs, strategy, target)
     return strategy
 
 
+def add_sparse_conv2d_sparse_tir_implementation(attrs, strategy, target):
+    """Add the SparseTIR implementation of 1x1 sparse_conv2d if enabled by `-libs=sparse_tir`"""
+    if "sparse_tir" in target.libs and attrs["kernel_size"][0] == 1:
+        strategy.add_implementation(
+            wrap_compute_sparse_conv2d(topi.nn.sparse_conv2d_sparse_tir),
+            wrap_topi_schedule(topi.generic.schedule_extern),
+            name="sparse_conv2d.sparse_tir",
+            plevel=15,
+        )
+
+
 # sort
 def wrap_compute_sort(topi_compute):
     """Wrap sort topi compute"""
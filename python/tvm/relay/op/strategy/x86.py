@@ -620,6 +620,7 @@ def sparse_dense_strategy_cpu(attrs, inputs, out_type, target):
         name="sparse_dense.x86",
         plevel=10,
     )
+    add_sparse_dense_sparse_tir_implementation(attrs, strategy, target)
     return strategy
 
 
@@ -645,6 +646,7 @@ def sparse_conv2d_strategy_cpu(attrs, inputs, out_type, target):
                 wrap_compute_sparse_conv2d(topi.x86.spconv2d_3x3_nchw),
                 wrap_topi_schedule(topi.x86.schedule_spconv2d_3x3_nchw),
             )
+    add_sparse_conv2d_sparse_tir_implementation(attrs, strategy, target)
     return strategy
 
 
@@ -16,6 +16,13 @@
 # under the License.
 # pylint: disable=invalid-name
 """Helper utility to save and load parameter dicts."""
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
 from . import _ffi_api, ndarray
 
 
@@ -67,3 +74,112 @@ def load_param_dict(param_bytes):
     if isinstance(param_bytes, (bytes, str)):
         param_bytes = bytearray(param_bytes)
     return _ffi_api.LoadParams(param_bytes)
+
+
+# "TVMPMAP" followed by the format version
+_MMAP_MAGIC = b"TVMPMAP\x01"
+
+
+def save_param_dict_mmap(params, path, alignment=4096):
+    """Save parameter dictionary to a file that `load_param_dict_mmap` maps into memory.
+
+    The file holds a JSON header followed by the data of every array, each starting at a
+    multiple of alignment bytes.
+
+    Parameters
+    ----------
+    params : dict of str to NDArray or numpy.ndarray
+        The parameter dictionary.
+
+    path : str
+        The path of the file.
+
+    alignment : int
+        The alignment of the data of every array in the file, the page size by default so that
+        pages are not shared between arrays. Must be a multiple of 64, the alignment assumed by
+        generated kernels.
+    """
+    if alignment <= 0 or alignment % 64 != 0:
+        raise ValueError("alignment must be a positive multiple of 64, but got %d" % alignment)
+    arrays = {}
+    for name, value in params.items():
+        arr = value.numpy() if isinstance(value, ndarray.NDArray) else np.asarray(value)
+        arrays[name] = np.ascontiguousarray(arr)
+    entries = []
+    offset = 0
+    for name, arr in arrays.items():
+        entries.append(
+            {
+                "name": name,
+                "dtype": arr.dtype.str,
+                "shape": list(arr.shape),
+                "offset": offset,
+                "nbytes": arr.nbytes,
+            }
+        )
+        offset += (arr.nbytes + alignment - 1) // alignment * alignment
+    header = json.dumps({"alignment": alignment, "arrays": entries}).encode("utf-8")
+    data_start = len(_MMAP_MAGIC) + 8 + len(header)
+    data_start = (data_start + alignment - 1) // alignment * alignment
+    with open(path, "wb") as f:
+        f.write(_MMAP_MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for entry, arr in zip(entries, arrays.values()):
+            f.seek(data_start + entry["offset"])
+            f.write(arr.tobytes())
+        f.truncate(data_start + offset)
+
+
+def load_param_dict_mmap(path, device=None):
+    """Load parameter dictionary from a file saved by `save_param_dict_mmap`.
+
+    The file is memory-mapped copy-on-write: the CPU NDArrays alias the mapping, their pages are
+    read on first access, and processes loading the same file share them through the page cache
+    until they are written to.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    device : Device, optional
+        The device of the result. Arrays on other devices than the CPU are copied.
+
+    Returns
+    -------
+    params : dict of str to NDArray
+        The parameter dictionary.
+    """
+    with open(path, "rb") as f:
+        if f.read(len(_MMAP_MAGIC)) != _MMAP_MAGIC:
+            raise ValueError("%s is not a file saved by save_param_dict_mmap" % path)
+        (header_len,) = struct.unpack("<Q", f.read(8))
+        header = json.loads(f.read(header_len).decode("utf-8"))
+        alignment = header["alignment"]
+        data_start = (len(_MMAP_MAGIC) + 8 + header_len + alignment - 1) // alignment * alignment
+        size = os.fstat(f.fileno()).st_size
+        # an empty mapping is not allowed, files of empty arrays only are read normally
+        mapping = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) if size > data_start else None
+    cpu = ndarray.cpu(0)
+    params = {}
+    for entry in header["arrays"]:
+        dtype = np.dtype(entry["dtype"])
+        if entry["nbytes"] == 0:
+            arr = np.empty(entry["shape"], dtype)
+        else:
+            arr = np.frombuffer(
+                mapping,
+                dtype=dtype,
+                count=entry["nbytes"] // dtype.itemsize,
+                offset=data_start + entry["offset"],
+            ).reshape(entry["shape"])
+        if hasattr(arr, "__dlpack__") and arr.size > 0:
+            # the NDArray keeps arr, and thus the mapping, alive
+            nd_arr = ndarray.from_dlpack(arr)
+        else:
+            nd_arr = ndarray.array(arr, cpu)
+        if device is not None and device.device_type != cpu.device_type:
+            nd_arr = nd_arr.copyto(device)
+        params[entry["name"]] = nd_arr
+    return params
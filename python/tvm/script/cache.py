@@ -0,0 +1,183 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Cache of the PrimFuncs parsed from TVMScript functions.
+
+A parsed function is keyed on a hash of its source, its position and the values of the Python
+variables it captures. Functions capturing values other than modules, numbers, strings and
+tuples of them are not cached, as their parsing may depend on the identity of these values.
+
+The cache lives in memory, and in the directory given by the `TVM_SCRIPT_CACHE_DIR`
+environment variable if it is set, so that the templates defined at module level are parsed
+once across processes.
+"""
+import hashlib
+import os
+import types
+from typing import Any, Dict, List, Optional
+
+import tvm
+from tvm._ffi.base import TVMError
+from tvm.tir.function import PrimFunc
+
+_MEMORY_CACHE: Dict[str, PrimFunc] = {}
+_PARSER_VERSION: Optional[str] = None
+
+
+def _parser_version() -> str:
+    """The TVM version and the modification times of the parser sources, so that a change of
+    the parser invalidates the cached functions."""
+    global _PARSER_VERSION
+    if _PARSER_VERSION is None:
+        script_dir = os.path.dirname(os.path.abspath(__file__))
+        mtimes = []
+        for directory in [script_dir, os.path.join(script_dir, "tir")]:
+            for name in sorted(os.listdir(directory)):
+                if name.endswith(".py"):
+                    mtimes.append(str(os.stat(os.path.join(directory, name)).st_mtime_ns))
+        _PARSER_VERSION = tvm.__version__ + ":" + ",".join(mtimes)
+    return _PARSER_VERSION
+
+
+def _value_key(value: Any) -> Optional[str]:
+    if isinstance(value, types.ModuleType):
+        return "module:" + value.__name__
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return type(value).__name__ + ":" + repr(value)
+    if isinstance(value, (tuple, list)):
+        keys = [_value_key(v) for v in value]
+        if None in keys:
+            return None
+        return "{}({})".format(type(value).__name__, ",".join(keys))
+    return None
+
+
+def cache_key(
+    source: str,
+    filename: str,
+    start_line: int,
+    namespace: List[str],
+    closure_vars: Dict[str, Any],
+) -> Optional[str]:
+    """The key of a TVMScript function in the cache.
+
+    Parameters
+    ----------
+    source : str
+        The source of the function.
+    filename : str
+        The file defining the function.
+    start_line : int
+        The first line of the function in the file, which the spans of the result refer to.
+    namespace : List[str]
+        The names of the tir module in the globals of the function.
+    closure_vars : Dict[str, Any]
+        The values of the nonlocal and global variables referred to by the function.
+
+    Returns
+    -------
+    Optional[str]
+        The key, None if the function cannot be cached.
+    """
+    parts = [_parser_version(), filename, str(start_line), ",".join(namespace), source]
+    for name in sorted(closure_vars):
+        value_key = _value_key(closure_vars[name])
+        if value_key is None:
+            return None
+        parts.append(name + "=" + value_key)
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _cache_path(key: str) -> Optional[str]:
+    cache_dir = os.environ.get("TVM_SCRIPT_CACHE_DIR")
+    if not cache_dir:
+        return None
+    return os.path.join(cache_dir, key + ".json")
+
+
+def lookup(key: str) -> Optional[PrimFunc]:
+    """Find a parsed function in the cache.
+
+    Parameters
+    ----------
+    key : str
+        The key returned by `cache_key`.
+
+    Returns
+    -------
+    Optional[PrimFunc]
+        The function, None if it is not cached.
+    """
+    if key in _MEMORY_CACHE:
+        return _MEMORY_CACHE[key]
+    path = _cache_path(key)
+    if path is None or not os.path.isfile(path):
+        return None
+    try:
+        with open(path) as f:
+            func = tvm.ir.load_json(f.read())
+    except (OSError, TVMError):
+        # unreadable or written by an incompatible build, parse again
+        return None
+    if not isinstance(func, PrimFunc):
+        return None
+    _MEMORY_CACHE[key] = func
+    return func
+
+
+def store(key: str, func: PrimFunc) -> None:
+    """Add a parsed function to the cache.
+
+    Parameters
+    ----------
+    key : str
+        The key returned by `cache_key`.
+    func : PrimFunc
+        The function.
+    """
+    _MEMORY_CACHE[key] = func
+    path = _cache_path(key)
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # write then rename, so that concurrent processes never read a partial file
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "w") as f:
+            f.write(tvm.ir.save_json(func))
+        os.replace(tmp_path, path)
+    except OSError:
+        pass
+
+
+def clear(disk: bool = False) -> None:
+    """Clear the cache.
+
+    Parameters
+    ----------
+    disk : bool
+        Whether to also remove the functions cached in `TVM_SCRIPT_CACHE_DIR`.
+    """
+    _MEMORY_CACHE.clear()
+    cache_dir = os.environ.get("TVM_SCRIPT_CACHE_DIR")
+    if disk and cache_dir and os.path.isdir(cache_dir):
+        for name in os.listdir(cache_dir):
+            if name.endswith(".json"):
+                os.remove(os.path.join(cache_dir, name))
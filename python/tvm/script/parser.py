@@ -35,6 +35,7 @@ from tvm.ir.function import BaseFunc
 from tvm.tir import buffer
 from tvm.tir.function import PrimFunc
 from . import _ffi_api
+from . import cache
 from . import tir
 
 from .context_maintainer import ContextMaintainer
@@ -438,6 +439,9 @@ class TVMScriptParser(Transformer):
             if len(decorators) != 1:
                 return False
             d: ast.Expr = decorators[0]
+            if isinstance(d, ast.Call):
+                # T.prim_func(lazy=True)
+                d = d.func_name
             return (
                 isinstance(d, ast.Attr)
                 and isinstance(d.object, ast.Var)
@@ -1264,13 +1268,29 @@ def from_source(
         tir_prefix = ["T", "tir"] if tir_prefix is None else tir_prefix
         return to_ast(input_func, TVMDiagnosticCtx(), TVMScriptParser(0, tir_prefix, {}))
     elif inspect.isfunction(input_func):
-        _, start_line = inspect.getsourcelines(input_func)
+        source_lines, start_line = inspect.getsourcelines(input_func)
         env: Dict[str, Any] = input_func.__globals__
-        namespace = [key for key in env.keys() if env[key] is tir]
         _closure_vars = inspect.getclosurevars(input_func)
         closure_vars = {**_closure_vars.nonlocals, **_closure_vars.globals}
+        # tir may also be imported in the function defining the script
+        namespace = [
+            key for key, value in {**env, **_closure_vars.nonlocals}.items() if value is tir
+        ]
+        key = cache.cache_key(
+            "".join(source_lines),
+            input_func.__code__.co_filename,
+            start_line,
+            namespace,
+            closure_vars,
+        )
+        if key is not None:
+            cached = cache.lookup(key)
+            if cached is not None:
+                return cached
         parser = TVMScriptParser(start_line, namespace, closure_vars)
         result = to_ast(input_func, TVMDiagnosticCtx(), parser)
+        if key is not None and isinstance(result, PrimFunc):
+            cache.store(key, result)
         return result
     else:
         raise TypeError("Only function definitions are supported.")
@@ -298,7 +298,7 @@ special_stmt - Annotations
 
 def buffer_var(dtype: str, storage_scope: str) -> Var: ...
 def func_attr(attrs: Mapping[str, Object]) -> None: ...
-def prim_func(input_func: Callable) -> PrimFunc: ...
+def prim_func(input_func: Optional[Callable] = None, lazy: bool = False) -> PrimFunc: ...
 
 """
 special_stmt - Threads and Bindings
@@ -17,29 +17,81 @@
 """TVM Script Interface for PrimFunc"""
 
 import inspect
-from typing import Callable
+from typing import Callable, Optional
 
+from tvm.runtime import ObjectGeneric
 from tvm.tir.function import PrimFunc
 from ..parser import from_source
 
 
-def prim_func(input_func: Callable) -> PrimFunc:
+class LazyPrimFunc(ObjectGeneric):
+    """A TVM script function parsed on first use.
+
+    Attributes are those of the parsed PrimFunc, and it is converted to the PrimFunc when
+    passed to TVM functions, e.g. ``IRModule.from_expr``. Use `func` where a PrimFunc instance
+    is required, e.g. by ``isinstance``.
+
+    Parameters
+    ----------
+    input_func : Callable
+        The function to be parsed.
+    """
+
+    def __init__(self, input_func: Callable) -> None:
+        self._input_func = input_func
+        self._func: Optional[PrimFunc] = None
+        self.__name__ = input_func.__name__
+        self.__qualname__ = input_func.__qualname__
+
+    @property
+    def func(self) -> PrimFunc:
+        """The parsed function."""
+        if self._func is None:
+            self._func = _parse(self._input_func)
+        return self._func
+
+    def asobject(self) -> PrimFunc:
+        return self.func
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.func, name)
+
+    def __repr__(self) -> str:
+        if self._func is None:
+            return "LazyPrimFunc({})".format(self.__qualname__)
+        return repr(self._func)
+
+
+def _parse(input_func: Callable) -> PrimFunc:
+    result = from_source(input_func)
+    result.__name__ = input_func.__name__
+    result.__qualname__ = input_func.__qualname__
+    return result
+
+
+def prim_func(input_func: Optional[Callable] = None, lazy: bool = False):
     """Decorate a python function as tvm script.
 
     Parameters
     ----------
     func : input_func
         The function to be parsed.
+    lazy : bool
+        Whether to parse the function on first use instead of now, e.g. for templates defined
+        at module level that are only specialized later. Use as ``@T.prim_func(lazy=True)``.
 
     Returns
     -------
-    output : PrimFunc
+    output : Union[PrimFunc, LazyPrimFunc]
         The result functions.
     """
+    if input_func is None:
+        return lambda func: prim_func(func, lazy)
     if inspect.isfunction(input_func):
-        result = from_source(input_func)
-        result.__name__ = input_func.__name__
-        result.__qualname__ = input_func.__qualname__
-        return result
+        if lazy:
+            return LazyPrimFunc(input_func)
+        return _parse(input_func)
 
     raise TypeError("Only function definitions are supported.")
@@ -18,5 +18,41 @@
 """Python-interface for Sparse-TIR"""
 
 from .lower import lower_sparse_iter, lower_sparse_buffer
-from .format import FormatRewriteRule, column_part_hyb, condense, format_decompose, csf_to_ell3d
+from .format import (
+    FormatRewriteRule,
+    bind_instances,
+    column_part_hyb,
+    condense,
+    format_decompose,
+    format_instances,
+    launch_instances,
+    csf_to_ell3d,
+    tile_unique_columns,
+)
 from .specialize import specialize_buffer
+from .profiling import SparseProfiler, ir_node_count, profile
+from .transpose import csr_transpose
+from .batch import GraphBatch, batched_csrmm, batched_ellmm, batched_sddmm, horizontal_fuse
+from .packing import PackedLayout, pack_params, rule_param_names, specialize_params
+from .bundle import SparseKernelBundle, export_bundle, load_bundle
+from .reduction import BucketContention, ReductionPlan, bucket_contention, plan_reduction
+from .quantize import (
+    bfloat16_to_float,
+    dequantize_values,
+    float_to_bfloat16,
+    quantize_sparse_buffer,
+    quantize_values,
+)
+from .nm import NMSparseMatrix
+from .interop import as_ndarray, from_dgl_graph, from_scipy, from_torch_sparse
+from .format_search import (
+    AnalyticFormatCost,
+    FormatCandidate,
+    FormatSearchResult,
+    SparseStructure,
+    bsr_rule,
+    dbsr_rule,
+    default_candidates,
+    ell_rule,
+    search_format,
+)
@@ -0,0 +1,412 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Batches of small sparse matrices, processed by a single kernel.
+
+The graphs of a batch are concatenated: rows, columns and non-zeros of graph `b` start at
+`row_indptr[b]`, `col_indptr[b]` and `indptr[row_indptr[b]]`, and the column indices stay local
+to their graph. In the kernels the batch is a `dense_fixed` axis `B`, the rows a
+`dense_variable` axis under `B` and the columns a `sparse_variable` axis under the rows, or a
+`sparse_fixed` axis for the ELL layout of `GraphBatch.to_ell`. Fusing `B` with the rows with
+`sparse_fuse` gives a single loop over the rows of all graphs.
+
+Batches stored in different layouts, e.g. the graphs of regular degree in ELL and the others in
+CSR, are combined by `horizontal_fuse`, whose kernels run in a single launch on GPUs.
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import tvm
+from tvm.runtime import NDArray
+from tvm.script import tir as T
+from tvm.tir import PrimFunc
+
+
+@T.prim_func(lazy=True)
+def batched_csrmm(
+    a: T.handle,
+    x: T.handle,
+    y: T.handle,
+    row_indptr: T.handle,
+    col_indptr: T.handle,
+    indptr: T.handle,
+    indices: T.handle,
+    batch_size: T.int32,
+    max_rows: T.int32,
+    max_cols: T.int32,
+    num_rows: T.int32,
+    num_cols: T.int32,
+    nnz: T.int32,
+    feat_size: T.int32,
+) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+    B = T.dense_fixed(batch_size)
+    I = T.dense_variable(B, (max_rows, num_rows), row_indptr, "int32")
+    J = T.sparse_variable(I, (max_cols, nnz), (indptr, indices), "int32")
+    J_detach = T.dense_variable(B, (max_cols, num_cols), col_indptr, "int32")
+    K = T.dense_fixed(feat_size)
+    A = T.match_sparse_buffer(a, (B, I, J), "float32")
+    X = T.match_sparse_buffer(x, (B, J_detach, K), "float32")
+    Y = T.match_sparse_buffer(y, (B, I, K), "float32")
+    with T.sp_iter([B, I, J, K], "SSRS", "batched_csrmm") as [b, i, j, k]:
+        with T.init():
+            Y[b, i, k] = 0.0
+        Y[b, i, k] = Y[b, i, k] + A[b, i, j] * X[b, j, k]
+
+
+@T.prim_func(lazy=True)
+def batched_sddmm(
+    x: T.handle,
+    y: T.handle,
+    z: T.handle,
+    row_indptr: T.handle,
+    col_indptr: T.handle,
+    indptr: T.handle,
+    indices: T.handle,
+    batch_size: T.int32,
+    max_rows: T.int32,
+    max_cols: T.int32,
+    num_rows: T.int32,
+    num_cols: T.int32,
+    nnz: T.int32,
+    feat_size: T.int32,
+) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+    B = T.dense_fixed(batch_size)
+    I = T.dense_variable(B, (max_rows, num_rows), row_indptr, "int32")
+    J = T.sparse_variable(I, (max_cols, nnz), (indptr, indices), "int32")
+    J_detach = T.dense_variable(B, (max_cols, num_cols), col_indptr, "int32")
+    K = T.dense_fixed(feat_size)
+    X = T.match_sparse_buffer(x, (B, I, K), "float32")
+    Y = T.match_sparse_buffer(y, (B, J_detach, K), "float32")
+    Z = T.match_sparse_buffer(z, (B, I, J), "float32")
+    with T.sp_iter([B, I, J, K], "SSSR", "batched_sddmm") as [b, i, j, k]:
+        with T.init():
+            Z[b, i, j] = 0.0
+        Z[b, i, j] = Z[b, i, j] + X[b, i, k] * Y[b, j, k]
+
+
+@T.prim_func(lazy=True)
+def batched_ellmm(
+    a: T.handle,
+    x: T.handle,
+    y: T.handle,
+    row_indptr: T.handle,
+    col_indptr: T.handle,
+    indices: T.handle,
+    batch_size: T.int32,
+    max_rows: T.int32,
+    max_cols: T.int32,
+    num_rows: T.int32,
+    num_cols: T.int32,
+    nnz_cols: T.int32,
+    feat_size: T.int32,
+) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+    B = T.dense_fixed(batch_size)
+    I = T.dense_variable(B, (max_rows, num_rows), row_indptr, "int32")
+    J = T.sparse_fixed(I, (max_cols, nnz_cols), indices, "int32")
+    J_detach = T.dense_variable(B, (max_cols, num_cols), col_indptr, "int32")
+    K = T.dense_fixed(feat_size)
+    A = T.match_sparse_buffer(a, (B, I, J), "float32")
+    X = T.match_sparse_buffer(x, (B, J_detach, K), "float32")
+    Y = T.match_sparse_buffer(y, (B, I, K), "float32")
+    with T.sp_iter([B, I, J, K], "SSRS", "batched_ellmm") as [b, i, j, k]:
+        with T.init():
+            Y[b, i, k] = 0.0
+        Y[b, i, k] = Y[b, i, k] + A[b, i, j] * X[b, j, k]
+
+
+def horizontal_fuse(funcs: Sequence[PrimFunc]) -> PrimFunc:
+    """Combine batched kernels into a single function, e.g. `batched_ellmm` on the graphs of a
+    minibatch with regular degrees and `batched_csrmm` on the others.
+
+    The function carries the "horizontal_fuse" attribute, so that once the outer loop of every
+    sparse iteration is bound to blockIdx.x, `HorizontalFusion` concatenates the thread blocks of
+    all the kernels into one launch. On CPUs the kernels run one after the other.
+
+    Parameters
+    ----------
+    funcs : Sequence[PrimFunc]
+        The stage-I kernels, e.g. specialized by `GraphBatch.specialize`.
+
+    Returns
+    -------
+    PrimFunc
+        The function, whose parameters are those of the kernels in order. The sparse iterations
+        whose name is already used by a previous kernel are suffixed with `_<k>`, k being the
+        position of their kernel.
+    """
+    if not funcs:
+        raise ValueError("Expected at least one function")
+    params, buffer_map, sp_axes, bodies, alloc_buffers, buf_doms = [], {}, [], [], [], []
+    names = set()
+    for k, func in enumerate(funcs):
+        if not isinstance(func.body, tvm.tir.BlockRealize):
+            raise ValueError("Expected a stage-I function with a root block, got {}".format(func))
+        if any(param in params for param in func.params):
+            # e.g. the same kernel specialized to two batches, whose variables must be distinct
+            func = tvm.ir.load_json(tvm.ir.save_json(func))
+        root = func.body.block
+
+        def _rename(op, k=k):
+            if op.name not in names:
+                return None
+            return tvm.tir.SparseIteration(
+                op.sp_iter_vars, "{}_{}".format(op.name, k), op.body, op.init, op.annotations
+            )
+
+        body = tvm.tir.stmt_functor.ir_transform(root.body, None, _rename, ["tir.SparseIteration"])
+        tvm.tir.stmt_functor.post_order_visit(
+            body,
+            lambda op: names.add(op.name) if isinstance(op, tvm.tir.SparseIteration) else None,
+        )
+        params += list(func.params)
+        buffer_map.update({param: func.buffer_map[param] for param in func.buffer_map})
+        sp_axes += list(func.sp_axes)
+        bodies.append(body)
+        alloc_buffers += list(root.alloc_buffers)
+        buf_doms += list(root.buf_doms)
+    root = tvm.tir.Block(
+        [],
+        [],
+        [],
+        "root",
+        tvm.tir.SeqStmt(bodies),
+        alloc_buffers=alloc_buffers,
+        buf_doms=buf_doms,
+    )
+    func = PrimFunc(
+        params,
+        tvm.tir.BlockRealize([], True, root),
+        buffer_map=buffer_map,
+        sp_axes=sp_axes,
+        attrs=funcs[0].attrs,
+    )
+    return func.with_attr("horizontal_fuse", 1)
+
+
+def _to_numpy(arr) -> np.ndarray:
+    if isinstance(arr, NDArray):
+        return arr.numpy()
+    return np.asarray(arr)
+
+
+class GraphBatch:
+    """A batch of sparse matrices in CSR, laid out for `batched_csrmm` and `batched_sddmm`, and
+    for `batched_ellmm` through `to_ell`.
+
+    Parameters
+    ----------
+    row_indptr : np.ndarray
+        The offset of the first row of every matrix, of shape (batch_size + 1,).
+    col_indptr : np.ndarray
+        The offset of the first column of every matrix, of shape (batch_size + 1,).
+    indptr : np.ndarray
+        The indptr array of the concatenated rows, of shape (num_rows + 1,).
+    indices : np.ndarray
+        The column indices, local to the matrix of their row.
+    data : np.ndarray
+        The values of the non-zeros.
+    """
+
+    def __init__(
+        self,
+        row_indptr: np.ndarray,
+        col_indptr: np.ndarray,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        data: np.ndarray,
+    ) -> None:
+        if len(row_indptr) != len(col_indptr):
+            raise ValueError("row_indptr and col_indptr have different lengths")
+        if len(indptr) != row_indptr[-1] + 1 or len(indices) != indptr[-1]:
+            raise ValueError("indptr and indices do not match row_indptr")
+        self.row_indptr = row_indptr
+        self.col_indptr = col_indptr
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @staticmethod
+    def from_csr(mats: Sequence, idtype: str = "int32") -> "GraphBatch":
+        """Batch CSR matrices.
+
+        Parameters
+        ----------
+        mats : Sequence[Union[scipy.sparse.csr_matrix, Tuple[indptr, indices, data, num_cols]]]
+            The matrices.
+        idtype : str
+            The dtype of the index arrays.
+
+        Returns
+        -------
+        GraphBatch
+            The batch.
+        """
+        indptrs, indices, data, num_cols = [], [], [], []
+        for mat in mats:
+            if isinstance(mat, tuple):
+                mat_indptr, mat_indices, mat_data, mat_num_cols = mat
+            else:
+                mat_indptr, mat_indices, mat_data = mat.indptr, mat.indices, mat.data
+                mat_num_cols = mat.shape[1]
+            mat_indptr = _to_numpy(mat_indptr).astype("int64")
+            indptrs.append(mat_indptr)
+            indices.append(_to_numpy(mat_indices)[: mat_indptr[-1]])
+            data.append(_to_numpy(mat_data)[: mat_indptr[-1]])
+            num_cols.append(mat_num_cols)
+        if not indptrs:
+            raise ValueError("Expected at least one matrix")
+        row_indptr = np.cumsum([0] + [len(mat_indptr) - 1 for mat_indptr in indptrs])
+        col_indptr = np.cumsum([0] + num_cols)
+        nnz_offsets = np.cumsum([0] + [mat_indptr[-1] for mat_indptr in indptrs])
+        indptr = np.concatenate(
+            [mat_indptr[:-1] + offset for mat_indptr, offset in zip(indptrs, nnz_offsets)]
+            + [nnz_offsets[-1:]]
+        )
+        return GraphBatch(
+            row_indptr.astype(idtype),
+            col_indptr.astype(idtype),
+            indptr.astype(idtype),
+            np.concatenate(indices).astype(idtype),
+            np.concatenate(data),
+        )
+
+    @property
+    def batch_size(self) -> int:
+        """The number of matrices."""
+        return len(self.row_indptr) - 1
+
+    @property
+    def num_rows(self) -> int:
+        """The total number of rows."""
+        return int(self.row_indptr[-1])
+
+    @property
+    def num_cols(self) -> int:
+        """The total number of columns."""
+        return int(self.col_indptr[-1])
+
+    @property
+    def nnz(self) -> int:
+        """The total number of non-zeros."""
+        return int(self.indptr[-1])
+
+    @property
+    def max_row_nnz(self) -> int:
+        """The largest number of non-zeros of a row."""
+        return int(np.diff(self.indptr).max(initial=0))
+
+    def shape_params(self, feat_size: int, ell_width: Optional[int] = None) -> Dict[str, int]:
+        """The values of the shape parameters of the batched kernels, by name. The width of the
+        ELL layout defaults to `max_row_nnz`."""
+        return {
+            "batch_size": self.batch_size,
+            "max_rows": int(np.diff(self.row_indptr).max(initial=0)),
+            "max_cols": int(np.diff(self.col_indptr).max(initial=0)),
+            "num_rows": self.num_rows,
+            "num_cols": self.num_cols,
+            "nnz": self.nnz,
+            "nnz_cols": self.max_row_nnz if ell_width is None else ell_width,
+            "feat_size": feat_size,
+        }
+
+    def specialize(
+        self, func: PrimFunc, feat_size: int, ell_width: Optional[int] = None
+    ) -> PrimFunc:
+        """Specialize the shape parameters of a batched kernel to this batch.
+
+        Parameters
+        ----------
+        func : PrimFunc
+            `batched_csrmm`, `batched_sddmm`, `batched_ellmm` or a kernel with parameters of the
+            same names.
+        feat_size : int
+            The feature size.
+        ell_width : Optional[int]
+            The width of the ELL layout, `max_row_nnz` if None.
+
+        Returns
+        -------
+        PrimFunc
+            The specialized kernel.
+        """
+        values = self.shape_params(feat_size, ell_width)
+        return func.specialize(
+            {param: values[param.name] for param in func.params if param.name in values}
+        )
+
+    def to_ell(self, width: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """The column indices and values of the batch in the ELL layout of `batched_ellmm`,
+        every row padded to `width` non-zeros.
+
+        The padding repeats the last column index of the row, or column 0 of the matrix for
+        empty rows, with a value of zero, so the indices of a row stay sorted.
+
+        Parameters
+        ----------
+        width : Optional[int]
+            The number of non-zeros of every row, `max_row_nnz` if None.
+
+        Returns
+        -------
+        Tuple[np.ndarray, np.ndarray]
+            The indices and the values, both of shape (num_rows * width,).
+        """
+        width = self.max_row_nnz if width is None else width
+        row_nnz = np.diff(self.indptr.astype("int64"))
+        if row_nnz.max(initial=0) > width:
+            raise ValueError(
+                "A row has {} non-zeros, more than the ELL width {}".format(
+                    row_nnz.max(), width
+                )
+            )
+        num_cols = np.diff(self.col_indptr.astype("int64"))
+        num_rows = np.diff(self.row_indptr.astype("int64"))
+        if width > 0 and np.any((num_cols == 0) & (num_rows > 0)):
+            raise ValueError("Cannot pad the rows of a matrix without columns")
+        # position of every slot in the non-zeros of its row, clamped to the last one
+        slot = np.arange(width)[None, :]
+        pos = self.indptr[:-1].astype("int64")[:, None] + np.minimum(slot, row_nnz[:, None] - 1)
+        pos = np.maximum(pos, 0)
+        if self.nnz > 0:
+            indices = np.where(row_nnz[:, None] > 0, self.indices[pos], 0)
+            data = np.where(slot < row_nnz[:, None], self.data[pos], 0)
+        else:
+            indices, data = np.zeros(pos.shape, "int64"), np.zeros(pos.shape, "float32")
+        return (
+            indices.reshape(-1).astype(self.indices.dtype),
+            data.reshape(-1).astype(self.data.dtype),
+        )
+
+    def split_rows(self, arr) -> List[np.ndarray]:
+        """Split an array over the concatenated rows, e.g. the output of `batched_csrmm`, into
+        the arrays of the matrices."""
+        return np.split(_to_numpy(arr), self.row_indptr[1:-1].astype("int64"))
+
+    def split_nnz(self, arr) -> List[np.ndarray]:
+        """Split an array over the non-zeros, e.g. the output of `batched_sddmm`, into the
+        arrays of the matrices."""
+        offsets = self.indptr[self.row_indptr.astype("int64")]
+        return np.split(_to_numpy(arr), offsets[1:-1].astype("int64"))
+
+    def __repr__(self) -> str:
+        return "GraphBatch(batch_size={}, num_rows={}, nnz={})".format(
+            self.batch_size, self.num_rows, self.nnz
+        )
@@ -0,0 +1,311 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Bundles of a compiled sparse kernel and the format arrays it is called with.
+
+A bundle is a directory holding the exported library of the kernel, the arrays bound to its
+parameters, e.g. the outputs of `column_part_hyb`, in a file saved by
+`tvm.runtime.save_param_dict_mmap`, and a `manifest.json` recording the order of the
+parameters, which of them are bound and the metadata of the format. Loading a bundle
+memory-maps the arrays, so that on the CPU the kernel reads them from the page cache without
+any copy or conversion.
+
+Example
+-------
+.. code-block:: python
+
+    f = tvm.build(packed, target="llvm")
+    export_bundle("spmm_hyb", f, packed, arrays, layout=layout, metadata={"buckets": buckets})
+
+    # in the serving process
+    kernel = load_bundle("spmm_hyb")
+    kernel(x, y)  # the parameters that are not bound, in order
+"""
+import json
+import os
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+import tvm
+from tvm.runtime import Device, Module, NDArray, load_module
+from tvm.runtime.params import load_param_dict_mmap, save_param_dict_mmap
+from tvm.tir import IntImm, PrimFunc
+
+from .interop import as_ndarray
+from .packing import PackedLayout
+from .profiling import profiled
+
+_VERSION = 2
+_MANIFEST = "manifest.json"
+_LIBRARY = "kernel.so"
+_ARRAYS = "arrays.params"
+
+
+def _param_specs(func: Union[PrimFunc, Sequence[str]]) -> List[Dict[str, Any]]:
+    """The name of every parameter and the dtype and constant shape of its buffer, if known."""
+    if not isinstance(func, PrimFunc):
+        return [{"name": name} for name in func]
+    specs = []
+    for param in func.params:
+        spec: Dict[str, Any] = {"name": param.name}
+        if param in func.buffer_map:
+            buf = func.buffer_map[param]
+            spec["dtype"] = buf.dtype
+            if all(isinstance(extent, IntImm) for extent in buf.shape):
+                spec["shape"] = [int(extent) for extent in buf.shape]
+        else:
+            spec["dtype"] = param.dtype
+        specs.append(spec)
+    return specs
+
+
+def export_bundle(
+    path: str,
+    rt_mod: Module,
+    func: Union[PrimFunc, Sequence[str]],
+    arrays: Dict[str, Any],
+    layout: Optional[PackedLayout] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+    device_type: str = "cpu",
+    entry: Optional[str] = None,
+) -> None:
+    """Export a compiled kernel and the arrays bound to its parameters as a bundle.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the bundle, created if it does not exist.
+    rt_mod : Module
+        The compiled kernel, e.g. returned by `tvm.build`.
+    func : Union[PrimFunc, Sequence[str]]
+        The kernel before compilation, or the names of its parameters in order. With the
+        PrimFunc, the dtypes and shapes of the arguments are checked when the bundle is called.
+    arrays : Dict[str, Union[NDArray, np.ndarray, torch.Tensor, int, float]]
+        The arrays, or the values of the scalar parameters, bound to the parameters, by name.
+        The other parameters are the arguments of the loaded kernel.
+    layout : Optional[PackedLayout]
+        The layout returned by `pack_params` if the kernel is packed. `arrays` then holds the
+        arrays of the parameters before packing, which are packed at export.
+    metadata : Optional[Dict[str, Any]]
+        JSON-serializable metadata of the format, e.g. the buckets of a HYB format.
+    device_type : str
+        The device the kernel runs on, e.g. "cpu" or "cuda".
+    entry : Optional[str]
+        The function of the module to call, the entry function of the module if None.
+    """
+    specs = _param_specs(func)
+    names = [spec["name"] for spec in specs]
+    bound = dict(arrays)
+    if layout is not None:
+        if names != layout.param_names:
+            raise ValueError(
+                "The parameters {} do not match the packed layout {}".format(
+                    names, layout.param_names
+                )
+            )
+        packed = layout.pack({name: bound.pop(name) for name in layout.segments if name in bound})
+        bound.update(packed)
+    unknown = [name for name in bound if name not in names]
+    if unknown:
+        raise KeyError("Unknown parameters {} of {}".format(unknown, names))
+
+    os.makedirs(path, exist_ok=True)
+    rt_mod.export_library(os.path.join(path, _LIBRARY))
+    bound_arrays = {}
+    for spec in specs:
+        name = spec["name"]
+        if name not in bound:
+            spec["kind"] = "input"
+            continue
+        value = bound[name]
+        if isinstance(value, (int, float, np.integer, np.floating)):
+            spec["kind"] = "scalar"
+            spec["value"] = value.item() if isinstance(value, np.generic) else value
+            continue
+        arr = value if isinstance(value, np.ndarray) else as_ndarray(value).numpy()
+        if "dtype" in spec and arr.dtype != np.dtype(spec["dtype"]):
+            raise ValueError(
+                "Expected dtype {} for parameter {}, but got {}".format(
+                    spec["dtype"], name, arr.dtype
+                )
+            )
+        spec["kind"] = "array"
+        bound_arrays[name] = arr
+    save_param_dict_mmap(bound_arrays, os.path.join(path, _ARRAYS))
+
+    manifest = {
+        "version": _VERSION,
+        "library": _LIBRARY,
+        "arrays": _ARRAYS,
+        "entry": entry,
+        "device_type": device_type,
+        "params": specs,
+        "metadata": metadata if metadata is not None else {},
+    }
+    # the manifest is written last, so that an interrupted export is not a valid bundle
+    tmp_path = os.path.join(path, _MANIFEST + ".tmp")
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, os.path.join(path, _MANIFEST))
+
+
+class SparseKernelBundle:
+    """A kernel loaded from a bundle, with its bound arguments ready on the device.
+
+    Use :py:func:`tvm.sparse.load_bundle` to create one.
+
+    Parameters
+    ----------
+    module : Module
+        The loaded library.
+    func : PackedFunc
+        The kernel.
+    device : Device
+        The device of the arguments.
+    params : List[Dict[str, Any]]
+        The parameters recorded in the manifest.
+    args : List[Any]
+        The arguments, None for the parameters that are inputs.
+    metadata : Dict[str, Any]
+        The metadata of the format.
+    """
+
+    def __init__(
+        self,
+        module: Module,
+        func,
+        device: Device,
+        params: List[Dict[str, Any]],
+        args: List[Any],
+        metadata: Dict[str, Any],
+    ) -> None:
+        self.module = module
+        self.func = func
+        self.device = device
+        self.params = params
+        self.metadata = metadata
+        self._args = args
+        self._input_positions = [i for i, spec in enumerate(params) if spec["kind"] == "input"]
+
+    @property
+    def input_names(self) -> List[str]:
+        """The names of the parameters passed on every call, in order."""
+        return [self.params[i]["name"] for i in self._input_positions]
+
+    @property
+    def arrays(self) -> Dict[str, NDArray]:
+        """The arrays bound to the parameters, by name."""
+        return {
+            spec["name"]: arg
+            for spec, arg in zip(self.params, self._args)
+            if spec["kind"] == "array"
+        }
+
+    def make_args(self, *inputs, **named_inputs) -> List[Any]:
+        """The arguments of the kernel, in order.
+
+        Parameters
+        ----------
+        inputs : Union[NDArray, np.ndarray, torch.Tensor]
+            The arrays of the input parameters, in the order of `input_names`.
+        named_inputs : Union[NDArray, np.ndarray, torch.Tensor]
+            The arrays of the input parameters, by name.
+
+        Returns
+        -------
+        List[Any]
+            The arguments.
+        """
+        if len(inputs) + len(named_inputs) != len(self._input_positions):
+            raise ValueError(
+                "Expected the inputs {}, but got {} arrays".format(
+                    self.input_names, len(inputs) + len(named_inputs)
+                )
+            )
+        args = list(self._args)
+        remaining = iter(inputs)
+        for pos in self._input_positions:
+            spec = self.params[pos]
+            if spec["name"] in named_inputs:
+                arr = named_inputs[spec["name"]]
+            else:
+                try:
+                    arr = next(remaining)
+                except StopIteration:
+                    raise KeyError("Missing input {}".format(spec["name"])) from None
+            if isinstance(arr, (int, float, np.generic)):
+                args[pos] = arr
+                continue
+            arr = as_ndarray(arr, device=self.device)
+            if arr.dtype != spec.get("dtype", arr.dtype) or list(arr.shape) != spec.get(
+                "shape", list(arr.shape)
+            ):
+                raise ValueError(
+                    "Expected a {} array of shape {} for input {}, but got {} {}".format(
+                        spec.get("dtype"), spec.get("shape"), spec["name"], arr.dtype, arr.shape
+                    )
+                )
+            args[pos] = arr
+        return args
+
+    def __call__(self, *inputs, **named_inputs):
+        return self.func(*self.make_args(*inputs, **named_inputs))
+
+    def __repr__(self) -> str:
+        return "SparseKernelBundle(inputs={}, device={})".format(self.input_names, self.device)
+
+
+@profiled("load_bundle")
+def load_bundle(path: str, device: Optional[Device] = None) -> SparseKernelBundle:
+    """Load a bundle exported by `export_bundle`.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the bundle.
+    device : Optional[Device]
+        The device to run the kernel on, the first device of the type recorded at export if
+        None.
+
+    Returns
+    -------
+    SparseKernelBundle
+        The kernel, to be called with the arrays of the parameters that are not bound.
+    """
+    manifest_path = os.path.join(path, _MANIFEST)
+    if not os.path.isfile(manifest_path):
+        raise ValueError("{} is not a sparse kernel bundle".format(path))
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    if manifest.get("version") != _VERSION:
+        raise ValueError(
+            "Unsupported bundle version {}, expected {}".format(manifest.get("version"), _VERSION)
+        )
+    device = device if device is not None else tvm.device(manifest["device_type"], 0)
+    module = load_module(os.path.join(path, manifest["library"]))
+    func = module[manifest["entry"]] if manifest["entry"] else module.entry_func
+
+    arrays = load_param_dict_mmap(os.path.join(path, manifest["arrays"]), device)
+    args: List[Any] = []
+    for spec in manifest["params"]:
+        if spec["kind"] == "array":
+            args.append(arrays[spec["name"]])
+        elif spec["kind"] == "scalar":
+            args.append(spec["value"])
+        else:
+            args.append(None)
+    return SparseKernelBundle(module, func, device, manifest["params"], args, manifest["metadata"])
@@ -16,15 +16,20 @@
 # under the License.
 
 """Format module for sparse tensor algebra."""
-from typing import Callable, Dict, List, Union
+import functools
+from typing import Any, Callable, Dict, List, Sequence, Union
+
+import numpy as np
 import tvm._ffi
 import tvm.tir
 
-from tvm.runtime import Object
+from tvm.runtime import NDArray, Object
 from tvm.tir import IndexMap, _ffi_api
 from tvm import IRModule
 from tvm.tir.transform import SparseFormatDecompose
 
+from .profiling import profiled
+
 
 @tvm._ffi.register_object("tir.sparse.FormatRewriteRule")
 class FormatRewriteRule(Object):
@@ -86,6 +91,7 @@ class FormatRewriteRule(Object):
         )  # type: ignore
 
 
+@profiled("column_part_hyb")
 def column_part_hyb(num_rows, num_cols, indptr_nd, indices_nd, num_col_parts, buckets):
     """Partition input CSR matrix by columns and collect rows into buckets according to non zero elements per row.
 
@@ -116,6 +122,7 @@ def column_part_hyb(num_rows, num_cols, indptr_nd, indices_nd, num_col_parts, bu
     )
 
 
+@profiled("condense")
 def condense(indptr_nd, indices_nd, t, g):
     """Condense sparse matrix in CSR format to (t x 1) tiles, and group g tiles together.
 
@@ -139,6 +146,46 @@ def condense(indptr_nd, indices_nd, t, g):
     return _ffi_api.ConDense(indptr_nd, indices_nd, t, g)  # type: ignore
 
 
+@profiled("tile_unique_columns")
+def tile_unique_columns(indptr_nd, indices_nd, tile_size: int):
+    """The unique column ids of every tile of rows of a CSR matrix, and the slot of the column
+    id of every non-zero among those of its tile, for the caches of `sparse_cache_read`.
+
+    Parameters
+    ----------
+    indptr : NDArray
+        The indptr array of CSR format.
+    indices : NDArray
+        The indices array of CSR format.
+    tile_size : int
+        The number of rows of a tile.
+
+    Returns
+    -------
+    Tuple[NDArray, NDArray]
+        The pair of (cols, slot). cols has shape (num_tiles, width), where width is the largest
+        number of unique column ids of a tile, and is padded with the first column id of the
+        tile. slot has the shape of indices.
+    """
+    if tile_size <= 0:
+        raise ValueError("Expected a positive tile size, but got {}".format(tile_size))
+    indptr = indptr_nd.numpy()
+    indices = indices_nd.numpy()
+    num_rows = indptr.shape[0] - 1
+    bounds = indptr[np.minimum(np.arange(0, num_rows + tile_size, tile_size), num_rows)]
+    tiles = [np.unique(indices[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+    width = max([len(cols) for cols in tiles] + [1])
+    cols = np.zeros((len(tiles), width), indices.dtype)
+    slot = np.zeros_like(indices)
+    for tile_id, (start, end) in enumerate(zip(bounds[:-1], bounds[1:])):
+        if end > start:
+            cols[tile_id] = tiles[tile_id][0]
+            cols[tile_id, : len(tiles[tile_id])] = tiles[tile_id]
+            slot[start:end] = np.searchsorted(tiles[tile_id], indices[start:end])
+    return tvm.nd.array(cols), tvm.nd.array(slot)
+
+
+@profiled("csf_to_ell3d")
 def csf_to_ell3d(
     csf_indptr_0, csf_indices_0, csf_indptr_1, csf_indices_1, nnz_rows_bkt, nnz_cols_bkt
 ):
@@ -170,10 +217,12 @@ def csf_to_ell3d(
     )
 
 
+@profiled("format_decompose")
 def format_decompose(
     mod: IRModule,
     composable_formats: List["FormatRewriteRule"],
     include_format_rewrite_blks: bool = True,
+    parametric: bool = False,
 ):
     """Rewrite the sparse format of sparse buffers in the TIR scripts.
 
@@ -185,7 +234,168 @@ def format_decompose(
         Composable formats is a list of rewrite rules.
     include_format_rewrite_blks : bool
         Whether to include format rewrite blocks in the output.
+    parametric : bool
+        Whether rules that only differ in their names, e.g. the ELL buckets of several column
+        partitions, or ELL buckets whose `nnz_cols` is left as a parameter of the format
+        description, are instances of one template. Only the first rule of a template is
+        decomposed, and the resulting kernel is launched once per instance, with the parameters
+        suffixed by the template name bound to the arrays of the instance. The IR size and
+        compile time then grow with the number of templates instead of rules.
+        See :py:func:`format_instances` and :py:func:`launch_instances`.
     """
     if not isinstance(mod, IRModule):
         raise TypeError("Expected IRModule, but got {}".format(type(mod)))
-    return SparseFormatDecompose(composable_formats, include_format_rewrite_blks)(mod)
+    return SparseFormatDecompose(composable_formats, include_format_rewrite_blks, parametric)(mod)
+
+
+def format_instances(func: tvm.tir.PrimFunc) -> Dict[str, List[str]]:
+    """The names of the rules sharing every template of a function decomposed by
+    `format_decompose` in parametric mode.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The function.
+
+    Returns
+    -------
+    Dict[str, List[str]]
+        The names of the rules of every template, by the name of the template, which is the name
+        of its first rule.
+    """
+    if func.attrs is None or "format_instances" not in func.attrs:
+        raise ValueError("The function is not decomposed in parametric mode")
+    return {
+        str(name): [str(rule) for rule in rules]
+        for name, rules in func.attrs["format_instances"].items()
+    }
+
+
+def bind_instances(func: tvm.tir.PrimFunc, arrays: Dict[str, Any]) -> List[List[Any]]:
+    """The arguments of every launch of a function decomposed by `format_decompose` in
+    parametric mode.
+
+    The k-th launch binds the parameters suffixed by the name of every template to the arrays
+    and values suffixed by the name of its k-th instance, e.g. `indices_i_0_0` to
+    `arrays["indices_i_1_0"]` for the instance "1_0" of the template "0_0". The other parameters
+    are bound to `arrays[name]` in every launch.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The function, e.g. after `lower_sparse_buffer`.
+    arrays : Dict[str, Any]
+        The arrays and scalar values by parameter name, as for the function decomposed without
+        the parametric mode.
+
+    Returns
+    -------
+    List[List[Any]]
+        The arguments of every launch, in the order of the parameters.
+    """
+    instances = format_instances(func)
+    num_launches = {len(rules) for rules in instances.values()}
+    if len(num_launches) != 1:
+        raise ValueError(
+            "Expected the same number of instances for every template, but got {}".format(
+                {name: len(rules) for name, rules in instances.items()}
+            )
+        )
+    # a parameter is suffixed by the longest template name it ends with
+    templates = sorted(instances, key=len, reverse=True)
+    launches = []
+    for launch_id in range(num_launches.pop()):
+        args = []
+        for param in func.params:
+            name = param.name
+            for template in templates:
+                if name.endswith("_" + template):
+                    name = name[: -len(template)] + instances[template][launch_id]
+                    break
+            if name not in arrays:
+                raise KeyError("No array or value of parameter {}".format(name))
+            args.append(arrays[name])
+        launches.append(args)
+    return launches
+
+
+@functools.lru_cache(maxsize=None)
+def _accumulate_func(dtype: str, device_type: int) -> tvm.runtime.Module:
+    """The kernel adding a flat array `b` of length `n` into `a` and zeroing `b`, built once per
+    dtype and device type."""
+    from tvm.script import tir as T  # pylint: disable=import-outside-toplevel
+
+    @T.prim_func
+    def accumulate(a: T.handle, b: T.handle, n: T.int32) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True})
+        A = T.match_buffer(a, [n], dtype=dtype)
+        B = T.match_buffer(b, [n], dtype=dtype)
+        for i in T.serial(n):
+            with T.block("accumulate"):
+                vi = T.axis.spatial(n, i)
+                A[vi] = A[vi] + B[vi]
+                B[vi] = T.cast(0, dtype)
+
+    sch = tvm.tir.Schedule(accumulate)
+    (loop,) = sch.get_loops(sch.get_block("accumulate"))
+    if device_type == tvm.cpu().device_type:
+        target = "llvm"
+        sch.parallel(loop)
+    else:
+        target = tvm.runtime.Device.MASK2STR[device_type]
+        block_idx, thread_idx = sch.split(loop, [None, 256])
+        sch.bind(block_idx, "blockIdx.x")
+        sch.bind(thread_idx, "threadIdx.x")
+    return tvm.build(sch.mod, target=target)
+
+
+def launch_instances(
+    f: tvm.runtime.Module,
+    func: tvm.tir.PrimFunc,
+    arrays: Dict[str, Any],
+    outputs: Sequence[str] = (),
+) -> List[NDArray]:
+    """Launch a kernel decomposed by `format_decompose` in parametric mode once per instance of
+    its templates, with the arguments of `bind_instances`.
+
+    Every launch runs the init of the reductions of the templates on the rows its instances
+    write, which the instances of other launches, e.g. other column partitions, may write too.
+    The outputs are hence written to zero-initialized scratch arrays by every launch, which are
+    added to the outputs on their device after the launch.
+
+    Parameters
+    ----------
+    f : tvm.runtime.Module
+        The kernel built from `func`.
+    func : PrimFunc
+        The function.
+    arrays : Dict[str, Any]
+        The arrays and scalar values by parameter name, see `bind_instances`.
+    outputs : Sequence[str]
+        The names of the output parameters written by several instances, e.g. "c".
+
+    Returns
+    -------
+    List[NDArray]
+        The output arrays, accumulated in place.
+    """
+    names = [param.name for param in func.params]
+    unknown = [name for name in outputs if name not in names]
+    if unknown:
+        raise KeyError("Unknown output parameters {} of {}".format(unknown, names))
+    scratches = {}
+    for name in outputs:
+        out = arrays[name]
+        scratches[name] = tvm.nd.array(np.zeros(out.shape, out.dtype), out.device)
+    for args in bind_instances(func, arrays):
+        for name, scratch in scratches.items():
+            args[names.index(name)] = scratch
+        f(*args)
+        for name, scratch in scratches.items():
+            out = arrays[name]
+            # pylint: disable=protected-access
+            numel = int(np.prod(out.shape))
+            _accumulate_func(out.dtype, out.device.device_type)(
+                out._create_view((numel,)), scratch._create_view((numel,)), numel
+            )
+    return [arrays[name] for name in outputs]
@@ -0,0 +1,633 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Search for the composable format of a sparse matrix."""
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import tvm
+from tvm import IRModule
+from tvm.runtime import NDArray
+from tvm.script import tir as T
+
+from .format import FormatRewriteRule, format_decompose
+
+
+@T.prim_func(lazy=True)
+def _ell_format(
+    a: T.handle,
+    indptr_i: T.handle,
+    indices_i: T.handle,
+    indices_j: T.handle,
+    m: T.int32,
+    n: T.int32,
+    num_rows: T.int32,
+    nnz_cols: T.int32,
+) -> None:
+    O = T.dense_fixed(1)
+    I = T.sparse_variable(O, (m, num_rows), (indptr_i, indices_i))
+    J = T.sparse_fixed(I, (n, nnz_cols), indices_j)
+    A = T.match_sparse_buffer(a, (O, I, J), "float32")
+    T.evaluate(0)
+
+
+@T.prim_func(lazy=True)
+def _bsr_format(
+    a: T.handle,
+    indptr: T.handle,
+    indices: T.handle,
+    m: T.int32,
+    n: T.int32,
+    nnz: T.int32,
+    block_size: T.int32,
+) -> None:
+    IO = T.dense_fixed(m)
+    JO = T.sparse_variable(IO, (n, nnz), (indptr, indices), "int32")
+    II = T.dense_fixed(block_size)
+    JI = T.dense_fixed(block_size)
+    A = T.match_sparse_buffer(a, (IO, JO, II, JI), "float32")
+    T.evaluate(0)
+
+
+@T.prim_func(lazy=True)
+def _dbsr_format(
+    a: T.handle,
+    indptr_0: T.handle,
+    indices_0: T.handle,
+    indptr_1: T.handle,
+    indices_1: T.handle,
+    m: T.int32,
+    n: T.int32,
+    nnz_0: T.int32,
+    nnz_1: T.int32,
+    block_size: T.int32,
+) -> None:
+    O = T.dense_fixed(1)
+    IO = T.sparse_variable(O, (m, nnz_0), (indptr_0, indices_0), "int32")
+    JO = T.sparse_variable(IO, (n, nnz_1), (indptr_1, indices_1), "int32")
+    II = T.dense_fixed(block_size)
+    JI = T.dense_fixed(block_size)
+    A = T.match_sparse_buffer(a, (O, IO, JO, II, JI), "float32")
+    T.evaluate(0)
+
+
+def ell_rule(
+    name: str,
+    nnz_cols: Optional[int],
+    buffer_name: str = "A",
+    axes: Tuple[str, str] = ("I", "J"),
+) -> FormatRewriteRule:
+    """The rule rewriting a CSR buffer to an ELL bucket holding the rows with at most `nnz_cols`
+    non-zeros.
+
+    Parameters
+    ----------
+    name : str
+        Name of the rule, used as the suffix of the new buffers and axes.
+    nnz_cols : Optional[int]
+        The number of non-zeros per row of the bucket. If None, it is the parameter `nnz_cols`
+        of the new format, so that the buckets of all widths are instances of one template in
+        the parametric mode of `format_decompose`.
+    buffer_name : str
+        The name of the sparse buffer to rewrite.
+    axes : Tuple[str, str]
+        The names of the row and the column axis of the buffer.
+
+    Returns
+    -------
+    FormatRewriteRule
+        The rewrite rule.
+    """
+    return FormatRewriteRule(
+        name,
+        _ell_format
+        if nnz_cols is None
+        else _ell_format.specialize({_ell_format.params[-1]: nnz_cols}),
+        [buffer_name],
+        list(axes),
+        ["O", "I", "J"],
+        {axes[0]: ["O", "I"], axes[1]: ["J"]},
+        lambda i, j: (0, i, j),
+        lambda o, i, j: (i, j),
+    )
+
+
+def bsr_rule(
+    name: str,
+    block_size: int,
+    buffer_name: str = "A",
+    axes: Tuple[str, str] = ("I", "J"),
+) -> FormatRewriteRule:
+    """The rule rewriting a CSR buffer to BSR with square blocks of `block_size`.
+
+    Parameters
+    ----------
+    name : str
+        Name of the rule, used as the suffix of the new buffers and axes.
+    block_size : int
+        The size of the blocks.
+    buffer_name : str
+        The name of the sparse buffer to rewrite.
+    axes : Tuple[str, str]
+        The names of the row and the column axis of the buffer.
+
+    Returns
+    -------
+    FormatRewriteRule
+        The rewrite rule.
+    """
+    return FormatRewriteRule(
+        name,
+        _bsr_format.specialize({_bsr_format.params[-1]: block_size}),
+        [buffer_name],
+        list(axes),
+        ["IO", "JO", "II", "JI"],
+        {axes[0]: ["IO", "II"], axes[1]: ["JO", "JI"]},
+        lambda i, j: (i // block_size, j // block_size, i % block_size, j % block_size),
+        lambda io, jo, ii, ji: (io * block_size + ii, jo * block_size + ji),
+    )
+
+
+def dbsr_rule(
+    name: str,
+    block_size: int,
+    buffer_name: str = "A",
+    axes: Tuple[str, str] = ("I", "J"),
+) -> FormatRewriteRule:
+    """The rule rewriting a CSR buffer to doubly compressed BSR, which only stores the block rows
+    containing at least one non-zero block.
+
+    Parameters
+    ----------
+    name : str
+        Name of the rule, used as the suffix of the new buffers and axes.
+    block_size : int
+        The size of the blocks.
+    buffer_name : str
+        The name of the sparse buffer to rewrite.
+    axes : Tuple[str, str]
+        The names of the row and the column axis of the buffer.
+
+    Returns
+    -------
+    FormatRewriteRule
+        The rewrite rule.
+    """
+    return FormatRewriteRule(
+        name,
+        _dbsr_format.specialize({_dbsr_format.params[-1]: block_size}),
+        [buffer_name],
+        list(axes),
+        ["O", "IO", "JO", "II", "JI"],
+        {axes[0]: ["O", "IO", "II"], axes[1]: ["JO", "JI"]},
+        lambda i, j: (0, i // block_size, j // block_size, i % block_size, j % block_size),
+        lambda o, io, jo, ii, ji: (io * block_size + ii, jo * block_size + ji),
+    )
+
+
+class FormatCandidate:
+    """A candidate composable format of a sparse matrix.
+
+    Parameters
+    ----------
+    kind : str
+        One of "csr", "hyb", "bsr" and "dbsr".
+    buckets : Tuple[int, ...]
+        The widths of the ELL buckets if kind is "hyb". Rows longer than the widest bucket are
+        split into several rows of it.
+    block_size : int
+        The block size if kind is "bsr" or "dbsr".
+    """
+
+    kind: str
+    buckets: Tuple[int, ...]
+    block_size: int
+
+    def __init__(self, kind: str, buckets: Sequence[int] = (), block_size: int = 1) -> None:
+        if kind not in ["csr", "hyb", "bsr", "dbsr"]:
+            raise ValueError("Unsupported format kind: {}".format(kind))
+        if kind == "hyb" and len(buckets) == 0:
+            raise ValueError("The hyb format requires at least one bucket")
+        self.kind = kind
+        self.buckets = tuple(sorted(int(width) for width in buckets))
+        self.block_size = int(block_size)
+
+    @property
+    def name(self) -> str:
+        """Name of the candidate, e.g. "hyb_1_2_4" or "bsr_16"."""
+        if self.kind == "csr":
+            return "csr"
+        if self.kind == "hyb":
+            return "hyb_" + "_".join(str(width) for width in self.buckets)
+        return "{}_{}".format(self.kind, self.block_size)
+
+    def rules(
+        self, buffer_name: str = "A", axes: Tuple[str, str] = ("I", "J")
+    ) -> List[FormatRewriteRule]:
+        """The rewrite rules to pass to `format_decompose`, empty if the buffer stays in CSR.
+
+        Parameters
+        ----------
+        buffer_name : str
+            The name of the sparse buffer to rewrite.
+        axes : Tuple[str, str]
+            The names of the row and the column axis of the buffer.
+
+        Returns
+        -------
+        List[FormatRewriteRule]
+            The rewrite rules.
+        """
+        if self.kind == "hyb":
+            return [
+                ell_rule("ell_{}".format(width), width, buffer_name, axes) for width in self.buckets
+            ]
+        if self.kind == "bsr":
+            return [bsr_rule(self.name, self.block_size, buffer_name, axes)]
+        if self.kind == "dbsr":
+            return [dbsr_rule(self.name, self.block_size, buffer_name, axes)]
+        return []
+
+    def convert(self, structure: "SparseStructure", data=None) -> Dict[str, Any]:
+        """The arrays and sizes of the matrix in this format, by the name of the parameter of the
+        module decomposed with `rules`, e.g. "indices_j_ell_4" or "nnz_bsr_16". The parameters
+        of the buffer kept in CSR are not included.
+
+        Rows longer than the widest ELL bucket are split into several rows of it. ELL rows are
+        padded with their last column and blocks with zeros, so that the padding holds zeros.
+
+        Parameters
+        ----------
+        structure : SparseStructure
+            The structure of the matrix.
+        data : Optional[Union[np.ndarray, NDArray]]
+            The values of the non-zeros of the matrix, ones if None.
+
+        Returns
+        -------
+        Dict[str, Any]
+            The NDArrays and integer sizes by parameter name.
+        """
+        if data is None:
+            data = np.ones(structure.nnz, dtype="float32")
+        elif isinstance(data, NDArray):
+            data = data.numpy()
+        data = np.asarray(data).astype("float32")[: structure.nnz]
+        if self.kind == "hyb":
+            return structure.to_hyb(self.buckets, data)
+        if self.kind in ["bsr", "dbsr"]:
+            return structure.to_bsr(self.name, self.block_size, data, self.kind == "dbsr")
+        return {}
+
+    def __repr__(self) -> str:
+        return "FormatCandidate({})".format(self.name)
+
+
+class SparseStructure:
+    """The structure of a CSR matrix, with the statistics the format cost model needs cached.
+
+    Parameters
+    ----------
+    indptr : Union[np.ndarray, NDArray]
+        The indptr array of the matrix.
+    indices : Union[np.ndarray, NDArray]
+        The indices array of the matrix.
+    num_cols : Optional[int]
+        The number of columns, inferred from the indices if None.
+    """
+
+    def __init__(self, indptr, indices, num_cols: Optional[int] = None) -> None:
+        if isinstance(indptr, NDArray):
+            indptr = indptr.numpy()
+        if isinstance(indices, NDArray):
+            indices = indices.numpy()
+        self.indptr = np.asarray(indptr).astype("int64")
+        self.indices = np.asarray(indices).astype("int64")
+        self.num_rows = len(self.indptr) - 1
+        self.nnz = int(self.indptr[-1])
+        if num_cols is None:
+            num_cols = int(self.indices.max()) + 1 if self.nnz > 0 else 0
+        self.num_cols = num_cols
+        self.degree = np.diff(self.indptr)
+        self._blocks: Dict[int, Tuple[int, int]] = {}
+
+    def blocks(self, block_size: int) -> Tuple[int, int]:
+        """The number of non-zero blocks and of non-empty block rows with the given block size."""
+        if block_size not in self._blocks:
+            rows = np.repeat(np.arange(self.num_rows, dtype="int64"), self.degree) // block_size
+            cols = self.indices[: self.nnz] // block_size
+            num_block_cols = (self.num_cols + block_size - 1) // block_size
+            block_ids = np.unique(rows * num_block_cols + cols)
+            num_block_rows = len(np.unique(block_ids // num_block_cols)) if self.nnz > 0 else 0
+            self._blocks[block_size] = (len(block_ids), num_block_rows)
+        return self._blocks[block_size]
+
+    def bucket_slots(self, buckets: Sequence[int]) -> Tuple[int, int]:
+        """The number of padded slots and of ELL rows when the rows are distributed to buckets."""
+        widths = np.asarray(sorted(buckets), dtype="int64")
+        degree = self.degree[self.degree > 0]
+        widest = widths[-1]
+        chunks = -(-degree // widest)
+        bucket = np.searchsorted(widths, np.minimum(degree, widest))
+        slots = np.where(degree > widest, chunks * widest, widths[bucket])
+        return int(slots.sum()), int(np.where(degree > widest, chunks, 1).sum())
+
+    def to_hyb(self, buckets: Sequence[int], data: np.ndarray) -> Dict[str, Any]:
+        """The ELL buckets of the matrix, see `FormatCandidate.convert`."""
+        widths = sorted(buckets)
+        widest = widths[-1]
+        # the (row, start, end) of the ELL rows of every bucket
+        ell_rows: Dict[int, List[Tuple[int, int, int]]] = {width: [] for width in widths}
+        for row in np.nonzero(self.degree)[0]:
+            start, end = int(self.indptr[row]), int(self.indptr[row + 1])
+            for chunk_start in range(start, end, widest):
+                chunk_end = min(chunk_start + widest, end)
+                width = widths[np.searchsorted(widths, chunk_end - chunk_start)]
+                ell_rows[width].append((int(row), chunk_start, chunk_end))
+        arrays: Dict[str, Any] = {}
+        for width in widths:
+            suffix = "_ell_{}".format(width)
+            rows = ell_rows[width]
+            indices_j = np.zeros((len(rows), width), dtype="int32")
+            values = np.zeros((len(rows), width), dtype="float32")
+            for ell_row, (_, start, end) in enumerate(rows):
+                indices_j[ell_row] = self.indices[end - 1]
+                indices_j[ell_row, : end - start] = self.indices[start:end]
+                values[ell_row, : end - start] = data[start:end]
+            arrays["a" + suffix] = tvm.nd.array(values.reshape(-1))
+            arrays["indptr_i" + suffix] = tvm.nd.array(np.array([0, len(rows)], dtype="int32"))
+            arrays["indices_i" + suffix] = tvm.nd.array(
+                np.array([row for row, _, _ in rows], dtype="int32")
+            )
+            arrays["indices_j" + suffix] = tvm.nd.array(indices_j.reshape(-1))
+            arrays["m" + suffix] = self.num_rows
+            arrays["n" + suffix] = self.num_cols
+            arrays["num_rows" + suffix] = len(rows)
+        return arrays
+
+    def to_bsr(
+        self, name: str, block_size: int, data: np.ndarray, doubly_compressed: bool
+    ) -> Dict[str, Any]:
+        """The BSR or DBSR blocks of the matrix, see `FormatCandidate.convert`."""
+        num_block_rows = (self.num_rows + block_size - 1) // block_size
+        num_block_cols = (self.num_cols + block_size - 1) // block_size
+        rows = np.repeat(np.arange(self.num_rows, dtype="int64"), self.degree)
+        cols = self.indices[: self.nnz]
+        block_ids, block_of = np.unique(
+            (rows // block_size) * num_block_cols + cols // block_size, return_inverse=True
+        )
+        values = np.zeros((len(block_ids), block_size, block_size), dtype="float32")
+        np.add.at(values, (block_of, rows % block_size, cols % block_size), data)
+        block_rows = block_ids // num_block_cols
+        indices = (block_ids % num_block_cols).astype("int32")
+        suffix = "_" + name
+        arrays: Dict[str, Any] = {
+            "a" + suffix: tvm.nd.array(values.reshape(-1)),
+            "m" + suffix: num_block_rows,
+            "n" + suffix: num_block_cols,
+        }
+        if not doubly_compressed:
+            indptr = np.zeros(num_block_rows + 1, dtype="int32")
+            np.cumsum(np.bincount(block_rows, minlength=num_block_rows), out=indptr[1:])
+            arrays["indptr" + suffix] = tvm.nd.array(indptr)
+            arrays["indices" + suffix] = tvm.nd.array(indices)
+            arrays["nnz" + suffix] = len(block_ids)
+            return arrays
+        nonempty_rows, row_counts = np.unique(block_rows, return_counts=True)
+        indptr_1 = np.zeros(len(nonempty_rows) + 1, dtype="int32")
+        np.cumsum(row_counts, out=indptr_1[1:])
+        arrays["indptr_0" + suffix] = tvm.nd.array(
+            np.array([0, len(nonempty_rows)], dtype="int32")
+        )
+        arrays["indices_0" + suffix] = tvm.nd.array(nonempty_rows.astype("int32"))
+        arrays["indptr_1" + suffix] = tvm.nd.array(indptr_1)
+        arrays["indices_1" + suffix] = tvm.nd.array(indices)
+        arrays["nnz_0" + suffix] = len(nonempty_rows)
+        arrays["nnz_1" + suffix] = len(block_ids)
+        return arrays
+
+
+class AnalyticFormatCost:
+    """A roofline-style cost model of a SpMM-like kernel in a given format, in units of the cost
+    of processing one non-zero of a CSR row.
+
+    Parameters
+    ----------
+    row_overhead : float
+        The cost of a CSR row, whose loop has a data-dependent extent.
+    ell_row_overhead : float
+        The cost of an ELL row, whose loop has a constant extent.
+    bucket_overhead : float
+        The cost of an ELL bucket, i.e. of an extra kernel or loop nest.
+    padded_cost : float
+        The cost of processing one slot of an ELL row, relative to a CSR non-zero.
+    block_cost : float
+        The cost of processing one element of a dense block, relative to a CSR non-zero.
+    """
+
+    def __init__(
+        self,
+        row_overhead: float = 4.0,
+        ell_row_overhead: float = 1.0,
+        bucket_overhead: float = 256.0,
+        padded_cost: float = 0.7,
+        block_cost: float = 0.25,
+    ) -> None:
+        self.row_overhead = row_overhead
+        self.ell_row_overhead = ell_row_overhead
+        self.bucket_overhead = bucket_overhead
+        self.padded_cost = padded_cost
+        self.block_cost = block_cost
+
+    def __call__(self, candidate: FormatCandidate, structure: SparseStructure) -> float:
+        if candidate.kind == "csr":
+            return structure.nnz + self.row_overhead * structure.num_rows
+        if candidate.kind == "hyb":
+            slots, rows = structure.bucket_slots(candidate.buckets)
+            return (
+                self.padded_cost * slots
+                + self.ell_row_overhead * rows
+                + self.bucket_overhead * len(candidate.buckets)
+            )
+        num_blocks, num_block_rows = structure.blocks(candidate.block_size)
+        if candidate.kind == "bsr":
+            num_block_rows = (structure.num_rows + candidate.block_size - 1) // candidate.block_size
+        return (
+            self.block_cost * num_blocks * candidate.block_size * candidate.block_size
+            + self.row_overhead * num_block_rows
+        )
+
+
+def default_candidates(
+    structure: SparseStructure,
+    max_bucket_width: int = 512,
+    block_sizes: Sequence[int] = (2, 4, 8, 16, 32),
+) -> List[FormatCandidate]:
+    """The built-in candidates: CSR, ELL buckets of powers of two up to several widest widths,
+    and BSR/DBSR with several block sizes.
+
+    Parameters
+    ----------
+    structure : SparseStructure
+        The structure of the matrix.
+    max_bucket_width : int
+        The largest width of the widest ELL bucket.
+    block_sizes : Sequence[int]
+        The block sizes of the BSR and DBSR candidates.
+
+    Returns
+    -------
+    List[FormatCandidate]
+        The candidates.
+    """
+    candidates = [FormatCandidate("csr")]
+    max_degree = int(structure.degree.max()) if structure.num_rows > 0 else 0
+    widest = 1
+    while True:
+        candidates.append(FormatCandidate("hyb", [1 << i for i in range(widest.bit_length())]))
+        if widest >= max_degree or widest * 2 > max_bucket_width:
+            break
+        widest *= 2
+    for block_size in block_sizes:
+        candidates.append(FormatCandidate("bsr", block_size=block_size))
+        candidates.append(FormatCandidate("dbsr", block_size=block_size))
+    return candidates
+
+
+class FormatSearchResult:
+    """The result of `search_format`.
+
+    Parameters
+    ----------
+    candidate : FormatCandidate
+        The best candidate.
+    mod : IRModule
+        The module decomposed (and scheduled if a schedule function is given) with the best
+        candidate.
+    estimated_costs : Dict[str, float]
+        The cost estimated by the cost model, indexed by the candidate name.
+    measured_costs : Dict[str, float]
+        The measured cost of the top-k candidates, indexed by the candidate name.
+    arrays : Dict[str, Any]
+        The matrix converted to the best candidate, see `FormatCandidate.convert`.
+    """
+
+    def __init__(
+        self,
+        candidate: FormatCandidate,
+        mod: IRModule,
+        estimated_costs: Dict[str, float],
+        measured_costs: Dict[str, float],
+        arrays: Dict[str, Any],
+    ) -> None:
+        self.candidate = candidate
+        self.mod = mod
+        self.estimated_costs = estimated_costs
+        self.measured_costs = measured_costs
+        self.arrays = arrays
+
+
+def search_format(
+    mod: IRModule,
+    indptr,
+    indices,
+    num_cols: Optional[int] = None,
+    data=None,
+    buffer_name: str = "A",
+    axes: Tuple[str, str] = ("I", "J"),
+    candidates: Optional[List[FormatCandidate]] = None,
+    cost_model: Optional[Callable[[FormatCandidate, SparseStructure], float]] = None,
+    top_k: int = 1,
+    f_schedule: Optional[Callable[[IRModule, FormatCandidate], IRModule]] = None,
+    f_measure: Optional[Callable[[IRModule, FormatCandidate], float]] = None,
+) -> FormatSearchResult:
+    """Search for the composable format of a CSR buffer that minimizes the cost of the kernel.
+
+    The candidates are ranked with the cost model. If `f_measure` is given, the `top_k` best
+    ranked candidates are decomposed, scheduled and measured, and the fastest one is picked;
+    otherwise the best ranked candidate is picked.
+
+    Parameters
+    ----------
+    mod : IRModule
+        The stage-I module containing the CSR buffer.
+    indptr : Union[np.ndarray, NDArray]
+        The indptr array of the matrix.
+    indices : Union[np.ndarray, NDArray]
+        The indices array of the matrix.
+    num_cols : Optional[int]
+        The number of columns, inferred from the indices if None.
+    data : Optional[Union[np.ndarray, NDArray]]
+        The values of the non-zeros of the matrix, ones if None.
+    buffer_name : str
+        The name of the sparse buffer whose format is searched.
+    axes : Tuple[str, str]
+        The names of the row and the column axis of the buffer.
+    candidates : Optional[List[FormatCandidate]]
+        The candidates, `default_candidates` if None.
+    cost_model : Optional[Callable[[FormatCandidate, SparseStructure], float]]
+        The cost model, `AnalyticFormatCost()` if None.
+    top_k : int
+        The number of candidates to measure if `f_measure` is given.
+    f_schedule : Optional[Callable[[IRModule, FormatCandidate], IRModule]]
+        The function scheduling a decomposed module.
+    f_measure : Optional[Callable[[IRModule, FormatCandidate], float]]
+        The function measuring the running time of a decomposed and scheduled module.
+
+    Returns
+    -------
+    FormatSearchResult
+        The best candidate, the module decomposed with it and the matrix converted to it.
+    """
+    if not isinstance(mod, IRModule):
+        raise TypeError("Expected IRModule, but got {}".format(type(mod)))
+    structure = SparseStructure(indptr, indices, num_cols)
+    if candidates is None:
+        candidates = default_candidates(structure)
+    if len(candidates) == 0:
+        raise ValueError("At least one candidate is required")
+    if cost_model is None:
+        cost_model = AnalyticFormatCost()
+
+    estimated_costs = {
+        candidate.name: float(cost_model(candidate, structure)) for candidate in candidates
+    }
+    ranked = sorted(candidates, key=lambda candidate: estimated_costs[candidate.name])
+
+    def _build(candidate: FormatCandidate) -> IRModule:
+        rules = candidate.rules(buffer_name, axes)
+        new_mod = format_decompose(mod, rules) if rules else mod
+        if f_schedule is not None:
+            new_mod = f_schedule(new_mod, candidate)
+        return new_mod
+
+    measured_costs: Dict[str, float] = {}
+    if f_measure is None:
+        best = ranked[0]
+        return FormatSearchResult(
+            best, _build(best), estimated_costs, measured_costs, best.convert(structure, data)
+        )
+    best, best_mod = None, None
+    for candidate in ranked[: max(1, top_k)]:
+        new_mod = _build(candidate)
+        measured_costs[candidate.name] = float(f_measure(new_mod, candidate))
+        if best is None or measured_costs[candidate.name] < measured_costs[best.name]:
+            best, best_mod = candidate, new_mod
+    return FormatSearchResult(
+        best, best_mod, estimated_costs, measured_costs, best.convert(structure, data)
+    )
@@ -0,0 +1,202 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=import-outside-toplevel
+"""Zero-copy views of sparse matrices of other frameworks as tvm NDArrays.
+
+The arrays are shared through DLPack. They are only copied when they have to be: when the
+requested dtype or device differs, when they are not contiguous, or when their data is not
+aligned as tvm kernels assume.
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from tvm.contrib.sparse import CSRNDArray
+from tvm.runtime import Device, NDArray, ndarray
+
+from .profiling import profiled
+
+# The alignment tvm allocates NDArrays with and generated kernels may assume.
+_ALIGNMENT = 64
+
+
+def _is_torch_tensor(arr) -> bool:
+    return type(arr).__module__.startswith("torch") and hasattr(arr, "data_ptr")
+
+
+def _same_device(arr: NDArray, device: Optional[Device]) -> bool:
+    return device is None or (
+        arr.device.device_type == device.device_type and arr.device.device_id == device.device_id
+    )
+
+
+def _from_torch(tensor, dtype: Optional[str], device: Optional[Device]) -> NDArray:
+    import torch
+    import torch.utils.dlpack
+
+    if dtype is not None and tensor.dtype != getattr(torch, dtype):
+        tensor = tensor.to(getattr(torch, dtype))
+    if not tensor.is_contiguous():
+        tensor = tensor.contiguous()
+    if tensor.data_ptr() % _ALIGNMENT != 0:
+        tensor = tensor.clone()
+    arr = ndarray.from_dlpack(torch.utils.dlpack.to_dlpack(tensor.detach()))
+    return arr if _same_device(arr, device) else arr.copyto(device)
+
+
+def _from_numpy(arr: np.ndarray, dtype: Optional[str], device: Optional[Device]) -> NDArray:
+    if dtype is not None and arr.dtype != np.dtype(dtype):
+        arr = arr.astype(dtype)
+    shareable = (
+        arr.flags.c_contiguous
+        and arr.flags.writeable
+        and arr.ctypes.data % _ALIGNMENT == 0
+        and hasattr(arr, "__dlpack__")
+        and (device is None or device.device_type == ndarray.cpu().device_type)
+    )
+    if not shareable:
+        return ndarray.array(arr, device if device is not None else ndarray.cpu())
+    return ndarray.from_dlpack(arr)
+
+
+def as_ndarray(arr, dtype: Optional[str] = None, device: Optional[Device] = None) -> NDArray:
+    """View an array of another framework as a tvm NDArray, copying only if needed.
+
+    Parameters
+    ----------
+    arr : Union[NDArray, np.ndarray, torch.Tensor, object with __dlpack__]
+        The array.
+    dtype : Optional[str]
+        The dtype of the result, the one of arr if None.
+    device : Optional[Device]
+        The device of the result, the one of arr if None.
+
+    Returns
+    -------
+    NDArray
+        The array, which shares memory with arr unless a conversion was required.
+    """
+    if isinstance(arr, NDArray):
+        if dtype is not None and arr.dtype != dtype:
+            arr = ndarray.array(arr.numpy().astype(dtype), arr.device)
+        return arr if _same_device(arr, device) else arr.copyto(device)
+    if _is_torch_tensor(arr):
+        return _from_torch(arr, dtype, device)
+    if isinstance(arr, np.ndarray):
+        return _from_numpy(arr, dtype, device)
+    if hasattr(arr, "__dlpack__"):
+        return as_ndarray(ndarray.from_dlpack(arr), dtype, device)
+    return _from_numpy(np.asarray(arr), dtype, device)
+
+
+@profiled("from_scipy")
+def from_scipy(mat, idtype: str = "int32", device: Optional[Device] = None) -> CSRNDArray:
+    """View a scipy sparse matrix as a CSRNDArray.
+
+    Parameters
+    ----------
+    mat : scipy.sparse.spmatrix
+        The matrix. Formats other than CSR are converted first, which copies.
+    idtype : str
+        The dtype of indptr and indices.
+    device : Optional[Device]
+        The device of the result, cpu if None.
+
+    Returns
+    -------
+    CSRNDArray
+        The matrix.
+    """
+    csr = mat.tocsr()
+    return CSRNDArray(
+        (
+            as_ndarray(csr.data, device=device),
+            as_ndarray(csr.indices, idtype, device),
+            as_ndarray(csr.indptr, idtype, device),
+        ),
+        shape=csr.shape,
+    )
+
+
+@profiled("from_torch_sparse")
+def from_torch_sparse(
+    tensor, idtype: str = "int32", device: Optional[Device] = None
+) -> CSRNDArray:
+    """View a torch sparse CSR or COO tensor as a CSRNDArray.
+
+    Parameters
+    ----------
+    tensor : torch.Tensor
+        The 2-D tensor, of layout torch.sparse_csr or torch.sparse_coo. A COO tensor is converted
+        to CSR first, which copies.
+    idtype : str
+        The dtype of indptr and indices.
+    device : Optional[Device]
+        The device of the result, the one of the tensor if None.
+
+    Returns
+    -------
+    CSRNDArray
+        The matrix.
+    """
+    import torch
+
+    if tensor.layout == torch.sparse_coo:
+        tensor = tensor.coalesce().to_sparse_csr()
+    if tensor.layout != torch.sparse_csr:
+        raise ValueError("Expected a sparse CSR or COO tensor, but got {}".format(tensor.layout))
+    return CSRNDArray(
+        (
+            as_ndarray(tensor.values(), device=device),
+            as_ndarray(tensor.col_indices(), idtype, device),
+            as_ndarray(tensor.crow_indices(), idtype, device),
+        ),
+        shape=tuple(tensor.shape),
+    )
+
+
+@profiled("from_dgl_graph")
+def from_dgl_graph(
+    graph, fmt: str = "csc", idtype: str = "int32", device: Optional[Device] = None
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """View the adjacency matrix of a DGL graph as tvm NDArrays.
+
+    Parameters
+    ----------
+    graph : dgl.DGLGraph
+        The graph.
+    fmt : str
+        "csc" to index by destination nodes, "csr" to index by source nodes.
+    idtype : str
+        The dtype of the returned arrays.
+    device : Optional[Device]
+        The device of the result, the one of the graph if None.
+
+    Returns
+    -------
+    Tuple[NDArray, NDArray, NDArray]
+        The (indptr, indices, edge_ids) arrays.
+    """
+    if hasattr(graph, "adj_tensors"):
+        indptr, indices, eids = graph.adj_tensors(fmt)
+    else:
+        indptr, indices, eids = graph.adj_sparse(fmt)
+    return (
+        as_ndarray(indptr, idtype, device),
+        as_ndarray(indices, idtype, device),
+        as_ndarray(eids, idtype, device),
+    )
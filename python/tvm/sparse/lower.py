@@ -19,8 +19,13 @@
 from tvm import IRModule
 from tvm.tir.transform import LowerSparseBuffer, LowerSparseIter
 
+from .profiling import profiled
 
-def lower_sparse_iter(mod: IRModule, check_invalid_binary_search: bool = False):
+
+@profiled("lower_sparse_iter")
+def lower_sparse_iter(
+    mod: IRModule, check_invalid_binary_search: bool = False, binary_search: str = "loop"
+):
     """Lower sparse iterators in Sparse TIR.
 
     Parameters
@@ -29,12 +34,30 @@ def lower_sparse_iter(mod: IRModule, check_invalid_binary_search: bool = False):
         The IRModule to lower.
     check_invalid_binary_search : bool
         Whether check invalid indices made by binary search.
+    binary_search : str
+        How the binary searches of sparse iterations are emitted:
+
+        - "loop": narrow the range until it is empty, with a data-dependent branch per step.
+        - "branchless": halve the range with selects, which compile to conditional moves. The
+          number of steps only depends on the length of the range, and the steps are unrolled
+          when it is a constant, so that batches of independent searches, e.g. one per non-zero
+          of a fused axis, have no branch and can be vectorized. Prefer it on CPUs.
+        - "merge": "branchless", except for the row of every non-zero of a fused (I, J) axis,
+          which is found by one sweep over the rows in O(nnz) instead of O(nnz log(m)). The loop
+          over the rows of the sweep can be parallelized.
     """
     if not isinstance(mod, IRModule):
         raise TypeError("Expected IRModule, but got {}".format(type(mod)))
-    return LowerSparseIter(check_invalid_binary_search)(mod)
+    if binary_search not in ["loop", "branchless", "merge"]:
+        raise ValueError(
+            "Expected binary_search to be loop, branchless or merge, but got {}".format(
+                binary_search
+            )
+        )
+    return LowerSparseIter(check_invalid_binary_search, binary_search)(mod)
 
 
+@profiled("lower_sparse_buffer")
 def lower_sparse_buffer(mod: IRModule):
     """Lower sparse buffers in Sparse TIR.
 
@@ -0,0 +1,198 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""N:M structured sparse format."""
+from typing import Optional, Tuple
+
+import numpy as np
+
+from tvm.runtime import NDArray
+
+
+def _to_numpy(arr) -> np.ndarray:
+    if isinstance(arr, NDArray):
+        return arr.numpy()
+    return np.asarray(arr)
+
+
+class NMSparseMatrix:
+    """A matrix where every group of `m` consecutive elements of a row holds at most `n`
+    non-zeros, e.g. 2:4.
+
+    The non-zeros of a group are stored in `n` slots, along with their position inside the group
+    (0 to m - 1) as the compact per-group metadata. Groups with fewer than `n` non-zeros are
+    padded with zero values.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        The values, of shape (num_rows, num_cols // m, n).
+    offsets : np.ndarray
+        The position of every value inside its group, of the same shape as values.
+    num_cols : int
+        The number of columns, a multiple of m.
+    n : int
+        The number of non-zeros per group.
+    m : int
+        The size of a group.
+    """
+
+    values: np.ndarray
+    offsets: np.ndarray
+    num_cols: int
+    n: int
+    m: int
+
+    def __init__(
+        self, values: np.ndarray, offsets: np.ndarray, num_cols: int, n: int, m: int
+    ) -> None:
+        if num_cols % m != 0:
+            raise ValueError("The number of columns {} is not a multiple of {}".format(num_cols, m))
+        if values.shape != offsets.shape or values.shape[1:] != (num_cols // m, n):
+            raise ValueError(
+                "Expected values and offsets of shape (num_rows, {}, {}), but got {} and {}".format(
+                    num_cols // m, n, values.shape, offsets.shape
+                )
+            )
+        self.values = values
+        self.offsets = offsets
+        self.num_cols = num_cols
+        self.n = n
+        self.m = m
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """The shape of the matrix."""
+        return (self.values.shape[0], self.num_cols)
+
+    @staticmethod
+    def meta_dtype(m: int) -> str:
+        """The narrowest unsigned integer type holding the offsets of groups of size m."""
+        return "uint8" if m <= 256 else "uint16" if m <= 65536 else "uint32"
+
+    @staticmethod
+    def from_dense(dense, n: int, m: int, prune: bool = False) -> "NMSparseMatrix":
+        """Convert a dense matrix.
+
+        Parameters
+        ----------
+        dense : Union[np.ndarray, NDArray]
+            The 2-D dense matrix.
+        n : int
+            The number of non-zeros per group.
+        m : int
+            The size of a group.
+        prune : bool
+            Whether to keep the `n` elements of largest magnitude of every group holding more
+            non-zeros. Otherwise such groups raise a ValueError.
+
+        Returns
+        -------
+        NMSparseMatrix
+            The converted matrix.
+        """
+        dense = _to_numpy(dense)
+        num_rows, num_cols = dense.shape
+        if num_cols % m != 0:
+            raise ValueError("The number of columns {} is not a multiple of {}".format(num_cols, m))
+        groups = dense.reshape(num_rows, num_cols // m, m)
+        if prune:
+            # the n elements of largest magnitude, zeros rank last
+            positions = np.argsort(-np.abs(groups), axis=-1, kind="stable")[..., :n]
+        else:
+            nonzero = groups != 0
+            if nonzero.sum(axis=-1).max(initial=0) > n:
+                raise ValueError("The matrix is not {}:{} sparse".format(n, m))
+            positions = np.argsort(~nonzero, axis=-1, kind="stable")[..., :n]
+        # store the non-zeros first in column order, then the padding, as from_csr does
+        values = np.take_along_axis(groups, positions, axis=-1)
+        order = np.argsort((values == 0) * m + positions, axis=-1, kind="stable")
+        positions = np.take_along_axis(positions, order, axis=-1)
+        values = np.take_along_axis(values, order, axis=-1)
+        return NMSparseMatrix(
+            values, positions.astype(NMSparseMatrix.meta_dtype(m)), num_cols, n, m
+        )
+
+    @staticmethod
+    def from_csr(
+        indptr, indices, data, num_cols: int, n: int, m: int, dtype: Optional[str] = None
+    ) -> "NMSparseMatrix":
+        """Convert a CSR matrix without densifying it.
+
+        Parameters
+        ----------
+        indptr : Union[np.ndarray, NDArray]
+            The indptr array of the matrix.
+        indices : Union[np.ndarray, NDArray]
+            The indices array of the matrix.
+        data : Union[np.ndarray, NDArray]
+            The values of the matrix.
+        num_cols : int
+            The number of columns, a multiple of m.
+        n : int
+            The number of non-zeros per group.
+        m : int
+            The size of a group.
+        dtype : Optional[str]
+            The dtype of the values, the one of data if None.
+
+        Returns
+        -------
+        NMSparseMatrix
+            The converted matrix. A ValueError is raised if a group holds more than n non-zeros.
+        """
+        indptr = _to_numpy(indptr).astype("int64")
+        indices = _to_numpy(indices).astype("int64")
+        data = _to_numpy(data)
+        if num_cols % m != 0:
+            raise ValueError("The number of columns {} is not a multiple of {}".format(num_cols, m))
+        num_rows, num_groups = len(indptr) - 1, num_cols // m
+        nnz = int(indptr[-1])
+        rows = np.repeat(np.arange(num_rows, dtype="int64"), np.diff(indptr))
+        cols, data = indices[:nnz], data[:nnz]
+        keys = rows * num_groups + cols // m
+        order = np.lexsort((cols, keys))
+        keys, cols, data = keys[order], cols[order], data[order]
+        # rank of every non-zero inside its group
+        first = np.searchsorted(keys, keys, side="left")
+        rank = np.arange(nnz, dtype="int64") - first
+        if nnz > 0 and rank.max() >= n:
+            raise ValueError("The matrix is not {}:{} sparse".format(n, m))
+        values = np.zeros((num_rows * num_groups, n), dtype=dtype or data.dtype)
+        offsets = np.zeros((num_rows * num_groups, n), dtype=NMSparseMatrix.meta_dtype(m))
+        values[keys, rank] = data
+        offsets[keys, rank] = cols % m
+        return NMSparseMatrix(
+            values.reshape(num_rows, num_groups, n),
+            offsets.reshape(num_rows, num_groups, n),
+            num_cols,
+            n,
+            m,
+        )
+
+    def to_dense(self) -> np.ndarray:
+        """Convert to a dense matrix."""
+        num_rows, num_groups = self.values.shape[:2]
+        groups = np.zeros((num_rows, num_groups, self.m), dtype=self.values.dtype)
+        offsets = self.offsets.astype("int64")
+        for slot in range(self.n):
+            # skip the padded slots, whose offsets may collide with a stored value
+            row, group = np.nonzero(self.values[..., slot])
+            groups[row, group, offsets[row, group, slot]] = self.values[row, group, slot]
+        return groups.reshape(num_rows, self.num_cols)
+
+    def __repr__(self) -> str:
+        return "NMSparseMatrix({}:{}, shape={})".format(self.n, self.m, self.shape)
@@ -0,0 +1,295 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Named parameter binding and packed arguments for format-decomposed kernels.
+
+`format_decompose` adds the parameters of every rewrite rule, suffixed by the rule name, to the
+kernel. With many rules, e.g. column partitions times buckets of a HYB format, the kernel takes
+hundreds of arguments. `pack_params` merges the 1-D buffers of selected parameters into one
+buffer per dtype, at offsets fixed at compile time, and `PackedLayout` builds the packed
+arguments on the host.
+"""
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import tvm
+from tvm.runtime import Device, NDArray
+from tvm.tir import PrimFunc
+from tvm.tir.stmt_functor import ir_transform
+
+from .interop import as_ndarray
+
+
+def _host_array(arr) -> np.ndarray:
+    """The array on the host, bfloat16 arrays as their uint16 bits, as numpy has no bfloat16."""
+    if not isinstance(arr, NDArray):
+        return np.asarray(arr)
+    if arr.dtype == "bfloat16":
+        bits = tvm.nd.empty(arr.shape, "uint16")
+        arr.copyto(bits)
+        return bits.numpy()
+    return arr.numpy()
+
+
+def _host_dtype(dtype: str) -> str:
+    return "uint16" if dtype == "bfloat16" else dtype
+
+
+def specialize_params(func: PrimFunc, values: Dict[str, Any]) -> PrimFunc:
+    """Specialize the parameters of a PrimFunc by name.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The function.
+    values : Dict[str, Any]
+        The values of the scalar parameters or the buffers of the handle parameters, by name,
+        e.g. {"m": m, "num_rows_0_1": num_rows}.
+
+    Returns
+    -------
+    PrimFunc
+        The specialized function.
+    """
+    params = {param.name: param for param in func.params}
+    unknown = [name for name in values if name not in params]
+    if unknown:
+        raise KeyError("Unknown parameters {} of {}".format(unknown, list(params)))
+    return func.specialize({params[name]: value for name, value in values.items()})
+
+
+def rule_param_names(func: PrimFunc, rule_names: Sequence[str]) -> List[str]:
+    """The names of the buffer parameters added to a kernel by the given rewrite rules.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The format-decomposed function.
+    rule_names : Sequence[str]
+        The names of the FormatRewriteRules.
+
+    Returns
+    -------
+    List[str]
+        The parameter names, in the order of the parameters.
+    """
+    suffixes = tuple("_" + name for name in rule_names)
+    return [
+        param.name
+        for param in func.params
+        if param in func.buffer_map and param.name.endswith(suffixes)
+    ]
+
+
+class PackedLayout:
+    """Where the packed parameters of a kernel are in its packed buffers.
+
+    Parameters
+    ----------
+    param_names : List[str]
+        The parameters of the packed kernel, in order.
+    segments : Dict[str, Tuple[str, int, int]]
+        The (packed parameter, offset, size) of every packed parameter, by name.
+    packed : Dict[str, Tuple[str, int]]
+        The (dtype, size) of every packed buffer, by name.
+    """
+
+    def __init__(
+        self,
+        param_names: List[str],
+        segments: Dict[str, Tuple[str, int, int]],
+        packed: Dict[str, Tuple[str, int]],
+    ) -> None:
+        self.param_names = param_names
+        self.segments = segments
+        self.packed = packed
+
+    def pack(self, arrays: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """Concatenate the arrays of the packed parameters.
+
+        Parameters
+        ----------
+        arrays : Dict[str, Union[NDArray, np.ndarray]]
+            The arrays of every packed parameter, by name. Multi-dimensional arrays are
+            flattened.
+
+        Returns
+        -------
+        Dict[str, np.ndarray]
+            The packed buffers, by name, the bfloat16 ones as their uint16 bits.
+        """
+        missing = [name for name in self.segments if name not in arrays]
+        if missing:
+            raise KeyError("Missing arrays of packed parameters {}".format(missing))
+        buffers = {
+            name: np.zeros(size, _host_dtype(dtype)) for name, (dtype, size) in self.packed.items()
+        }
+        for name, (packed_name, offset, size) in self.segments.items():
+            arr = _host_array(arrays[name]).reshape(-1)
+            if arr.shape[0] != size:
+                raise ValueError(
+                    "Expected {} elements for parameter {}, but got {}".format(
+                        size, name, arr.shape[0]
+                    )
+                )
+            buffers[packed_name][offset : offset + size] = arr
+        return buffers
+
+    def make_args(self, arrays: Dict[str, Any], device: Optional[Device] = None) -> List[NDArray]:
+        """The arguments of the packed kernel, in order.
+
+        Parameters
+        ----------
+        arrays : Dict[str, Union[NDArray, np.ndarray, torch.Tensor]]
+            The arrays of every parameter of the kernel before packing, by name.
+        device : Optional[Device]
+            The device of the arguments, cpu if None.
+
+        Returns
+        -------
+        List[NDArray]
+            The arguments.
+        """
+        device = device if device is not None else tvm.cpu()
+        packed = {
+            name: tvm.nd.empty(buf.shape, self.packed[name][0], device).copyfrom(buf)
+            for name, buf in self.pack(arrays).items()
+        }
+        return [
+            packed[name] if name in packed else as_ndarray(arrays[name], device=device)
+            for name in self.param_names
+        ]
+
+    def __repr__(self) -> str:
+        return "PackedLayout({})".format(
+            ", ".join("{}: {}[{}]".format(k, v[0], v[1]) for k, v in self.packed.items())
+        )
+
+
+def pack_params(
+    func: PrimFunc, names: Sequence[str], alignment: int = 16
+) -> Tuple[PrimFunc, PackedLayout]:
+    """Merge the buffers of the given parameters into one buffer per dtype.
+
+    The buffers must be 1-D and of constant size, i.e. the kernel is lowered by
+    `lower_sparse_buffer` and its shape parameters are specialized. The packed buffers are
+    appended to the parameters as `packed_<dtype>`.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The function.
+    names : Sequence[str]
+        The names of the parameters to pack.
+    alignment : int
+        The offsets of the buffers in the packed buffers are multiples of alignment elements.
+
+    Returns
+    -------
+    Tuple[PrimFunc, PackedLayout]
+        The packed function and the layout of its packed buffers.
+    """
+    params = {param.name: param for param in func.params}
+    analyzer = tvm.arith.Analyzer()
+    remap: Dict[tvm.tir.Buffer, Tuple[str, int]] = {}
+    segments: Dict[str, Tuple[str, int, int]] = {}
+    sizes: Dict[str, int] = {}
+    for name in names:
+        if name not in params or params[name] not in func.buffer_map:
+            raise KeyError("{} is not a buffer parameter".format(name))
+        buf = func.buffer_map[params[name]]
+        shape = [analyzer.simplify(extent) for extent in buf.shape]
+        if len(shape) != 1 or not isinstance(shape[0], tvm.tir.IntImm):
+            raise ValueError(
+                "Expected a 1-D buffer of constant size for {}, but got shape {}".format(
+                    name, buf.shape
+                )
+            )
+        packed_name = "packed_" + buf.dtype
+        offset = sizes.get(packed_name, 0)
+        size = int(shape[0])
+        remap[buf] = (packed_name, offset)
+        segments[name] = (packed_name, offset, size)
+        sizes[packed_name] = (offset + size + alignment - 1) // alignment * alignment
+
+    packed_buffers = {
+        packed_name: tvm.tir.decl_buffer((size,), packed_name[len("packed_") :], packed_name)
+        for packed_name, size in sizes.items()
+    }
+
+    def rewrite_region(region):
+        if region.buffer not in remap:
+            return region
+        packed_name, offset = remap[region.buffer]
+        (rng,) = region.region
+        new_range = tvm.ir.Range.from_min_extent(rng.min + offset, rng.extent)
+        return tvm.tir.BufferRegion(packed_buffers[packed_name], [new_range])
+
+    def postorder(op):
+        if isinstance(op, tvm.tir.Block):
+            return tvm.tir.Block(
+                op.iter_vars,
+                [rewrite_region(r) for r in op.reads],
+                [rewrite_region(r) for r in op.writes],
+                op.name_hint,
+                op.body,
+                op.init,
+                op.alloc_buffers,
+                op.match_buffers,
+                op.buf_doms,
+                op.annotations,
+            )
+        if op.buffer not in remap:
+            return None
+        packed_name, offset = remap[op.buffer]
+        indices = [op.indices[0] + offset]
+        if isinstance(op, tvm.tir.BufferLoad):
+            return tvm.tir.BufferLoad(packed_buffers[packed_name], indices, op.span)
+        return tvm.tir.BufferStore(packed_buffers[packed_name], op.value, indices, op.span)
+
+    body = ir_transform(
+        func.body, None, postorder, ["tir.BufferLoad", "tir.BufferStore", "tir.Block"]
+    )
+    packed_names = set(names)
+    new_params, buffer_map, preflattened_buffer_map = [], {}, {}
+    for param in func.params:
+        if param.name in packed_names:
+            continue
+        new_params.append(param)
+        if param in func.buffer_map:
+            buffer_map[param] = func.buffer_map[param]
+        if param in func.preflattened_buffer_map:
+            preflattened_buffer_map[param] = func.preflattened_buffer_map[param]
+    for packed_name, buf in packed_buffers.items():
+        var = tvm.tir.Var(packed_name, "handle")
+        new_params.append(var)
+        buffer_map[var] = buf
+    new_func = PrimFunc(
+        new_params,
+        body,
+        ret_type=func.ret_type,
+        buffer_map=buffer_map,
+        preflattened_buffer_map=preflattened_buffer_map,
+        sp_axes=func.sp_axes,
+        attrs=func.attrs,
+    )
+    layout = PackedLayout(
+        [param.name for param in new_params],
+        segments,
+        {name: (buf.dtype, int(buf.shape[0])) for name, buf in packed_buffers.items()},
+    )
+    return new_func, layout
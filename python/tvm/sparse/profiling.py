@@ -0,0 +1,341 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Wall time and memory profiling of the phases of a SparseTIR workflow.
+
+Example
+-------
+.. code-block:: python
+
+    with tvm.sparse.profile() as prof:
+        row_indices, col_indices, mask = column_part_hyb(m, n, indptr, indices, 1, buckets)
+        mod = format_decompose(mod, rules)
+        mod = lower_sparse_buffer(lower_sparse_iter(mod))
+        with prof.phase("build"):
+            f = tvm.build(mod["main"], target="llvm")
+        with prof.phase("run", device=tvm.cpu()):
+            f(*args)
+    print(prof.table())
+
+The converters and lowering functions of `tvm.sparse` record a phase on their own while a
+profiler is active, and every pass run in between is recorded through a pass instrument.
+"""
+import functools
+import json
+import time
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from tvm.contrib.sparse import CSRNDArray
+from tvm.ir import Array, IRModule
+from tvm.ir.instrument import pass_instrument
+from tvm.ir.transform import PassContext
+from tvm.runtime import DataType, Device, NDArray
+from tvm.tir import PrimFunc
+from tvm.tir.stmt_functor import post_order_visit
+
+_ACTIVE: List["SparseProfiler"] = []
+
+
+def _traced_memory():
+    """The current and peak traced sizes since the last `_reset_peak`.
+
+    `tracemalloc.reset_peak` is only available from Python 3.9. Before, the peak is the current
+    size, so that the peak of a phase is the largest size seen at the boundaries of its nested
+    phases and passes.
+    """
+    current, peak = tracemalloc.get_traced_memory()
+    if not hasattr(tracemalloc, "reset_peak"):
+        peak = current
+    return current, peak
+
+
+def _reset_peak() -> None:
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+
+
+def _ndarray_bytes(value) -> int:
+    """The bytes of the NDArrays in a (nested) result of a converter."""
+    if isinstance(value, NDArray):
+        dtype = DataType(value.dtype)
+        return int(np.prod(value.shape)) * ((dtype.bits * dtype.lanes + 7) // 8)
+    if isinstance(value, CSRNDArray):
+        return sum(_ndarray_bytes(v) for v in [value.data, value.indices, value.indptr])
+    if isinstance(value, (list, tuple, Array)):
+        return sum(_ndarray_bytes(v) for v in value)
+    return 0
+
+
+class PhaseRecord:
+    """The measurements of a phase or a pass.
+
+    Parameters
+    ----------
+    name : str
+        The name of the phase or pass.
+    kind : str
+        "phase" or "pass".
+    depth : int
+        The nesting depth.
+    """
+
+    def __init__(self, name: str, kind: str, depth: int) -> None:
+        self.name = name
+        self.kind = kind
+        self.depth = depth
+        self.wall_ms = 0.0
+        self.peak_host_bytes = 0
+        self.ndarray_bytes = 0
+        # tracemalloc state at the start, and the highest peak reported by nested records
+        self._start_time = 0.0
+        self._start_traced = 0
+        self._max_traced = 0
+
+    @property
+    def peak_bytes(self) -> int:
+        """The peak host memory allocated by Python objects plus the NDArrays produced."""
+        return self.peak_host_bytes + self.ndarray_bytes
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "depth": self.depth,
+            "wall_ms": self.wall_ms,
+            "peak_host_bytes": self.peak_host_bytes,
+            "ndarray_bytes": self.ndarray_bytes,
+            "peak_bytes": self.peak_bytes,
+        }
+
+
+class SparseProfiler:
+    """Records the phases and passes run inside its context.
+
+    Use :py:func:`tvm.sparse.profile` to create one.
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Whether to trace the host memory with tracemalloc, which slows Python code down.
+    """
+
+    def __init__(self, trace_memory: bool = True) -> None:
+        self.trace_memory = trace_memory
+        self.records: List[PhaseRecord] = []
+        self._stack: List[PhaseRecord] = []
+        self._pass_ctx: Optional[PassContext] = None
+        self._started_tracemalloc = False
+
+    def _begin(self, name: str, kind: str) -> PhaseRecord:
+        record = PhaseRecord(name, kind, len(self._stack))
+        self.records.append(record)
+        if self.trace_memory:
+            current, peak = _traced_memory()
+            if self._stack:
+                self._stack[-1]._max_traced = max(self._stack[-1]._max_traced, peak)
+            _reset_peak()
+            record._start_traced = current
+            record._max_traced = current
+        self._stack.append(record)
+        record._start_time = time.perf_counter()
+        return record
+
+    def _end(self, record: PhaseRecord) -> None:
+        record.wall_ms += (time.perf_counter() - record._start_time) * 1000
+        while self._stack and self._stack.pop() is not record:
+            pass
+        if self.trace_memory:
+            _, peak = _traced_memory()
+            peak = max(peak, record._max_traced)
+            record.peak_host_bytes = peak - record._start_traced
+            if self._stack:
+                self._stack[-1]._max_traced = max(self._stack[-1]._max_traced, peak)
+            _reset_peak()
+
+    def phase(self, name: str, device: Optional[Device] = None) -> "_Phase":
+        """Record a phase.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        device : Optional[Device]
+            The device to synchronize with at the end of the phase, so that asynchronous kernel
+            launches are accounted for.
+        """
+        return _Phase(self, name, device)
+
+    def __enter__(self) -> "SparseProfiler":
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        cur = PassContext.current()
+        self._pass_ctx = PassContext(
+            opt_level=cur.opt_level,
+            required_pass=list(cur.required_pass),
+            disabled_pass=list(cur.disabled_pass),
+            instruments=list(cur.instruments) + [_PassProfiler(self)],
+            config=cur.config,
+        )
+        self._pass_ctx.__enter__()
+        _ACTIVE.append(self)
+        return self
+
+    def __exit__(self, ptype, value, trace) -> None:
+        _ACTIVE.remove(self)
+        self._pass_ctx.__exit__(ptype, value, trace)
+        self._pass_ctx = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """The total wall time, peak memory and count of every phase and pass, by name."""
+        result: Dict[str, Dict[str, float]] = {}
+        for record in self.records:
+            entry = result.setdefault(
+                record.name, {"kind": record.kind, "count": 0, "wall_ms": 0.0, "peak_bytes": 0}
+            )
+            entry["count"] += 1
+            entry["wall_ms"] += record.wall_ms
+            entry["peak_bytes"] = max(entry["peak_bytes"], record.peak_bytes)
+        return result
+
+    def json(self) -> str:
+        """The records, in the order they started, and their summary as a JSON string."""
+        return json.dumps(
+            {"records": [r.as_dict() for r in self.records], "summary": self.summary()}, indent=2
+        )
+
+    def table(self) -> str:
+        """The records, in the order they started and indented by nesting, as a table."""
+        lines = [
+            "{:<48}{:>7}{:>14}{:>16}{:>16}".format(
+                "Name", "Kind", "Wall (ms)", "Host peak (B)", "NDArray (B)"
+            )
+        ]
+        for r in self.records:
+            lines.append(
+                "{:<48}{:>7}{:>14.3f}{:>16}{:>16}".format(
+                    ("  " * r.depth + r.name)[:47],
+                    r.kind,
+                    r.wall_ms,
+                    r.peak_host_bytes,
+                    r.ndarray_bytes,
+                )
+            )
+        return "\n".join(lines)
+
+
+class _Phase:
+    def __init__(self, profiler: SparseProfiler, name: str, device: Optional[Device]) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.device = device
+        self.record: Optional[PhaseRecord] = None
+
+    def __enter__(self) -> PhaseRecord:
+        self.record = self.profiler._begin(self.name, "phase")
+        return self.record
+
+    def __exit__(self, ptype, value, trace) -> None:
+        if self.device is not None:
+            self.device.sync()
+        self.profiler._end(self.record)
+
+
+@pass_instrument
+class _PassProfiler:
+    """Records every pass as a nested record of the running phase."""
+
+    def __init__(self, profiler: SparseProfiler) -> None:
+        self.profiler = profiler
+        self.running: List[PhaseRecord] = []
+
+    def run_before_pass(self, mod, info):
+        self.running.append(self.profiler._begin(info.name, "pass"))
+
+    def run_after_pass(self, mod, info):
+        self.profiler._end(self.running.pop())
+
+
+def profile(trace_memory: bool = True) -> SparseProfiler:
+    """Profile the phases and passes of a SparseTIR workflow.
+
+    Parameters
+    ----------
+    trace_memory : bool
+        Whether to trace the host memory with tracemalloc, which slows Python code down.
+
+    Returns
+    -------
+    SparseProfiler
+        The profiler, to be used as a context manager.
+    """
+    return SparseProfiler(trace_memory)
+
+
+def ir_node_count(mod) -> int:
+    """The number of statements and expressions in the bodies of the PrimFuncs of a module, a
+    measure of the IR size that does not depend on the machine.
+
+    Parameters
+    ----------
+    mod : Union[IRModule, PrimFunc]
+        The module or function.
+
+    Returns
+    -------
+    int
+        The number of nodes.
+    """
+    funcs = mod.functions.values() if isinstance(mod, IRModule) else [mod]
+    count = 0
+
+    def visit(_):
+        nonlocal count
+        count += 1
+
+    for func in funcs:
+        if isinstance(func, PrimFunc):
+            post_order_visit(func.body, visit)
+    return count
+
+
+def profiled(name: str):
+    """Record the calls of the decorated function as phases of the active profiler, and the
+    bytes of the NDArrays it returns."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _ACTIVE:
+                return func(*args, **kwargs)
+            profiler = _ACTIVE[-1]
+            record = profiler._begin(name, "phase")
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                profiler._end(record)
+            record.ndarray_bytes = _ndarray_bytes(result)
+            return result
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,291 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Storage of the values of sparse buffers in float16, bfloat16 or int8.
+
+`quantize_sparse_buffer` changes the storage dtype of a sparse buffer of a kernel, while the
+kernel keeps computing in the dtype the buffer was declared with, e.g. float32: every read of
+the buffer is converted, and the reads of an int8 buffer are multiplied by the scale of their
+row, held by a new float32 sparse buffer over all the axes of the buffer but the last one.
+`quantize_values` converts the value arrays, e.g. the data of a CSR matrix or the arrays of the
+buckets of `column_part_hyb`, and computes the scales.
+
+Example
+-------
+.. code-block:: python
+
+    mod = format_decompose(mod, rules)
+    for rule in rules:
+        mod["main"] = quantize_sparse_buffer(mod["main"], "a_" + rule.name, "int8")
+    ...
+    # the values of every bucket, with one scale per ELL row
+    values, scales = quantize_values(mask[part_id][bucket_id], "int8")
+    arrays["a_" + rule.name], arrays["scale_a_" + rule.name] = values, scales
+"""
+from typing import Optional, Tuple
+
+import numpy as np
+
+import tvm
+from tvm.ir import PointerType, PrimType
+from tvm.runtime import Device, NDArray
+from tvm.tir import PrimFunc
+from tvm.tir.sparse import SparseBuffer
+from tvm.tir.stmt_functor import ir_transform, post_order_visit
+
+VALUE_DTYPES = ("float16", "bfloat16", "int8")
+
+
+def _check_dtype(dtype: str) -> None:
+    if dtype not in VALUE_DTYPES:
+        raise ValueError("Expected one of {}, but got {}".format(VALUE_DTYPES, dtype))
+
+
+def quantize_sparse_buffer(
+    func: PrimFunc, param: str, dtype: str, scale_param: Optional[str] = None
+) -> PrimFunc:
+    """Store the values of a sparse buffer in float16, bfloat16 or int8.
+
+    The function is at the level of sparse iterations, e.g. returned by `format_decompose`,
+    before `lower_sparse_iter`. The float16 and bfloat16 buffers may be written, the int8 ones
+    are read only.
+
+    Parameters
+    ----------
+    func : PrimFunc
+        The function.
+    param : str
+        The name of the parameter bound to the sparse buffer.
+    dtype : str
+        The storage dtype, one of "float16", "bfloat16" and "int8".
+    scale_param : Optional[str]
+        The name of the parameter of the scales of an int8 buffer, appended to the parameters.
+        `"scale_" + param` if None, so that the scales of a bucket are packed by `pack_params`
+        with the other arrays of its rule.
+
+    Returns
+    -------
+    PrimFunc
+        The function.
+    """
+    _check_dtype(dtype)
+    params = {p.name: p for p in func.params}
+    if param not in params or not isinstance(func.buffer_map.get(params[param]), SparseBuffer):
+        raise KeyError("{} is not a sparse buffer parameter".format(param))
+    old_buf = func.buffer_map[params[param]]
+    compute_dtype = old_buf.dtype
+    if not compute_dtype.startswith("float"):
+        raise ValueError(
+            "Expected a floating point buffer {}, but got {}".format(old_buf.name, compute_dtype)
+        )
+    new_buf = SparseBuffer(
+        tvm.tir.Var(old_buf.name, PointerType(PrimType(dtype), "global")),
+        old_buf.axes,
+        dtype,
+        old_buf.name,
+        old_buf.extra_storage,
+        # the default value is in the compute dtype, the sparse buffer requires its own dtype
+        tvm.tir.Cast(dtype, old_buf.default_value),
+        old_buf.span,
+    )
+    scale_buf = None
+    if dtype == "int8":
+        if len(old_buf.axes) < 2:
+            raise ValueError("The int8 buffer {} has no rows".format(old_buf.name))
+        stores = []
+        post_order_visit(
+            func.body,
+            lambda node: stores.append(node)
+            if isinstance(node, tvm.tir.BufferStore) and node.buffer == old_buf
+            else None,
+        )
+        if stores:
+            raise ValueError("The int8 buffer {} is written".format(old_buf.name))
+        scale_buf = SparseBuffer(
+            tvm.tir.Var(old_buf.name + "_scale", PointerType(PrimType(compute_dtype), "global")),
+            old_buf.axes[:-1],
+            compute_dtype,
+            old_buf.name + "_scale",
+            None,
+            None,
+            old_buf.span,
+        )
+
+    def postorder(op):
+        if op.buffer != old_buf:
+            return None
+        if isinstance(op, tvm.tir.BufferLoad):
+            value = tvm.tir.Cast(compute_dtype, tvm.tir.BufferLoad(new_buf, op.indices, op.span))
+            if scale_buf is not None:
+                value = value * tvm.tir.BufferLoad(scale_buf, op.indices[:-1], op.span)
+            return value
+        return tvm.tir.BufferStore(new_buf, tvm.tir.Cast(dtype, op.value), op.indices, op.span)
+
+    body = ir_transform(func.body, None, postorder, ["tir.BufferLoad", "tir.BufferStore"])
+    new_params = list(func.params)
+    buffer_map = dict(func.buffer_map)
+    buffer_map[params[param]] = new_buf
+    if scale_buf is not None:
+        scale_var = tvm.tir.Var(scale_param if scale_param else "scale_" + param, "handle")
+        new_params.append(scale_var)
+        buffer_map[scale_var] = scale_buf
+    return PrimFunc(
+        new_params,
+        body,
+        ret_type=func.ret_type,
+        buffer_map=buffer_map,
+        preflattened_buffer_map=func.preflattened_buffer_map,
+        sp_axes=func.sp_axes,
+        attrs=func.attrs,
+    )
+
+
+def _to_numpy(arr) -> np.ndarray:
+    if isinstance(arr, NDArray):
+        if arr.dtype == "bfloat16":
+            # numpy has no bfloat16, read the bits
+            bits = tvm.nd.empty(arr.shape, "uint16")
+            arr.copyto(bits)
+            return bits.numpy()
+        return arr.numpy()
+    return np.asarray(arr)
+
+
+def _row_reduce(values: np.ndarray, indptr: Optional[np.ndarray]) -> np.ndarray:
+    """The largest absolute value of every row, zero for empty rows."""
+    if indptr is None:
+        return np.abs(values).max(axis=-1, initial=0)
+    result = np.zeros(len(indptr) - 1, values.dtype)
+    nonempty = np.diff(indptr) > 0
+    if nonempty.any():
+        result[nonempty] = np.maximum.reduceat(
+            np.abs(values[: indptr[-1]]), indptr[:-1][nonempty]
+        )
+    return result
+
+
+def _expand_rows(scales: np.ndarray, indptr: Optional[np.ndarray]) -> np.ndarray:
+    if indptr is None:
+        return scales[..., None]
+    return np.repeat(scales, np.diff(indptr))
+
+
+def float_to_bfloat16(values) -> np.ndarray:
+    """The bits of the bfloat16 values nearest to float32 values, rounding half to even.
+
+    Parameters
+    ----------
+    values : Union[NDArray, np.ndarray]
+        The values.
+
+    Returns
+    -------
+    np.ndarray
+        The bits, of dtype uint16.
+    """
+    values = np.ascontiguousarray(_to_numpy(values), dtype="float32")
+    bits = values.view("uint32")
+    rounded = (bits + 0x7FFF + ((bits >> 16) & 1)) >> 16
+    # keep NaNs quiet instead of rounding them to infinity
+    return np.where(np.isnan(values), 0x7FC0, rounded).astype("uint16")
+
+
+def bfloat16_to_float(bits) -> np.ndarray:
+    """The float32 values of bfloat16 bits.
+
+    Parameters
+    ----------
+    bits : Union[NDArray, np.ndarray]
+        The bits, of dtype uint16, or a bfloat16 NDArray.
+
+    Returns
+    -------
+    np.ndarray
+        The values.
+    """
+    bits = np.ascontiguousarray(_to_numpy(bits), dtype="uint16")
+    return (bits.astype("uint32") << 16).view("float32")
+
+
+def quantize_values(
+    values, dtype: str, indptr=None, device: Optional[Device] = None
+) -> Tuple[NDArray, Optional[NDArray]]:
+    """Convert the values of a sparse matrix to the storage dtype of `quantize_sparse_buffer`.
+
+    Parameters
+    ----------
+    values : Union[NDArray, np.ndarray]
+        The float32 values.
+    dtype : str
+        The storage dtype, one of "float16", "bfloat16" and "int8".
+    indptr : Optional[Union[NDArray, np.ndarray]]
+        The offset of every row in `values`, e.g. for the data of a CSR matrix. If None, the rows
+        are the last axis of `values`, e.g. for the values of an ELL bucket.
+    device : Optional[Device]
+        The device of the result, cpu if None.
+
+    Returns
+    -------
+    Tuple[NDArray, Optional[NDArray]]
+        The converted values, and for int8 the float32 scale of every row, such that a value is
+        its int8 value times the scale of its row.
+    """
+    _check_dtype(dtype)
+    device = device if device is not None else tvm.cpu()
+    values = _to_numpy(values).astype("float32")
+    indptr = _to_numpy(indptr).astype("int64") if indptr is not None else None
+    if dtype == "float16":
+        return tvm.nd.array(values.astype("float16"), device), None
+    if dtype == "bfloat16":
+        arr = tvm.nd.empty(values.shape, "bfloat16", device)
+        return arr.copyfrom(float_to_bfloat16(values)), None
+    # symmetric quantization, the largest value of a row is 127
+    scales = _row_reduce(values, indptr) / 127
+    scales[scales == 0] = 1
+    quantized = np.clip(np.rint(values / _expand_rows(scales, indptr)), -127, 127)
+    return (
+        tvm.nd.array(quantized.astype("int8"), device),
+        tvm.nd.array(scales.astype("float32"), device),
+    )
+
+
+def dequantize_values(values, scales=None, indptr=None) -> np.ndarray:
+    """The float32 values of the values converted by `quantize_values`.
+
+    Parameters
+    ----------
+    values : Union[NDArray, np.ndarray]
+        The converted values, bfloat16 as an NDArray or its uint16 bits.
+    scales : Optional[Union[NDArray, np.ndarray]]
+        The scales of the rows of int8 values.
+    indptr : Optional[Union[NDArray, np.ndarray]]
+        The offset of every row in `values`, the rows are the last axis of `values` if None.
+
+    Returns
+    -------
+    np.ndarray
+        The values.
+    """
+    arr = _to_numpy(values)
+    if arr.dtype == np.uint16:
+        return bfloat16_to_float(arr)
+    if arr.dtype == np.int8:
+        if scales is None:
+            raise ValueError("The scales of int8 values are required")
+        indptr = _to_numpy(indptr).astype("int64") if indptr is not None else None
+        return arr.astype("float32") * _expand_rows(_to_numpy(scales), indptr)
+    return arr.astype("float32")
@@ -0,0 +1,583 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Reduction strategies for the outputs of the buckets of a HYB format.
+
+A row of the output of SpMM on a HYB format is written by several ELL rows when it is split in
+the last bucket, or when its non-zeros fall in several column partitions. Atomic additions
+serialize the writes to the rows of hub nodes. `plan_reduction` chooses, per bucket and from the
+rows of the actual graph, between:
+
+- "store": the rows of the bucket are written by no other ELL row, no atomic is needed.
+- "atomic": few ELL rows write the same row, atomic additions are cheap.
+- "private": the rows are shared with other column partitions only. Every partition adds into
+  its own copy of the output, and the copies are added to the output by a reduction kernel.
+- "segmented": every ELL row writes its own partial row, and a segmented reduction kernel adds
+  the partial rows of every output row.
+
+Example
+-------
+.. code-block:: python
+
+    plan = plan_reduction(row_indices, m, feat_size)
+    # schedule, annotating the blocks of the buckets with plan.is_atomic(part_id, bucket_id)
+    ...
+    mod = lower_sparse_buffer(sch.mod)
+    func = plan.apply(mod["main"])
+    f = tvm.build(func, target="cuda")
+    reduce = plan.build_reduce("cuda", tvm.cuda(0))
+    buffers = plan.make_buffers(tvm.cuda(0))
+    f(*args, *buffers.values())  # c is zero-initialized
+    reduce(c, buffers)
+"""
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+import tvm
+from tvm.runtime import Device, NDArray
+from tvm.script import tir as T
+from tvm.tir import PrimFunc
+from tvm.tir.stmt_functor import ir_transform, post_order_visit
+
+from .interop import as_ndarray
+
+STRATEGIES = ("store", "atomic", "private", "segmented")
+
+
+@T.prim_func(lazy=True)
+def _private_reduce(c: T.handle, c_private: T.handle, num_slots: T.int32, size: T.int32) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True})
+    C = T.match_buffer(c, (size,), "float32")
+    C_private = T.match_buffer(c_private, (num_slots * size,), "float32")
+    for i, p in T.grid(size, num_slots):
+        with T.block("private_reduce"):
+            vi, vp = T.axis.remap("SR", [i, p])
+            C[vi] = C[vi] + C_private[vp * size + vi]
+
+
+@T.prim_func(lazy=True)
+def _segment_reduce(
+    c: T.handle,
+    partial: T.handle,
+    seg_indptr: T.handle,
+    seg_perm: T.handle,
+    seg_rows: T.handle,
+    num_rows: T.int32,
+    num_ell_rows: T.int32,
+    num_segments: T.int32,
+    row_size: T.int32,
+) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True})
+    C = T.match_buffer(c, (num_rows * row_size,), "float32")
+    Partial = T.match_buffer(partial, (num_ell_rows * row_size,), "float32")
+    Seg_indptr = T.match_buffer(seg_indptr, (num_segments + 1,), "int32")
+    Seg_perm = T.match_buffer(seg_perm, (num_ell_rows,), "int32")
+    Seg_rows = T.match_buffer(seg_rows, (num_segments,), "int32")
+    for s, k in T.grid(num_segments, row_size):
+        with T.block("segment_reduce"):
+            vs, vk = T.axis.remap("SS", [s, k])
+            for e in T.serial(Seg_indptr[vs + 1] - Seg_indptr[vs]):
+                C[Seg_rows[vs] * row_size + vk] = (
+                    C[Seg_rows[vs] * row_size + vk]
+                    + Partial[Seg_perm[Seg_indptr[vs] + e] * row_size + vk]
+                )
+
+
+class BucketContention:
+    """The writes to the output rows of a bucket.
+
+    Parameters
+    ----------
+    num_ell_rows : int
+        The number of ELL rows of the bucket.
+    max_multiplicity : int
+        The most ELL rows of the bucket writing the same output row, more than one when rows are
+        split.
+    max_partition_multiplicity : int
+        The most ELL rows of the column partition of the bucket writing the same output row as an
+        ELL row of the bucket.
+    max_contention : int
+        The most ELL rows of all buckets writing the same output row as an ELL row of the bucket,
+        i.e. the longest chain of atomic additions on its rows.
+    num_conflicts : int
+        The number of ELL rows of the bucket whose output row is written by another ELL row.
+    """
+
+    def __init__(
+        self,
+        num_ell_rows: int,
+        max_multiplicity: int,
+        max_partition_multiplicity: int,
+        max_contention: int,
+        num_conflicts: int,
+    ) -> None:
+        self.num_ell_rows = num_ell_rows
+        self.max_multiplicity = max_multiplicity
+        self.max_partition_multiplicity = max_partition_multiplicity
+        self.max_contention = max_contention
+        self.num_conflicts = num_conflicts
+
+    def __repr__(self) -> str:
+        return (
+            "BucketContention(num_ell_rows={}, max_multiplicity={}, "
+            "max_partition_multiplicity={}, max_contention={}, num_conflicts={})".format(
+                self.num_ell_rows,
+                self.max_multiplicity,
+                self.max_partition_multiplicity,
+                self.max_contention,
+                self.num_conflicts,
+            )
+        )
+
+
+def _to_numpy(arr) -> np.ndarray:
+    if isinstance(arr, NDArray):
+        return arr.numpy()
+    return np.asarray(arr)
+
+
+def bucket_contention(row_indices, num_rows: int) -> List[List[BucketContention]]:
+    """The contention on the output rows of every bucket.
+
+    Parameters
+    ----------
+    row_indices : List[List[Union[NDArray, np.ndarray]]]
+        The output row of every ELL row, by column partition and bucket, as returned by
+        `column_part_hyb`.
+    num_rows : int
+        The number of output rows.
+
+    Returns
+    -------
+    List[List[BucketContention]]
+        The contention, by column partition and bucket.
+    """
+    rows = [[_to_numpy(arr).astype("int64") for arr in part] for part in row_indices]
+    part_mult = [
+        np.bincount(np.concatenate(part), minlength=num_rows)
+        if part
+        else np.zeros(num_rows, "int64")
+        for part in rows
+    ]
+    total_mult = sum(part_mult, np.zeros(num_rows, "int64"))
+    result = []
+    for part, mult in zip(rows, part_mult):
+        result.append([])
+        for bucket_rows in part:
+            if bucket_rows.size == 0:
+                result[-1].append(BucketContention(0, 0, 0, 0, 0))
+                continue
+            result[-1].append(
+                BucketContention(
+                    int(bucket_rows.size),
+                    int(np.bincount(bucket_rows).max()),
+                    int(mult[bucket_rows].max()),
+                    int(total_mult[bucket_rows].max()),
+                    int((total_mult[bucket_rows] > 1).sum()),
+                )
+            )
+    return result
+
+
+class ReductionPlan:
+    """The reduction strategy of every bucket of a HYB format, and the buffers and kernels they
+    need.
+
+    Use :py:func:`tvm.sparse.plan_reduction` to create one.
+
+    Parameters
+    ----------
+    row_indices : List[List[np.ndarray]]
+        The output row of every ELL row, by column partition and bucket.
+    contention : List[List[BucketContention]]
+        The contention, by column partition and bucket.
+    strategies : List[List[str]]
+        The strategy, by column partition and bucket.
+    num_rows : int
+        The number of output rows.
+    row_size : int
+        The number of elements of an output row.
+    rule_names : List[List[str]]
+        The names of the FormatRewriteRules of the buckets, by column partition and bucket.
+    """
+
+    def __init__(
+        self,
+        row_indices: List[List[np.ndarray]],
+        contention: List[List[BucketContention]],
+        strategies: List[List[str]],
+        num_rows: int,
+        row_size: int,
+        rule_names: List[List[str]],
+    ) -> None:
+        self.row_indices = row_indices
+        self.contention = contention
+        self.strategies = strategies
+        self.num_rows = num_rows
+        self.row_size = row_size
+        self.rule_names = rule_names
+        # the partitions with a private copy of the output, in the order of their slots
+        self.private_parts = [
+            part_id for part_id, part in enumerate(strategies) if "private" in part
+        ]
+        self.segmented = [
+            (part_id, bucket_id)
+            for part_id, part in enumerate(strategies)
+            for bucket_id, strategy in enumerate(part)
+            if strategy == "segmented"
+        ]
+
+    def strategy(self, part_id: int, bucket_id: int) -> str:
+        """The strategy of a bucket."""
+        return self.strategies[part_id][bucket_id]
+
+    def is_atomic(self, part_id: int, bucket_id: int) -> bool:
+        """Whether the writes of a bucket to its output have to be atomic."""
+        return self.strategy(part_id, bucket_id) == "atomic"
+
+    def buffer_names(self, output: str = "c") -> List[str]:
+        """The names of the parameters `apply` adds to the kernel, in order."""
+        names = [output + "_private"] if self.private_parts else []
+        names += [output + "_partial{}".format(i) for i in range(len(self.segmented))]
+        return names
+
+    def apply(
+        self, func: PrimFunc, output: str = "c", row_indices: str = "indices_i"
+    ) -> PrimFunc:
+        """Redirect the writes of the private and segmented buckets of a kernel.
+
+        The kernel is lowered by `lower_sparse_buffer`, and its parameters are not packed yet.
+        The private copies of the output and the partial rows of the segmented buckets are
+        appended to its parameters, named as `buffer_names` returns.
+
+        Parameters
+        ----------
+        func : PrimFunc
+            The kernel.
+        output : str
+            The name of the output parameter.
+        row_indices : str
+            The prefix of the parameters holding the output row of every ELL row, suffixed by the
+            rule names.
+
+        Returns
+        -------
+        PrimFunc
+            The rewritten kernel.
+        """
+        params = {param.name: param for param in func.params}
+        if output not in params or params[output] not in func.buffer_map:
+            raise KeyError("{} is not a buffer parameter".format(output))
+        out_buf = func.buffer_map[params[output]]
+        if len(out_buf.shape) != 1 or int(out_buf.shape[0]) != self.num_rows * self.row_size:
+            raise ValueError(
+                "Expected a 1-D output of {} elements, but got shape {}".format(
+                    self.num_rows * self.row_size, out_buf.shape
+                )
+            )
+        names = self.buffer_names(output)
+        new_buffers = []
+        if self.private_parts:
+            size = len(self.private_parts) * self.num_rows * self.row_size
+            new_buffers.append(tvm.tir.decl_buffer((size,), out_buf.dtype, names[0]))
+        # the redirection of the writes of every row index buffer
+        redirects: Dict[tvm.tir.Buffer, Tuple[str, int, Optional[tvm.tir.Buffer]]] = {}
+        for part_id, part in enumerate(self.strategies):
+            for bucket_id, strategy in enumerate(part):
+                if strategy not in ["private", "segmented"]:
+                    continue
+                name = "{}_{}".format(row_indices, self.rule_names[part_id][bucket_id])
+                if name not in params or params[name] not in func.buffer_map:
+                    raise KeyError("{} is not a buffer parameter".format(name))
+                if strategy == "private":
+                    slot = self.private_parts.index(part_id)
+                    redirects[func.buffer_map[params[name]]] = (strategy, slot, new_buffers[0])
+                else:
+                    i = self.segmented.index((part_id, bucket_id))
+                    size = self.contention[part_id][bucket_id].num_ell_rows * self.row_size
+                    buf = tvm.tir.decl_buffer(
+                        (max(size, 1),), out_buf.dtype, names[len(new_buffers)]
+                    )
+                    new_buffers.append(buf)
+                    redirects[func.buffer_map[params[name]]] = (strategy, i, buf)
+
+        def redirect(index):
+            loads = []
+            post_order_visit(
+                index,
+                lambda node: loads.append(node)
+                if isinstance(node, tvm.tir.BufferLoad) and node.buffer in redirects
+                else None,
+            )
+            if not loads:
+                return None
+            strategy, slot, buf = redirects[loads[0].buffer]
+            if strategy == "private":
+                return buf, index + slot * self.num_rows * self.row_size
+            # the ELL row instead of the output row
+            new_index = ir_transform(
+                tvm.tir.Evaluate(index),
+                None,
+                lambda op: op.indices[0] if op.buffer in redirects else None,
+                ["tir.BufferLoad"],
+            ).value
+            return buf, new_index
+
+        def postorder(op):
+            if isinstance(op, tvm.tir.Block):
+                return rewrite_block(op)
+            if op.buffer != out_buf:
+                return None
+            redirected = redirect(op.indices[0])
+            if redirected is None:
+                return None
+            buf, index = redirected
+            if isinstance(op, tvm.tir.BufferLoad):
+                return tvm.tir.BufferLoad(buf, [index], op.span)
+            return tvm.tir.BufferStore(buf, op.value, [index], op.span)
+
+        def rewrite_block(op):
+            accessed = set()
+            for stmt in [op.body, op.init]:
+                if stmt is not None:
+                    post_order_visit(
+                        stmt,
+                        lambda node: accessed.add(node.buffer)
+                        if isinstance(node, (tvm.tir.BufferLoad, tvm.tir.BufferStore))
+                        else None,
+                    )
+            targets = [buf for buf in new_buffers if buf in accessed]
+            if not targets:
+                return None
+
+            def rewrite_regions(regions):
+                new_regions = [r for r in regions if r.buffer != out_buf]
+                if len(new_regions) == len(regions):
+                    return regions
+                if out_buf in accessed:
+                    new_regions += [r for r in regions if r.buffer == out_buf]
+                for buf in targets:
+                    new_regions.append(
+                        tvm.tir.BufferRegion(buf, [tvm.ir.Range.from_min_extent(0, buf.shape[0])])
+                    )
+                return new_regions
+
+            return tvm.tir.Block(
+                op.iter_vars,
+                rewrite_regions(op.reads),
+                rewrite_regions(op.writes),
+                op.name_hint,
+                op.body,
+                op.init,
+                op.alloc_buffers,
+                op.match_buffers,
+                op.buf_doms,
+                op.annotations,
+            )
+
+        body = ir_transform(
+            func.body, None, postorder, ["tir.BufferLoad", "tir.BufferStore", "tir.Block"]
+        )
+        new_params = list(func.params)
+        buffer_map = dict(func.buffer_map)
+        for buf in new_buffers:
+            var = tvm.tir.Var(buf.name, "handle")
+            new_params.append(var)
+            buffer_map[var] = buf
+        return PrimFunc(
+            new_params,
+            body,
+            ret_type=func.ret_type,
+            buffer_map=buffer_map,
+            preflattened_buffer_map=func.preflattened_buffer_map,
+            sp_axes=func.sp_axes,
+            attrs=func.attrs,
+        )
+
+    def make_buffers(self, device: Optional[Device] = None, dtype: str = "float32"):
+        """Allocate the zero-initialized private copies and partial rows added by `apply`.
+
+        Parameters
+        ----------
+        device : Optional[Device]
+            The device of the buffers, cpu if None.
+        dtype : str
+            The dtype of the output.
+
+        Returns
+        -------
+        Dict[str, NDArray]
+            The buffers, by parameter name, in the order of the parameters.
+        """
+        device = device if device is not None else tvm.cpu()
+        sizes = []
+        if self.private_parts:
+            sizes.append(len(self.private_parts) * self.num_rows * self.row_size)
+        for part_id, bucket_id in self.segmented:
+            sizes.append(max(self.contention[part_id][bucket_id].num_ell_rows * self.row_size, 1))
+        return {
+            name: tvm.nd.array(np.zeros(size, dtype), device)
+            for name, size in zip(self.buffer_names(), sizes)
+        }
+
+    def build_reduce(self, target="llvm", device: Optional[Device] = None):
+        """Build the kernels adding the private copies and the partial rows to the output.
+
+        Parameters
+        ----------
+        target : Union[str, Target]
+            The target of the kernels.
+        device : Optional[Device]
+            The device of the kernels, cpu if None.
+
+        Returns
+        -------
+        Callable[[NDArray, Dict[str, NDArray]], None]
+            The reduction, called with the output and the buffers returned by `make_buffers` once
+            the kernel returned. It does nothing if no bucket is private or segmented.
+        """
+        device = device if device is not None else tvm.cpu()
+        target = tvm.target.Target(target)
+        names = self.buffer_names()
+        kernels = []
+        if self.private_parts:
+            num_slots, size = _private_reduce.params[-2:]
+            func = _private_reduce.specialize(
+                {num_slots: len(self.private_parts), size: self.num_rows * self.row_size}
+            )
+            f = tvm.build(_schedule_reduce(func, "private_reduce", target), target=target)
+            kernels.append((f, names[0], []))
+        for i, (part_id, bucket_id) in enumerate(self.segmented):
+            rows = self.row_indices[part_id][bucket_id]
+            perm = np.argsort(rows, kind="stable")
+            seg_rows, starts = np.unique(rows[perm], return_index=True)
+            seg_indptr = np.append(starts, rows.size)
+            func = _segment_reduce.specialize(
+                dict(
+                    zip(
+                        _segment_reduce.params[-4:],
+                        [self.num_rows, rows.size, seg_rows.size, self.row_size],
+                    )
+                )
+            )
+            f = tvm.build(_schedule_reduce(func, "segment_reduce", target), target=target)
+            seg_args = [
+                as_ndarray(arr.astype("int32"), device=device)
+                for arr in [seg_indptr, perm, seg_rows]
+            ]
+            kernels.append((f, names[len(kernels)], seg_args))
+
+        def reduce(c, buffers: Dict[str, NDArray]) -> None:
+            for f, name, seg_args in kernels:
+                f(c, buffers[name], *seg_args)
+
+        return reduce
+
+    def __repr__(self) -> str:
+        return "ReductionPlan({})".format(self.strategies)
+
+
+def _schedule_reduce(func: PrimFunc, block_name: str, target) -> PrimFunc:
+    """Parallelize the spatial loops of a reduction kernel."""
+    sch = tvm.tir.Schedule(func)
+    blk = sch.get_block(block_name)
+    outer = sch.get_loops(blk)[0] if block_name == "private_reduce" else sch.fuse(
+        *sch.get_loops(blk)[:2]
+    )
+    if "gpu" in target.keys:
+        bx, tx = sch.split(outer, [None, 256])
+        sch.bind(bx, "blockIdx.x")
+        sch.bind(tx, "threadIdx.x")
+    else:
+        sch.parallel(outer)
+    return sch.mod["main"]
+
+
+def plan_reduction(
+    row_indices,
+    num_rows: int,
+    row_size: int,
+    rule_names: Optional[Sequence[Sequence[str]]] = None,
+    atomic_threshold: int = 4,
+    private_budget: int = 1 << 30,
+    dtype: str = "float32",
+) -> ReductionPlan:
+    """Choose the reduction strategy of every bucket from the contention on its output rows.
+
+    A bucket whose rows are written by no other ELL row is "store". Otherwise it is "atomic"
+    when at most `atomic_threshold` ELL rows write any of its rows, "private" when its rows are
+    only shared with other column partitions and the private copies of the output fit in
+    `private_budget`, and "segmented" else.
+
+    Parameters
+    ----------
+    row_indices : List[List[Union[NDArray, np.ndarray]]]
+        The output row of every ELL row, by column partition and bucket, as returned by
+        `column_part_hyb`.
+    num_rows : int
+        The number of output rows.
+    row_size : int
+        The number of elements of an output row, e.g. the feature size.
+    rule_names : Optional[Sequence[Sequence[str]]]
+        The names of the FormatRewriteRules of the buckets, by column partition and bucket,
+        "<part_id>_<bucket_id>" if None.
+    atomic_threshold : int
+        The most ELL rows writing the same output row for which atomic additions are used.
+    private_budget : int
+        The most bytes allocated for the private copies of the output.
+    dtype : str
+        The dtype of the output.
+
+    Returns
+    -------
+    ReductionPlan
+        The plan.
+    """
+    if dtype != "float32":
+        raise ValueError("Expected a float32 output, but got {}".format(dtype))
+    rows = [[_to_numpy(arr).astype("int64") for arr in part] for part in row_indices]
+    contention = bucket_contention(rows, num_rows)
+    if rule_names is None:
+        rule_names = [
+            ["{}_{}".format(part_id, bucket_id) for bucket_id in range(len(part))]
+            for part_id, part in enumerate(rows)
+        ]
+    strategies = []
+    for part in contention:
+        strategies.append([])
+        for stats in part:
+            if stats.num_conflicts == 0:
+                strategies[-1].append("store")
+            elif stats.max_contention <= atomic_threshold:
+                strategies[-1].append("atomic")
+            elif stats.max_partition_multiplicity == 1:
+                strategies[-1].append("private")
+            else:
+                strategies[-1].append("segmented")
+    # the private copies that do not fit are replaced by segmented reductions
+    copy_bytes = num_rows * row_size * np.dtype(dtype).itemsize
+    num_copies = 0
+    for part in strategies:
+        if "private" in part:
+            if (num_copies + 1) * copy_bytes <= private_budget:
+                num_copies += 1
+            else:
+                part[:] = ["segmented" if s == "private" else s for s in part]
+    return ReductionPlan(
+        rows, contention, strategies, num_rows, row_size, [list(names) for names in rule_names]
+    )
@@ -0,0 +1,217 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name
+"""Synthetic sparse matrices for testing and benchmarking SparseTIR without datasets.
+
+Every generator is deterministic given its seed and returns a scipy CSR matrix of float32
+values with sorted, duplicate-free column indices.
+"""
+from typing import Callable, Dict
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def _finalize(rows: np.ndarray, cols: np.ndarray, shape, rng: np.random.Generator) -> sp.csr_matrix:
+    mat = sp.csr_matrix(
+        (np.ones(len(rows), dtype="float32"), (rows, cols)), shape=shape, dtype="float32"
+    )
+    mat.sum_duplicates()
+    mat.data = rng.random(mat.nnz, dtype="float32")
+    return mat
+
+
+def uniform(num_rows: int, num_cols: int, density: float, seed: int = 0) -> sp.csr_matrix:
+    """A matrix whose non-zeros are placed uniformly at random.
+
+    Parameters
+    ----------
+    num_rows : int
+        The number of rows.
+    num_cols : int
+        The number of columns.
+    density : float
+        The fraction of non-zeros.
+    seed : int
+        The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    nnz = int(round(num_rows * num_cols * density))
+    return _finalize(
+        rng.integers(0, num_rows, nnz), rng.integers(0, num_cols, nnz), (num_rows, num_cols), rng
+    )
+
+
+def power_law(
+    num_rows: int, num_cols: int, avg_degree: float, alpha: float = 2.0, seed: int = 0
+) -> sp.csr_matrix:
+    """A matrix whose row lengths follow a power law, as the adjacency matrices of social
+    networks and citation graphs do.
+
+    Parameters
+    ----------
+    num_rows : int
+        The number of rows.
+    num_cols : int
+        The number of columns.
+    avg_degree : float
+        The average number of non-zeros per row.
+    alpha : float
+        The exponent of the power law, larger values give fewer long rows.
+    seed : int
+        The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    degrees = rng.pareto(alpha, num_rows) + 1
+    degrees = np.minimum(np.round(degrees * avg_degree / degrees.mean()), num_cols).astype("int64")
+    rows = np.repeat(np.arange(num_rows), degrees)
+    return _finalize(rows, rng.integers(0, num_cols, len(rows)), (num_rows, num_cols), rng)
+
+
+def rmat(
+    scale: int,
+    edge_factor: int = 16,
+    a: float = 0.57,
+    b: float = 0.19,
+    c: float = 0.19,
+    seed: int = 0,
+) -> sp.csr_matrix:
+    """The adjacency matrix of a recursive matrix (R-MAT) graph, as in Graph500.
+
+    Parameters
+    ----------
+    scale : int
+        The matrix has 2 ** scale rows and columns.
+    edge_factor : int
+        The number of generated edges per row, before removing duplicates.
+    a, b, c : float
+        The probabilities of the top-left, top-right and bottom-left quadrants, the
+        bottom-right one takes the rest.
+    seed : int
+        The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    num_edges = (1 << scale) * edge_factor
+    rows = np.zeros(num_edges, dtype="int64")
+    cols = np.zeros(num_edges, dtype="int64")
+    for bit in range(scale):
+        r = rng.random(num_edges)
+        rows |= (r >= a + b).astype("int64") << bit
+        cols |= (((r >= a) & (r < a + b)) | (r >= a + b + c)).astype("int64") << bit
+    return _finalize(rows, cols, (1 << scale, 1 << scale), rng)
+
+
+def banded(num_rows: int, bandwidth: int, seed: int = 0) -> sp.csr_matrix:
+    """A square matrix whose non-zeros are the diagonals at distance at most `bandwidth` from
+    the main one, as the stencils of structured meshes.
+
+    Parameters
+    ----------
+    num_rows : int
+        The number of rows and columns.
+    bandwidth : int
+        The number of diagonals on either side of the main one.
+    seed : int
+        The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    offsets = np.arange(-bandwidth, bandwidth + 1)
+    rows = np.repeat(np.arange(num_rows), len(offsets))
+    cols = rows + np.tile(offsets, num_rows)
+    valid = (cols >= 0) & (cols < num_rows)
+    return _finalize(rows[valid], cols[valid], (num_rows, num_rows), rng)
+
+
+def block_diagonal(
+    num_blocks: int, block_size: int, density: float = 1.0, seed: int = 0
+) -> sp.csr_matrix:
+    """A square block-diagonal matrix, as the adjacency matrix of a batch of small graphs.
+
+    Parameters
+    ----------
+    num_blocks : int
+        The number of diagonal blocks.
+    block_size : int
+        The number of rows and columns of every block.
+    density : float
+        The fraction of non-zeros inside a block.
+    seed : int
+        The random seed.
+    """
+    rng = np.random.default_rng(seed)
+    nnz_per_block = int(round(block_size * block_size * density))
+    block = np.repeat(np.arange(num_blocks), nnz_per_block) * block_size
+    rows = block + rng.integers(0, block_size, len(block))
+    cols = block + rng.integers(0, block_size, len(block))
+    n = num_blocks * block_size
+    return _finalize(rows, cols, (n, n), rng)
+
+
+def _power_law(num_rows, avg_degree, seed):
+    return power_law(num_rows, num_rows, avg_degree, seed=seed)
+
+
+def _rmat(num_rows, avg_degree, seed):
+    return rmat(max(int(num_rows - 1).bit_length(), 1), int(avg_degree), seed=seed)
+
+
+def _banded(num_rows, avg_degree, seed):
+    return banded(num_rows, int(avg_degree) // 2, seed=seed)
+
+
+def _block_diagonal(num_rows, avg_degree, seed):
+    block_size = max(int(avg_degree) * 2, 1)
+    return block_diagonal(max(num_rows // block_size, 1), block_size, 0.5, seed=seed)
+
+
+def _uniform(num_rows, avg_degree, seed):
+    return uniform(num_rows, num_rows, min(avg_degree / num_rows, 1.0), seed=seed)
+
+
+GENERATORS: Dict[str, Callable[[int, float, int], sp.csr_matrix]] = {
+    "power_law": _power_law,
+    "rmat": _rmat,
+    "banded": _banded,
+    "block_diagonal": _block_diagonal,
+    "uniform": _uniform,
+}
+
+
+def generate(name: str, num_rows: int, avg_degree: float = 16, seed: int = 0) -> sp.csr_matrix:
+    """Generate a square synthetic matrix of roughly `num_rows` rows and `avg_degree` non-zeros
+    per row.
+
+    Parameters
+    ----------
+    name : str
+        One of "power_law", "rmat", "banded", "block_diagonal" and "uniform".
+    num_rows : int
+        The number of rows. R-MAT rounds it up to a power of two, block-diagonal down to a
+        multiple of its block size.
+    avg_degree : float
+        The average number of non-zeros per row, before removing duplicates.
+    seed : int
+        The random seed.
+
+    Returns
+    -------
+    scipy.sparse.csr_matrix
+        The matrix.
+    """
+    if name not in GENERATORS:
+        raise KeyError("Unknown synthetic matrix {}.".format(name))
+    return GENERATORS[name](num_rows, avg_degree, seed)
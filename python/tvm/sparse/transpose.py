@@ -0,0 +1,108 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Transpose of sparse matrices on the host."""
+import functools
+from typing import Optional, Tuple
+
+import numpy as np
+
+import tvm
+from tvm import te
+from tvm.runtime import NDArray, ndarray
+
+from .interop import as_ndarray
+from .profiling import profiled
+
+
+@functools.lru_cache(maxsize=None)
+def _transpose_func(dtype: str, idtype: str, num_chunks: int) -> tvm.runtime.Module:
+    """The parallel transpose kernel for any shape, built once per dtype."""
+    from tvm import topi  # pylint: disable=import-outside-toplevel
+
+    nnz = te.var("nnz", idtype)
+    num_rows_plus_1 = te.var("num_rows_plus_1", idtype)
+    num_cols_plus_1 = te.var("num_cols_plus_1", idtype)
+    data = te.placeholder((nnz,), dtype, name="data")
+    indices = te.placeholder((nnz,), idtype, name="indices")
+    indptr = te.placeholder((num_rows_plus_1,), idtype, name="indptr")
+    outs = topi.nn.sparse_transpose(
+        data, indices, indptr, num_cols=num_cols_plus_1 - 1, num_chunks=num_chunks
+    )
+    s = te.create_schedule([out.op for out in outs])
+    return tvm.build(s, [data, indices, indptr] + list(outs), target="llvm")
+
+
+@profiled("csr_transpose")
+def csr_transpose(
+    indptr,
+    indices,
+    data=None,
+    num_cols: Optional[int] = None,
+    idtype: Optional[str] = None,
+    num_chunks: int = 16,
+) -> Tuple[NDArray, NDArray, NDArray]:
+    """Transpose a CSR matrix on the cpu with a parallel counting sort.
+
+    The CSR arrays of the transpose are the CSC arrays of the matrix, so the same routine
+    converts CSR to CSC and CSC to CSR. The kernel is compiled once per dtype and reused for
+    all shapes.
+
+    Parameters
+    ----------
+    indptr : Union[NDArray, np.ndarray, torch.Tensor]
+        The indptr array of the matrix.
+    indices : Union[NDArray, np.ndarray, torch.Tensor]
+        The indices array of the matrix.
+    data : Optional[Union[NDArray, np.ndarray, torch.Tensor]]
+        The values of the matrix. If None, the transpose carries the position of each of its
+        non-zeros in the input instead, e.g. to permute edge features.
+    num_cols : Optional[int]
+        The number of columns. If None, the largest column index plus one, so the trailing empty
+        columns of the matrix are not rows of the transpose.
+    idtype : Optional[str]
+        The dtype of the indices, "int32" or "int64", the one of indices if None.
+    num_chunks : int
+        The number of chunks of rows processed in parallel.
+
+    Returns
+    -------
+    Tuple[NDArray, NDArray, NDArray]
+        The (indptr, indices, data) arrays of the transpose.
+    """
+    indices = as_ndarray(indices, idtype, tvm.cpu())
+    idtype = indices.dtype
+    indptr = as_ndarray(indptr, idtype, tvm.cpu())
+    nnz = indices.shape[0]
+    if data is None:
+        data = ndarray.array(np.arange(nnz, dtype=idtype), tvm.cpu())
+    data = as_ndarray(data, device=tvm.cpu())
+    # the kernel writes the rows of the transpose at the column indices unchecked
+    max_col = int(indices.numpy().max()) if nnz > 0 else -1
+    if num_cols is None:
+        num_cols = max_col + 1
+    elif num_cols <= max_col:
+        raise ValueError(
+            "Expected num_cols larger than the column index {}, but got {}".format(
+                max_col, num_cols
+            )
+        )
+    out_indptr = ndarray.empty((num_cols + 1,), idtype, tvm.cpu())
+    out_indices = ndarray.empty((nnz,), idtype, tvm.cpu())
+    out_data = ndarray.empty((nnz,), data.dtype, tvm.cpu())
+    func = _transpose_func(data.dtype, idtype, num_chunks)
+    func(data, indices, indptr, out_data, out_indices, out_indptr)
+    return out_indptr, out_indices, out_data
@@ -2404,6 +2404,55 @@ class Schedule(Object):
             iters_to_fuse,
         )
 
+    def sparse_cache_read(
+        self, block: SparseIterationRV, buffer_name: str, storage_scope: str, tile_size: int
+    ) -> SparseIterationRV:
+        """Create a sparse iteration that gathers the rows of a sparse buffer read through the
+        indices of a sparse axis into a cache per tile of rows, and redirect the reads of the
+        buffer in the given sparse iteration to the cache.
+
+        For example, caching ``B`` in SpMM, where ``B[j, k]`` is read through the sparse axis
+        ``J`` of parent ``I``, with a tile size ``t`` creates a cache ``B_shared`` indexed by the
+        tile, the slot of a unique column id of the tile and ``k``, and adds three parameters to
+        the function:
+
+        - ``b_shared_cols``: the unique column ids of every tile, ``B_shared_cols[tile, slot]``,
+          padded to the largest number of unique column ids of a tile;
+        - ``b_shared_slot``: the slot of the column id of every nonzero among those of its tile,
+          ``B_shared_slot[i, j]``, with the axes of ``I`` and ``J``;
+        - ``b_shared_width``: the padded number of unique column ids of a tile.
+
+        The cache iteration gathers ``B[B_shared_cols[tile, slot], k]``, and the given sparse
+        iteration reads ``B_shared[i // t, B_shared_slot[i, j], k]``, so every row of ``B`` is
+        loaded once per tile however many nonzeros of the tile share its column id. The maps are
+        computed by :py:func:`tvm.sparse.tile_unique_columns`. After ``lower_sparse_iter``, the
+        cache block is placed under the tile loop of the compute block with ``compute_at``, and
+        the cache of a tile only holds ``b_shared_width`` rows.
+
+        Parameters
+        ----------
+        block : SparseIterationRV
+            The sparse iteration reading the buffer.
+        buffer_name : str
+            The name of the sparse buffer to be cached.
+        storage_scope : str
+            The storage scope of the cache buffer, e.g. "shared" or "local".
+        tile_size : int
+            The number of rows of a tile.
+
+        Returns
+        -------
+        cached_block : SparseIterationRV
+            The sparse iteration filling the cache.
+        """
+        return _ffi_api.ScheduleSparseCacheRead(  # type: ignore # pylint: disable=no-member
+            self,
+            block,
+            buffer_name,
+            storage_scope,
+            tile_size,
+        )
+
     def hide_buffer_access(self, block: BlockRV, buf_type: str, buf_index_array: List[int]) -> None:
         """Hide some buffer access in a given block.
 
@@ -806,7 +806,7 @@ def RenormalizeSplitPattern():
     return _ffi_api.RenormalizeSplitPattern()  # type: ignore
 
 
-def LowerSparseIter(check_invalid_binary_search: bool = False):
+def LowerSparseIter(check_invalid_binary_search: bool = False, binary_search: str = "loop"):
     """Lower iterations in Sparse TIR
 
     Parameters
@@ -814,12 +814,16 @@ def LowerSparseIter(check_invalid_binary_search: bool = False):
     check_invalid_binary_search : bool
         Whether check invalid indices made by binary search.
 
+    binary_search : str
+        How binary searches are emitted, "loop", "branchless" or "merge".
+        See :py:func:`tvm.sparse.lower_sparse_iter`.
+
     Returns
     -------
     fpass : tvm.transform.Pass
         The result pass
     """
-    return _ffi_api.LowerSparseIter(check_invalid_binary_search)  # type: ignore
+    return _ffi_api.LowerSparseIter(check_invalid_binary_search, binary_search)  # type: ignore
 
 
 def LowerSparseBuffer():
@@ -856,7 +860,9 @@ def LowerAtomic():
 
 
 def SparseFormatDecompose(
-    composable_formats: List["FormatRewriteRule"], include_format_rewrite_blks: bool = True
+    composable_formats: List["FormatRewriteRule"],
+    include_format_rewrite_blks: bool = True,
+    parametric: bool = False,
 ):
     """Rewrite the sparse format of sparse buffers in the TIR scripts.
 
@@ -866,13 +872,18 @@ def SparseFormatDecompose(
         Composable formats is a list of rewrite rules.
     include_format_rewrite_blks : bool
         Whether to include format rewrite blocks in the output.
+    parametric : bool
+        Whether rules that only differ in their names share the sparse iterations of the first
+        one, recorded in the "format_instances" function attribute.
 
     Returns
     ------
     fpass : tvm.transform.Pass
         The result pass
     """
-    return _ffi_api.SparseFormatDecompose(composable_formats, include_format_rewrite_blks)  # type: ignore
+    return _ffi_api.SparseFormatDecompose(  # type: ignore
+        composable_formats, include_format_rewrite_blks, parametric
+    )
 
 
 def ExtractPreprocess():
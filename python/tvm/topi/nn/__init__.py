@@ -44,6 +44,7 @@ from .bitserial_dense import *
 from .batch_matmul import *
 from .batch_norm import *
 from .sparse import *
+from .sparse_tir import *
 from .pad import *
 from .fifo_buffer import *
 from .depth_to_space import *
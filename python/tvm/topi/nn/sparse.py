@@ -17,6 +17,8 @@
 
 """Sparse operators"""
 from __future__ import absolute_import
+from contextlib import contextmanager
+
 import tvm
 from tvm import te, auto_scheduler
 
@@ -230,11 +232,16 @@ def _sparse_dense_sp_rhs_bsrmm(data, weight_data, weight_indices, weight_indptr)
     )
 
 
-def sparse_transpose(sparse_data, sparse_indices, sparse_indptr):
+def sparse_transpose(sparse_data, sparse_indices, sparse_indptr, num_cols=None, num_chunks=16):
     """
-    Transpose a square sparse matrix,
-    `A` is an n-by-n sparse matrix in the CSR format.
-    ** Currently only support Square Matrices **
+    Transpose a sparse matrix,
+    `A` is an m-by-n sparse matrix in the CSR format. The transpose in CSR is also `A` in the
+    CSC format, and conversely.
+
+    The transpose is a counting sort parallelized over chunks of rows: every chunk counts the
+    non-zeros of each column, a parallel scan gives every chunk its write offset in each column
+    and the chunks scatter their non-zeros in parallel. The non-zeros of a column stay in row
+    order, so the result does not depend on the number of chunks.
 
     Parameters
     ----------
@@ -242,10 +249,17 @@ def sparse_transpose(sparse_data, sparse_indices, sparse_indptr):
         1-D with shape [nonzeros]
 
     sparse_indices : tvm.te.Tensor
-        1-D with shape [nonzeros], dtype of 'int32'
+        1-D with shape [nonzeros], dtype of 'int32' or 'int64'
 
     sparse_indptr : tvm.te.Tensor
-        1-D with shape [n+1], dtype of 'int32'
+        1-D with shape [m+1], of the same dtype as sparse_indices
+
+    num_cols : Optional[Union[int, PrimExpr]]
+        The number of columns n, m if None.
+
+    num_chunks : int
+        The number of chunks of rows processed in parallel. The kernel allocates a workspace of
+        num_chunks * n indices.
 
     Returns
     -------
@@ -253,18 +267,20 @@ def sparse_transpose(sparse_data, sparse_indices, sparse_indptr):
         1-D with shape [nonzeros]
 
     out_indices : tvm.te.Tensor
-        1-D with shape [nonzeros], dtype of 'int32'
+        1-D with shape [nonzeros], of the dtype of sparse_indices
 
     out_indptr : tvm.te.Tensor
-        1-D with shape [n+1], dtype of 'int32'
+        1-D with shape [n+1], of the dtype of sparse_indptr
     """
     assert len(sparse_data.shape) == 1, "error in data dimension"
     assert len(sparse_indices.shape) == 1, "error in indices dimension"
     assert len(sparse_indptr.shape) == 1, "error in indptr dimension"
 
     nnz = get_const_tuple(sparse_data.shape)[0]
-    n = get_const_tuple(sparse_indptr.shape)[0] - 1
-    output_shape = [(nnz,), (nnz,), (n + 1,)]
+    n = get_const_tuple(sparse_indptr.shape)[0] - 1 if num_cols is None else num_cols
+    # simplified, so that a symbolic `num_cols_plus_1 - 1` binds back to its variable
+    n_plus_1 = n + 1 if isinstance(n, int) else tvm.arith.Analyzer().simplify(n + 1)
+    output_shape = [(nnz,), (nnz,), (n_plus_1,)]
 
     # TODO: Add BSR transpose support
 
@@ -272,17 +288,17 @@ def sparse_transpose(sparse_data, sparse_indices, sparse_indptr):
         shape=output_shape,
         inputs=[sparse_data, sparse_indices, sparse_indptr],
         fcompute=lambda ins, outs: _csr_transpose_ir(
-            ins[0], ins[1], ins[2], outs[0], outs[1], outs[2]
+            ins[0], ins[1], ins[2], outs[0], outs[1], outs[2], num_chunks
         ),
         tag="sparse_transpose_csr",
-        dtype=[sparse_data.dtype, "int32", "int32"],
+        dtype=[sparse_data.dtype, sparse_indices.dtype, sparse_indptr.dtype],
         name="out",
     )
 
     return [output_data, output_indices, output_indptr]
 
 
-def _csr_transpose_ir(data, indices, indptr, out_data, out_indices, out_indptr):
+def _csr_transpose_ir(data, indices, indptr, out_data, out_indices, out_indptr, num_chunks):
     """define ir for csr_transpose"""
     irb = tvm.tir.ir_builder.create()
 
@@ -294,44 +310,84 @@ def _csr_transpose_ir(data, indices, indptr, out_data, out_indices, out_indptr):
     out_indices_ptr = irb.buffer_ptr(out_indices)
     out_indptr_ptr = irb.buffer_ptr(out_indptr)
 
-    n = get_const_tuple(indptr.shape)[0] - 1
-    nnz = get_const_tuple(data.shape)[0]
-
-    with irb.for_range(0, n, kind="parallel", name="col") as col:
-        out_indptr_ptr[col] = 0
-
-    with irb.for_range(0, nnz, kind="serial", name="nz_idx") as nz_idx:
-        out_indptr_ptr[indices_ptr[nz_idx]] += 1
-
-    cumsum = irb.allocate("int32", (1,), name="cumsum", scope="local")
-    temp = irb.allocate("int32", (1,), name="temp", scope="local")
-    cumsum[0] = 0
-    with irb.for_range(0, n, kind="serial", name="col") as col:
-        temp[0] = out_indptr_ptr[col]
-        out_indptr_ptr[col] = cumsum[0]
+    idtype = indptr.dtype
+
+    @contextmanager
+    def offset_range(begin, end, name):
+        # the CPU codegen requires loops starting at 0
+        with irb.for_range(0, end - begin, name=name, dtype=idtype) as i:
+            yield begin + i
+
+    def as_idtype(expr):
+        return tvm.tir.const(expr, idtype) if isinstance(expr, int) else expr.astype(idtype)
+
+    m = as_idtype(get_const_tuple(indptr.shape)[0] - 1)
+    n = as_idtype(get_const_tuple(out_indptr.shape)[0] - 1)
+    nnz = as_idtype(get_const_tuple(data.shape)[0])
+    rows_per_chunk = tvm.tir.indexdiv(m + num_chunks - 1, num_chunks)
+    cols_per_chunk = tvm.tir.indexdiv(n + num_chunks - 1, num_chunks)
+
+    # hist[chunk * n + col]: the number of non-zeros of col in the rows of chunk, then the
+    # position the chunk writes its next non-zero of col to
+    hist = irb.allocate(idtype, (num_chunks * n,), name="hist", scope="global")
+    block_sum = irb.allocate(idtype, (num_chunks,), name="block_sum", scope="global")
+
+    def row_range(chunk):
+        begin = chunk * rows_per_chunk
+        return begin, tvm.te.max(tvm.te.min(begin + rows_per_chunk, m), begin)
+
+    # histogram
+    with irb.for_range(0, num_chunks, kind="parallel", name="chunk", dtype=idtype) as chunk:
+        with irb.for_range(0, n, name="col", dtype=idtype) as col:
+            hist[chunk * n + col] = tvm.tir.const(0, idtype)
+        begin, end = row_range(chunk)
+        with offset_range(begin, end, "row") as row:
+            with offset_range(indptr_ptr[row], indptr_ptr[row + 1], "j") as j:
+                hist[chunk * n + indices_ptr[j]] += tvm.tir.const(1, idtype)
+
+    # exclusive scan in (col, chunk) order, over blocks of columns in parallel
+    def col_range(block):
+        begin = block * cols_per_chunk
+        return begin, tvm.te.max(tvm.te.min(begin + cols_per_chunk, n), begin)
+
+    with irb.for_range(0, num_chunks, kind="parallel", name="block", dtype=idtype) as block:
+        block_sum[block] = tvm.tir.const(0, idtype)
+        begin, end = col_range(block)
+        with offset_range(begin, end, "col") as col:
+            with irb.for_range(0, num_chunks, name="chunk", dtype=idtype) as chunk:
+                block_sum[block] += hist[chunk * n + col]
+
+    cumsum = irb.allocate(idtype, (1,), name="cumsum", scope="local")
+    temp = irb.allocate(idtype, (1,), name="temp", scope="local")
+    cumsum[0] = tvm.tir.const(0, idtype)
+    with irb.for_range(0, num_chunks, name="block", dtype=idtype) as block:
+        temp[0] = block_sum[block]
+        block_sum[block] = cumsum[0]
         cumsum[0] += temp[0]
 
+    with irb.for_range(0, num_chunks, kind="parallel", name="block", dtype=idtype) as block:
+        running = irb.allocate(idtype, (1,), name="running", scope="local")
+        count = irb.allocate(idtype, (1,), name="count", scope="local")
+        running[0] = block_sum[block]
+        begin, end = col_range(block)
+        with offset_range(begin, end, "col") as col:
+            out_indptr_ptr[col] = running[0]
+            with irb.for_range(0, num_chunks, name="chunk", dtype=idtype) as chunk:
+                count[0] = hist[chunk * n + col]
+                hist[chunk * n + col] = running[0]
+                running[0] += count[0]
+
     out_indptr_ptr[n] = nnz
 
-    with irb.for_range(0, n, kind="serial", name="row") as row:
-        offset = indptr_ptr[row]
-        diff = indptr_ptr[row + 1] - indptr_ptr[row]
-        with irb.for_range(0, diff, kind="serial", name="idx") as idx:
-            real_idx = offset + idx
-            col = indices_ptr[real_idx]
-            dest = out_indptr_ptr[col]
-
-            out_indices_ptr[dest] = row
-            out_data_ptr[dest] = data_ptr[real_idx]
-            out_indptr_ptr[col] += 1
-
-    last = irb.allocate("int32", (1,), name="last", scope="local")
-    temp2 = irb.allocate("int32", (1,), name="temp2", scope="local")
-    last[0] = 0
-    with irb.for_range(0, n, kind="serial", name="col") as col:
-        temp2[0] = out_indptr_ptr[col]
-        out_indptr_ptr[col] = last[0]
-        last[0] = temp2[0]
+    # scatter
+    with irb.for_range(0, num_chunks, kind="parallel", name="chunk", dtype=idtype) as chunk:
+        begin, end = row_range(chunk)
+        with offset_range(begin, end, "row") as row:
+            with offset_range(indptr_ptr[row], indptr_ptr[row + 1], "j") as j:
+                dest = hist[chunk * n + indices_ptr[j]]
+                out_indices_ptr[dest] = row
+                out_data_ptr[dest] = data_ptr[j]
+                hist[chunk * n + indices_ptr[j]] = dest + 1
 
     return irb.get()
 
@@ -0,0 +1,427 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=invalid-name,unused-variable,no-self-argument,import-outside-toplevel
+"""Sparse operators lowered through SparseTIR.
+
+The kernels are written with `sp_iter`, lowered by `lower_sparse_iter`, scheduled, lowered by
+`lower_sparse_buffer` and embedded as the body of a TE extern op, so that Relay can dispatch
+`nn.sparse_dense` and `nn.sparse_conv2d` to them.
+"""
+from __future__ import absolute_import
+
+import tvm
+from tvm import te
+
+from ..utils import get_const_tuple, unravel_index
+
+
+def _csr_rhs(m, n, k, nnz, dtype, idtype):
+    """Y[i, j] = sum_k X[i, k] * W[j, k], W in CSR"""
+    from tvm.script import tir as T
+
+    @T.prim_func
+    def func(
+        x: T.handle, w_data: T.handle, w_indices: T.handle, w_indptr: T.handle, y: T.handle
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(m, idtype)
+        J = T.dense_fixed(n, idtype)
+        K = T.sparse_variable(J, (k, nnz), (w_indptr, w_indices), idtype)
+        K_detach = T.dense_fixed(k, idtype)
+        X = T.match_sparse_buffer(x, (I, K_detach), dtype)
+        W = T.match_sparse_buffer(w_data, (J, K), dtype)
+        Y = T.match_sparse_buffer(y, (I, J), dtype)
+        with T.sp_iter([J, I, K], "SSR", "sparse_dense") as [vj, vi, vk]:
+            with T.init():
+                Y[vi, vj] = T.cast(0, dtype)
+            Y[vi, vj] = Y[vi, vj] + W[vj, vk] * X[vi, vk]
+
+    return func
+
+
+def _bsr_rhs(m, nb, kb, nnzb, bs_r, bs_c, dtype, idtype):
+    """Y[i, io, bi] = sum_{jo, bj} X[i, jo, bj] * W[io, jo, bi, bj], W in BSR"""
+    from tvm.script import tir as T
+
+    @T.prim_func
+    def func(
+        x: T.handle, w_data: T.handle, w_indices: T.handle, w_indptr: T.handle, y: T.handle
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(m, idtype)
+        IO = T.dense_fixed(nb, idtype)
+        JO = T.sparse_variable(IO, (kb, nnzb), (w_indptr, w_indices), idtype)
+        JO_detach = T.dense_fixed(kb, idtype)
+        BI = T.dense_fixed(bs_r, idtype)
+        BJ = T.dense_fixed(bs_c, idtype)
+        X = T.match_sparse_buffer(x, (I, JO_detach, BJ), dtype)
+        W = T.match_sparse_buffer(w_data, (IO, JO, BI, BJ), dtype)
+        Y = T.match_sparse_buffer(y, (I, IO, BI), dtype)
+        with T.sp_iter([IO, BI, I, JO, BJ], "SSSRR", "sparse_dense") as [vio, vbi, vi, vjo, vbj]:
+            with T.init():
+                Y[vi, vio, vbi] = T.cast(0, dtype)
+            Y[vi, vio, vbi] = Y[vi, vio, vbi] + W[vio, vjo, vbi, vbj] * X[vi, vjo, vbj]
+
+    return func
+
+
+def _csr_lhs(b, n, k, p, nnz, dtype, idtype):
+    """Y[b, j, p] = sum_k W[j, k] * X[b, k, p], W in CSR"""
+    from tvm.script import tir as T
+
+    @T.prim_func
+    def func(
+        x: T.handle, w_data: T.handle, w_indices: T.handle, w_indptr: T.handle, y: T.handle
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        B = T.dense_fixed(b, idtype)
+        J = T.dense_fixed(n, idtype)
+        K = T.sparse_variable(J, (k, nnz), (w_indptr, w_indices), idtype)
+        K_detach = T.dense_fixed(k, idtype)
+        P = T.dense_fixed(p, idtype)
+        X = T.match_sparse_buffer(x, (B, K_detach, P), dtype)
+        W = T.match_sparse_buffer(w_data, (J, K), dtype)
+        Y = T.match_sparse_buffer(y, (B, J, P), dtype)
+        with T.sp_iter([B, J, K, P], "SSRS", "sparse_conv2d") as [vb, vj, vk, vp]:
+            with T.init():
+                Y[vb, vj, vp] = T.cast(0, dtype)
+            Y[vb, vj, vp] = Y[vb, vj, vp] + W[vj, vk] * X[vb, vk, vp]
+
+    return func
+
+
+def _bsr_lhs(b, nb, kb, p, nnzb, bs_r, bs_c, dtype, idtype):
+    """Y[b, io, bi, p] = sum_{jo, bj} W[io, jo, bi, bj] * X[b, jo, bj, p], W in BSR"""
+    from tvm.script import tir as T
+
+    @T.prim_func
+    def func(
+        x: T.handle, w_data: T.handle, w_indices: T.handle, w_indptr: T.handle, y: T.handle
+    ) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        B = T.dense_fixed(b, idtype)
+        IO = T.dense_fixed(nb, idtype)
+        JO = T.sparse_variable(IO, (kb, nnzb), (w_indptr, w_indices), idtype)
+        JO_detach = T.dense_fixed(kb, idtype)
+        BI = T.dense_fixed(bs_r, idtype)
+        BJ = T.dense_fixed(bs_c, idtype)
+        P = T.dense_fixed(p, idtype)
+        X = T.match_sparse_buffer(x, (B, JO_detach, BJ, P), dtype)
+        W = T.match_sparse_buffer(w_data, (IO, JO, BI, BJ), dtype)
+        Y = T.match_sparse_buffer(y, (B, IO, BI, P), dtype)
+        with T.sp_iter([B, IO, BI, JO, BJ, P], "SSSRRS", "sparse_conv2d") as [
+            vb,
+            vio,
+            vbi,
+            vjo,
+            vbj,
+            vp,
+        ]:
+            with T.init():
+                Y[vb, vio, vbi, vp] = T.cast(0, dtype)
+            Y[vb, vio, vbi, vp] = (
+                Y[vb, vio, vbi, vp] + W[vio, vjo, vbi, vbj] * X[vb, vjo, vbj, vp]
+            )
+
+    return func
+
+
+def _nm_rhs(m, n_out, num_groups, n, group_size, dtype, meta_dtype, idtype):
+    """Y[i, j] = sum_{g, p} X[i, g * group_size + O[j, g, p]] * W[j, g, p], W in N:M format"""
+    from tvm.script import tir as T
+
+    # the parser does not fold operations on captured Python values
+    k = num_groups * group_size
+
+    @T.prim_func
+    def func(x: T.handle, w_values: T.handle, w_offsets: T.handle, y: T.handle) -> None:
+        T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+        I = T.dense_fixed(m, idtype)
+        J = T.dense_fixed(n_out, idtype)
+        G = T.dense_fixed(num_groups, idtype)
+        P = T.dense_fixed(n, idtype)
+        K = T.dense_fixed(k, idtype)
+        X = T.match_sparse_buffer(x, (I, K), dtype)
+        W = T.match_sparse_buffer(w_values, (J, G, P), dtype)
+        O = T.match_sparse_buffer(w_offsets, (J, G, P), meta_dtype)
+        Y = T.match_sparse_buffer(y, (I, J), dtype)
+        with T.sp_iter([J, I, G, P], "SSRR", "sparse_dense_nm") as [vj, vi, vg, vp]:
+            with T.init():
+                Y[vi, vj] = T.cast(0, dtype)
+            Y[vi, vj] = (
+                Y[vi, vj] + W[vj, vg, vp] * X[vi, vg * group_size + T.cast(O[vj, vg, vp], idtype)]
+            )
+
+    return func
+
+
+def _lower(kernel, name, inputs, out_shape, out_dtype):
+    """Lower a stage-I kernel and wrap the result as a TE extern op.
+
+    Parameters
+    ----------
+    kernel : PrimFunc
+        The stage-I function, whose parameters are the inputs followed by the output. Its leading
+        spatial axes are parallelized.
+    name : str
+        The name of the sparse iteration in `kernel`, the extern op is named `<name>_sparse_tir`.
+    inputs : List[te.Tensor]
+        The inputs of the kernel.
+    out_shape : Tuple[int]
+        The shape of the output.
+    out_dtype : str
+        The dtype of the output.
+
+    Returns
+    -------
+    output : te.Tensor
+        The output of the extern op.
+    """
+    from tvm.sparse import lower_sparse_buffer, lower_sparse_iter
+
+    mod = lower_sparse_iter(tvm.IRModule({"main": kernel}))
+    sch = tvm.tir.Schedule(mod)
+    # lower_sparse_iter splits the iteration before the sparse axis, the outer block `<name>0`
+    # iterates over the rows.
+    block = sch.get_block(name + "0")
+    num_spatial = 0
+    for iter_var in sch.get(block).iter_vars:
+        if iter_var.iter_type != tvm.tir.IterVar.DataPar:
+            break
+        num_spatial += 1
+    rows = sch.fuse(*sch.get_loops(block)[:num_spatial])
+    target = tvm.target.Target.current(allow_none=True)
+    if target is not None and "gpu" in target.keys:
+        block_idx, thread_idx = sch.split(rows, [None, 32])
+        sch.bind(block_idx, "blockIdx.x")
+        sch.bind(thread_idx, "threadIdx.x")
+    else:
+        sch.parallel(rows)
+    mod = lower_sparse_buffer(sch.mod)
+    # Remove blocks and flatten buffers, so that the body can be placed in an extern op.
+    prim_func = tvm.lower(mod)["main"]
+    params = [prim_func.buffer_map[param] for param in prim_func.params]
+
+    def _fcompute(ins, outs):
+        # StorageFlatten only knows the placeholders of the extern op, so the accesses to the
+        # flattened parameters are redirected to them, the same way ir_builder indexes a buffer.
+        bufs = {param.data: buf for param, buf in zip(params, list(ins) + list(outs))}
+
+        def _indices(buf, indices):
+            if len(indices) == 1 and len(buf.shape) != 1:
+                return unravel_index(indices[0], buf.shape)
+            return indices
+
+        def _bind(op):
+            if op.buffer.data not in bufs:
+                return None
+            buf = bufs[op.buffer.data]
+            if isinstance(op, tvm.tir.BufferLoad):
+                return tvm.tir.BufferLoad(buf, _indices(buf, op.indices))
+            return tvm.tir.BufferStore(buf, op.value, _indices(buf, op.indices))
+
+        body = tvm.tir.stmt_functor.ir_transform(
+            prim_func.body, None, _bind, ["tir.BufferLoad", "tir.BufferStore"]
+        )
+        vmap = {data: buf.data for data, buf in bufs.items()}
+        return tvm.tir.stmt_functor.substitute(body, vmap)
+
+    return te.extern(
+        [out_shape],
+        inputs,
+        _fcompute,
+        name=name + "_sparse_tir",
+        dtype=[out_dtype],
+        tag=name + "_sparse_tir",
+    )
+
+
+def sparse_dense_sparse_tir(data, weight_data, weight_indices, weight_indptr, sparse_lhs=False):
+    """
+    Computes sparse-dense matrix multiplication of `data` and
+    `(weight_data, weight_indices, weight_indptr).T` with a kernel generated by SparseTIR
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        2-D with shape [M, K]
+
+    weight_data : tvm.te.Tensor
+        1-D with shape [nnz] (CSR) or
+        3-D with shape [num_blocks, bs_r, bs_c] (BSR)
+
+    weight_indices : tvm.te.Tensor
+        1-D with shape [nnz] (CSR) or
+        1-D with shape [num_blocks] (BSR)
+
+    weight_indptr : tvm.te.Tensor
+        1-D with shape [N + 1] (CSR) or
+        1-D with shape [(N + 1) // bs_r] (BSR)
+
+    sparse_lhs : bool, optional
+        Indicates whether lhs or rhs matrix is sparse. Only a sparse rhs is supported.
+
+    Returns
+    -------
+    output : tvm.te.Tensor
+        2-D with shape [M, N]
+    """
+    if sparse_lhs:
+        raise ValueError("sparse_dense_sparse_tir only supports a sparse rhs")
+    m, k = get_const_tuple(data.shape)
+    (num_rows_plus_1,) = get_const_tuple(weight_indptr.shape)
+    (nnz,) = get_const_tuple(weight_indices.shape)
+    dtype, idtype = data.dtype, weight_indices.dtype
+    if len(weight_data.shape) == 1:
+        n = num_rows_plus_1 - 1
+        kernel = _csr_rhs(m, n, k, nnz, dtype, idtype)
+    elif len(weight_data.shape) == 3:
+        _, bs_r, bs_c = get_const_tuple(weight_data.shape)
+        n = (num_rows_plus_1 - 1) * bs_r
+        kernel = _bsr_rhs(m, num_rows_plus_1 - 1, k // bs_c, nnz, bs_r, bs_c, dtype, idtype)
+    else:
+        raise ValueError("Unsupported weight_data shape: {}".format(weight_data.shape))
+    return _lower(
+        kernel,
+        "sparse_dense",
+        [data, weight_data, weight_indices, weight_indptr],
+        (m, n),
+        dtype,
+    )
+
+
+def sparse_conv2d_sparse_tir(data, weight_data, weight_indices, weight_indptr, layout="NHWC"):
+    """
+    Computes sparse-conv2d(1*1) of ``data`` and
+    ``(weight_data, weight_indices, weight_indptr)`` with a kernel generated by SparseTIR
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        4-D with shape ``[M, H, W, K]`` (layout=NHWC)
+
+        4-D with shape ``[M, K, H, W]`` (layout=NCHW)
+
+    weight_data : tvm.te.Tensor
+        1-D with shape ``[nnz]`` (CSR)
+
+        2-D with shape ``[num_blocks, bs_r]`` (BSR)
+
+        3-D with shape ``[num_blocks, bs_r, bs_c]`` (BSR)
+
+    weight_indices : tvm.te.Tensor
+        1-D with shape ``[nnz]`` (CSR) or ``[num_blocks]`` (BSR)
+
+    weight_indptr : tvm.te.Tensor
+        1-D with shape ``[N + 1]`` (CSR) or ``[(N + 1) // bs_r]`` (BSR)
+
+    layout : str
+        layout of data
+
+    Returns
+    -------
+    output : tvm.te.Tensor
+        4-D with shape [M, H, W, N] (layout=NHWC)
+        4-D with shape [M, N, H ,W] (layout=NCHW)
+    """
+    if layout == "NHWC":
+        m, h, w, k = get_const_tuple(data.shape)
+    elif layout == "NCHW":
+        m, k, h, w = get_const_tuple(data.shape)
+    else:
+        raise ValueError("Unsupported layout: {}".format(layout))
+    (num_rows_plus_1,) = get_const_tuple(weight_indptr.shape)
+    (nnz,) = get_const_tuple(weight_indices.shape)
+    dtype, idtype = data.dtype, weight_indices.dtype
+    if len(weight_data.shape) == 1:
+        bs_r, bs_c = 1, 1
+        n = num_rows_plus_1 - 1
+    elif len(weight_data.shape) == 2:
+        (_, bs_r), bs_c = get_const_tuple(weight_data.shape), 1
+        n = (num_rows_plus_1 - 1) * bs_r
+    elif len(weight_data.shape) == 3:
+        _, bs_r, bs_c = get_const_tuple(weight_data.shape)
+        n = (num_rows_plus_1 - 1) * bs_r
+    else:
+        raise ValueError("Unsupported weight_data shape: {}".format(weight_data.shape))
+    csr = len(weight_data.shape) == 1
+    nb, kb = num_rows_plus_1 - 1, k // bs_c
+    if layout == "NHWC":
+        # a 1x1 convolution in NHWC is a sparse_dense over the pixels
+        if csr:
+            kernel = _csr_rhs(m * h * w, n, k, nnz, dtype, idtype)
+        else:
+            kernel = _bsr_rhs(m * h * w, nb, kb, nnz, bs_r, bs_c, dtype, idtype)
+        out_shape = (m, h, w, n)
+    else:
+        if csr:
+            kernel = _csr_lhs(m, n, k, h * w, nnz, dtype, idtype)
+        else:
+            kernel = _bsr_lhs(m, nb, kb, h * w, nnz, bs_r, bs_c, dtype, idtype)
+        out_shape = (m, n, h, w)
+    return _lower(
+        kernel,
+        "sparse_conv2d",
+        [data, weight_data, weight_indices, weight_indptr],
+        out_shape,
+        dtype,
+    )
+
+
+def sparse_dense_nm_sparse_tir(data, weight_values, weight_offsets, group_size):
+    """
+    Computes sparse-dense matrix multiplication of `data` and the transpose of an N:M sparse
+    weight `(weight_values, weight_offsets)`, see `tvm.sparse.NMSparseMatrix`, with a kernel
+    generated by SparseTIR
+
+    Parameters
+    ----------
+    data : tvm.te.Tensor
+        2-D with shape [M, K]
+
+    weight_values : tvm.te.Tensor
+        3-D with shape [N, K // group_size, n]
+
+    weight_offsets : tvm.te.Tensor
+        3-D with shape [N, K // group_size, n], the position of every value inside its group
+
+    group_size : int
+        The size M of a group of the N:M weight
+
+    Returns
+    -------
+    output : tvm.te.Tensor
+        2-D with shape [M, N]
+    """
+    m, k = get_const_tuple(data.shape)
+    n_out, num_groups, n = get_const_tuple(weight_values.shape)
+    if num_groups * group_size != k:
+        raise ValueError(
+            "The weight of {} groups of size {} does not match the data of {} columns".format(
+                num_groups, group_size, k
+            )
+        )
+    kernel = _nm_rhs(
+        m, n_out, num_groups, n, group_size, data.dtype, weight_offsets.dtype, "int32"
+    )
+    return _lower(
+        kernel,
+        "sparse_dense_nm",
+        [data, weight_values, weight_offsets],
+        (m, n_out),
+        data.dtype,
+    )
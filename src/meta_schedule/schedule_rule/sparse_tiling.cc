@@ -0,0 +1,330 @@
+/*
+ * Licensed to the Apache Software Foundation (ASF) under one
+ * or more contributor license agreements.  See the NOTICE file
+ * distributed with this work for additional information
+ * regarding copyright ownership.  The ASF licenses this file
+ * to you under the Apache License, Version 2.0 (the
+ * "License"); you may not use this file except in compliance
+ * with the License.  You may obtain a copy of the License at
+ *
+ *   http://www.apache.org/licenses/LICENSE-2.0
+ *
+ * Unless required by applicable law or agreed to in writing,
+ * software distributed under the License is distributed on an
+ * "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+ * KIND, either express or implied.  See the License for the
+ * specific language governing permissions and limitations
+ * under the License.
+ */
+#include "../utils.h"
+
+namespace tvm {
+namespace tir {
+
+/*!
+ * \brief Check whether a block is emitted by LowerSparseIter.
+ * \param block The block to be checked.
+ * \return Whether the block carries the "sparse" annotation.
+ */
+bool IsSparseBlock(const BlockNode* block) {
+  auto it = block->annotations.find("sparse");
+  return it != block->annotations.end() && Downcast<Bool>((*it).second)->value;
+}
+
+/*!
+ * \brief Check whether a sparse block is a binary search block emitted by LowerSparseIter.
+ * \param block The block to be checked.
+ * \return Whether the block carries the "preprocess" annotation.
+ */
+bool IsSparsePreprocessBlock(const BlockNode* block) {
+  return block->annotations.count("preprocess") != 0;
+}
+
+/*!
+ * \brief Check whether a block writes its output through an indirect index, e.g. the row indices
+ * of an ELL bucket, in which case different iterations may reduce into the same element.
+ * \param block The block to be checked.
+ * \return Whether the block is a reduction block with an indirect write index.
+ */
+bool HasIndirectReductionWrite(const BlockNode* block) {
+  bool is_reduction = false;
+  for (const IterVar& iter_var : block->iter_vars) {
+    is_reduction |= iter_var->iter_type == kCommReduce;
+  }
+  if (!is_reduction) {
+    return false;
+  }
+  bool indirect = false;
+  for (const BufferRegion& write : block->writes) {
+    for (const Range& range : write->region) {
+      PostOrderVisit(range->min, [&indirect](const ObjectRef& obj) {
+        indirect |= obj->IsInstance<BufferLoadNode>();
+      });
+    }
+  }
+  return indirect;
+}
+
+/*!
+ * \brief Check whether all the block iterators bound to a loop, in any block under it, are
+ * spatial, i.e. whether the loop can be parallelized or bound to threads.
+ * \param sch The schedule.
+ * \param loop_rv The loop to be checked.
+ * \return Whether every block iterator whose binding uses the loop variable is spatial.
+ */
+bool IsSpatialLoop(const Schedule& sch, const LoopRV& loop_rv) {
+  const ForNode* loop = TVM_SREF_TO_FOR(loop, sch->GetSRef(loop_rv));
+  const VarNode* loop_var = loop->loop_var.get();
+  auto f_uses_loop_var = [loop_var](const VarNode* var) { return var == loop_var; };
+  bool spatial = true;
+  PreOrderVisit(loop->body, [&](const ObjectRef& obj) -> bool {
+    if (!spatial) {
+      return false;
+    }
+    if (const auto* realize = obj.as<BlockRealizeNode>()) {
+      std::vector<IterVarType> iter_types = GetBlockVarTypes(sch->GetSRef(realize->block));
+      for (size_t i = 0; i < iter_types.size(); ++i) {
+        if (iter_types[i] != kDataPar && UsesVar(realize->iter_values[i], f_uses_loop_var)) {
+          spatial = false;
+          return false;
+        }
+      }
+    }
+    return true;
+  });
+  return spatial;
+}
+
+}  // namespace tir
+}  // namespace tvm
+
+namespace tvm {
+namespace meta_schedule {
+
+/*!
+ * \brief Tiling rule for the stage-II blocks emitted by LowerSparseIter. The outermost loop (rows)
+ * is tiled with a factor inversely proportional to the constant reduction extent of the block, so
+ * that buckets of a composable format get a similar amount of work per tile; the innermost
+ * spatial loop (features) is split to threads. Reductions with an indirect output index are
+ * annotated as atomic, and binary search blocks only get their outermost loop distributed.
+ */
+class SparseTilingNode : public ScheduleRuleNode {
+ public:
+  // Inherited from ScheduleRuleNode
+  void InitializeWithTuneContext(const TuneContext& context) final {
+    ICHECK(context->target.defined());
+    Target target = context->target.value();
+    if (tile_binds.defined()) {
+      Optional<Integer> opt_max_threads_per_block =
+          target->GetAttr<Integer>("max_threads_per_block");
+      max_threads_per_block_ = opt_max_threads_per_block.value_or(Integer(1024))->value;
+    }
+  }
+
+  // Inherited from ScheduleRuleNode
+  Array<tir::Schedule> Apply(const tir::Schedule& sch, const tir::BlockRV& block_rv) final {
+    const tir::BlockNode* block = TVM_SREF_TO_BLOCK(block, sch->GetSRef(block_rv));
+    // Step 0. Only leaf blocks emitted by LowerSparseIter are handled.
+    if (!tir::IsSparseBlock(block) || !sch->GetChildBlocks(block_rv).empty()) {
+      return {sch};
+    }
+    Array<tir::LoopRV> loops = GetEnclosingLoops(sch, block_rv);
+    if (loops.empty()) {
+      return {sch};
+    }
+    const tir::ForNode* row_loop = TVM_SREF_TO_FOR(row_loop, sch->GetSRef(loops[0]));
+    if (row_loop->kind != tir::ForKind::kSerial) {
+      // The row loop has already been scheduled by another block sharing it.
+      return {sch};
+    }
+
+    // Only loops whose bound block iterators are all spatial can be parallelized or bound.
+    bool row_spatial = tir::IsSpatialLoop(sch, loops[0]);
+
+    // Step 1. Binary search blocks only have their outermost loop distributed.
+    if (tir::IsSparsePreprocessBlock(block)) {
+      if (!row_spatial) {
+        return {sch};
+      }
+      if (tile_binds.defined()) {
+        tir::ExprRV thread_extent = SampleUniform(sch, thread_extents);
+        Array<tir::LoopRV> split = sch->Split(loops[0], {NullOpt, thread_extent});
+        sch->Bind(split[0], tile_binds.value()[0]);
+        sch->Bind(split[1], tile_binds.value()[tile_binds.value().size() - 1]);
+      } else {
+        sch->Parallel(loops[0]);
+      }
+      return {sch};
+    }
+
+    // Step 2. Collect the constant reduction extent per row and the innermost spatial loop.
+    int64_t work_per_row = 1;
+    std::unordered_map<const tir::VarNode*, const tir::IterVarNode*> loop_var_to_iter;
+    tir::BlockRealize realize = tir::GetBlockRealize(sch->state(), sch->GetSRef(block_rv));
+    for (size_t i = 0; i < block->iter_vars.size(); ++i) {
+      if (const auto* var = realize->iter_values[i].as<tir::VarNode>()) {
+        loop_var_to_iter[var] = block->iter_vars[i].get();
+      }
+    }
+    Optional<tir::LoopRV> feature_loop = NullOpt;
+    int64_t feature_extent = -1;
+    for (size_t i = 1; i < loops.size(); ++i) {
+      const tir::ForNode* loop = TVM_SREF_TO_FOR(loop, sch->GetSRef(loops[i]));
+      auto it = loop_var_to_iter.find(loop->loop_var.get());
+      const auto* extent = loop->extent.as<IntImmNode>();
+      if (it == loop_var_to_iter.end()) {
+        continue;
+      }
+      if (it->second->iter_type == tir::kCommReduce) {
+        if (extent != nullptr) {
+          work_per_row *= extent->value;
+        }
+      } else if (i + 1 == loops.size() && extent != nullptr &&
+                 tir::IsSpatialLoop(sch, loops[i])) {
+        feature_loop = loops[i];
+        feature_extent = extent->value;
+      }
+    }
+
+    // Step 3. Annotate reductions that may write the same element from different rows.
+    if (tir::HasIndirectReductionWrite(block)) {
+      sch->Annotate(block_rv, "atomic", Bool(true));
+    }
+
+    // Step 4. Split the feature loop to threads.
+    int64_t threads_per_row = 1;
+    if (tile_binds.defined() && feature_loop.defined()) {
+      Array<Integer> candidates;
+      for (const Integer& extent : thread_extents) {
+        if (extent->value <= feature_extent && extent->value <= max_threads_per_block_) {
+          candidates.push_back(extent);
+        }
+      }
+      if (!candidates.empty()) {
+        tir::ExprRV thread_extent = SampleUniform(sch, candidates);
+        Array<tir::LoopRV> split = sch->Split(feature_loop.value(), {NullOpt, thread_extent});
+        sch->Bind(split[1], tile_binds.value()[tile_binds.value().size() - 1]);
+        // The sampled extent is unknown here, so bound the row tile with the largest candidate.
+        for (const Integer& extent : candidates) {
+          threads_per_row = std::max(threads_per_row, extent->value);
+        }
+      }
+    }
+
+    // Step 5. Tile the rows: rows with a wider reduction get a smaller tile.
+    if (!row_spatial) {
+      return {sch};
+    }
+    std::vector<int64_t> row_factors;
+    Array<Integer> candidates;
+    for (const Integer& work : row_tile_work) {
+      int64_t factor = std::max<int64_t>(1, work->value / work_per_row);
+      if (tile_binds.defined()) {
+        factor = std::max<int64_t>(1, std::min(factor, max_threads_per_block_ / threads_per_row));
+      }
+      if (std::find(row_factors.begin(), row_factors.end(), factor) == row_factors.end()) {
+        row_factors.push_back(factor);
+        candidates.push_back(Integer(factor));
+      }
+    }
+    tir::ExprRV row_factor = SampleUniform(sch, candidates);
+    Array<tir::LoopRV> split = sch->Split(loops[0], {NullOpt, row_factor});
+    if (tile_binds.defined()) {
+      sch->Bind(split[0], tile_binds.value()[0]);
+      if (tile_binds.value().size() > 2) {
+        sch->Bind(split[1], tile_binds.value()[1]);
+      }
+    } else {
+      sch->Parallel(split[0]);
+    }
+    return {sch};
+  }
+
+ private:
+  /*!
+   * \brief Get the loops above a block, including the loops above its enclosing sparse blocks, e.g.
+   * the row loop of a leaf block nested in the block of its row iterator.
+   */
+  static Array<tir::LoopRV> GetEnclosingLoops(const tir::Schedule& sch,
+                                              const tir::BlockRV& block_rv) {
+    Array<tir::LoopRV> loops = sch->GetLoops(block_rv);
+    tir::StmtSRef block_sref = sch->GetSRef(block_rv);
+    GlobalVar g_var;
+    tir::GetRootPrimFunc(sch->mod(), tir::GetSRefTreeRoot(block_sref)->stmt, &g_var);
+    while (true) {
+      const tir::StmtSRefNode* parent = block_sref->parent;
+      while (parent != nullptr && parent->stmt->IsInstance<tir::ForNode>()) {
+        parent = parent->parent;
+      }
+      if (parent == nullptr || parent->parent == nullptr) {
+        break;
+      }
+      block_sref = GetRef<tir::StmtSRef>(parent);
+      const tir::BlockNode* block = TVM_SREF_TO_BLOCK(block, block_sref);
+      if (!tir::IsSparseBlock(block)) {
+        break;
+      }
+      tir::BlockRV outer_rv = GetRVFromSRef(sch, block_sref, g_var->name_hint);
+      Array<tir::LoopRV> outer_loops = sch->GetLoops(outer_rv);
+      outer_loops.insert(outer_loops.end(), loops.begin(), loops.end());
+      loops = std::move(outer_loops);
+    }
+    return loops;
+  }
+
+  /*! \brief Sample a value uniformly from the given candidates. */
+  static tir::ExprRV SampleUniform(const tir::Schedule& sch, const Array<Integer>& candidates) {
+    int n = candidates.size();
+    Array<FloatImm> probs(n, FloatImm(DataType::Float(64), 1.0 / n));
+    return sch->SampleCategorical(candidates, probs);
+  }
+
+ public:
+  /*!
+   * \brief The thread axes the row tile, the rows inside a tile and the features are bound to.
+   * NullOpt on CPU, where the row tiles are parallelized instead.
+   */
+  Optional<Array<String>> tile_binds;
+  /*! \brief Candidates of the number of threads along the feature loop. */
+  Array<Integer> thread_extents;
+  /*!
+   * \brief Candidates of the amount of work (rows times the constant reduction extent) per row
+   * tile.
+   */
+  Array<Integer> row_tile_work;
+  /*! \brief The maximum number of threads per block of the target. */
+  int64_t max_threads_per_block_ = -1;
+
+  void VisitAttrs(tvm::AttrVisitor* v) {
+    v->Visit("tile_binds", &tile_binds);
+    v->Visit("thread_extents", &thread_extents);
+    v->Visit("row_tile_work", &row_tile_work);
+    // `max_threads_per_block_` is not visited
+  }
+
+  static constexpr const char* _type_key = "meta_schedule.SparseTiling";
+  TVM_DECLARE_FINAL_OBJECT_INFO(SparseTilingNode, ScheduleRuleNode);
+};
+
+ScheduleRule ScheduleRule::SparseTiling(Optional<Array<String>> tile_binds,
+                                        Array<Integer> thread_extents,
+                                        Array<Integer> row_tile_work) {
+  CHECK(!thread_extents.empty()) << "ValueError: thread_extents should not be empty";
+  CHECK(!row_tile_work.empty()) << "ValueError: row_tile_work should not be empty";
+  if (tile_binds.defined()) {
+    CHECK_GE(tile_binds.value().size(), 2)
+        << "ValueError: tile_binds should contain at least the block and the thread axes";
+  }
+  ObjectPtr<SparseTilingNode> n = make_object<SparseTilingNode>();
+  n->tile_binds = tile_binds;
+  n->thread_extents = thread_extents;
+  n->row_tile_work = row_tile_work;
+  return ScheduleRule(n);
+}
+
+TVM_REGISTER_NODE_TYPE(SparseTilingNode);
+TVM_REGISTER_GLOBAL("meta_schedule.ScheduleRuleSparseTiling")
+    .set_body_typed(ScheduleRule::SparseTiling);
+
+}  // namespace meta_schedule
+}  // namespace tvm
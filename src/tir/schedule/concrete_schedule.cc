@@ -798,6 +798,21 @@ void ConcreteScheduleNode::SparseFuse(const SparseIterationRV& sp_iteration_rv,
   this->UpdateRV(sp_iteration_rv, new_block);
 }
 
+SparseIterationRV ConcreteScheduleNode::SparseCacheRead(const SparseIterationRV& sp_iteration_rv,
+                                                        const String& buffer_name,
+                                                        const String& storage_scope,
+                                                        int tile_size) {
+  SparseIteration old_block = this->Get(sp_iteration_rv);
+  SparseIteration cache_block{nullptr};
+  SparseIteration new_block{nullptr};
+  TVM_TIR_SCHEDULE_BEGIN();
+  std::tie(cache_block, new_block) =
+      tir::SparseCacheRead(state_, old_block, buffer_name, storage_scope, tile_size);
+  TVM_TIR_SCHEDULE_END("sparse-cache-read", this->error_render_level_);
+  this->UpdateRV(sp_iteration_rv, new_block);
+  return CreateRV(cache_block);
+}
+
 void ConcreteScheduleNode::HideBufAccess(const BlockRV& block_rv, const String& buf_type,
                                          const Array<PrimExpr>& buf_index_array) {
   TVM_TIR_SCHEDULE_BEGIN();
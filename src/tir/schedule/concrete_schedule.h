@@ -159,6 +159,9 @@ class ConcreteScheduleNode : public ScheduleNode {
                      const Array<SpIterVar>& new_order) override;
   void SparseFuse(const SparseIterationRV& sp_iteration_rv,
                   const Array<SpIterVar>& iters_to_fuse) override;
+  SparseIterationRV SparseCacheRead(const SparseIterationRV& sp_iteration_rv,
+                                    const String& buffer_name, const String& storage_scope,
+                                    int tile_size) override;
   void HideBufAccess(const BlockRV& block_rv, const String& buf_type,
                      const Array<PrimExpr>& buf_index_array) override;
 
@@ -543,6 +543,23 @@ TVM_DLL SparseIteration SparseReorder(ScheduleState self, const SparseIteration&
 TVM_DLL SparseIteration SparseFuse(ScheduleState self, const SparseIteration& sp_iteration,
                                    const Array<SpIterVar>& iters_to_fuse);
 
+/*!
+ * \brief Create a sparse iteration that gathers the rows of a sparse buffer read through the
+ * indices of a sparse axis into a cache per tile of rows, indexed by the tile and the slot of a
+ * unique column id of the tile. Reads of the buffer in the given sparse iteration are redirected
+ * to the slot of their column id in the cache of their tile. The unique column ids of every tile
+ * and the slot of every nonzero are new parameters of the function.
+ * \param self The state of the schedule.
+ * \param sp_iteration The sparse iteration reading the buffer.
+ * \param buffer_name The name of the sparse buffer to be cached.
+ * \param storage_scope The storage scope of the cache buffer.
+ * \param tile_size The number of rows of a tile.
+ * \return The sparse iteration filling the cache, and the new sparse iteration reading from it.
+ */
+TVM_DLL std::pair<SparseIteration, SparseIteration> SparseCacheRead(
+    ScheduleState self, const SparseIteration& sp_iteration, const String& buffer_name,
+    const String& storage_scope, int tile_size);
+
 /*!
  * \brief Hide some buffer access in the given block.
  * \param self The state of the schedule.
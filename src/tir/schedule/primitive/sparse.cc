@@ -16,6 +16,9 @@
  * specific language governing permissions and limitations
  * under the License.
  */
+#include <algorithm>
+#include <cctype>
+
 #include "../utils.h"
 
 namespace tvm {
@@ -40,7 +43,7 @@ class SpIterationReplacer : public StmtMutator {
 };
 
 void UpdateIRModule(ScheduleState self, const SparseIteration& old_sp_iteration,
-                    const SparseIteration& new_sp_iteration) {
+                    StmtMutator* mutator) {
   const PrimFuncNode* g_func = nullptr;
   GlobalVar g_var;
   g_func = GetPrimFuncFromSparseIteration(self->mod, old_sp_iteration.get(), &g_var);
@@ -51,12 +54,17 @@ void UpdateIRModule(ScheduleState self, const SparseIteration& old_sp_iteration,
   ICHECK(ref_new_func.get() == g_func);
   PrimFuncNode* new_func = ref_new_func.CopyOnWrite();
 
-  SpIterationReplacer replacer(old_sp_iteration, new_sp_iteration);
-  new_func->body = replacer(g_func->body);
+  new_func->body = (*mutator)(g_func->body);
   new_map->at(g_var) = std::move(ref_new_func);
   self->mod = GetRef<IRModule>(new_mod);
 }
 
+void UpdateIRModule(ScheduleState self, const SparseIteration& old_sp_iteration,
+                    const SparseIteration& new_sp_iteration) {
+  SpIterationReplacer replacer(old_sp_iteration, new_sp_iteration);
+  UpdateIRModule(self, old_sp_iteration, &replacer);
+}
+
 /*!
  * \brief Check whether the new iterators are valid. We say they are valid if the new order is a
  * permutation of the old order
@@ -269,6 +277,400 @@ SparseIteration SparseFuse(ScheduleState self, const SparseIteration& sp_iterati
   return new_sp_iteration;
 }
 
+/*!
+ * \brief Collect the indices used to read a sparse buffer inside a sparse iteration, and check that
+ * the buffer is read in a way supported by sparse cache read.
+ * \param self The state of the schedule.
+ * \param sp_iteration The sparse iteration to be checked.
+ * \param buffer_name The name of the sparse buffer to be cached.
+ * \return The buffer to be cached and the indices of its read access.
+ * \throw ScheduleError If the buffer is not read in the sparse iteration, is also written by it, or
+ * if the read accesses are not made by the sparse iterators directly.
+ */
+std::pair<SparseBuffer, Array<PrimExpr>> CheckSparseCacheReadAccess(
+    const ScheduleState self, const SparseIteration& sp_iteration, const String& buffer_name) {
+  class BufferNotReadError : public ScheduleError {
+   public:
+    explicit BufferNotReadError(IRModule mod, String buffer_name, SparseIteration sp_iteration)
+        : mod_(std::move(mod)),
+          buffer_name_(std::move(buffer_name)),
+          sp_iteration_(std::move(sp_iteration)) {}
+
+    String FastErrorString() const final {
+      return "ScheduleError: The sparse buffer to cache is not read by the sparse iteration.";
+    }
+
+    String DetailRenderTemplate() const final {
+      std::ostringstream os;
+      os << "ScheduleError: Sparse iteration " << sp_iteration_->name
+         << " does not read a sparse buffer named " << buffer_name_
+         << ", or the buffer is also written by the sparse iteration.";
+      return os.str();
+    }
+
+    IRModule mod() const final { return mod_; }
+    Array<ObjectRef> LocationsOfInterest() const final { return {}; }
+
+    IRModule mod_;
+    String buffer_name_;
+    SparseIteration sp_iteration_;
+  };
+
+  class NonIteratorAccessError : public ScheduleError {
+   public:
+    explicit NonIteratorAccessError(IRModule mod, String buffer_name, Array<PrimExpr> indices)
+        : mod_(std::move(mod)),
+          buffer_name_(std::move(buffer_name)),
+          indices_(std::move(indices)) {}
+
+    String FastErrorString() const final {
+      return "ScheduleError: The sparse buffer to cache should be accessed by the sparse iterators "
+             "of the sparse iteration in a unique way.";
+    }
+
+    String DetailRenderTemplate() const final {
+      std::ostringstream os;
+      os << "ScheduleError: Sparse buffer " << buffer_name_ << " is accessed with indices "
+         << indices_
+         << ", which are either not sparse iterators of the given sparse iteration, or differ "
+            "from another access of the same buffer.";
+      return os.str();
+    }
+
+    IRModule mod() const final { return mod_; }
+    Array<ObjectRef> LocationsOfInterest() const final { return {}; }
+
+    IRModule mod_;
+    String buffer_name_;
+    Array<PrimExpr> indices_;
+  };
+
+  class AccessCollector : public StmtExprVisitor {
+   public:
+    explicit AccessCollector(const String& buffer_name) : buffer_name_(buffer_name) {}
+
+    void VisitExpr_(const BufferLoadNode* op) final {
+      if (op->buffer->name == buffer_name_ && op->buffer->IsInstance<SparseBufferNode>()) {
+        buffer = Downcast<SparseBuffer>(op->buffer);
+        accesses.push_back(op->indices);
+      }
+      StmtExprVisitor::VisitExpr_(op);
+    }
+
+    void VisitStmt_(const BufferStoreNode* op) final {
+      if (op->buffer->name == buffer_name_) {
+        written = true;
+      }
+      StmtExprVisitor::VisitStmt_(op);
+    }
+
+    const String& buffer_name_;
+    Optional<SparseBuffer> buffer;
+    std::vector<Array<PrimExpr>> accesses;
+    bool written = false;
+  };
+
+  AccessCollector collector(buffer_name);
+  collector(sp_iteration->body);
+  if (sp_iteration->init.defined()) {
+    collector(sp_iteration->init.value());
+  }
+  if (!collector.buffer.defined() || collector.written) {
+    throw BufferNotReadError(self->mod, buffer_name, sp_iteration);
+  }
+
+  const Array<PrimExpr>& indices = collector.accesses[0];
+  for (const Array<PrimExpr>& access : collector.accesses) {
+    if (access.size() != indices.size()) {
+      throw NonIteratorAccessError(self->mod, buffer_name, access);
+    }
+    for (size_t i = 0; i < access.size(); ++i) {
+      if (!access[i].same_as(indices[i])) {
+        throw NonIteratorAccessError(self->mod, buffer_name, access);
+      }
+    }
+  }
+  for (const PrimExpr& index : indices) {
+    const auto* var = index.as<VarNode>();
+    bool is_iterator = false;
+    for (const SpIterVar& sp_iter_var : sp_iteration->sp_iter_vars) {
+      if (sp_iter_var->var.get() == var) {
+        is_iterator = true;
+        break;
+      }
+    }
+    if (!is_iterator) {
+      throw NonIteratorAccessError(self->mod, buffer_name, indices);
+    }
+  }
+  return {collector.buffer.value(), indices};
+}
+
+/*!
+ * \brief The read of a sparse buffer gathered through the indices of a sparse axis, e.g. B[j, k]
+ * in SpMM where j iterates the sparse axis J, whose parent is the row axis I.
+ */
+struct GatherAccess {
+  /*! \brief The position of the gathered index in the indices of the read. */
+  size_t gather_pos;
+  /*! \brief The iterator of the sparse axis, e.g. j. */
+  SpIterVar gather_iter;
+  /*! \brief The iterator of the row axis, the parent of the sparse axis, e.g. i. */
+  SpIterVar row_iter;
+};
+
+/*!
+ * \brief Check that a sparse buffer is read through the indices of exactly one sparse axis whose
+ * parent is a dense fixed root axis, while its other indices iterate its own root axes.
+ * \param self The state of the schedule.
+ * \param sp_iteration The sparse iteration reading the buffer.
+ * \param buffer The buffer to be cached.
+ * \param indices The indices of the read of the buffer, iterators of the sparse iteration.
+ * \return The gathered read.
+ * \throw ScheduleError If the buffer is not read that way.
+ */
+GatherAccess CheckGatherAccess(const ScheduleState self, const SparseIteration& sp_iteration,
+                               const SparseBuffer& buffer, const Array<PrimExpr>& indices) {
+  class NotGatheredError : public ScheduleError {
+   public:
+    explicit NotGatheredError(IRModule mod, SparseBuffer buffer, Array<PrimExpr> indices,
+                              SparseIteration sp_iteration)
+        : mod_(std::move(mod)),
+          buffer_(std::move(buffer)),
+          indices_(std::move(indices)),
+          sp_iteration_(std::move(sp_iteration)) {}
+
+    String FastErrorString() const final {
+      return "ScheduleError: The sparse buffer to cache should be gathered through the indices "
+             "of a sparse axis of the sparse iteration.";
+    }
+
+    String DetailRenderTemplate() const final {
+      std::ostringstream os;
+      os << "ScheduleError: Sparse buffer " << buffer_->name << " is read with indices "
+         << indices_ << " in sparse iteration " << sp_iteration_->name
+         << ". Exactly one index should iterate a sparse axis, whose parent is a dense fixed root "
+            "axis iterated by the sparse iteration, and the other indices should iterate the "
+            "root axes of the buffer.";
+      return os.str();
+    }
+
+    IRModule mod() const final { return mod_; }
+    Array<ObjectRef> LocationsOfInterest() const final { return {}; }
+
+    IRModule mod_;
+    SparseBuffer buffer_;
+    Array<PrimExpr> indices_;
+    SparseIteration sp_iteration_;
+  };
+
+  auto f_find_iter = [&](const PrimExpr& index) -> SpIterVar {
+    for (const SpIterVar& sp_iter_var : sp_iteration->sp_iter_vars) {
+      if (sp_iter_var->var.same_as(index)) {
+        return sp_iter_var;
+      }
+    }
+    throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+  };
+
+  Optional<Integer> gather_pos;
+  for (size_t i = 0; i < indices.size(); ++i) {
+    SpIterVar sp_iter_var = f_find_iter(indices[i]);
+    const Axis& axis = sp_iter_var->axis;
+    if (axis->IsInstance<FusedAxisNode>()) {
+      throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+    }
+    if (axis.same_as(buffer->axes[i])) {
+      // read at the positions of the axis, only kept as is for root axes
+      if (axis->parent.defined()) {
+        throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+      }
+      continue;
+    }
+    if (!axis->IsSparse() || !axis->parent.defined() || gather_pos.defined()) {
+      throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+    }
+    gather_pos = Integer(i);
+  }
+  if (!gather_pos.defined()) {
+    throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+  }
+  size_t pos = gather_pos.value()->value;
+  SpIterVar gather_iter = f_find_iter(indices[pos]);
+  Axis row_axis = Downcast<Axis>(gather_iter->axis->parent.value());
+  if (row_axis->parent.defined() || row_axis->IsVariable() || row_axis->IsSparse()) {
+    throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+  }
+  for (const SpIterVar& sp_iter_var : sp_iteration->sp_iter_vars) {
+    if (sp_iter_var->axis.same_as(row_axis)) {
+      return {pos, gather_iter, sp_iter_var};
+    }
+  }
+  throw NotGatheredError(self->mod, buffer, indices, sp_iteration);
+}
+
+std::pair<SparseIteration, SparseIteration> SparseCacheRead(ScheduleState self,
+                                                            const SparseIteration& sp_iteration,
+                                                            const String& buffer_name,
+                                                            const String& storage_scope,
+                                                            int tile_size) {
+  CHECK_GT(tile_size, 0) << "ValueError: The tile size should be positive, but got "
+                         << tile_size;
+  // Step 1. Check that the buffer is read through the indices of a sparse axis.
+  SparseBuffer buffer{nullptr};
+  Array<PrimExpr> indices;
+  std::tie(buffer, indices) = CheckSparseCacheReadAccess(self, sp_iteration, buffer_name);
+  GatherAccess gather = CheckGatherAccess(self, sp_iteration, buffer, indices);
+  const Axis& row_axis = gather.row_iter->axis;
+  const Axis& gather_axis = gather.gather_iter->axis;
+  DataType idtype = gather_axis->idtype;
+
+  // Step 2. Create the axis of the row tiles, the axis of the unique column ids of a tile, padded
+  // to the largest number of unique column ids of a tile, and the buffers mapping them:
+  // - `<cache>_cols[t, u]`: the u-th unique column id of tile t;
+  // - `<cache>_slot[i, j]`: the slot of the column id of nonzero (i, j) among those of its tile.
+  String cache_name = buffer->name + "_" + storage_scope;
+  std::string param_prefix = cache_name;
+  std::transform(param_prefix.begin(), param_prefix.end(), param_prefix.begin(), ::tolower);
+  PrimExpr num_tiles = floordiv(row_axis->length + (tile_size - 1), tile_size);
+  // The parameters carry a type annotation, as those of the parser do.
+  Var width(param_prefix + "_width", PrimType(idtype));
+  Axis tile_axis(cache_name + "_tile", NullOpt, num_tiles, num_tiles, num_tiles, NullOpt, NullOpt,
+                 row_axis->idtype);
+  Axis col_axis(cache_name + "_col", NullOpt, width, width, width, NullOpt, NullOpt, idtype);
+  Var cols_param(param_prefix + "_cols", PrimType(DataType::Handle()));
+  Var slot_param(param_prefix + "_slot", PrimType(DataType::Handle()));
+  SparseBuffer cols_buffer(Var(cache_name + "_cols", PointerType(PrimType(idtype), "global")),
+                           {tile_axis, col_axis}, idtype, cache_name + "_cols", NullOpt);
+  SparseBuffer slot_buffer(Var(cache_name + "_slot", PointerType(PrimType(idtype), "global")),
+                           {row_axis, gather_axis}, idtype, cache_name + "_slot", NullOpt);
+
+  // Step 3. Create the cache of a tile, and the sparse iteration that gathers the rows of the
+  // unique column ids of every tile into it.
+  Var tile_var("t", row_axis->idtype), col_var("u", idtype);
+  Array<Axis> cache_axes{tile_axis};
+  Array<SpIterVar> cache_sp_iter_vars{SpIterVar(tile_var, /*is_reduction=*/false, tile_axis)};
+  Array<PrimExpr> cache_indices{tile_var}, fill_indices;
+  for (size_t i = 0; i < indices.size(); ++i) {
+    if (i == gather.gather_pos) {
+      cache_axes.push_back(col_axis);
+      cache_sp_iter_vars.push_back(SpIterVar(col_var, /*is_reduction=*/false, col_axis));
+      cache_indices.push_back(col_var);
+      fill_indices.push_back(BufferLoad(cols_buffer, {tile_var, col_var}));
+    } else {
+      Var new_var = Downcast<Var>(indices[i]).copy_with_suffix("");
+      cache_axes.push_back(buffer->axes[i]);
+      cache_sp_iter_vars.push_back(SpIterVar(new_var, /*is_reduction=*/false, buffer->axes[i]));
+      cache_indices.push_back(new_var);
+      fill_indices.push_back(new_var);
+    }
+  }
+  Var cache_data(cache_name, PointerType(PrimType(buffer->dtype), storage_scope));
+  SparseBuffer cache_buffer(cache_data, cache_axes, buffer->dtype, cache_name, Integer(0),
+                            buffer->default_value);
+  SparseIteration cache_sp_iteration(
+      cache_sp_iter_vars, cache_name,
+      BufferStore(cache_buffer, BufferLoad(buffer, fill_indices), cache_indices));
+
+  // Step 4. Redirect the reads of the buffer to the cache of the tile of the row, at the slot of
+  // the column id of the nonzero.
+  Array<PrimExpr> read_indices{floordiv(gather.row_iter->var, tile_size)};
+  for (size_t i = 0; i < indices.size(); ++i) {
+    if (i == gather.gather_pos) {
+      read_indices.push_back(
+          BufferLoad(slot_buffer, {gather.row_iter->var, gather.gather_iter->var}));
+    } else {
+      read_indices.push_back(indices[i]);
+    }
+  }
+
+  class ReadRedirector : public StmtExprMutator {
+   public:
+    explicit ReadRedirector(const SparseBuffer& buffer, const SparseBuffer& cache_buffer,
+                            const Array<PrimExpr>& cache_indices)
+        : buffer_(buffer), cache_buffer_(cache_buffer), cache_indices_(cache_indices) {}
+
+    PrimExpr VisitExpr_(const BufferLoadNode* op) final {
+      if (op->buffer.same_as(buffer_)) {
+        return BufferLoad(cache_buffer_, cache_indices_);
+      }
+      return StmtExprMutator::VisitExpr_(op);
+    }
+
+    const SparseBuffer& buffer_;
+    const SparseBuffer& cache_buffer_;
+    const Array<PrimExpr>& cache_indices_;
+  };
+
+  ReadRedirector redirector(buffer, cache_buffer, read_indices);
+  ObjectPtr<SparseIterationNode> p_new_sp_iteration =
+      make_object<SparseIterationNode>(*sp_iteration.get());
+  p_new_sp_iteration->body = redirector(sp_iteration->body);
+  if (sp_iteration->init.defined()) {
+    p_new_sp_iteration->init = redirector(sp_iteration->init.value());
+  }
+  SparseIteration new_sp_iteration(p_new_sp_iteration);
+
+  // Step 5. Insert the cache iteration before the original one and allocate the cache buffer in
+  // the root block.
+  class CacheReadInserter : public StmtMutator {
+   public:
+    explicit CacheReadInserter(const SparseIteration& old_sp_iteration,
+                               const SparseIteration& new_sp_iteration,
+                               const SparseIteration& cache_sp_iteration,
+                               const SparseBuffer& cache_buffer)
+        : old_sp_iteration_(old_sp_iteration.get()),
+          new_sp_iteration_(new_sp_iteration),
+          cache_sp_iteration_(cache_sp_iteration),
+          cache_buffer_(cache_buffer) {}
+
+   private:
+    Stmt VisitStmt_(const SparseIterationNode* op) final {
+      if (op == old_sp_iteration_) {
+        return SeqStmt({cache_sp_iteration_, new_sp_iteration_});
+      }
+      return StmtMutator::VisitStmt_(op);
+    }
+
+    Stmt VisitStmt_(const SeqStmtNode* op) final {
+      return SeqStmt::Flatten(StmtMutator::VisitStmt_(op));
+    }
+
+    Stmt VisitStmt_(const BlockNode* op) final {
+      Block block = Downcast<Block>(StmtMutator::VisitStmt_(op));
+      if (op->name_hint == "root") {
+        block.CopyOnWrite()->alloc_buffers.push_back(cache_buffer_);
+      }
+      return std::move(block);
+    }
+
+    const SparseIterationNode* old_sp_iteration_;
+    const SparseIteration& new_sp_iteration_;
+    const SparseIteration& cache_sp_iteration_;
+    const SparseBuffer& cache_buffer_;
+  };
+
+  GlobalVar g_var;
+  GetPrimFuncFromSparseIteration(self->mod, sp_iteration.get(), &g_var);
+  CacheReadInserter inserter(sp_iteration, new_sp_iteration, cache_sp_iteration, cache_buffer);
+  UpdateIRModule(self, sp_iteration, &inserter);
+
+  // Step 6. Add the maps of the unique column ids and their width to the parameters.
+  PrimFunc func = Downcast<PrimFunc>(self->mod->Lookup(g_var));
+  PrimFuncNode* fptr = func.CopyOnWrite();
+  fptr->params.push_back(cols_param);
+  fptr->params.push_back(slot_param);
+  fptr->params.push_back(width);
+  fptr->buffer_map.Set(cols_param, cols_buffer);
+  fptr->buffer_map.Set(slot_param, slot_buffer);
+  fptr->sp_axes.push_back(tile_axis);
+  fptr->sp_axes.push_back(col_axis);
+  IRModule mod = self->mod;
+  mod.CopyOnWrite()->Update(g_var, func);
+  self->mod = mod;
+  return {cache_sp_iteration, new_sp_iteration};
+}
+
 SparseIteration GetSparseIteration(const ScheduleState& self, const String& name,
                                    const String& func_name) {
   class Finder : public StmtVisitor {
@@ -558,6 +558,16 @@ void TracedScheduleNode::SparseFuse(const SparseIterationRV& sp_iteration_rv,
   // Do not support traced schedule so far.
 }
 
+SparseIterationRV TracedScheduleNode::SparseCacheRead(const SparseIterationRV& sp_iteration_rv,
+                                                      const String& buffer_name,
+                                                      const String& storage_scope,
+                                                      int tile_size) {
+  SparseIterationRV result = ConcreteScheduleNode::SparseCacheRead(sp_iteration_rv, buffer_name,
+                                                                   storage_scope, tile_size);
+  // Do not support traced schedule so far.
+  return result;
+}
+
 void TracedScheduleNode::HideBufAccess(const BlockRV& block_rv, const String& buf_type,
                                        const Array<PrimExpr>& buf_index_array) {
   ConcreteScheduleNode::HideBufAccess(block_rv, buf_type, buf_index_array);
@@ -117,6 +117,9 @@ class TracedScheduleNode : public ConcreteScheduleNode {
                      const Array<SpIterVar>& new_order) final;
   void SparseFuse(const SparseIterationRV& sp_iteration_rv,
                   const Array<SpIterVar>& iters_to_fuse) final;
+  SparseIterationRV SparseCacheRead(const SparseIterationRV& sp_iteration_rv,
+                                    const String& buffer_name, const String& storage_scope,
+                                    int tile_size) final;
   void HideBufAccess(const BlockRV& block_rv, const String& buf_type,
                      const Array<PrimExpr>& buf_index_array) final;
 };
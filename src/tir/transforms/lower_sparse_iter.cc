@@ -331,11 +331,12 @@ class IterTransformer : public StmtExprMutator {
  public:
   explicit IterTransformer(Map<Axis, SparseBuffer> axis_indptr_map,
                            Map<Axis, SparseBuffer> axis_indices_map, const Array<Axis>& sp_axes,
-                           bool check_invalid_binary_search)
+                           bool check_invalid_binary_search, String binary_search)
       : axis_indptr_map_(std::move(axis_indptr_map)),
         axis_indices_map_(std::move(axis_indices_map)),
         bsearch_blk_counter(0),
-        check_invalid_binary_search_(check_invalid_binary_search) {
+        check_invalid_binary_search_(check_invalid_binary_search),
+        binary_search_(std::move(binary_search)) {
     CreateBaseDomMap(sp_axes);
   }
 
@@ -777,9 +778,16 @@ class IterTransformer : public StmtExprMutator {
             for (const Axis& ancestor : ancestors) {
               prefix_indices.push_back(ctx_.GetIterVarFromAxis(ancestor).value()->var);
             }
-            offset =
-                BinarySearch(indptr_buf, prefix_indices, Integer(0),
-                             GetParentAxis(original_axis)->nnz + Integer(1), offset, false, true);
+            if (binary_search_ == "merge" && fused_axis->group.size() == 2 &&
+                prefix_indices.empty() &&
+                !(!binary_search_vaild_check_region && check_invalid_binary_search_)) {
+              // the row of every non-zero of a fused (I, J) axis.
+              offset = RowSweep(indptr_buf, GetParentAxis(original_axis)->nnz, fused_axis);
+            } else {
+              offset =
+                  BinarySearch(indptr_buf, prefix_indices, Integer(0),
+                               GetParentAxis(original_axis)->nnz + Integer(1), offset, false, true);
+            }
           }
           Axis original_axis = GetAxisBeforeFuse(fused_axis->group[fused_axis->index]);
           if (!original_axis->IsSparse()) {
@@ -936,26 +944,15 @@ class IterTransformer : public StmtExprMutator {
     SparseBuffer mid = SparseBuffer(Var(mid_buf_name, PointerType(PrimType(dtype), "global")), axes,
                                     dtype, mid_buf_name, Integer(0));
 
-    Stmt low_store = BufferStore(low, lb, {Integer(0)});
-    Stmt high_store = BufferStore(high, ub, {Integer(0)});
-    PrimExpr low_val = BufferLoad(low, {Integer(0)}), high_val = BufferLoad(high, {Integer(0)}),
-             mid_val = BufferLoad(mid, mid_indices);
-    PrimExpr while_cond = low_val < high_val;
-    // Two store mid statements, one for init, another one inside while loop.
-    Stmt mid_store_init = BufferStore(mid, low_val + floordiv(high_val - low_val, 2), mid_indices);
-    Stmt mid_store_while = BufferStore(mid, low_val + floordiv(high_val - low_val, 2), mid_indices);
+    PrimExpr mid_val = BufferLoad(mid, mid_indices);
     Array<PrimExpr> indices = prefix_indices;
     indices.push_back(mid_val);
     PrimExpr pivot = BufferLoad(buf, indices);
-    PrimExpr pivot_cmp_cond = left ? (pivot < val) : (pivot > val);
-    Stmt if_true = left ? BufferStore(low, mid_val + 1, {Integer(0)})
-                        : BufferStore(high, mid_val, {Integer(0)});
-    Stmt if_false = left ? BufferStore(high, mid_val, {Integer(0)})
-                         : BufferStore(low, mid_val + 1, {Integer(0)});
-    Stmt if_then_else = IfThenElse(pivot_cmp_cond, if_true, if_false);
-    SeqStmt while_body({if_then_else, mid_store_while});
-    Stmt while_ = While(while_cond, while_body);
-    Array<Stmt> body_stmts({low_store, high_store, mid_store_init, while_});
+    Array<Stmt> body_stmts = binary_search_ == "loop"
+                                 ? SearchLoop(buf, prefix_indices, lb, ub, val, left, low, high,
+                                              mid, mid_indices)
+                                 : BranchlessSearch(buf, prefix_indices, lb, ub, val, left, low,
+                                                    high, mid, mid_indices);
     if (minus_one) {
       body_stmts.push_back(
           BufferStore(mid, BufferLoad(mid, mid_indices) - Integer(1), mid_indices));
@@ -988,6 +985,149 @@ class IterTransformer : public StmtExprMutator {
     return mid_val;
   }
 
+  /*!
+   * \brief The statements of a binary search, narrowing [low, high) until it is empty.
+   * \note The branch taken at every step depends on the data.
+   */
+  Array<Stmt> SearchLoop(const SparseBuffer& buf, const Array<PrimExpr>& prefix_indices,
+                         const PrimExpr& lb, const PrimExpr& ub, const PrimExpr& val, bool left,
+                         const Buffer& low, const Buffer& high, const SparseBuffer& mid,
+                         const Array<PrimExpr>& mid_indices) {
+    Stmt low_store = BufferStore(low, lb, {Integer(0)});
+    Stmt high_store = BufferStore(high, ub, {Integer(0)});
+    PrimExpr low_val = BufferLoad(low, {Integer(0)}), high_val = BufferLoad(high, {Integer(0)}),
+             mid_val = BufferLoad(mid, mid_indices);
+    PrimExpr while_cond = low_val < high_val;
+    // Two store mid statements, one for init, another one inside while loop.
+    Stmt mid_store_init = BufferStore(mid, low_val + floordiv(high_val - low_val, 2), mid_indices);
+    Stmt mid_store_while = BufferStore(mid, low_val + floordiv(high_val - low_val, 2), mid_indices);
+    Array<PrimExpr> indices = prefix_indices;
+    indices.push_back(mid_val);
+    PrimExpr pivot = BufferLoad(buf, indices);
+    PrimExpr pivot_cmp_cond = left ? (pivot < val) : (pivot > val);
+    Stmt if_true = left ? BufferStore(low, mid_val + 1, {Integer(0)})
+                        : BufferStore(high, mid_val, {Integer(0)});
+    Stmt if_false = left ? BufferStore(high, mid_val, {Integer(0)})
+                         : BufferStore(low, mid_val + 1, {Integer(0)});
+    Stmt if_then_else = IfThenElse(pivot_cmp_cond, if_true, if_false);
+    SeqStmt while_body({if_then_else, mid_store_while});
+    Stmt while_ = While(while_cond, while_body);
+    return {low_store, high_store, mid_store_init, while_};
+  }
+
+  /*!
+   * \brief The statements of a branch-free binary search.
+   * \note `low` is the base of the remaining range and `high` its length. Every step halves the
+   *   length and moves the base with a select, so that the number of steps only depends on
+   *   ub - lb and the steps compile to conditional moves. When ub - lb is a constant, the steps
+   *   are unrolled and the search has no loop at all, so that independent searches over the same
+   *   range, e.g. the rows of the non-zeros of a fused axis, can be vectorized.
+   */
+  Array<Stmt> BranchlessSearch(const SparseBuffer& buf, const Array<PrimExpr>& prefix_indices,
+                               const PrimExpr& lb, const PrimExpr& ub, const PrimExpr& val,
+                               bool left, const Buffer& low, const Buffer& high,
+                               const SparseBuffer& mid, const Array<PrimExpr>& mid_indices) {
+    PrimExpr low_val = BufferLoad(low, {Integer(0)}), high_val = BufferLoad(high, {Integer(0)});
+    auto move_right = [&](PrimExpr pos) {
+      Array<PrimExpr> indices = prefix_indices;
+      indices.push_back(pos);
+      PrimExpr pivot = BufferLoad(buf, indices);
+      return left ? (pivot < val) : (pivot <= val);
+    };
+    Array<Stmt> stmts({BufferStore(low, lb, {Integer(0)})});
+    arith::Analyzer analyzer;
+    PrimExpr length = analyzer.Simplify(ub - lb);
+    if (const IntImmNode* imm = length.as<IntImmNode>()) {
+      int64_t n = imm->value;
+      for (; n > 1; n -= n / 2) {
+        PrimExpr next = low_val + make_const(low_val.dtype(), n / 2);
+        stmts.push_back(BufferStore(low, Select(move_right(next), next, low_val), {Integer(0)}));
+      }
+      PrimExpr result = n > 0 ? low_val + Cast(low_val.dtype(), move_right(low_val)) : low_val;
+      stmts.push_back(BufferStore(mid, result, mid_indices));
+      return stmts;
+    }
+    stmts.push_back(BufferStore(high, length, {Integer(0)}));
+    PrimExpr half = floordiv(high_val, 2);
+    PrimExpr next = low_val + half;
+    Stmt step = SeqStmt({BufferStore(low, Select(move_right(next), next, low_val), {Integer(0)}),
+                         BufferStore(high, high_val - half, {Integer(0)})});
+    stmts.push_back(While(high_val > 1, step));
+    // the last comparison does not read buf when the range is empty.
+    PrimExpr last = if_then_else(high_val > 0, Cast(low_val.dtype(), move_right(low_val)),
+                                 make_zero(low_val.dtype()));
+    stmts.push_back(BufferStore(mid, low_val + last, mid_indices));
+    return stmts;
+  }
+
+  /*!
+   * \brief Find the row of every non-zero of a fused (I, J) axis with a sweep over the rows,
+   *   instead of a binary search per non-zero.
+   * \param indptr_buf The indptr buffer of J.
+   * \param num_rows The number of rows, i.e. the length of I.
+   * \param fused_axis The fused axis.
+   * \return The row of the current non-zero.
+   * \note The rows write disjoint ranges and the loop over them can be parallelized.
+   */
+  PrimExpr RowSweep(const SparseBuffer& indptr_buf, const PrimExpr& num_rows,
+                    const FusedAxisNode* fused_axis) {
+    Array<Axis> axes;
+    Array<PrimExpr> mid_indices, store_indices;
+    for (const Axis& ax : fused_axis->group) {
+      Var var = ctx_.GetIterVarFromAxis(ax).value()->var;
+      axes.push_back(ax);
+      mid_indices.push_back(var);
+    }
+    Array<ObjectRef> args({indptr_buf, String("merge"), mid_indices.back()});
+    if (bsearch_map_.count(args)) {
+      return bsearch_map_[args];
+    }
+    DataType dtype = indptr_buf->dtype;
+    String mid_buf_name = "mid_" + std::to_string(bsearch_blk_counter);
+    SparseBuffer mid = SparseBuffer(Var(mid_buf_name, PointerType(PrimType(dtype), "global")), axes,
+                                    dtype, mid_buf_name, Integer(0));
+
+    Var row("row", num_rows.dtype()), nnz("j", dtype);
+    IterVar v_row(Range::FromMinExtent(make_zero(num_rows.dtype()), num_rows),
+                  Var("v_row", num_rows.dtype()), kDataPar);
+    PrimExpr begin = BufferLoad(indptr_buf, {v_row->var});
+    PrimExpr end = BufferLoad(indptr_buf, {v_row->var + 1});
+    store_indices.push_back(make_zero(mid_indices[0].dtype()));
+    store_indices.push_back(begin + nnz);
+    // the codegen requires loops starting at 0.
+    Stmt body = For(nnz, make_zero(dtype), end - begin, ForKind::kSerial,
+                    BufferStore(mid, cast(dtype, v_row->var), store_indices));
+    BufferRegion read(indptr_buf, {Range::FromMinExtent(v_row->var, Integer(2))});
+    BufferRegion write(mid, {Range::FromMinExtent(store_indices[0], Integer(1)),
+                             Range::FromMinExtent(begin, end - begin)});
+    Map<String, ObjectRef> annotations;
+    annotations.Set("sparse", Bool(true));
+    annotations.Set("preprocess", Bool(true));
+    String name = "binary_search_block_" + std::to_string(bsearch_blk_counter);
+    bsearch_blk_counter++;
+    Block block(/*iter_vars=*/{v_row},
+                /*reads=*/{read},
+                /*writes=*/{write},
+                /*name_hint=*/name + "_0",
+                /*body=*/body,
+                /*init=*/NullOpt,
+                /*alloc_buffers=*/{},
+                /*match_buffers=*/{},
+                /*buf_doms=*/{},
+                /*annotations=*/annotations);
+    Stmt loop = For(row, make_zero(num_rows.dtype()), num_rows, ForKind::kSerial,
+                    BlockRealize({row}, const_true(), std::move(block)));
+
+    root_alloc_buffers.push_back(mid);
+    alloc_buf_doms.push_back(
+        BufferDomain(mid, Range::FromMinExtent(Integer(0), indptr_buf->shape.back())));
+    // an empty var map, the sweep is not wrapped by the loops of the sparse iteration.
+    bsearch_structures.push_back(BinarySearchStructure({name, loop, {}, {}, {}, read, write}));
+    PrimExpr mid_val = BufferLoad(mid, mid_indices);
+    bsearch_map_[args] = mid_val;
+    return mid_val;
+  }
+
   /*! \brief Return indices viewed in a given buffer. */
   Array<PrimExpr> RewriteIndices(Buffer buf, Array<PrimExpr> old_indices) {
     Array<PrimExpr> new_indices;
@@ -1123,6 +1263,7 @@ class IterTransformer : public StmtExprMutator {
   int bsearch_blk_counter;  // Counter for generated binary search blocks.
   bool binary_search_vaild_check_region = true;
   bool check_invalid_binary_search_ = false;
+  String binary_search_;  // "loop", "branchless" or "merge".
 };
 
 class InvalidIndicesPostProcess : public StmtExprMutator {
@@ -1209,7 +1350,10 @@ class InvalidIndicesPostProcess : public StmtExprMutator {
   int find_mid_buffer = 0;
 };
 
-PrimFunc LowerSparseIter(PrimFunc f, bool check_invalid_binary_search) {
+PrimFunc LowerSparseIter(PrimFunc f, bool check_invalid_binary_search, String binary_search) {
+  CHECK(binary_search == "loop" || binary_search == "branchless" || binary_search == "merge")
+      << "ValueError: Unknown binary search strategy " << binary_search
+      << ", expected one of loop, branchless and merge.";
   // Only apply this pass to TIR that is not from TE schedules
   if (!IsFromLegacyTESchedule(f) && SparseTIRLevel(f) == 2) {
     PrimFuncNode* fptr = f.CopyOnWrite();
@@ -1220,7 +1364,7 @@ PrimFunc LowerSparseIter(PrimFunc f, bool check_invalid_binary_search) {
         UpdateMetadata(f);
     // Step 2. Lower iterations.
     IterTransformer lower_sparse(axis_indptr_map, axis_indices_map, fptr->sp_axes,
-                                 check_invalid_binary_search);
+                                 check_invalid_binary_search, binary_search);
     Stmt body = lower_sparse(std::move(fptr->body));
     // Step 3. Wrap with root block, insert bsearch blocks and allocated buffers.
     if (!lower_sparse.bsearch_structures.empty()) {
@@ -1254,9 +1398,9 @@ namespace transform {
 /*!
  * \brief The lowering pass from TIR to Sparse TIR.
  */
-Pass LowerSparseIter(bool check_invalid_binary_search) {
+Pass LowerSparseIter(bool check_invalid_binary_search, String binary_search) {
   auto pass_func = [=](PrimFunc f, IRModule m, PassContext ctx) {
-    return LowerSparseIter(std::move(f), check_invalid_binary_search);
+    return LowerSparseIter(std::move(f), check_invalid_binary_search, binary_search);
   };
   return CreatePrimFuncPass(pass_func, 0, "tir.LowerSparseIter", {});
 }
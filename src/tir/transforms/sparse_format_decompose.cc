@@ -25,6 +25,10 @@
 #include <tvm/tir/stmt_functor.h>
 #include <tvm/tir/transform.h>
 
+#include <tuple>
+#include <utility>
+#include <vector>
+
 #include "../../support/utils.h"
 #include "../schedule/analysis.h"
 #include "ir_utils.h"
@@ -135,6 +139,54 @@ Array<Axis> UpdateSparseAxes(const Array<PrimFunc>& format_descs, const Array<Ax
   return ret;
 }
 
+bool SameIndexMap(const IndexMap& lhs, const IndexMap& rhs) {
+  if (lhs->initial_indices.size() != rhs->initial_indices.size()) {
+    return false;
+  }
+  Array<PrimExpr> indices{lhs->initial_indices.begin(), lhs->initial_indices.end()};
+  return StructuralEqual()(lhs->MapIndices(indices), rhs->MapIndices(indices));
+}
+
+/*!
+ * \brief Check whether two rules are instances of the same template, i.e. only differ in their
+ * names.
+ */
+bool SameTemplate(const FormatRewriteRule& lhs, const FormatRewriteRule& rhs) {
+  StructuralEqual equal;
+  return equal(lhs->buffers_to_rewrite, rhs->buffers_to_rewrite) &&
+         equal(lhs->axes_before_rewrite, rhs->axes_before_rewrite) &&
+         equal(lhs->axes_after_rewrite, rhs->axes_after_rewrite) &&
+         equal(lhs->axis_map, rhs->axis_map) && SameIndexMap(lhs->idx_map, rhs->idx_map) &&
+         SameIndexMap(lhs->inv_idx_map, rhs->inv_idx_map) &&
+         equal(lhs->new_format_desc, rhs->new_format_desc);
+}
+
+/*!
+ * \brief Group the rules by template, in the order of their first instance.
+ * \return The first rule of every group, and the names of the rules in the group of each of them.
+ */
+std::pair<Array<FormatRewriteRule>, Map<String, Array<String>>> GroupByTemplate(
+    const Array<FormatRewriteRule>& rules) {
+  Array<FormatRewriteRule> templates;
+  std::vector<Array<String>> instances;
+  for (const FormatRewriteRule& rule : rules) {
+    size_t i = 0;
+    while (i < templates.size() && !SameTemplate(templates[i], rule)) {
+      ++i;
+    }
+    if (i == templates.size()) {
+      templates.push_back(rule);
+      instances.emplace_back();
+    }
+    instances[i].push_back(rule->name);
+  }
+  Map<String, Array<String>> instance_map;
+  for (size_t i = 0; i < templates.size(); ++i) {
+    instance_map.Set(templates[i]->name, instances[i]);
+  }
+  return {templates, instance_map};
+}
+
 }  // namespace
 
 class IndexRewriter {
@@ -430,11 +482,17 @@ class SparseFormatDecomposer : public StmtExprMutator {
 };
 
 PrimFunc SparseFormatDecompose(Array<FormatRewriteRule> composable_formats, PrimFunc f,
-                               bool include_format_rewrite_blks = true) {
+                               bool include_format_rewrite_blks = true, bool parametric = false) {
   CHECK(composable_formats.size() >= 1)
       << "The given composable formats length should be greater than or equal to 1.";
   // Only apply this pass to TIR that is not from TE schedules
   if (!IsFromLegacyTESchedule(f) && SparseTIRLevel(f) == 2) {
+    // in parametric mode, rules of the same template share the sparse iterations of the first
+    // one, which are launched once per instance.
+    Map<String, Array<String>> instances;
+    if (parametric) {
+      std::tie(composable_formats, instances) = GroupByTemplate(composable_formats);
+    }
     // SparseFormatDecomposer rewriter(composable_formats);
     PrimFuncNode* fptr = f.CopyOnWrite();
     Array<PrimFunc> format_descs;
@@ -480,6 +538,11 @@ PrimFunc SparseFormatDecompose(Array<FormatRewriteRule> composable_formats, Prim
       new_attr_dict.Set("composable", Integer(1));
       fptr->attrs = DictAttrs(new_attr_dict);
     }
+    if (parametric) {
+      Map<String, ObjectRef> new_attr_dict = fptr->attrs->dict;
+      new_attr_dict.Set("format_instances", instances);
+      fptr->attrs = DictAttrs(new_attr_dict);
+    }
     return f;
   } else {
     return f;
@@ -489,10 +552,10 @@ PrimFunc SparseFormatDecompose(Array<FormatRewriteRule> composable_formats, Prim
 namespace transform {
 
 Pass SparseFormatDecompose(Array<FormatRewriteRule> composable_formats,
-                           bool include_format_rewrite_blks) {
+                           bool include_format_rewrite_blks, bool parametric) {
   auto pass_func = [=](PrimFunc f, IRModule m, PassContext ctx) {
     return SparseFormatDecompose(std::move(composable_formats), std::move(f),
-                                 include_format_rewrite_blks);
+                                 include_format_rewrite_blks, parametric);
   };
   return CreatePrimFuncPass(pass_func, 0, "tir.SparseFormatDecompose", {});
 }
@@ -115,7 +115,50 @@ def test_sparse_array_tuple():
     tvm.testing.assert_allclose(c.numpy(), a.numpy() * 2.0, rtol=1e-5)
 
 
+def test_sparse_array_conversion():
+    import scipy.sparse as sp
+
+    a = np.maximum(np.random.uniform(size=(6, 8)).astype("float32") - 0.6, 0.0)
+    a[2] = 0.0
+    ref = sp.csr_matrix(a)
+    csr = tvmsp.array(a)
+    assert csr.nnz == ref.nnz
+    np.testing.assert_array_equal(csr.indptr.numpy(), ref.indptr)
+    np.testing.assert_array_equal(csr.indices.numpy(), ref.indices)
+    np.testing.assert_array_equal(csr.numpy(), a)
+
+    # scipy
+    np.testing.assert_array_equal(tvmsp.CSRNDArray.from_scipy(sp.coo_matrix(a)).numpy(), a)
+    np.testing.assert_array_equal(csr.to_scipy().toarray(), a)
+
+    # dlpack
+    shared = tvmsp.CSRNDArray.from_dlpack(*csr.to_dlpack(), shape=csr.shape)
+    np.testing.assert_array_equal(shared.numpy(), a)
+
+    # coo
+    data, row, col = csr.to_coo()
+    coo = sp.coo_matrix((data.numpy(), (row.numpy(), col.numpy())), shape=a.shape)
+    np.testing.assert_array_equal(coo.toarray(), a)
+    np.testing.assert_array_equal(
+        tvmsp.CSRNDArray.from_coo(data, row, col, a.shape).numpy(), a
+    )
+
+    # csc
+    data, indices, indptr = csr.to_csc()
+    csc = ref.tocsc()
+    np.testing.assert_array_equal(data.numpy(), csc.data)
+    np.testing.assert_array_equal(indices.numpy(), csc.indices)
+    np.testing.assert_array_equal(indptr.numpy(), csc.indptr)
+
+    # bsr
+    data, indices, indptr = csr.to_bsr((2, 4))
+    assert data.shape[1:] == (2, 4)
+    bsr = sp.bsr_matrix((data.numpy(), indices.numpy(), indptr.numpy()), shape=a.shape)
+    np.testing.assert_array_equal(bsr.toarray(), a)
+
+
 if __name__ == "__main__":
     test_static_tensor()
     test_dynamic_tensor()
     test_sparse_array_tuple()
+    test_sparse_array_conversion()
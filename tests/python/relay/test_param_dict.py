@@ -16,6 +16,7 @@
 # under the License.
 import os
 import numpy as np
+import pytest
 import tvm
 from tvm import te, runtime
 import json
@@ -39,6 +40,27 @@ def test_save_load():
     np.testing.assert_equal(param2["y"].numpy(), y)
 
 
+def test_save_load_mmap():
+    x = np.random.uniform(size=(10, 2)).astype("float32")
+    indices = np.arange(1000, dtype="int32")
+    empty = np.zeros((0, 3), dtype="int64")
+    temp = utils.tempdir()
+    path = temp.relpath("params.bin")
+    runtime.save_param_dict_mmap({"x": tvm.nd.array(x), "indices": indices, "empty": empty}, path)
+    params = runtime.load_param_dict_mmap(path)
+    assert set(params) == {"x", "indices", "empty"}
+    np.testing.assert_equal(params["x"].numpy(), x)
+    np.testing.assert_equal(params["indices"].numpy(), indices)
+    assert params["empty"].shape == (0, 3) and params["empty"].dtype == "int64"
+    # writes are private to the process and do not change the file
+    params["indices"].copyfrom(np.zeros(1000, dtype="int32"))
+    np.testing.assert_equal(runtime.load_param_dict_mmap(path)["indices"].numpy(), indices)
+    with open(path, "wb") as f:
+        f.write(runtime.save_param_dict({"x": x}))
+    with pytest.raises(ValueError):
+        runtime.load_param_dict_mmap(path)
+
+
 def test_ndarray_reflection():
     # Make two `NDArrayWrapper`s that point to the same underlying array.
     np_array = np.random.uniform(size=(10, 2)).astype("float32")
@@ -91,5 +113,6 @@ def test_bigendian_rpc_param():
 
 if __name__ == "__main__":
     test_save_load()
+    test_save_load_mmap()
     test_ndarray_reflection()
     test_bigendian_rpc_param()
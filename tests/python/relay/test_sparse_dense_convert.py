@@ -86,5 +86,57 @@ def test_bsr_sparse_dense():
     np.testing.assert_allclose(sparse_output, dense_output, atol=1e-5, rtol=1e-5)
 
 
+def test_sparse_dense_per_layer_format():
+    data = relay.var("data", shape=(1, 128), dtype="float32")
+    w0 = relay.var("weight0", shape=(256, 128), dtype="float32")
+    w1 = relay.var("weight1", shape=(128, 256), dtype="float32")
+    y = relay.nn.dense(relay.nn.dense(data, w0), w1)
+    func = relay.Function(relay.analysis.free_vars(y), y)
+
+    # 16x16 blocks for the first layer, no sparsity for the second one
+    w0_np = np.kron(sp.random(16, 8, density=0.2, random_state=0).toarray(), np.ones((16, 16)))
+    w1_np = np.random.randn(128, 256)
+    params = {
+        "weight0": tvm.nd.array(w0_np.astype("float32")),
+        "weight1": tvm.nd.array(w1_np.astype("float32")),
+    }
+    x_np = np.random.randn(1, 128).astype("float32")
+    dense_output = run_func(func, params, x_np)
+
+    weight_info = relay.analysis.sparse_dense.process_params(func, dict(params), None, 0.5)
+    assert list(weight_info.weight_name) == ["weight0"]
+    assert list(weight_info.weight_format) == ["bsr_16"]
+
+    sparse_func, params = relay.data_dep_optimization.bsr_dense.convert(func, params, None, 0.5)
+    assert "weight0.data" in params and "weight1" in params
+    # the choice is only returned, the params hold the arrays of the relay graph
+    assert "weight0.format" not in params
+    assert params["weight0.data"].shape[1:] == (16, 16)
+    sparse_output = run_func(sparse_func, params, x_np)
+    np.testing.assert_allclose(sparse_output, dense_output, atol=1e-4, rtol=1e-4)
+
+
+def test_select_sparse_format():
+    from tvm.relay.analysis.sparse_dense import analyze_weight, select_sparse_format
+
+    w_np = np.zeros((16, 16), dtype="float32")
+    w_np[:, ::4] = 1.0
+    stats = analyze_weight(w_np, block_sizes=(2, 3, 4))
+    assert stats.sparsity == 0.75
+    assert stats.degree_cv == 0.0
+    assert sorted(stats.block_fill) == [2, 4]
+    assert stats.block_fill[4] == 0.25
+    assert select_sparse_format(w_np, 0.9).name == "dense"
+    # scattered non-zeros are stored in 1x1 blocks
+    w_np = np.zeros((64, 256), dtype="float32")
+    for row in range(64):
+        w_np[row, (row * 37 + 32 * np.arange(8)) % 256] = 1.0
+    choice = select_sparse_format(w_np, 0.5)
+    assert choice.name == "bsr_1" and choice.block_size == (1, 1)
+    assert select_sparse_format(np.ones((16, 16)), 0.0).name == "dense"
+
+
 if __name__ == "__main__":
     test_bsr_sparse_dense()
+    test_sparse_dense_per_layer_format()
+    test_select_sparse_format()
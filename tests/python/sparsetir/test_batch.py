@@ -0,0 +1,200 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import scipy.sparse as sp
+import tvm
+import tvm.tir as tir
+from tvm.sparse import (
+    GraphBatch,
+    batched_csrmm,
+    batched_ellmm,
+    batched_sddmm,
+    horizontal_fuse,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+)
+
+FEAT_SIZE = 16
+
+
+def random_graphs():
+    rng = np.random.default_rng(0)
+    return [
+        sp.random(m, n, density=0.2, format="csr", dtype="float32", random_state=i)
+        for i, (m, n) in enumerate(rng.integers(1, 40, size=(12, 2)))
+    ]
+
+
+def test_graph_batch():
+    mats = random_graphs()
+    batch = GraphBatch.from_csr(mats)
+    assert batch.batch_size == len(mats)
+    assert batch.num_rows == sum(mat.shape[0] for mat in mats)
+    assert batch.nnz == sum(mat.nnz for mat in mats)
+    for mat, data in zip(mats, batch.split_nnz(batch.data)):
+        np.testing.assert_array_equal(data, mat.data)
+    params = batch.specialize(batched_csrmm, FEAT_SIZE).params
+    assert [param.name for param in params] == [
+        "a",
+        "x",
+        "y",
+        "row_indptr",
+        "col_indptr",
+        "indptr",
+        "indices",
+    ]
+
+
+def build(mod, name, fuse_batch):
+    sch = tir.Schedule(mod)
+    if fuse_batch:
+        sp_iteration = sch.get_sparse_iteration(name)
+        b, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [b, i])
+    mod = lower_sparse_iter(sch.mod)
+    sch = tir.Schedule(mod)
+    sch.parallel(sch.get_loops(sch.get_block(name + "0"))[0])
+    mod = lower_sparse_buffer(sch.mod)
+    return tvm.build(mod["main"], target="llvm")
+
+
+def index_args(batch):
+    return [
+        tvm.nd.array(arr)
+        for arr in [batch.row_indptr, batch.col_indptr, batch.indptr, batch.indices]
+    ]
+
+
+def test_batched_csrmm():
+    mats = random_graphs()
+    batch = GraphBatch.from_csr(mats)
+    xs = [np.random.rand(mat.shape[1], FEAT_SIZE).astype("float32") for mat in mats]
+    mod = tvm.IRModule.from_expr(batch.specialize(batched_csrmm, FEAT_SIZE))
+    for fuse_batch in [False, True]:
+        f = build(mod, "batched_csrmm", fuse_batch)
+        y = tvm.nd.array(np.zeros(batch.num_rows * FEAT_SIZE, "float32"))
+        f(
+            tvm.nd.array(batch.data),
+            tvm.nd.array(np.concatenate(xs).reshape(-1)),
+            y,
+            *index_args(batch),
+        )
+        ys = batch.split_rows(y.numpy().reshape(-1, FEAT_SIZE))
+        for mat, x, y_b in zip(mats, xs, ys):
+            np.testing.assert_allclose(y_b, mat @ x, rtol=1e-5, atol=1e-5)
+
+
+def test_batched_ellmm():
+    mats = random_graphs()
+    batch = GraphBatch.from_csr(mats)
+    xs = [np.random.rand(mat.shape[1], FEAT_SIZE).astype("float32") for mat in mats]
+    width = batch.max_row_nnz + 1
+    indices, data = batch.to_ell(width)
+    mod = tvm.IRModule.from_expr(batch.specialize(batched_ellmm, FEAT_SIZE, width))
+    f = build(mod, "batched_ellmm", True)
+    y = tvm.nd.array(np.zeros(batch.num_rows * FEAT_SIZE, "float32"))
+    f(
+        tvm.nd.array(data),
+        tvm.nd.array(np.concatenate(xs).reshape(-1)),
+        y,
+        tvm.nd.array(batch.row_indptr),
+        tvm.nd.array(batch.col_indptr),
+        tvm.nd.array(indices),
+    )
+    ys = batch.split_rows(y.numpy().reshape(-1, FEAT_SIZE))
+    for mat, x, y_b in zip(mats, xs, ys):
+        np.testing.assert_allclose(y_b, mat @ x, rtol=1e-5, atol=1e-5)
+
+
+def test_horizontal_fuse():
+    mats = random_graphs()
+    # the graphs with short rows in ELL, the others in CSR
+    short = [mat.getnnz(axis=1).max(initial=0) <= 3 for mat in mats]
+    ell_mats = [mat for mat, s in zip(mats, short) if s]
+    csr_mats = [mat for mat, s in zip(mats, short) if not s]
+    ell_batch, csr_batch = GraphBatch.from_csr(ell_mats), GraphBatch.from_csr(csr_mats)
+    func = horizontal_fuse(
+        [
+            ell_batch.specialize(batched_ellmm, FEAT_SIZE),
+            csr_batch.specialize(batched_csrmm, FEAT_SIZE),
+            csr_batch.specialize(batched_csrmm, FEAT_SIZE),
+        ]
+    )
+    assert func.attrs["horizontal_fuse"] == 1
+    mod = lower_sparse_iter(tvm.IRModule.from_expr(func))
+    sch = tir.Schedule(mod)
+    for name in ["batched_ellmm", "batched_csrmm", "batched_csrmm_2"]:
+        sch.parallel(sch.get_loops(sch.get_block(name + "0"))[0])
+    f = tvm.build(lower_sparse_buffer(sch.mod)["main"], target="llvm")
+
+    ell_indices, ell_data = ell_batch.to_ell()
+    ell_xs = [np.random.rand(mat.shape[1], FEAT_SIZE).astype("float32") for mat in ell_mats]
+    csr_xs = [np.random.rand(mat.shape[1], FEAT_SIZE).astype("float32") for mat in csr_mats]
+    ell_y = tvm.nd.array(np.zeros(ell_batch.num_rows * FEAT_SIZE, "float32"))
+    csr_ys = [tvm.nd.array(np.zeros(csr_batch.num_rows * FEAT_SIZE, "float32")) for _ in range(2)]
+    args = [
+        tvm.nd.array(ell_data),
+        tvm.nd.array(np.concatenate(ell_xs).reshape(-1)),
+        ell_y,
+        tvm.nd.array(ell_batch.row_indptr),
+        tvm.nd.array(ell_batch.col_indptr),
+        tvm.nd.array(ell_indices),
+    ]
+    for csr_y in csr_ys:
+        args += [
+            tvm.nd.array(csr_batch.data),
+            tvm.nd.array(np.concatenate(csr_xs).reshape(-1)),
+            csr_y,
+            *index_args(csr_batch),
+        ]
+    f(*args)
+    ys = ell_batch.split_rows(ell_y.numpy().reshape(-1, FEAT_SIZE))
+    for mat, x, y_b in zip(ell_mats, ell_xs, ys):
+        np.testing.assert_allclose(y_b, mat @ x, rtol=1e-5, atol=1e-5)
+    for csr_y in csr_ys:
+        ys = csr_batch.split_rows(csr_y.numpy().reshape(-1, FEAT_SIZE))
+        for mat, x, y_b in zip(csr_mats, csr_xs, ys):
+            np.testing.assert_allclose(y_b, mat @ x, rtol=1e-5, atol=1e-5)
+
+
+def test_batched_sddmm():
+    mats = random_graphs()
+    batch = GraphBatch.from_csr(mats)
+    xs = [np.random.rand(mat.shape[0], FEAT_SIZE).astype("float32") for mat in mats]
+    ys = [np.random.rand(mat.shape[1], FEAT_SIZE).astype("float32") for mat in mats]
+    mod = tvm.IRModule.from_expr(batch.specialize(batched_sddmm, FEAT_SIZE))
+    f = build(mod, "batched_sddmm", True)
+    z = tvm.nd.array(np.zeros(batch.nnz, "float32"))
+    f(
+        tvm.nd.array(np.concatenate(xs).reshape(-1)),
+        tvm.nd.array(np.concatenate(ys).reshape(-1)),
+        z,
+        *index_args(batch),
+    )
+    for mat, x, y, z_b in zip(mats, xs, ys, batch.split_nnz(z)):
+        rows = np.repeat(np.arange(mat.shape[0]), np.diff(mat.indptr))
+        np.testing.assert_allclose(
+            z_b, (x[rows] * y[mat.indices]).sum(axis=-1), rtol=1e-5, atol=1e-5
+        )
+
+
+if __name__ == "__main__":
+    test_graph_batch()
+    test_batched_csrmm()
+    test_batched_ellmm()
+    test_horizontal_fuse()
+    test_batched_sddmm()
@@ -15,9 +15,15 @@
 # specific language governing permissions and limitations
 # under the License.
 
+import numpy as np
+import pytest
+import scipy.sparse as sp
 from tvm.script import tir as T
+from tvm.sparse import lower_sparse_buffer, lower_sparse_iter
 from sparse_tir_lowered_iter_scripts import csrmm_dense_iter
+from sparse_tir_scripts import sddmm
 import tvm
+import tvm.tir as tir
 
 
 def test_binary_search():
@@ -34,5 +40,75 @@ def test_binary_search():
     print(f.imported_modules[0].get_source())
 
 
+def lower_fused_sddmm(func, binary_search):
+    sch = tir.Schedule(tvm.IRModule.from_expr(func))
+    sp_iteration = sch.get_sparse_iteration("sddmm")
+    i, j, _ = sch.get_sp_iters(sp_iteration)
+    sch.sparse_fuse(sp_iteration, [i, j])
+    return lower_sparse_iter(sch.mod, binary_search=binary_search)
+
+
+def count_whiles(func):
+    whiles = []
+    tvm.tir.stmt_functor.post_order_visit(
+        func.body, lambda node: whiles.append(node) if isinstance(node, tir.While) else None
+    )
+    return len(whiles)
+
+
+@pytest.mark.parametrize("binary_search", ["loop", "branchless", "merge"])
+@pytest.mark.parametrize("specialize_rows", [True, False])
+def test_fused_sddmm_binary_search(binary_search, specialize_rows):
+    m, n, feat_size = 64, 48, 8
+    mat = sp.random(m, n, density=0.1, format="lil", dtype="float32")
+    mat[20:30, :] = 0  # empty rows
+    mat = mat.tocsr()
+    mat.eliminate_zeros()
+    params = {p.name: p for p in sddmm.params}
+    values = {"n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    if specialize_rows:
+        values["m"] = m
+    func = sddmm.specialize({params[k]: v for k, v in values.items()})
+    mod = lower_fused_sddmm(func, binary_search)
+    if binary_search == "loop":
+        assert count_whiles(mod["main"]) == 1
+    elif binary_search == "branchless":
+        # the steps are unrolled when the number of rows is known
+        assert count_whiles(mod["main"]) == (0 if specialize_rows else 1)
+    else:
+        assert count_whiles(mod["main"]) == 0
+        sch = tir.Schedule(mod)
+        (row,) = sch.get_loops(sch.get_block("binary_search_block_0_0"))
+        sch.parallel(row)
+        mod = sch.mod
+    f = tvm.build(lower_sparse_buffer(mod)["main"], target="llvm")
+
+    x = np.random.rand(m, feat_size).astype("float32")
+    y = np.random.rand(n, feat_size).astype("float32")
+    z = tvm.nd.array(np.zeros(mat.nnz, "float32"))
+    args = [
+        tvm.nd.array(x.reshape(-1)),
+        tvm.nd.array(y.reshape(-1)),
+        z,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+    ]
+    if not specialize_rows:
+        args.append(m)
+    f(*args)
+    rows = np.repeat(np.arange(m), np.diff(mat.indptr))
+    expected = (x[rows] * y[mat.indices]).sum(axis=1)
+    np.testing.assert_allclose(z.numpy(), expected, rtol=1e-5)
+
+
+def test_invalid_binary_search_strategy():
+    with pytest.raises(ValueError):
+        lower_fused_sddmm(sddmm, "linear")
+
+
 if __name__ == "__main__":
     test_binary_search()
+    for binary_search in ["loop", "branchless", "merge"]:
+        for specialize_rows in [True, False]:
+            test_fused_sddmm_binary_search(binary_search, specialize_rows)
+    test_invalid_binary_search_strategy()
@@ -0,0 +1,128 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import json
+import os
+
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+import tvm.testing
+import tvm.tir as tir
+from tvm.sparse import (
+    FormatCandidate,
+    column_part_hyb,
+    export_bundle,
+    format_decompose,
+    load_bundle,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    pack_params,
+    rule_param_names,
+    specialize_params,
+)
+from sparse_tir_scripts import csrmm
+
+
+def build_packed_hyb(mat, feat_size, buckets):
+    m, n = mat.shape
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        1,
+        buckets,
+    )
+    rules = FormatCandidate("hyb", buckets).rules()
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules)
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    values = {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    arrays = {}
+    for bucket_id, rule in enumerate(rules):
+        values["m_" + rule.name] = m
+        values["n_" + rule.name] = n
+        values["num_rows_" + rule.name] = row_indices[0][bucket_id].shape[0]
+        arrays["a_" + rule.name] = mask[0][bucket_id]
+        arrays["indices_i_" + rule.name] = row_indices[0][bucket_id]
+        arrays["indices_j_" + rule.name] = col_indices[0][bucket_id]
+    mod["main"] = specialize_params(mod["main"], values)
+    sch = tir.Schedule(mod)
+    for rule in rules:
+        sp_iteration = sch.get_sparse_iteration("csrmm_" + rule.name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_buffer(lower_sparse_iter(sch.mod))
+    mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+    names = rule_param_names(mod["main"], [rule.name for rule in rules])
+    packed, layout = pack_params(mod["main"], names)
+    return packed, layout, arrays
+
+
+def test_bundle_packed_hyb(tmpdir):
+    m = n = 128
+    feat_size = 8
+    buckets = [1, 2, 4, 8, 16, 32]
+    mat = sp.random(m, n, density=0.05, format="csr", dtype="float32")
+    mat.data[:] = 1
+    packed, layout, arrays = build_packed_hyb(mat, feat_size, buckets)
+    path = os.path.join(str(tmpdir), "spmm_hyb")
+    export_bundle(
+        path,
+        tvm.build(packed, target="llvm"),
+        packed,
+        arrays,
+        layout=layout,
+        metadata={"buckets": buckets},
+    )
+    with open(os.path.join(path, "manifest.json")) as f:
+        manifest = json.load(f)
+    assert [spec["kind"] for spec in manifest["params"]] == ["input", "input", "array", "array"]
+
+    kernel = load_bundle(path)
+    assert kernel.input_names == ["b", "c"]
+    assert kernel.metadata == {"buckets": buckets}
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    kernel(x.reshape(-1), c)
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+    # inputs by name
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    kernel(c=c, b=x.reshape(-1))
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+    with pytest.raises(ValueError):
+        kernel(x.reshape(-1))
+    with pytest.raises(ValueError):
+        kernel(x.reshape(-1).astype("float64"), c)
+
+
+def test_bundle_errors(tmpdir):
+    mat = sp.random(32, 32, density=0.1, format="csr", dtype="float32")
+    packed, layout, arrays = build_packed_hyb(mat, 4, [1, 2, 4])
+    f = tvm.build(packed, target="llvm")
+    path = os.path.join(str(tmpdir), "bundle")
+    with pytest.raises(KeyError):
+        export_bundle(path, f, packed, dict(arrays, unknown=np.zeros(1)), layout=layout)
+    with pytest.raises(KeyError):
+        # the arrays of the packed parameters are required
+        export_bundle(path, f, packed, {}, layout=layout)
+    with pytest.raises(ValueError):
+        load_bundle(path)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
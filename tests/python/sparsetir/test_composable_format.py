@@ -16,8 +16,21 @@
 # under the License.
 
 import tvm
+import tvm.testing
 import numpy as np
-from tvm.sparse import FormatRewriteRule, format_decompose
+import scipy.sparse as sp
+from tvm.sparse import (
+    FormatRewriteRule,
+    column_part_hyb,
+    format_decompose,
+    format_instances,
+    launch_instances,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    plan_reduction,
+    specialize_params,
+)
+from tvm.sparse.format_search import ell_rule
 from sparse_tir_scripts import csrmm
 from sparse_tir_composable_format_scripts import (
     bsr,
@@ -94,6 +107,131 @@ def test_csrmm_ell_rewrite():
     tvm.ir.assert_structural_equal(mod["main"], ell_rewrite_with_preprocess, True)
 
 
+def csr2ell_rule(name, nnz_cols=None):
+    return FormatRewriteRule(
+        name,
+        ell if nnz_cols is None else ell.specialize({ell.params[-1]: nnz_cols}),
+        ["A"],
+        ["I", "J"],
+        ["O", "I", "J"],
+        {"I": ["O", "I"], "J": ["J"]},
+        csr2ell_index_map,
+        csr2ell_inv_index_map,
+    )
+
+
+def test_csrmm_ell_parametric_rewrite():
+    mod = tvm.IRModule.from_expr(csrmm)
+    # the buckets of all column partitions and widths share one template
+    rewrites = [
+        csr2ell_rule("{}_{}".format(part_id, bucket_id))
+        for part_id in range(4)
+        for bucket_id in range(8)
+    ]
+    parametric = format_decompose(mod, rewrites, parametric=True)["main"]
+    single = format_decompose(mod, rewrites[:1])["main"]
+    tvm.ir.assert_structural_equal(parametric.body, single.body, True)
+    assert [p.name for p in parametric.params] == [p.name for p in single.params]
+    assert format_instances(parametric) == {"0_0": [rule.name for rule in rewrites]}
+
+    # buckets of specialized widths are only shared by the column partitions
+    rewrites = [
+        csr2ell_rule("{}_{}".format(part_id, nnz_cols), nnz_cols)
+        for part_id in range(4)
+        for nnz_cols in [4, 8, 16]
+    ]
+    parametric = format_decompose(mod, rewrites, parametric=True)["main"]
+    assert format_instances(parametric) == {
+        "0_{}".format(nnz_cols): ["{}_{}".format(part_id, nnz_cols) for part_id in range(4)]
+        for nnz_cols in [4, 8, 16]
+    }
+    tvm.ir.assert_structural_equal(
+        parametric.body, format_decompose(mod, rewrites[:3])["main"].body, True
+    )
+
+
+def build_hyb(rules, values, sp_iter_names, parametric):
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules, parametric=parametric)
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    names = {param.name for param in mod["main"].params}
+    mod["main"] = specialize_params(
+        mod["main"], {name: value for name, value in values.items() if name in names}
+    )
+    sch = tvm.tir.Schedule(mod)
+    for name in sp_iter_names:
+        sp_iteration = sch.get_sparse_iteration(name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_buffer(lower_sparse_iter(sch.mod))
+    return tvm.tir.transform.RemoveUnusedArgs()(mod)["main"]
+
+
+def test_csrmm_ell_parametric_launch():
+    m = n = 64
+    feat_size = 4
+    num_col_parts = 2
+    # a column partition holds 32 columns, no row is split in the last bucket
+    buckets = [1, 2, 4, 8, 16, 32]
+    mat = sp.random(m, n, density=0.1, format="csr", dtype="float32")
+    mat.data[:] = 1
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        num_col_parts,
+        buckets,
+    )
+    names = [
+        "{}_{}".format(part_id, bucket_id)
+        for part_id in range(num_col_parts)
+        for bucket_id in range(len(buckets))
+    ]
+    values = {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    sizes = {}
+    arrays = {}
+    for name in names:
+        part_id, bucket_id = map(int, name.split("_"))
+        values["m_" + name] = m
+        values["n_" + name] = n
+        sizes["num_rows_" + name] = row_indices[part_id][bucket_id].shape[0]
+        sizes["nnz_cols_" + name] = buckets[bucket_id]
+        arrays["a_" + name] = tvm.nd.array(
+            mask[part_id][bucket_id].numpy().reshape(-1).astype("float32")
+        )
+        arrays["indices_i_" + name] = row_indices[part_id][bucket_id]
+        arrays["indices_j_" + name] = tvm.nd.array(
+            col_indices[part_id][bucket_id].numpy().reshape(-1)
+        )
+    x = np.random.rand(n, feat_size).astype("float32")
+    arrays["b"] = tvm.nd.array(x.reshape(-1))
+
+    # the buckets of all partitions and widths are decomposed, the rows written by several
+    # buckets are reduced by a plan
+    rules = [ell_rule(name, buckets[int(name.split("_")[1])]) for name in names]
+    func = build_hyb(rules, dict(values, **sizes), ["csrmm_" + name for name in names], False)
+    plan = plan_reduction(row_indices, m, feat_size, atomic_threshold=0)
+    func = plan.apply(func)
+    buffers = plan.make_buffers()
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    args = dict(arrays, c=c, **buffers)
+    tvm.build(func, target="llvm")(*[args[param.name] for param in func.params])
+    plan.build_reduce("llvm")(c, buffers)
+    expected = c.numpy()
+    tvm.testing.assert_allclose(expected.reshape(m, feat_size), mat @ x, rtol=1e-5)
+
+    # one template, launched once per bucket with its width and number of rows
+    rules = [ell_rule(name, None) for name in names]
+    func = build_hyb(rules, values, ["csrmm_0_0"], True)
+    assert format_instances(func) == {"0_0": names}
+    assert {"nnz_cols_0_0", "num_rows_0_0"} <= {param.name for param in func.params}
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    arrays.update(sizes, c=c)
+    (out,) = launch_instances(tvm.build(func, target="llvm"), func, arrays, ["c"])
+    assert out.same_as(c)
+    tvm.testing.assert_allclose(c.numpy(), expected, rtol=1e-5)
+
+
 def csrpadding_inv_index_map(i, jo, ji):
     return i, ji
 
@@ -125,4 +263,6 @@ def test_csrmm_padding_rewrite():
 if __name__ == "__main__":
     test_csrmm_bsr_rewrite()
     test_csrmm_ell_rewrite()
+    test_csrmm_ell_parametric_rewrite()
+    test_csrmm_ell_parametric_launch()
     test_csrmm_padding_rewrite()
@@ -0,0 +1,127 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import tvm
+import numpy as np
+import scipy.sparse as sp
+from tvm.sparse import (
+    AnalyticFormatCost,
+    FormatCandidate,
+    SparseStructure,
+    default_candidates,
+    search_format,
+)
+from sparse_tir_scripts import csrmm
+
+
+def block_diagonal():
+    return sp.block_diag([np.ones((16, 16), dtype="float32")] * 32).tocsr()
+
+
+def power_law():
+    rng = np.random.default_rng(0)
+    degree = np.minimum((rng.pareto(1.5, 2048) + 1).astype("int64"), 2048)
+    rows = np.repeat(np.arange(2048), degree)
+    cols = rng.integers(0, 2048, len(rows))
+    mat = sp.csr_matrix((np.ones(len(rows), dtype="float32"), (rows, cols)), shape=(2048, 2048))
+    mat.sum_duplicates()
+    return mat
+
+
+def rank(mat):
+    structure = SparseStructure(mat.indptr, mat.indices, mat.shape[1])
+    cost_model = AnalyticFormatCost()
+    return sorted(
+        default_candidates(structure), key=lambda candidate: cost_model(candidate, structure)
+    )
+
+
+def test_sparse_structure():
+    structure = SparseStructure(np.array([0, 1, 3, 3, 8]), np.array([0, 1, 2, 0, 1, 2, 3, 7]))
+    assert structure.num_cols == 8
+    assert structure.blocks(2) == (5, 2)
+    # rows of degree 1, 2 and 5 in buckets of width 1, 2 and 4
+    assert structure.bucket_slots([1, 2, 4]) == (1 + 2 + 8, 4)
+
+
+def test_rank_block_diagonal():
+    assert rank(block_diagonal())[0].kind in ["bsr", "dbsr"]
+    assert rank(block_diagonal())[0].block_size == 16
+
+
+def test_rank_power_law():
+    assert rank(power_law())[0].kind == "hyb"
+
+
+def test_search_format():
+    mat = block_diagonal()
+    result = search_format(tvm.IRModule.from_expr(csrmm), mat.indptr, mat.indices)
+    assert result.candidate.name in ["bsr_16", "dbsr_16"]
+    param_names = [param.name for param in result.mod["main"].params]
+    assert "a_" + result.candidate.name in param_names
+    assert len(result.measured_costs) == 0
+    # every block of the block diagonal matrix is full
+    a = result.arrays["a_" + result.candidate.name].numpy()
+    assert a.shape == (mat.nnz,) and np.all(a == 1)
+    assert {name for name in result.arrays if not name.startswith("a_")} <= set(param_names)
+
+
+def test_convert_hyb():
+    mat = sp.csr_matrix(
+        (np.arange(1, 9, dtype="float32"), np.array([0, 1, 2, 0, 1, 2, 3, 7]), [0, 1, 3, 3, 8]),
+        shape=(4, 8),
+    )
+    structure = SparseStructure(mat.indptr, mat.indices, mat.shape[1])
+    arrays = FormatCandidate("hyb", [1, 2]).convert(structure, mat.data)
+    # the row of degree 5 is split into two rows of width 2 and one of width 1
+    assert arrays["indices_i_ell_1"].numpy().tolist() == [0, 3]
+    assert arrays["indices_i_ell_2"].numpy().tolist() == [1, 3, 3]
+    assert arrays["indices_j_ell_2"].numpy().tolist() == [1, 2, 0, 1, 2, 3]
+    assert arrays["a_ell_1"].numpy().tolist() == [1, 8]
+    assert arrays["num_rows_ell_2"] == 3
+
+
+def test_search_format_measure_top_k():
+    mat = power_law()
+    measured = []
+
+    def f_measure(mod, candidate):
+        measured.append(candidate.name)
+        # pretend CSR, which the cost model ranks low, is the fastest
+        return 0.0 if candidate.kind == "csr" else 1.0
+
+    candidates = [FormatCandidate("csr"), FormatCandidate("hyb", [1, 2, 4, 8])]
+    result = search_format(
+        tvm.IRModule.from_expr(csrmm),
+        mat.indptr,
+        mat.indices,
+        candidates=candidates,
+        top_k=2,
+        f_measure=f_measure,
+    )
+    assert sorted(measured) == ["csr", "hyb_1_2_4_8"]
+    assert result.candidate.kind == "csr"
+    tvm.ir.assert_structural_equal(result.mod["main"], csrmm)
+    assert len(result.arrays) == 0
+
+
+if __name__ == "__main__":
+    test_sparse_structure()
+    test_rank_block_diagonal()
+    test_rank_power_law()
+    test_search_format()
+    test_convert_hyb()
+    test_search_format_measure_top_k()
@@ -0,0 +1,80 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+from tvm.sparse import as_ndarray, from_scipy, from_torch_sparse
+
+
+def aligned(arr):
+    """A copy of arr whose data is 64-byte aligned."""
+    buf = np.empty(arr.nbytes + 64, dtype="uint8")
+    offset = -buf.ctypes.data % 64
+    out = buf[offset : offset + arr.nbytes].view(arr.dtype).reshape(arr.shape)
+    out[...] = arr
+    return out
+
+
+def test_as_ndarray_numpy():
+    arr = aligned(np.arange(16, dtype="int32"))
+    view = as_ndarray(arr)
+    arr[0] = 42
+    # shares memory
+    assert view.numpy()[0] == 42
+    # a dtype conversion copies
+    copy = as_ndarray(arr, "int64")
+    arr[0] = 0
+    assert copy.dtype == "int64" and copy.numpy()[0] == 42
+    # a strided array is copied
+    np.testing.assert_array_equal(as_ndarray(arr[::2]).numpy(), arr[::2])
+    # a misaligned array is copied
+    np.testing.assert_array_equal(as_ndarray(arr[1:]).numpy(), arr[1:])
+
+
+def test_from_scipy():
+    mat = sp.random(32, 16, density=0.2, format="csr", dtype="float32")
+    csr = from_scipy(mat)
+    np.testing.assert_array_equal(csr.numpy(), mat.toarray())
+    assert csr.indptr.dtype == "int32" and csr.indices.dtype == "int32"
+    csr = from_scipy(mat.tocoo(), idtype="int64")
+    assert csr.indptr.dtype == "int64"
+    np.testing.assert_array_equal(csr.numpy(), mat.toarray())
+
+
+def test_from_torch_sparse():
+    torch = pytest.importorskip("torch")
+    dense = torch.rand(8, 8) * (torch.rand(8, 8) > 0.7)
+    csr = from_torch_sparse(dense.to_sparse_csr(), idtype="int64")
+    np.testing.assert_array_equal(csr.numpy(), dense.numpy())
+    csr = from_torch_sparse(dense.to_sparse())
+    assert csr.indices.dtype == "int32"
+    np.testing.assert_array_equal(csr.numpy(), dense.numpy())
+
+    # int64 torch tensors are shared without copy
+    indices = torch.arange(16)
+    view = as_ndarray(indices)
+    indices[0] = 42
+    assert view.numpy()[0] == 42
+    with pytest.raises(ValueError):
+        from_torch_sparse(dense)
+
+
+if __name__ == "__main__":
+    test_as_ndarray_numpy()
+    test_from_scipy()
+    test_from_torch_sparse()
@@ -0,0 +1,85 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+from tvm import te, topi
+from tvm.sparse import NMSparseMatrix
+
+
+def random_nm(num_rows, num_cols, n, m):
+    w = np.random.randn(num_rows, num_cols).astype("float32")
+    return NMSparseMatrix.from_dense(w, n, m, prune=True).to_dense()
+
+
+def test_from_dense():
+    w = np.random.randn(8, 16).astype("float32")
+    nm = NMSparseMatrix.from_dense(w, 2, 4, prune=True)
+    assert nm.values.shape == (8, 4, 2)
+    assert nm.offsets.dtype == "uint8"
+    pruned = nm.to_dense()
+    assert ((pruned != 0).reshape(8, 4, 4).sum(axis=-1) == 2).all()
+    # the two elements of largest magnitude of every group are kept
+    np.testing.assert_allclose(
+        np.sort(np.abs(pruned).reshape(8, 4, 4), axis=-1)[..., 2:],
+        np.sort(np.abs(w).reshape(8, 4, 4), axis=-1)[..., 2:],
+    )
+    pruned[0, :4] = 0
+    np.testing.assert_array_equal(NMSparseMatrix.from_dense(pruned, 2, 4).to_dense(), pruned)
+    with pytest.raises(ValueError):
+        NMSparseMatrix.from_dense(w, 2, 4)
+
+
+def test_from_csr():
+    w = random_nm(8, 16, 2, 4)
+    w[3, 4:8] = 0
+    csr = sp.csr_matrix(w)
+    nm = NMSparseMatrix.from_csr(csr.indptr, csr.indices, csr.data, 16, 2, 4)
+    np.testing.assert_array_equal(nm.values, NMSparseMatrix.from_dense(w, 2, 4).values)
+    np.testing.assert_array_equal(nm.to_dense(), w)
+    with pytest.raises(ValueError):
+        csr = sp.csr_matrix(np.ones((2, 8), dtype="float32"))
+        NMSparseMatrix.from_csr(csr.indptr, csr.indices, csr.data, 8, 2, 4)
+
+
+def test_sparse_dense_nm():
+    x_np = np.random.randn(16, 64).astype("float32")
+    w_np = random_nm(32, 64, 2, 4)
+    nm = NMSparseMatrix.from_dense(w_np, 2, 4)
+    x = te.placeholder(x_np.shape, "float32", name="x")
+    w_values = te.placeholder(nm.values.shape, "float32", name="w_values")
+    w_offsets = te.placeholder(nm.offsets.shape, "uint8", name="w_offsets")
+    with tvm.target.Target("llvm"):
+        y = topi.nn.sparse_dense_nm_sparse_tir(x, w_values, w_offsets, 4)
+        s = te.create_schedule(y.op)
+    f = tvm.build(s, [x, w_values, w_offsets, y], "llvm")
+    dev = tvm.cpu()
+    y_nd = tvm.nd.empty(y.shape, "float32", dev)
+    f(
+        tvm.nd.array(x_np, dev),
+        tvm.nd.array(nm.values, dev),
+        tvm.nd.array(nm.offsets, dev),
+        y_nd,
+    )
+    np.testing.assert_allclose(y_nd.numpy(), x_np @ w_np.T, rtol=1e-4, atol=1e-4)
+
+
+if __name__ == "__main__":
+    test_from_dense()
+    test_from_csr()
+    test_sparse_dense_nm()
@@ -0,0 +1,96 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+import tvm.tir as tir
+from tvm.sparse import (
+    FormatCandidate,
+    column_part_hyb,
+    format_decompose,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    pack_params,
+    rule_param_names,
+    specialize_params,
+)
+from sparse_tir_scripts import csrmm
+
+
+def test_specialize_params():
+    func = specialize_params(csrmm, {"m": 16, "n": 16})
+    assert [param.name for param in func.params][-2:] == ["feat_size", "nnz"]
+    with pytest.raises(KeyError):
+        specialize_params(csrmm, {"num_rows": 16})
+
+
+def test_packed_hyb():
+    m = n = 128
+    feat_size = 8
+    buckets = [1, 2, 4, 8, 16, 32]
+    mat = sp.random(m, n, density=0.05, format="csr", dtype="float32")
+    mat.data[:] = 1
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        1,
+        buckets,
+    )
+    rules = FormatCandidate("hyb", buckets).rules()
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules)
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    values = {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    for bucket_id, rule in enumerate(rules):
+        values["m_" + rule.name] = m
+        values["n_" + rule.name] = n
+        values["num_rows_" + rule.name] = row_indices[0][bucket_id].shape[0]
+    mod["main"] = specialize_params(mod["main"], values)
+    sch = tir.Schedule(mod)
+    for rule in rules:
+        sp_iteration = sch.get_sparse_iteration("csrmm_" + rule.name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_buffer(lower_sparse_iter(sch.mod))
+    mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+
+    names = rule_param_names(mod["main"], [rule.name for rule in rules])
+    assert len(names) == 3 * len(buckets)
+    packed, layout = pack_params(mod["main"], names)
+    assert [param.name for param in packed.params] == ["b", "c", "packed_float32", "packed_int32"]
+    for name, (_, offset, _) in layout.segments.items():
+        assert offset % 16 == 0
+
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    arrays = {"b": x.reshape(-1), "c": c}
+    for bucket_id, rule in enumerate(rules):
+        arrays["a_" + rule.name] = mask[0][bucket_id]
+        arrays["indices_i_" + rule.name] = row_indices[0][bucket_id]
+        arrays["indices_j_" + rule.name] = col_indices[0][bucket_id]
+    f = tvm.build(packed, target="llvm")
+    f(*layout.make_args(arrays))
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+    with pytest.raises(KeyError):
+        layout.pack({"b": x})
+
+
+if __name__ == "__main__":
+    test_specialize_params()
+    test_packed_hyb()
@@ -0,0 +1,98 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import json
+
+import numpy as np
+import scipy.sparse as sp
+import tvm
+from tvm.sparse import (
+    column_part_hyb,
+    format_decompose,
+    ir_node_count,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    profile,
+)
+from tvm.sparse.format_search import ell_rule
+from sparse_tir_scripts import csrmm
+
+
+def test_profile_phases():
+    mat = sp.random(64, 64, density=0.1, format="csr", dtype="float32")
+    indptr = tvm.nd.array(mat.indptr.astype("int32"))
+    indices = tvm.nd.array(mat.indices.astype("int32"))
+    with profile() as prof:
+        row_indices, _, _ = column_part_hyb(64, 64, indptr, indices, 1, [1, 2, 4, 8, 16])
+        with prof.phase("lower"):
+            mod = tvm.IRModule.from_expr(csrmm)
+            mod = lower_sparse_buffer(lower_sparse_iter(mod))
+        with prof.phase("build"):
+            tvm.build(mod["main"], target="llvm")
+        with prof.phase("alloc"):
+            big = np.zeros(1 << 20, dtype="uint8")
+    del big
+
+    names = [r.name for r in prof.records]
+    assert names[0] == "column_part_hyb" and names[1] == "lower"
+    # conversion results are accounted as NDArray bytes
+    expected = sum(row_indices[0][i].numpy().nbytes for i in range(5))
+    assert prof.records[0].ndarray_bytes >= expected
+    # lowering functions and their passes are nested records
+    lower = prof.records[1]
+    nested = [r for r in prof.records if r.depth > lower.depth]
+    assert {"lower_sparse_iter", "lower_sparse_buffer"} <= {r.name for r in nested}
+    assert any(r.kind == "pass" for r in nested)
+    alloc = [r for r in prof.records if r.name == "alloc"][0]
+    assert alloc.peak_host_bytes >= 1 << 20
+    summary = json.loads(prof.json())["summary"]
+    assert summary["build"]["count"] == 1 and summary["build"]["wall_ms"] > 0
+    assert "Wall (ms)" in prof.table()
+
+
+def test_profile_restores_context():
+    with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+        with profile(trace_memory=False) as prof:
+            ctx = tvm.transform.PassContext.current()
+            assert ctx.opt_level == 3 and bool(ctx.config["tir.disable_vectorize"])
+            with prof.phase("noop"):
+                pass
+        assert len(tvm.transform.PassContext.current().instruments) == 0
+    assert prof.records[0].peak_host_bytes == 0
+
+
+def lowered_hyb_nodes(num_buckets, parametric):
+    rules = [
+        ell_rule("ell_{}".format(width), None if parametric else width)
+        for width in range(1, num_buckets + 1)
+    ]
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules, parametric=parametric)
+    return ir_node_count(lower_sparse_buffer(lower_sparse_iter(mod)))
+
+
+def test_ir_node_count():
+    mod = tvm.IRModule.from_expr(csrmm)
+    assert ir_node_count(mod) == ir_node_count(mod["main"]) > 0
+    assert ir_node_count(lower_sparse_iter(mod)) > ir_node_count(mod)
+    # the IR grows with the number of buckets, unless they share a template
+    assert lowered_hyb_nodes(8, False) > lowered_hyb_nodes(2, False)
+    assert lowered_hyb_nodes(8, True) == lowered_hyb_nodes(2, True)
+
+
+if __name__ == "__main__":
+    test_profile_phases()
+    test_profile_restores_context()
+    test_ir_node_count()
@@ -0,0 +1,175 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+import tvm.testing
+import tvm.tir as tir
+from tvm.sparse import (
+    FormatCandidate,
+    bfloat16_to_float,
+    column_part_hyb,
+    dequantize_values,
+    float_to_bfloat16,
+    format_decompose,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    pack_params,
+    quantize_sparse_buffer,
+    quantize_values,
+    rule_param_names,
+    specialize_params,
+)
+from sparse_tir_scripts import csrmm
+
+
+def test_bfloat16_rounding():
+    x = np.array([1.0, 1.00390625, 1.01171875, -3.14159, np.inf, np.nan], "float32")
+    bits = float_to_bfloat16(x)
+    # halfway values are rounded to even
+    np.testing.assert_array_equal(bits[:3], [0x3F80, 0x3F80, 0x3F82])
+    y = bfloat16_to_float(bits)
+    np.testing.assert_allclose(y[:4], x[:4], rtol=1 / 128)
+    assert np.isinf(y[4]) and np.isnan(y[5])
+
+
+def test_quantize_values():
+    # rows of 2, 0 and 3 values
+    indptr = np.array([0, 2, 2, 5])
+    data = np.array([1.0, -4.0, 0.5, 2.0, -1.0], "float32")
+    values, scales = quantize_values(data, "int8", indptr)
+    assert values.dtype == "int8" and scales.shape == (3,)
+    np.testing.assert_allclose(scales.numpy(), [4 / 127, 1, 2 / 127], rtol=1e-6)
+    assert np.abs(values.numpy()).max() == 127
+    np.testing.assert_allclose(
+        dequantize_values(values, scales, indptr), data, atol=scales.numpy().max() / 2
+    )
+    # the rows of an ELL bucket are its last axis
+    ell = np.random.rand(16, 4).astype("float32")
+    values, scales = quantize_values(ell, "int8")
+    assert scales.shape == (16,)
+    np.testing.assert_allclose(
+        dequantize_values(values, scales), ell, atol=scales.numpy().max() / 2 + 1e-6
+    )
+    for dtype in ["float16", "bfloat16"]:
+        values, scales = quantize_values(ell, dtype)
+        assert values.dtype == dtype and scales is None
+        np.testing.assert_allclose(dequantize_values(values), ell, rtol=1 / 128)
+    with pytest.raises(ValueError):
+        quantize_values(ell, "int4")
+    with pytest.raises(ValueError):
+        dequantize_values(quantize_values(ell, "int8")[0])
+
+
+@pytest.mark.parametrize("dtype", ["float16", "bfloat16", "int8"])
+def test_quantized_csrmm(dtype):
+    m, n, feat_size = 64, 48, 16
+    mat = sp.random(m, n, density=0.1, format="csr", dtype="float32")
+    func = specialize_params(csrmm, {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz})
+    func = quantize_sparse_buffer(func, "a", dtype)
+    assert func.buffer_map[func.params[0]].dtype == dtype
+    assert (func.params[-1].name == "scale_a") == (dtype == "int8")
+    mod = lower_sparse_buffer(lower_sparse_iter(tvm.IRModule.from_expr(func)))
+    f = tvm.build(mod["main"], target="llvm")
+
+    values, scales = quantize_values(mat.data, dtype, mat.indptr)
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    args = [
+        values,
+        tvm.nd.array(x.reshape(-1)),
+        c,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+    ]
+    f(*args, *([scales] if scales is not None else []))
+    # the kernel computes in float32 on the stored values
+    stored = sp.csr_matrix(
+        (dequantize_values(values, scales, mat.indptr), mat.indices, mat.indptr), shape=(m, n)
+    )
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), stored @ x, rtol=1e-5)
+
+
+def test_quantized_packed_hyb():
+    m = n = 128
+    feat_size = 8
+    buckets = [1, 2, 4, 8]
+    mat = sp.random(m, n, density=0.05, format="csr", dtype="float32")
+    mat.data[:] = 1
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        1,
+        buckets,
+    )
+    rules = FormatCandidate("hyb", buckets).rules()
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules)
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    values = {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    arrays = {}
+    for bucket_id, rule in enumerate(rules):
+        values["m_" + rule.name] = m
+        values["n_" + rule.name] = n
+        values["num_rows_" + rule.name] = row_indices[0][bucket_id].shape[0]
+        mod["main"] = quantize_sparse_buffer(mod["main"], "a_" + rule.name, "int8")
+        # one scale per ELL row
+        quantized, scales = quantize_values(mask[0][bucket_id], "int8")
+        arrays["a_" + rule.name] = quantized
+        arrays["scale_a_" + rule.name] = scales
+        arrays["indices_i_" + rule.name] = row_indices[0][bucket_id]
+        arrays["indices_j_" + rule.name] = col_indices[0][bucket_id]
+    mod["main"] = specialize_params(mod["main"], values)
+    sch = tir.Schedule(mod)
+    for rule in rules:
+        sp_iteration = sch.get_sparse_iteration("csrmm_" + rule.name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_buffer(lower_sparse_iter(sch.mod))
+    mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+    names = rule_param_names(mod["main"], [rule.name for rule in rules])
+    assert len(names) == 4 * len(buckets)
+    packed, layout = pack_params(mod["main"], names)
+    assert [param.name for param in packed.params[:2]] == ["b", "c"]
+    assert sorted(param.name for param in packed.params[2:]) == [
+        "packed_float32",
+        "packed_int32",
+        "packed_int8",
+    ]
+
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    arrays.update(b=x.reshape(-1), c=c)
+    f = tvm.build(packed, target="llvm")
+    f(*layout.make_args(arrays))
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+
+
+def test_quantize_sparse_buffer_errors():
+    with pytest.raises(KeyError):
+        quantize_sparse_buffer(csrmm, "m", "float16")
+    with pytest.raises(ValueError):
+        quantize_sparse_buffer(csrmm, "a", "float64")
+    # the output of an int8 buffer has no scales to write
+    with pytest.raises(ValueError):
+        quantize_sparse_buffer(csrmm, "c", "int8")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
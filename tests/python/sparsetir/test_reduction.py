@@ -0,0 +1,140 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+import scipy.sparse as sp
+import tvm
+import tvm.testing
+import tvm.tir as tir
+from tvm.sparse import (
+    bucket_contention,
+    column_part_hyb,
+    format_decompose,
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    plan_reduction,
+    specialize_params,
+)
+from tvm.sparse.format_search import ell_rule
+from sparse_tir_scripts import csrmm
+
+
+def test_bucket_contention():
+    # row 0 is split in bucket 1 of partition 0 and also in partition 1
+    row_indices = [[np.array([2, 3]), np.array([0, 0, 1])], [np.array([0, 4]), np.array([])]]
+    stats = bucket_contention(row_indices, 5)
+    assert [s.num_ell_rows for s in stats[0] + stats[1]] == [2, 3, 2, 0]
+    assert stats[0][1].max_multiplicity == 2
+    assert stats[0][1].max_partition_multiplicity == 2
+    assert stats[0][1].max_contention == 3
+    assert stats[0][1].num_conflicts == 2
+    assert stats[0][0].num_conflicts == 0
+    assert stats[1][0].max_partition_multiplicity == 1
+    assert stats[1][0].max_contention == 3
+
+    plan = plan_reduction(row_indices, 5, 8, atomic_threshold=3)
+    assert plan.strategies == [["store", "atomic"], ["atomic", "store"]]
+    assert plan.is_atomic(0, 1) and not plan.is_atomic(0, 0)
+    plan = plan_reduction(row_indices, 5, 8, atomic_threshold=1)
+    assert plan.strategies == [["store", "segmented"], ["private", "store"]]
+    assert plan.buffer_names() == ["c_private", "c_partial0"]
+    plan = plan_reduction(row_indices, 5, 8, atomic_threshold=1, private_budget=0)
+    assert plan.strategies == [["store", "segmented"], ["segmented", "store"]]
+    with pytest.raises(ValueError):
+        plan_reduction(row_indices, 5, 8, dtype="float16")
+
+
+@pytest.mark.parametrize("private_budget", [0, 1 << 30])
+def test_hyb_reduction(private_budget):
+    m = n = 64
+    feat_size = 4
+    num_col_parts = 2
+    buckets = [1, 2]
+    mat = sp.random(m, n, density=0.1, format="csr", dtype="float32")
+    # the buckets hold the masks of the non-zeros
+    mat.data[:] = 1
+    row_indices, col_indices, mask = column_part_hyb(
+        m,
+        n,
+        tvm.nd.array(mat.indptr.astype("int32")),
+        tvm.nd.array(mat.indices.astype("int32")),
+        num_col_parts,
+        buckets,
+    )
+    # no atomics, the rows written by several ELL rows are reduced by the plan
+    plan = plan_reduction(
+        row_indices, m, feat_size, atomic_threshold=0, private_budget=private_budget
+    )
+    strategies = sum(plan.strategies, [])
+    assert "segmented" in strategies
+    assert ("private" in strategies) == (private_budget > 0)
+
+    rules = [
+        ell_rule("{}_{}".format(part_id, bucket_id), width)
+        for part_id in range(num_col_parts)
+        for bucket_id, width in enumerate(buckets)
+    ]
+    mod = format_decompose(tvm.IRModule.from_expr(csrmm), rules)
+    mod = tvm.tir.transform.RemovePreprocess()(mod)
+    values = {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz}
+    arrays = {}
+    for part_id in range(num_col_parts):
+        for bucket_id in range(len(buckets)):
+            suffix = "_{}_{}".format(part_id, bucket_id)
+            values["m" + suffix] = m
+            values["n" + suffix] = n
+            values["num_rows" + suffix] = row_indices[part_id][bucket_id].shape[0]
+            arrays["a" + suffix] = tvm.nd.array(
+                mask[part_id][bucket_id].numpy().reshape(-1).astype("float32")
+            )
+            arrays["indices_i" + suffix] = row_indices[part_id][bucket_id]
+            arrays["indices_j" + suffix] = tvm.nd.array(
+                col_indices[part_id][bucket_id].numpy().reshape(-1)
+            )
+    mod["main"] = specialize_params(mod["main"], values)
+    sch = tir.Schedule(mod)
+    for rule in rules:
+        sp_iteration = sch.get_sparse_iteration("csrmm_" + rule.name)
+        o, i, _, _ = sch.get_sp_iters(sp_iteration)
+        sch.sparse_fuse(sp_iteration, [o, i])
+    mod = lower_sparse_buffer(lower_sparse_iter(sch.mod))
+    mod = tvm.tir.transform.RemoveUnusedArgs()(mod)
+    func = plan.apply(mod["main"])
+    assert [param.name for param in func.params[-len(plan.buffer_names()) :]] == (
+        plan.buffer_names()
+    )
+
+    f = tvm.build(func, target="llvm")
+    reduce = plan.build_reduce("llvm")
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    buffers = plan.make_buffers()
+    arrays.update(b=tvm.nd.array(x.reshape(-1)), c=c, **buffers)
+    f(*[arrays[param.name] for param in func.params])
+    reduce(c, buffers)
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+
+
+def test_apply_errors():
+    plan = plan_reduction([[np.array([0, 0])]], 4, 2, atomic_threshold=0)
+    func = tvm.IRModule.from_expr(csrmm)["main"]
+    with pytest.raises(KeyError):
+        plan.apply(func, output="d")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
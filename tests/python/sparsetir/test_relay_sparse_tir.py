@@ -0,0 +1,96 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import scipy.sparse as sp
+import tvm
+from tvm import relay, te
+from tvm.contrib import graph_executor
+from tvm.topi.utils import get_const_tuple
+
+TARGET = "llvm -libs=sparse_tir"
+
+
+def check_sparse_tir_selected(expr):
+    call = relay.transform.InferType()(tvm.IRModule.from_expr(expr))["main"].body
+    inputs = [
+        te.placeholder(get_const_tuple(arg.checked_type.shape), arg.checked_type.dtype)
+        for arg in call.args
+    ]
+    impl, _ = relay.backend.te_compiler.select_implementation(
+        call.op, call.attrs, inputs, call.checked_type, tvm.target.Target(TARGET)
+    )
+    assert impl.name == call.op.name[len("nn.") :] + ".sparse_tir"
+
+
+def run(expr, inputs):
+    check_sparse_tir_selected(expr)
+    mod = tvm.IRModule.from_expr(relay.Function(relay.analysis.free_vars(expr), expr))
+    with tvm.transform.PassContext(opt_level=3):
+        lib = relay.build(mod, TARGET)
+    m = graph_executor.GraphModule(lib["default"](tvm.cpu()))
+    m.set_input(**inputs)
+    m.run()
+    return m.get_output(0).numpy()
+
+
+def sparse_dense(x_np, w_sp):
+    x = relay.var("x", shape=x_np.shape, dtype="float32")
+    w_data = relay.const(w_sp.data)
+    w_indices = relay.const(w_sp.indices)
+    w_indptr = relay.const(w_sp.indptr)
+    return run(relay.nn.sparse_dense(x, (w_data, w_indices, w_indptr)), {"x": x_np})
+
+
+def test_sparse_dense_csr():
+    x_np = np.random.rand(8, 64).astype("float32")
+    w_sp = sp.random(32, 64, density=0.1, format="csr", dtype="float32")
+    np.testing.assert_allclose(sparse_dense(x_np, w_sp), x_np @ w_sp.T, rtol=1e-5)
+
+
+def test_sparse_dense_bsr():
+    x_np = np.random.rand(8, 64).astype("float32")
+    dense = sp.random(32, 64, density=0.1, dtype="float32").toarray()
+    w_sp = sp.bsr_matrix(dense, blocksize=(4, 2))
+    np.testing.assert_allclose(sparse_dense(x_np, w_sp), x_np @ w_sp.T, rtol=1e-5)
+
+
+def test_sparse_conv2d():
+    dense = sp.random(32, 64, density=0.1, dtype="float32").toarray()
+    w_sp = sp.bsr_matrix(dense, blocksize=(4, 1))
+    for layout in ["NHWC", "NCHW"]:
+        shape = (2, 4, 4, 64) if layout == "NHWC" else (2, 64, 4, 4)
+        x_np = np.random.rand(*shape).astype("float32")
+        x = relay.var("x", shape=shape, dtype="float32")
+        y = relay.op.nn._make.sparse_conv2d(
+            x,
+            relay.const(w_sp.data),
+            relay.const(w_sp.indices),
+            relay.const(w_sp.indptr),
+            layout,
+            [1, 1],
+        )
+        if layout == "NHWC":
+            expected = np.einsum("nhwk,ck->nhwc", x_np, w_sp.toarray())
+        else:
+            expected = np.einsum("nkhw,ck->nchw", x_np, w_sp.toarray())
+        np.testing.assert_allclose(run(y, {"x": x_np}), expected, rtol=1e-5)
+
+
+if __name__ == "__main__":
+    test_sparse_dense_csr()
+    test_sparse_dense_bsr()
+    test_sparse_conv2d()
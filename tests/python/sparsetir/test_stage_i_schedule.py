@@ -22,6 +22,12 @@ import numpy as np
 from tvm.script import tir as T
 from scipy.sparse import bsr
 import pytest
+from tvm.sparse import (
+    lower_sparse_buffer,
+    lower_sparse_iter,
+    specialize_params,
+    tile_unique_columns,
+)
 from sparse_tir_scripts import csrmm, bsrmm, sddmm, fused_sddmm
 
 
@@ -61,6 +67,42 @@ def reordered_bsrmm(
         C[vi, vbi, vf] = C[vi, vbi, vf] + A[vi, vj, vbi, vbj] * B[vj, vbj, vf]
 
 
+@T.prim_func
+def csrmm_cache_read_b(
+    a: T.handle,
+    b: T.handle,
+    c: T.handle,
+    indptr: T.handle,
+    indices: T.handle,
+    m: T.int32,
+    n: T.int32,
+    feat_size: T.int32,
+    nnz: T.int32,
+    b_shared_cols: T.handle,
+    b_shared_slot: T.handle,
+    b_shared_width: T.int32,
+) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+    I = T.dense_fixed(m)
+    J = T.sparse_variable(I, (n, nnz), (indptr, indices), "int32")
+    J_detach = T.dense_fixed(n)
+    K = T.dense_fixed(feat_size)
+    B_shared_tile = T.dense_fixed((m + 3) // 4)
+    B_shared_col = T.dense_fixed(b_shared_width)
+    A = T.match_sparse_buffer(a, (I, J), "float32")
+    B = T.match_sparse_buffer(b, (J_detach, K), "float32")
+    C = T.match_sparse_buffer(c, (I, K), "float32")
+    B_shared_cols = T.match_sparse_buffer(b_shared_cols, (B_shared_tile, B_shared_col), "int32")
+    B_shared_slot = T.match_sparse_buffer(b_shared_slot, (I, J), "int32")
+    B_shared = T.alloc_sparse_buffer((B_shared_tile, B_shared_col, K), "float32", "shared")
+    with T.sp_iter([B_shared_tile, B_shared_col, K], "SSS", "B_shared") as [t, u, k]:
+        B_shared[t, u, k] = B[B_shared_cols[t, u], k]
+    with T.sp_iter([I, J, K], "SRS", "csrmm") as [i, j, k]:
+        with T.init():
+            C[i, k] = 0.0
+        C[i, k] = C[i, k] + A[i, j] * B_shared[i // 4, B_shared_slot[i, j], k]
+
+
 def test_get_sparse_iteration():
     sch = tir.Schedule(csrmm, debug_mask="all")
     sp_iteration_rv = sch.get_sparse_iteration("csrmm")
@@ -114,6 +156,65 @@ def test_reorder_fail_on_new_order_length():
         sch.sparse_reorder(block, [bi, bj, i, j])
 
 
+def test_sparse_cache_read():
+    sch = tir.Schedule(csrmm, debug_mask="all")
+    block = sch.get_sparse_iteration("csrmm")
+    cache_block = sch.sparse_cache_read(block, "B", "shared", 4)
+    tvm.ir.assert_structural_equal(sch.mod["main"], csrmm_cache_read_b, True)
+    assert sch.get(cache_block).name == "B_shared"
+    assert sch.get(block).name == "csrmm"
+
+
+def test_sparse_cache_read_numeric():
+    m, n, feat_size, tile_size = 37, 64, 8, 4
+    # the rows of a tile share most of their column ids
+    mat = sp.random(m, 16, density=0.4, format="csr", dtype="float32")
+    mat = sp.csr_matrix((mat.data, mat.indices * 4, mat.indptr), shape=(m, n))
+    indptr = tvm.nd.array(mat.indptr.astype("int32"))
+    indices = tvm.nd.array(mat.indices.astype("int32"))
+    cols, slot = tile_unique_columns(indptr, indices, tile_size)
+    assert cols.shape[0] == (m + tile_size - 1) // tile_size
+    rows = np.repeat(np.arange(m), np.diff(mat.indptr))
+    np.testing.assert_array_equal(cols.numpy()[rows // tile_size, slot.numpy()], mat.indices)
+
+    func = specialize_params(csrmm, {"m": m, "n": n, "feat_size": feat_size, "nnz": mat.nnz})
+    sch = tir.Schedule(func)
+    block = sch.get_sparse_iteration("csrmm")
+    sch.sparse_cache_read(block, "B", "global", tile_size)
+    func = specialize_params(sch.mod["main"], {"b_global_width": cols.shape[1]})
+    mod = lower_sparse_iter(tvm.IRModule.from_expr(func))
+    mod = lower_sparse_buffer(mod)
+    f = tvm.build(mod["main"], target="llvm")
+
+    x = np.random.rand(n, feat_size).astype("float32")
+    c = tvm.nd.array(np.zeros(m * feat_size, "float32"))
+    f(
+        tvm.nd.array(mat.data),
+        tvm.nd.array(x.reshape(-1)),
+        c,
+        indptr,
+        indices,
+        tvm.nd.array(cols.numpy().reshape(-1)),
+        slot,
+    )
+    tvm.testing.assert_allclose(c.numpy().reshape(m, feat_size), mat @ x, rtol=1e-5)
+
+
+def test_sparse_cache_read_fail_on_written_buffer():
+    sch = tir.Schedule(csrmm, debug_mask="all")
+    block = sch.get_sparse_iteration("csrmm")
+    with pytest.raises(tvm.tir.ScheduleError):
+        sch.sparse_cache_read(block, "C", "shared", 4)
+
+
+def test_sparse_cache_read_fail_on_non_gathered_buffer():
+    sch = tir.Schedule(csrmm, debug_mask="all")
+    block = sch.get_sparse_iteration("csrmm")
+    # A is read at the positions of the sparse axis, not gathered through its indices
+    with pytest.raises(tvm.tir.ScheduleError):
+        sch.sparse_cache_read(block, "A", "shared", 4)
+
+
 if __name__ == "__main__":
     test_get_sparse_iteration()
     test_get_sp_iters()
@@ -121,3 +222,7 @@ if __name__ == "__main__":
     test_fuse()
     test_reorder_fail_on_dependency()
     test_reorder_fail_on_new_order_length()
+    test_sparse_cache_read()
+    test_sparse_cache_read_numeric()
+    test_sparse_cache_read_fail_on_written_buffer()
+    test_sparse_cache_read_fail_on_non_gathered_buffer()
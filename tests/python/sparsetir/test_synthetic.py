@@ -0,0 +1,53 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import pytest
+from tvm.sparse import testing
+
+
+@pytest.mark.parametrize("name", list(testing.GENERATORS))
+def test_generate(name):
+    mat = testing.generate(name, 1000, 8)
+    assert mat.shape[0] == mat.shape[1]
+    assert mat.dtype == "float32" and mat.has_sorted_indices
+    # no duplicate non-zeros
+    assert mat.nnz == len(set(zip(*mat.nonzero())))
+    assert 4 <= mat.nnz / mat.shape[0] <= 9
+    # deterministic given the seed
+    assert (testing.generate(name, 1000, 8) != mat).nnz == 0
+    assert (testing.generate(name, 1000, 8, seed=1) != mat).nnz > 0
+
+
+def test_structure():
+    banded = testing.banded(64, 2)
+    rows, cols = banded.nonzero()
+    assert np.abs(rows - cols).max() == 2 and banded.nnz == 64 * 5 - 6
+    block = testing.block_diagonal(8, 16)
+    rows, cols = block.nonzero()
+    assert (rows // 16 == cols // 16).all()
+    degrees = np.diff(testing.power_law(4096, 4096, 8).indptr)
+    # a heavy tail
+    assert degrees.max() > 8 * np.median(degrees)
+    assert testing.rmat(10).shape == (1024, 1024)
+    with pytest.raises(KeyError):
+        testing.generate("unknown", 16)
+
+
+if __name__ == "__main__":
+    for name in testing.GENERATORS:
+        test_generate(name)
+    test_structure()
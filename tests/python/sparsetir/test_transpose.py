@@ -0,0 +1,46 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import numpy as np
+import scipy.sparse as sp
+from tvm.sparse import csr_transpose
+
+
+def test_csr_transpose():
+    for idtype in ["int32", "int64"]:
+        for m, n in [(200, 120), (7, 300)]:
+            mat = sp.random(m, n, density=0.05, format="csr", dtype="float32")
+            csc = mat.tocsc()
+            indptr, indices, data = csr_transpose(
+                mat.indptr.astype(idtype), mat.indices.astype(idtype), mat.data, num_cols=n
+            )
+            assert indptr.dtype == idtype and indices.dtype == idtype
+            np.testing.assert_array_equal(indptr.numpy(), csc.indptr)
+            np.testing.assert_array_equal(indices.numpy(), csc.indices)
+            np.testing.assert_array_equal(data.numpy(), csc.data)
+
+
+def test_csr_transpose_permutation():
+    mat = sp.random(64, 64, density=0.1, format="csr", dtype="float32")
+    _, _, perm = csr_transpose(mat.indptr, mat.indices, idtype="int64")
+    assert perm.dtype == "int64"
+    # the values of the transpose are gathered from the input
+    np.testing.assert_array_equal(mat.data[perm.numpy()], mat.tocsc().data)
+
+
+if __name__ == "__main__":
+    test_csr_transpose()
+    test_csr_transpose_permutation()
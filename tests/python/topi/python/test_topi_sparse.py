@@ -331,6 +331,45 @@ def test_sparse_transpose_csr():
     tvm.testing.assert_allclose(X_np_T, X_T_out, atol=1e-4, rtol=1e-4)
 
 
+def verify_sparse_transpose_csr(M, N, density, idtype, num_chunks):
+    X_sp = sp.random(M, N, density=density, format="csr", dtype="float32")
+    X_sp_T = X_sp.transpose().tocsr()
+    X_sp_T.sort_indices()
+
+    X_data = te.placeholder(shape=X_sp.data.shape, dtype="float32")
+    X_indices = te.placeholder(shape=X_sp.indices.shape, dtype=idtype)
+    X_indptr = te.placeholder(shape=X_sp.indptr.shape, dtype=idtype)
+
+    outs = topi.nn.sparse_transpose(X_data, X_indices, X_indptr, num_cols=N, num_chunks=num_chunks)
+    assert [out.dtype for out in outs] == ["float32", idtype, idtype]
+    s = te.create_schedule([out.op for out in outs])
+    func = tvm.build(s, [X_data, X_indices, X_indptr] + outs)
+
+    X_T_data_tvm = tvm.nd.empty(X_sp_T.data.shape, "float32")
+    X_T_indices_tvm = tvm.nd.empty(X_sp_T.indices.shape, idtype)
+    X_T_indptr_tvm = tvm.nd.empty(X_sp_T.indptr.shape, idtype)
+    func(
+        tvm.nd.array(X_sp.data),
+        tvm.nd.array(X_sp.indices.astype(idtype)),
+        tvm.nd.array(X_sp.indptr.astype(idtype)),
+        X_T_data_tvm,
+        X_T_indices_tvm,
+        X_T_indptr_tvm,
+    )
+    # non-zeros of a column stay in row order
+    tvm.testing.assert_allclose(X_T_indptr_tvm.numpy(), X_sp_T.indptr)
+    tvm.testing.assert_allclose(X_T_indices_tvm.numpy(), X_sp_T.indices)
+    tvm.testing.assert_allclose(X_T_data_tvm.numpy(), X_sp_T.data)
+
+
+def test_sparse_transpose_csr_rectangular():
+    for idtype in ["int32", "int64"]:
+        for num_chunks in [1, 16]:
+            verify_sparse_transpose_csr(301, 157, 0.1, idtype, num_chunks)
+    # fewer rows than chunks
+    verify_sparse_transpose_csr(5, 40, 0.3, "int32", 16)
+
+
 def random_bsr_matrix(M, N, BS_R, BS_C, density, dtype):
     import itertools
 
@@ -0,0 +1,91 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import os
+import subprocess
+import sys
+import textwrap
+
+import pytest
+
+
+def run_python(code, lazy):
+    env = dict(os.environ, TVM_LAZY_IMPORT="1" if lazy else "0")
+    proc = subprocess.run(
+        [sys.executable, "-c", textwrap.dedent(code)],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        env=env,
+    )
+    assert proc.returncode == 0, f"{proc.args} exited with {proc.returncode}: {proc.stdout}"
+
+
+def test_lazy_import_runtime_only():
+    run_python(
+        """
+        import sys
+        import numpy as np
+        import tvm
+
+        for name in ["tvm.te", "tvm.tir", "tvm.driver", "tvm.relay", "tvm.topi", "tvm.sparse"]:
+            assert name not in sys.modules, name
+        a = tvm.nd.array(np.arange(4, dtype="float32"), tvm.cpu())
+        np.testing.assert_equal(a.numpy(), np.arange(4, dtype="float32"))
+        assert tvm.get_global_func("runtime.ModuleLoadFromFile") is not None
+        assert "tvm.tir" not in sys.modules
+        """,
+        lazy=True,
+    )
+
+
+def test_lazy_import_compiler_on_access():
+    run_python(
+        """
+        import sys
+        import tvm
+
+        build = tvm.build
+        assert "tvm.tir" in sys.modules and "tvm.te" in sys.modules
+        assert tvm.tir.IntImm("int32", 1).value == 1
+        assert isinstance(tvm.IRModule(), tvm.ir.IRModule)
+        assert "tvm.relay" not in sys.modules
+        """,
+        lazy=True,
+    )
+
+
+def test_lazy_subpackages():
+    code = """
+        import sys
+        import tvm
+
+        assert "tvm.relay" not in sys.modules
+        assert tvm.relay.const(1).data.numpy() == 1
+        assert "tvm.relay" in sys.modules
+        assert tvm.sparse.lower_sparse_iter is not None
+        try:
+            tvm.not_a_subpackage
+        except AttributeError:
+            pass
+        else:
+            raise AssertionError("expected AttributeError")
+        """
+    run_python(code, lazy=False)
+    run_python(code, lazy=True)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))
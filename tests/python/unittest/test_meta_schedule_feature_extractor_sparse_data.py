@@ -0,0 +1,98 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+from typing import List
+
+import numpy as np
+from tvm.meta_schedule import TuneContext
+from tvm.meta_schedule.feature_extractor import (
+    PyFeatureExtractor,
+    SparseDataFeature,
+    sparse_statistics,
+)
+from tvm.meta_schedule.feature_extractor.sparse_data_feature import sparse_statistics_length
+from tvm.meta_schedule.search_strategy import MeasureCandidate
+from tvm.meta_schedule.utils import derived_object
+from tvm.runtime.ndarray import array
+from tvm.script import tir as T
+from tvm.tir import Schedule
+
+# rows of degree 1, 2, 0, 5
+INDPTR = np.array([0, 1, 3, 3, 8], dtype="int32")
+INDICES = np.array([0, 1, 2, 0, 1, 2, 3, 7], dtype="int32")
+
+
+@T.prim_func
+def add(a: T.handle, b: T.handle) -> None:
+    A = T.match_buffer(a, (16,), "float32")
+    B = T.match_buffer(b, (16,), "float32")
+    for i in T.serial(16):
+        with T.block("add"):
+            vi = T.axis.spatial(16, i)
+            B[vi] = A[vi] + T.float32(1)
+
+
+@derived_object
+class ConstFeatureExtractor(PyFeatureExtractor):
+    def extract_from(
+        self,
+        context: TuneContext,  # pylint: disable = unused-argument
+        candidates: List[MeasureCandidate],
+    ) -> List[np.ndarray]:
+        return [array(np.ones((3, 4), dtype="float32")) for _ in candidates]
+
+
+def test_sparse_statistics():
+    stats = sparse_statistics(INDPTR, INDICES, bucket_widths=(1, 2, 4), num_degree_bins=4)
+    assert stats.shape == (sparse_statistics_length((1, 2, 4), 4),)
+    sizes, moments, histogram, locality, fill = np.split(stats, [3, 9, 13, 15])
+    np.testing.assert_allclose(sizes, np.log1p([4, 8, 8]), rtol=1e-6)
+    np.testing.assert_allclose(moments[4], 0.25)  # empty rows
+    # degrees 0 | 1 | 2 | 5
+    np.testing.assert_allclose(histogram, [0.25, 0.25, 0.25, 0.25])
+    # gaps inside rows: 1 | 1, 1, 1, 4
+    np.testing.assert_allclose(locality[0], 0.8)
+    # buckets: width 1 holds the row of degree 1, width 2 the row of degree 2,
+    # width 4 the row of degree 5 split into two chunks
+    np.testing.assert_allclose(fill, [1.0, 1 / 8, 1.0, 2 / 8, 5 / 8, 5 / 8], rtol=1e-6)
+
+
+def test_sparse_data_feature():
+    extractor = SparseDataFeature(
+        {"spmm": (INDPTR, INDICES)},
+        extractor=ConstFeatureExtractor(),
+    )
+    candidates = [MeasureCandidate(Schedule(add), []) for _ in range(2)]
+    features = extractor.extract_from(TuneContext(task_name="spmm"), candidates)
+    assert len(features) == 2
+    stats = sparse_statistics(INDPTR, INDICES)
+    for feature in features:
+        feature = feature.numpy()
+        assert feature.shape == (3, 4 + 1 + len(stats))
+        np.testing.assert_allclose(feature[:, :4], 1.0)
+        np.testing.assert_allclose(feature[:, 4], 1.0)
+        np.testing.assert_allclose(feature[:, 5:], np.tile(stats, (3, 1)))
+    # no sparse inputs are bound to other tasks
+    features = extractor.extract_from(TuneContext(task_name="dense"), candidates)
+    np.testing.assert_allclose(features[0].numpy()[:, 4:], 0.0)
+    assert extractor.data_hash(TuneContext(task_name="dense")) == ""
+    assert extractor.data_hash(TuneContext(task_name="spmm")) != ""
+
+
+if __name__ == "__main__":
+    test_sparse_statistics()
+    test_sparse_data_feature()
@@ -36,6 +36,7 @@ from tvm.meta_schedule.runner import (
     RPCRunner,
     RunnerFuture,
     RunnerInput,
+    bind_args_by_name,
 )
 from tvm.meta_schedule.runner.local_runner import (
     default_alloc_argument as local_default_alloc_argument,
@@ -47,6 +48,7 @@ from tvm.meta_schedule.runner.rpc_runner import (
 from tvm.meta_schedule.runner.rpc_runner import (
     default_alloc_argument as rpc_default_alloc_argument,
 )
+from tvm.meta_schedule.runner.utils import alloc_argument_common, run_evaluator_common
 from tvm.meta_schedule.testing.local_rpc import LocalRPC
 from tvm.meta_schedule.utils import (
     derived_object,
@@ -131,6 +133,20 @@ class AddModule:
                 C[vi] = A[vi] + B[vi]
 
 
+@tvm.script.ir_module
+class GatherModule:
+    @T.prim_func
+    def main(a: T.handle, indices: T.handle, b: T.handle) -> None:  # pylint: disable=no-self-argument
+        T.func_attr({"global_symbol": "main", "tir.noalias": True})
+        A = T.match_buffer(a, [32], "float32")
+        Indices = T.match_buffer(indices, [32], "int32")
+        B = T.match_buffer(b, [32], "float32")
+        for i in range(32):
+            with T.block("gather"):
+                vi = T.axis.S(32, i)
+                B[vi] = A[Indices[vi]]
+
+
 # pylint: enable=invalid-name,no-member,line-too-long,too-many-nested-blocks,missing-docstring
 
 
@@ -889,5 +905,77 @@ def test_meta_schedule_local_runner_add_test():
     _clean_build(builder_result.artifact_path)
 
 
+def test_meta_schedule_local_runner_bound_args():
+    """Test meta schedule local runner with arrays bound to the arguments"""
+    indices = np.arange(MATMUL_M, dtype="int32")[::-1].copy()
+
+    def test_run_evaluator(
+        rt_mod: Module,
+        device: Device,
+        evaluator_config: EvaluatorConfig,
+        repeated_args: List[Any],
+    ) -> List[float]:
+        for args in repeated_args:
+            assert (args[1].numpy() == np.arange(MATMUL_M, dtype="int32")[::-1]).all()
+        # the bound array is uploaded once and reused across measurements
+        assert all(args[1].same_as(repeated_args[0][1]) for args in repeated_args)
+        return run_evaluator_common(rt_mod, device, evaluator_config, repeated_args)
+
+    # Build the module
+    mod = GatherModule
+    builder = LocalBuilder()
+    (builder_result,) = builder.build([BuilderInput(mod, Target("llvm"))])
+    assert builder_result.artifact_path is not None
+    assert builder_result.error_msg is None
+
+    runner_input = RunnerInput(
+        builder_result.artifact_path,
+        "llvm",
+        [
+            TensorInfo("float32", [MATMUL_M]),
+            TensorInfo("int32", [MATMUL_M]),
+            TensorInfo("float32", [MATMUL_M]),
+        ],
+    )
+
+    evaluator_config = EvaluatorConfig(
+        number=1,
+        repeat=1,
+        min_repeat_ms=0,
+        enable_cpu_cache_flush=False,
+    )
+    runner = LocalRunner(
+        timeout_sec=100,
+        evaluator_config=evaluator_config,
+        alloc_repeat=2,
+        f_run_evaluator=test_run_evaluator,
+        bound_args=bind_args_by_name(mod["main"], {"indices": indices}),
+    )
+    # Run the module twice
+    for runner_future in runner.run([runner_input, runner_input]):
+        runner_result = runner_future.result()
+        assert runner_result.error_msg is None
+        for result in runner_result.run_secs:
+            if isinstance(result, FloatImm):
+                result = result.value
+            assert isinstance(result, float)
+            assert result >= 0.0
+    _clean_build(builder_result.artifact_path)
+
+
+def test_meta_schedule_bound_args_dtype_mismatch():
+    """Test the dtype of the bound arrays is checked against the argument info"""
+    with pytest.raises(ValueError):
+        alloc_argument_common(
+            lambda arr: None,
+            tvm.cpu(),
+            [("TENSOR", "int32", [MATMUL_M])],
+            1,
+            {0: tvm.nd.array(np.zeros(MATMUL_M, dtype="int64"))},
+        )
+    with pytest.raises(ValueError):
+        bind_args_by_name(GatherModule["main"], {"indptr": np.zeros(MATMUL_M, dtype="int32")})
+
+
 if __name__ == "__main__":
     sys.exit(pytest.main([__file__] + sys.argv[1:]))
@@ -0,0 +1,131 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+# pylint: disable=missing-module-docstring,missing-function-docstring,missing-class-docstring
+import tvm
+from tvm.meta_schedule.space_generator.post_order_apply import PostOrderApply
+from tvm.meta_schedule.testing.schedule_rule import sparse_tiling
+from tvm.meta_schedule.tune import Parse
+from tvm.meta_schedule.tune_context import TuneContext
+from tvm.script import tir as T
+from tvm.sparse import lower_sparse_iter
+from tvm.target import Target
+
+# fmt: off
+# pylint: disable=no-member,invalid-name,unused-variable,no-self-argument,line-too-long,chained-comparison,not-callable,too-many-nested-blocks
+
+@T.prim_func
+def csrmm(a: T.handle, b: T.handle, c: T.handle, indptr: T.handle, indices: T.handle, m: T.int32, n: T.int32, nnz: T.int32) -> None:
+    T.func_attr({"global_symbol": "main", "tir.noalias": True, "sparse_tir_level": 2})
+    I = T.dense_fixed(m)
+    J = T.sparse_variable(I, (n, nnz), (indptr, indices), "int32")
+    J_detach = T.dense_fixed(n)
+    K = T.dense_fixed(128)
+    A = T.match_sparse_buffer(a, (I, J), "float32")
+    B = T.match_sparse_buffer(b, (J_detach, K), "float32")
+    C = T.match_sparse_buffer(c, (I, K), "float32")
+    with T.sp_iter([I, J, K], "SRS", "csrmm") as [i, j, k]:
+        with T.init():
+            C[i, k] = 0.0
+        C[i, k] = C[i, k] + A[i, j] * B[j, k]
+
+# pylint: enable=no-member,invalid-name,unused-variable,no-self-argument,line-too-long,chained-comparison,not-callable,too-many-nested-blocks
+# fmt: on
+
+
+def _create_context(mod, target, rule):
+    ctx = TuneContext(
+        mod=mod,
+        target=target,
+        space_generator=PostOrderApply(),
+        sch_rules=[rule],
+        task_name="test",
+    )
+    ctx.space_generator.initialize_with_tune_context(ctx)
+    for sch_rule in ctx.sch_rules:
+        sch_rule.initialize_with_tune_context(ctx)
+    return ctx
+
+
+def _lowered_csrmm():
+    return lower_sparse_iter(tvm.IRModule.from_expr(csrmm))
+
+
+def _inst_kinds(space):
+    return [inst.kind.name for inst in space.trace.insts]
+
+
+def test_sparse_tiling_cpu():
+    target = Target("llvm --num-cores=16")
+    ctx = _create_context(_lowered_csrmm(), target, sparse_tiling(target))
+    spaces = ctx.space_generator.generate_design_space(mod=ctx.mod)
+    assert len(spaces) == 1
+    kinds = _inst_kinds(spaces[0])
+    assert kinds.count("SampleCategorical") == 1
+    assert kinds.count("Split") == 1
+    assert kinds.count("Parallel") == 1
+    assert "Bind" not in kinds
+
+
+def test_sparse_tiling_cuda():
+    target = Target("nvidia/geforce-rtx-3080")
+    ctx = _create_context(_lowered_csrmm(), target, sparse_tiling(target))
+    spaces = ctx.space_generator.generate_design_space(mod=ctx.mod)
+    assert len(spaces) == 1
+    sch = spaces[0]
+    kinds = _inst_kinds(sch)
+    # one split for the feature loop, one for the rows
+    assert kinds.count("SampleCategorical") == 2
+    assert kinds.count("Split") == 2
+    assert kinds.count("Bind") == 3
+    thread_tags = set()
+    for loop in sch.get_loops(sch.get_block("csrmm1")):
+        for_node = sch.get(loop)
+        if for_node.thread_binding is not None:
+            thread_tags.add(for_node.thread_binding.thread_tag)
+    assert thread_tags == {"blockIdx.x", "threadIdx.y", "threadIdx.x"}
+
+
+def test_sparse_tiling_skip_dense():
+    @T.prim_func
+    def add(a: T.handle, b: T.handle) -> None:
+        T.func_attr({"global_symbol": "main"})
+        A = T.match_buffer(a, (128,), "float32")
+        B = T.match_buffer(b, (128,), "float32")
+        for i in T.serial(128):
+            with T.block("add"):
+                vi = T.axis.spatial(128, i)
+                B[vi] = A[vi] + T.float32(1)
+
+    target = Target("llvm --num-cores=16")
+    ctx = _create_context(tvm.IRModule.from_expr(add), target, sparse_tiling(target))
+    spaces = ctx.space_generator.generate_design_space(mod=ctx.mod)
+    assert len(spaces) == 1
+    kinds = _inst_kinds(spaces[0])
+    assert "Split" not in kinds
+    assert "Parallel" not in kinds
+
+
+def test_parse_is_sparse():
+    assert not Parse._is_sparse(tvm.IRModule.from_expr(csrmm))  # pylint: disable=protected-access
+    assert Parse._is_sparse(_lowered_csrmm())  # pylint: disable=protected-access
+
+
+if __name__ == "__main__":
+    test_sparse_tiling_cpu()
+    test_sparse_tiling_cuda()
+    test_sparse_tiling_skip_dense()
+    test_parse_is_sparse()
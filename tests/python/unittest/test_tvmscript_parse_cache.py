@@ -0,0 +1,93 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+import os
+import sys
+
+import pytest
+import tvm
+from tvm.script import cache
+from tvm.script import tir as T
+from tvm.script.tir.prim_func import LazyPrimFunc
+
+
+def copy_generator(n: int, m):
+    @T.prim_func
+    def copy(a: T.handle, b: T.handle) -> None:
+        A = T.match_buffer(a, [n, m], dtype="float32")
+        B = T.match_buffer(b, [n, m], dtype="float32")
+        for i, j in T.grid(n, m):
+            with T.block("copy"):
+                vi, vj = T.axis.remap("SS", [i, j])
+                B[vi, vj] = A[vi, vj]
+
+    return copy
+
+
+def test_parse_cache_hit():
+    cache.clear()
+    assert copy_generator(16, 2).same_as(copy_generator(16, 2))
+    # the captured values are part of the key
+    assert not copy_generator(16, 2).same_as(copy_generator(32, 2))
+    assert not copy_generator(16, 2).same_as(copy_generator(16, 3))
+    tvm.ir.assert_structural_equal(copy_generator(32, 2), copy_generator(32, 2))
+
+
+def test_parse_cache_skips_objects():
+    cache.clear()
+    m = tvm.tir.const(2, "int32")
+    assert not copy_generator(16, m).same_as(copy_generator(16, m))
+    assert len(cache._MEMORY_CACHE) == 0
+
+
+def test_parse_cache_disk(tmp_path, monkeypatch):
+    monkeypatch.setenv("TVM_SCRIPT_CACHE_DIR", str(tmp_path))
+    cache.clear()
+    func = copy_generator(8, 2)
+    assert len(os.listdir(tmp_path)) == 1
+    # a new process only finds the function on disk
+    cache.clear()
+    loaded = copy_generator(8, 2)
+    assert not loaded.same_as(func)
+    tvm.ir.assert_structural_equal(loaded, func)
+    cache.clear(disk=True)
+    assert len(os.listdir(tmp_path)) == 0
+
+
+@T.prim_func(lazy=True)
+def lazy_scale(a: T.handle, b: T.handle, n: T.int32) -> None:
+    A = T.match_buffer(a, [n], dtype="float32")
+    B = T.match_buffer(b, [n], dtype="float32")
+    for i in T.serial(n):
+        with T.block("scale"):
+            vi = T.axis.spatial(n, i)
+            B[vi] = A[vi] * T.float32(2)
+
+
+def test_lazy_prim_func():
+    assert isinstance(lazy_scale, LazyPrimFunc)
+    assert lazy_scale.__name__ == "lazy_scale"
+    specialized = lazy_scale.specialize({lazy_scale.params[-1]: 16})
+    assert isinstance(lazy_scale.func, tvm.tir.PrimFunc)
+    assert specialized.buffer_map[specialized.params[0]].shape[0] == 16
+    # converted to the parsed function when passed to TVM functions
+    mod = tvm.IRModule.from_expr(lazy_scale)
+    tvm.ir.assert_structural_equal(mod["main"].body, lazy_scale.body)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__] + sys.argv[1:]))